@@ -5,11 +5,13 @@ training server and processes candidate training tasks.
 
 Two worker implementations are available:
 - ``CascorWorkerAgent`` (default): WebSocket-based, no pickle.
+- ``FederatedWorker``: one ``CascorWorkerAgent`` per server, sharing training.
 - ``CandidateTrainingWorker`` (legacy): BaseManager-based, deprecated.
 """
 
 from juniper_cascor_worker.config import WorkerConfig
-from juniper_cascor_worker.exceptions import WorkerConfigError, WorkerConnectionError, WorkerError
+from juniper_cascor_worker.exceptions import TrainingBackendError, WorkerConfigError, WorkerConnectionError, WorkerError
+from juniper_cascor_worker.federation import FederatedWorker
 from juniper_cascor_worker.worker import CandidateTrainingWorker, CascorWorkerAgent
 
 __version__ = "0.4.0"
@@ -17,9 +19,11 @@ __version__ = "0.4.0"
 __all__ = [
     "CascorWorkerAgent",
     "CandidateTrainingWorker",
+    "FederatedWorker",
     "WorkerConfig",
     "WorkerError",
     "WorkerConnectionError",
     "WorkerConfigError",
+    "TrainingBackendError",
     "__version__",
 ]
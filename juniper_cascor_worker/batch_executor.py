@@ -0,0 +1,217 @@
+"""Vectorized training for a batch of candidates sharing one dataset.
+
+Every candidate in a cascade round trains on the same ``candidate_input``
+and ``residual_error``. :func:`execute_training_task` builds one
+``CandidateUnit`` per task and runs its Python-level loop, so for the small
+to medium input sizes CasCor uses, per-epoch cost is dominated by
+interpreter overhead rather than arithmetic. This engine stacks the K
+candidates' weight vectors into one ``(inputs, K)`` matrix and runs each
+epoch as a single ``X @ W`` with batched correlation and gradient
+computation, so the work is BLAS-bound instead.
+
+The epoch is the one ``CandidateUnit.train_detailed`` runs, column for
+column: forward pass, Pearson correlation against every residual-error
+column, best column by absolute correlation, one autograd step on
+``-|corr(best)|``, then the unit's early-stopping rule. Candidates are
+still constructed through ``CandidateUnit`` so seeding and initial weights
+are identical to the single-task path; only the training loop is batched.
+Results come back in exactly the ``(result_dict, tensor_dict)`` shape of
+:func:`execute_training_task`, one per candidate, in input order.
+
+Candidates are grouped by activation; activations that are not
+column-wise (see ``BATCH_SEQUENTIAL_ACTIVATIONS``) fall back to the
+single-task path.
+
+CW-08: torch is imported lazily, as in :mod:`task_executor`.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from juniper_cascor_worker.constants import BATCH_SEQUENTIAL_ACTIVATIONS, DEFAULT_ACTIVATION, DEFAULT_LEARNING_RATE, DEFAULT_TRAINING_EPOCHS
+from juniper_cascor_worker.task_executor import _as_float32_tensor, _build_candidate_unit, _build_failure_result, _get_candidate_unit_class, _package_result, execute_training_task
+
+logger = logging.getLogger(__name__)
+
+# Matches CandidateUnit._calculate_correlation: the epsilon added to every
+# denominator, and the threshold below which a correlation is reported as 0.
+_CORRELATION_EPSILON = 1e-8
+_DEGENERATE_DENOMINATOR = 1e-7
+
+
+@dataclass
+class _BatchTrainingResult:
+    """The ``CandidateTrainingResult`` fields :func:`_package_result` reads."""
+
+    correlation: float
+    all_correlations: list[float]
+    best_corr_idx: int
+    norm_output: Any
+    norm_error: Any
+    numerator: float
+    denominator: float
+    epochs_completed: int
+    success: bool = True
+    error_message: Optional[str] = None
+
+
+def execute_training_batch(
+    candidates: list[dict[str, Any]],
+    training_params: dict[str, Any],
+    tensors: dict[str, np.ndarray],
+) -> list[tuple[dict[str, Any], dict[str, np.ndarray]]]:
+    """Train every candidate in ``candidates`` against the shared tensors.
+
+    Args:
+        candidates: Candidate configurations (same keys as
+            ``execute_training_task``'s ``candidate_data``).
+        training_params: Training hyperparameters shared by the batch.
+        tensors: Shared training data (``candidate_input``, ``residual_error``).
+
+    Returns:
+        One ``(result_dict, tensor_dict)`` per candidate, in input order.
+        A group that fails reports a failure result for each of its members.
+
+    Raises:
+        ImportError: If CandidateUnit is not importable.
+    """
+    CandidateUnit = _get_candidate_unit_class()
+
+    results: list[Optional[tuple[dict[str, Any], dict[str, np.ndarray]]]] = [None] * len(candidates)
+    groups: dict[str, list[int]] = {}
+    for i, candidate_data in enumerate(candidates):
+        activation_name = candidate_data.get("activation_name", DEFAULT_ACTIVATION)
+        if str(activation_name).lower() in BATCH_SEQUENTIAL_ACTIVATIONS:
+            results[i] = execute_training_task(candidate_data, training_params, tensors)
+        else:
+            groups.setdefault(activation_name, []).append(i)
+
+    if groups:
+        candidate_input = _as_float32_tensor(tensors["candidate_input"])
+        residual_error = _as_float32_tensor(tensors["residual_error"])
+        for activation_name, indices in groups.items():
+            members = [candidates[i] for i in indices]
+            try:
+                group_results = _train_group(CandidateUnit, members, training_params, candidate_input, residual_error)
+            except Exception as e:
+                logger.error("Batch training failed for %d '%s' candidate(s): %s", len(members), activation_name, e)
+                group_results = [(_build_failure_result(candidate_data, str(e)), {}) for candidate_data in members]
+            for i, result in zip(indices, group_results):
+                results[i] = result
+
+    return [result for result in results if result is not None]
+
+
+def _train_group(
+    CandidateUnit: Any,
+    candidates: list[dict[str, Any]],
+    training_params: dict[str, Any],
+    x: Any,
+    residual_error: Any,
+) -> list[tuple[dict[str, Any], dict[str, np.ndarray]]]:
+    """Train candidates that share an activation as one stacked weight matrix."""
+    import torch
+
+    epochs = training_params.get("epochs", DEFAULT_TRAINING_EPOCHS)
+    learning_rate = training_params.get("learning_rate", DEFAULT_LEARNING_RATE)
+
+    units = [_build_candidate_unit(CandidateUnit, candidate_data, training_params) for candidate_data in candidates]
+    activation = units[0].activation_fn
+    early_stopping = bool(units[0].early_stopping)
+    patience = units[0].patience
+    convergence_threshold = units[0].convergence_threshold
+
+    weights = torch.stack([unit.weights.detach().reshape(-1) for unit in units], dim=1)  # (inputs, K)
+    bias = torch.cat([unit.bias.detach().reshape(-1) for unit in units])  # (K,)
+    errors = residual_error if residual_error.dim() > 1 else residual_error.unsqueeze(1)  # (samples, outputs)
+    errors_centered = errors - errors.mean(dim=0)
+    errors_norm = torch.linalg.norm(errors_centered, dim=0)  # (outputs,)
+
+    k = weights.shape[1]
+    active = torch.ones(k, dtype=torch.bool)
+    epochs_completed = torch.zeros(k, dtype=torch.long)
+    best_so_far = torch.zeros(k)
+    epochs_without_improvement = torch.zeros(k, dtype=torch.long)
+
+    for epoch in range(epochs):
+        if not bool(active.any()):
+            break
+        epochs_completed[active] = epoch + 1
+
+        weights_param = weights.clone().requires_grad_(True)
+        bias_param = bias.clone().requires_grad_(True)
+        output = activation(x @ weights_param + bias_param)  # (samples, K)
+        numerator, denominator = _correlation_terms(output, errors_centered, errors_norm)
+
+        with torch.no_grad():
+            correlations = _abs_correlations(numerator, denominator)  # (K, outputs)
+            best = correlations.argmax(dim=1)
+
+        # Candidates are independent, so one backward over the summed
+        # per-candidate losses yields each candidate's own gradient. Stopped
+        # candidates are masked out of the sum and keep their weights.
+        best_column = best.unsqueeze(1)
+        selected = numerator.gather(1, best_column).squeeze(1) / denominator.gather(1, best_column).squeeze(1)
+        loss = -(selected.abs() * active).sum()
+        loss.backward()
+        with torch.no_grad():
+            weights -= learning_rate * weights_param.grad
+            bias -= learning_rate * bias_param.grad
+
+        if early_stopping:
+            current = correlations.gather(1, best_column).squeeze(1)
+            improved = current > best_so_far.abs() + convergence_threshold
+            best_so_far = torch.where(active & improved, current, best_so_far)
+            epochs_without_improvement = torch.where(improved, torch.zeros_like(epochs_without_improvement), epochs_without_improvement + 1)
+            active &= epochs_without_improvement < patience
+
+    with torch.no_grad():
+        output = activation(x @ weights + bias)
+        output_centered = output - output.mean(dim=0)
+        numerator, denominator = _correlation_terms(output, errors_centered, errors_norm)
+        correlations = _abs_correlations(numerator, denominator)
+        best = correlations.argmax(dim=1)
+
+    results = []
+    for j, (unit, candidate_data) in enumerate(zip(units, candidates)):
+        best_idx = int(best[j])
+        numerator_val = float(numerator[j, best_idx])
+        denominator_val = float(denominator[j, best_idx])
+        if denominator_val < _DEGENERATE_DENOMINATOR or np.isnan(denominator_val):
+            numerator_val, denominator_val = 0.0, _CORRELATION_EPSILON
+        unit.weights = weights[:, j].clone()
+        unit.bias = bias[j : j + 1].clone()
+        training_result = _BatchTrainingResult(
+            correlation=float(correlations[j, best_idx]),
+            all_correlations=[float(c) for c in correlations[j]],
+            best_corr_idx=best_idx,
+            norm_output=output_centered[:, j],
+            norm_error=errors_centered[:, best_idx],
+            numerator=numerator_val,
+            denominator=denominator_val,
+            epochs_completed=int(epochs_completed[j]),
+        )
+        results.append(_package_result(unit, candidate_data, training_params, training_result))
+    return results
+
+
+def _correlation_terms(output: Any, errors_centered: Any, errors_norm: Any) -> tuple[Any, Any]:
+    """Covariance numerators and norm-product denominators, shape ``(K, outputs)``."""
+    import torch
+
+    output_centered = output - output.mean(dim=0)
+    numerator = output_centered.T @ errors_centered
+    denominator = torch.linalg.norm(output_centered, dim=0).unsqueeze(1) * errors_norm.unsqueeze(0) + _CORRELATION_EPSILON
+    return numerator, denominator
+
+
+def _abs_correlations(numerator: Any, denominator: Any) -> Any:
+    """``|num / den|`` clipped to 1, with degenerate denominators reported as 0."""
+    import torch
+
+    correlations = (numerator / denominator).abs().clamp(max=1.0)
+    degenerate = (denominator < _DEGENERATE_DENOMINATOR) | torch.isnan(denominator)
+    return torch.where(degenerate, torch.zeros_like(correlations), correlations)
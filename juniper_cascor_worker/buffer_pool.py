@@ -0,0 +1,120 @@
+"""Size-classed pool of reusable tensor buffers.
+
+Every task used to decode its frames into fresh arrays and every result
+narrowed for the wire into another, so a long-running worker kept asking
+the allocator for large, differently sized blocks. Freed in between, these
+fragment the heap and RSS creeps up over hours. The pool keeps released
+buffers on per-size-class free lists and hands them out again:
+
+- :meth:`BufferPool.empty` works like ``np.empty`` but returns a view of a
+  pooled buffer; allocations below ``BUFFER_POOL_MIN_BYTES`` bypass the
+  pool.
+- :meth:`BufferPool.release` returns the buffer behind an array (or any
+  view of it). The caller guarantees nothing else still reads the array.
+- :meth:`BufferPool.detach` gives a buffer away for good, e.g. to a cache.
+
+Size classes are quarter octaves (at most 25% slack). Leases are tracked
+weakly, so a buffer that is never released is simply garbage-collected.
+Idle buffers are capped at ``max_bytes``; a release beyond that frees the
+buffer instead.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any
+
+import numpy as np
+
+from juniper_cascor_worker.constants import BUFFER_POOL_MIN_BYTES
+
+
+def size_class(nbytes: int) -> int:
+    """Round ``nbytes`` up to its quarter-octave size class."""
+    step = 1 << max((nbytes - 1).bit_length() - 3, 0)
+    return -(-nbytes // step) * step
+
+
+class BufferPool:
+    """Free lists of ``uint8`` buffers keyed by size class."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._free: dict[int, list[np.ndarray]] = {}
+        self._leased: weakref.WeakValueDictionary[int, np.ndarray] = weakref.WeakValueDictionary()
+        self._idle_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def empty(self, shape: tuple[int, ...], dtype: Any) -> np.ndarray:
+        """Return an uninitialised C-contiguous array, backed by a pooled buffer when large enough."""
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if not self.enabled or nbytes < BUFFER_POOL_MIN_BYTES:
+            return np.empty(shape, dtype=dtype)
+        size = size_class(nbytes)
+        free = self._free.get(size)
+        if free:
+            buffer = free.pop()
+            self._idle_bytes -= size
+            self._hits += 1
+        else:
+            buffer = np.empty(size, dtype=np.uint8)
+            self._misses += 1
+        self._leased[id(buffer)] = buffer
+        return buffer[:nbytes].view(dtype).reshape(shape)
+
+    def release(self, array: Any) -> bool:
+        """Return the pooled buffer behind ``array`` to its free list.
+
+        ``array`` may be the array from :meth:`empty`, a view of it or a
+        ``memoryview`` over it. Anything not leased from this pool is
+        ignored. Returns True if a buffer was released.
+        """
+        buffer = self._leased_buffer(array)
+        if buffer is None:
+            return False
+        del self._leased[id(buffer)]
+        if self._idle_bytes + buffer.nbytes > self.max_bytes:
+            self._dropped += 1
+            return True
+        self._free.setdefault(buffer.nbytes, []).append(buffer)
+        self._idle_bytes += buffer.nbytes
+        return True
+
+    def detach(self, array: Any) -> None:
+        """Stop tracking the buffer behind ``array``; it is never reused."""
+        buffer = self._leased_buffer(array)
+        if buffer is not None:
+            del self._leased[id(buffer)]
+
+    def clear(self) -> None:
+        self._free.clear()
+        self._idle_bytes = 0
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing pool occupancy and reuse."""
+        requests = self._hits + self._misses
+        return {
+            "buffer_pool_idle_bytes": self._idle_bytes,
+            "buffer_pool_leased_bytes": sum(buffer.nbytes for buffer in self._leased.values()),
+            "buffer_pool_hits": self._hits,
+            "buffer_pool_misses": self._misses,
+            "buffer_pool_hit_rate": round(self._hits / requests, 3) if requests else 0.0,
+            "buffer_pool_dropped": self._dropped,
+        }
+
+    def _leased_buffer(self, array: Any) -> np.ndarray | None:
+        """Follow ``.obj``/``.base`` to the buffer that owns ``array``'s memory, if leased here."""
+        owner = array.obj if isinstance(array, memoryview) else array
+        while isinstance(owner, np.ndarray) and owner.base is not None:
+            owner = owner.base
+        if not isinstance(owner, np.ndarray):
+            return None
+        buffer = self._leased.get(id(owner))
+        return buffer if buffer is owner else None
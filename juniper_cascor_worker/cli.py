@@ -9,8 +9,67 @@ import threading
 
 from juniper_config_tools import env_with_legacy_alias
 
-from juniper_cascor_worker.config import _resolve
-from juniper_cascor_worker.constants import DEFAULT_HEARTBEAT_INTERVAL, DEFAULT_LOG_LEVEL, DEFAULT_MANAGER_HOST, DEFAULT_MANAGER_PORT, DEFAULT_MP_CONTEXT, DEFAULT_NUM_WORKERS, DEFAULT_TASK_TIMEOUT, ENV_AUTH_TOKEN, ENV_AUTHKEY, ENV_SERVER_URL, ENV_TASK_TIMEOUT, LEGACY_ENV_API_KEY, LEGACY_ENV_AUTH_TOKEN, LEGACY_ENV_AUTHKEY, LEGACY_ENV_SERVER_URL, LEGACY_ENV_TASK_TIMEOUT, LOG_FORMAT, VALID_LOG_LEVELS, VALID_MP_CONTEXTS
+from juniper_cascor_worker.config import _resolve, _split_urls
+from juniper_cascor_worker.constants import (
+    DEFAULT_BUFFER_POOL_BYTES,
+    DEFAULT_DATASET_STORE_BYTES,
+    DEFAULT_FRAME_CODEC,
+    DEFAULT_FRAME_CODEC_LEVEL,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LOG_LEVEL,
+    DEFAULT_MANAGER_HOST,
+    DEFAULT_MANAGER_PORT,
+    DEFAULT_MAX_MESSAGE_BYTES,
+    DEFAULT_MP_CONTEXT,
+    DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_BYTES,
+    DEFAULT_PREFETCH_TASKS,
+    DEFAULT_RESULT_CACHE_BYTES,
+    DEFAULT_RESULT_OUTBOX_SIZE,
+    DEFAULT_RESULT_REPLAY_BYTES,
+    DEFAULT_SEND_BUFFER_BYTES,
+    DEFAULT_SHM_TRANSPORT,
+    DEFAULT_TASK_SLOTS,
+    DEFAULT_TASK_TIMEOUT,
+    DEFAULT_TENSOR_CACHE_BYTES,
+    DEFAULT_TRAINING_BACKEND,
+    DEFAULT_WARMUP,
+    DEFAULT_WIRE_PRECISION,
+    ENV_AUTH_TOKEN,
+    ENV_AUTHKEY,
+    ENV_BUFFER_POOL_BYTES,
+    ENV_DATASET_STORE_BYTES,
+    ENV_FEDERATION_URLS,
+    ENV_FRAME_CODEC,
+    ENV_FRAME_CODEC_LEVEL,
+    ENV_MAX_MESSAGE_BYTES,
+    ENV_PREFETCH_BYTES,
+    ENV_PREFETCH_TASKS,
+    ENV_RESULT_CACHE_BYTES,
+    ENV_RESULT_OUTBOX_SIZE,
+    ENV_RESULT_REPLAY_BYTES,
+    ENV_SEND_BUFFER_BYTES,
+    ENV_SERVER_URL,
+    ENV_SHM_TRANSPORT,
+    ENV_TASK_SLOTS,
+    ENV_TASK_TIMEOUT,
+    ENV_TENSOR_CACHE_BYTES,
+    ENV_TRAINING_BACKEND,
+    ENV_WARMUP,
+    ENV_WIRE_PRECISION,
+    LEGACY_ENV_API_KEY,
+    LEGACY_ENV_AUTH_TOKEN,
+    LEGACY_ENV_AUTHKEY,
+    LEGACY_ENV_SERVER_URL,
+    LEGACY_ENV_TASK_TIMEOUT,
+    LOG_FORMAT,
+    TRUTHY_ENV_VALUES,
+    VALID_FRAME_CODECS,
+    VALID_LOG_LEVELS,
+    VALID_MP_CONTEXTS,
+    VALID_TRAINING_BACKENDS,
+    VALID_WIRE_PRECISIONS,
+)
 
 # Retain the helper import even though every executable call site below now
 # routes through ``_resolve`` (which handles ``_FILE``-suffix indirection in
@@ -26,6 +85,24 @@ def main() -> None:
     Default mode: WebSocket-based CascorWorkerAgent.
     Legacy mode (``--legacy``): BaseManager-based CandidateTrainingWorker.
     """
+    args = _build_parser().parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format=LOG_FORMAT,
+    )
+
+    if args.cascor_path:
+        sys.path.insert(0, args.cascor_path)
+
+    if args.legacy:
+        _run_legacy(args)
+    else:
+        _run_websocket(args)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for both worker modes."""
     parser = argparse.ArgumentParser(
         prog="juniper-cascor-worker",
         description="Remote candidate training worker for JuniperCascor",
@@ -44,42 +121,47 @@ def main() -> None:
         default=None,
         help="Auth token for X-API-Key authentication",
     )
+    parser.add_argument("--federation-url", action="append", default=None, help="Further server URL served by this process alongside --server-url (repeatable)")
     parser.add_argument("--heartbeat-interval", type=float, default=DEFAULT_HEARTBEAT_INTERVAL, help="Heartbeat interval in seconds (default: 10)")
     parser.add_argument("--tls-cert", default=None, help="Client certificate path (for mTLS)")
     parser.add_argument("--tls-key", default=None, help="Client key path (for mTLS)")
     parser.add_argument("--tls-ca", default=None, help="CA certificate path (for mTLS)")
     parser.add_argument("--task-timeout", type=float, default=DEFAULT_TASK_TIMEOUT, help="Maximum seconds for a single training task (default: 3600)")
+    parser.add_argument("--task-slots", type=int, default=DEFAULT_TASK_SLOTS, help="Number of training tasks to run concurrently (default: 1)")
+    parser.add_argument("--training-backend", default=DEFAULT_TRAINING_BACKEND, choices=list(VALID_TRAINING_BACKENDS), help="Run training in a thread pool or in worker processes (default: thread)")
+    parser.add_argument("--prefetch-tasks", type=int, default=DEFAULT_PREFETCH_TASKS, help="Tasks to receive and decode ahead while every slot is training (default: 0, off)")
+    parser.add_argument("--prefetch-bytes", type=int, default=DEFAULT_PREFETCH_BYTES, help="Byte budget for tensors of prefetched tasks (default: 268435456)")
+    parser.add_argument("--result-outbox-size", type=int, default=DEFAULT_RESULT_OUTBOX_SIZE, help="Finished results queued for upload before tasks wait (default: 8)")
+    parser.add_argument("--warmup", action="store_true", default=DEFAULT_WARMUP, help="Warm up torch and CandidateUnit while connecting; register once warm")
+    parser.add_argument("--tensor-cache-bytes", type=int, default=DEFAULT_TENSOR_CACHE_BYTES, help="Byte budget for cached round tensors referenced by hash (default: 536870912, 0 = off)")
+    parser.add_argument("--dataset-store-bytes", type=int, default=DEFAULT_DATASET_STORE_BYTES, help="Byte budget for per-session input matrices grown by column deltas (default: 536870912, 0 = off)")
+    parser.add_argument("--result-cache-bytes", type=int, default=DEFAULT_RESULT_CACHE_BYTES, help="Byte budget for withheld result tensors kept for result_fetch (default: 268435456)")
+    parser.add_argument("--buffer-pool-bytes", type=int, default=DEFAULT_BUFFER_POOL_BYTES, help="Byte budget for idle pooled tensor buffers; 0 disables the pool (default: 268435456)")
+    parser.add_argument("--result-replay-bytes", type=int, default=DEFAULT_RESULT_REPLAY_BYTES, help="Byte budget for unacknowledged results replayed after a reconnect (default: 268435456, 0 = off)")
+    parser.add_argument("--send-buffer-bytes", type=int, default=DEFAULT_SEND_BUFFER_BYTES, help="Send-queue high watermark; no new task is admitted above it (default: 16777216, 0 = off)")
+    parser.add_argument("--frame-codec", default=DEFAULT_FRAME_CODEC, choices=list(VALID_FRAME_CODECS), help="Compress result frames with this codec if the server accepts it (default: none)")
+    parser.add_argument("--frame-codec-level", type=int, default=DEFAULT_FRAME_CODEC_LEVEL, help="Compression level for --frame-codec, 0-9 (default: 6)")
+    parser.add_argument("--wire-precision", default=DEFAULT_WIRE_PRECISION, choices=list(VALID_WIRE_PRECISIONS), help="Request reduced precision for bulk tensors on the wire (default: float32)")
+    parser.add_argument("--max-message-bytes", type=int, default=DEFAULT_MAX_MESSAGE_BYTES, help="Largest incoming WebSocket message; bigger tensors arrive chunked (default: 1048576)")
+    parser.add_argument("--shm-transport", action="store_true", default=DEFAULT_SHM_TRANSPORT, help="Offer zero-copy shared-memory tensors to a server on the same host")
 
     # Legacy mode arguments
     parser.add_argument("--manager-host", default=DEFAULT_MANAGER_HOST, help="[Legacy] Manager hostname (default: 127.0.0.1)")
     parser.add_argument("--manager-port", type=int, default=DEFAULT_MANAGER_PORT, help="[Legacy] Manager port (default: 50000)")
     parser.add_argument("--authkey", default=None, help="[Legacy] Authentication key")
     parser.add_argument("--workers", type=int, default=DEFAULT_NUM_WORKERS, help="[Legacy] Number of worker processes (default: 1)")
-    parser.add_argument("--mp-context", default=DEFAULT_MP_CONTEXT, choices=list(VALID_MP_CONTEXTS), help="[Legacy] Multiprocessing context (default: forkserver)")
+    parser.add_argument("--mp-context", default=DEFAULT_MP_CONTEXT, choices=list(VALID_MP_CONTEXTS), help="Multiprocessing context for legacy workers and the process training backend (default: forkserver)")
 
     # Shared arguments
     parser.add_argument("--log-level", default=DEFAULT_LOG_LEVEL, choices=list(VALID_LOG_LEVELS), help="Log level (default: INFO)")
     parser.add_argument("--cascor-path", help="Path to CasCor src directory (added to sys.path)")
-
-    args = parser.parse_args()
-
-    logging.basicConfig(
-        level=getattr(logging, args.log_level),
-        format=LOG_FORMAT,
-    )
-
-    if args.cascor_path:
-        sys.path.insert(0, args.cascor_path)
-
-    if args.legacy:
-        _run_legacy(args)
-    else:
-        _run_websocket(args)
+    return parser
 
 
 def _run_websocket(args: argparse.Namespace) -> None:
     """Run the WebSocket-based CascorWorkerAgent."""
     from juniper_cascor_worker.config import WorkerConfig
+    from juniper_cascor_worker.federation import FederatedWorker
     from juniper_cascor_worker.worker import CascorWorkerAgent
 
     # CFG-06 + ``_FILE``-suffix indirection: route every env read through
@@ -92,21 +174,61 @@ def _run_websocket(args: argparse.Namespace) -> None:
     # ``ENV_AUTH_TOKEN`` has two legacy aliases (chain via ``or``).
     server_url = args.server_url or _resolve(None, ENV_SERVER_URL, LEGACY_ENV_SERVER_URL, "")
     auth_token = args.auth_token or _resolve(None, ENV_AUTH_TOKEN, LEGACY_ENV_AUTH_TOKEN) or _resolve(None, ENV_AUTH_TOKEN, LEGACY_ENV_API_KEY, "")
+    federation_urls = tuple(args.federation_url) if args.federation_url else _split_urls(_resolve(None, ENV_FEDERATION_URLS, None, ""))
 
     task_timeout = args.task_timeout if args.task_timeout != DEFAULT_TASK_TIMEOUT else float(_resolve(None, ENV_TASK_TIMEOUT, LEGACY_ENV_TASK_TIMEOUT, str(DEFAULT_TASK_TIMEOUT)))
+    task_slots = args.task_slots if args.task_slots != DEFAULT_TASK_SLOTS else int(_resolve(None, ENV_TASK_SLOTS, None, str(DEFAULT_TASK_SLOTS)))
+    training_backend = args.training_backend if args.training_backend != DEFAULT_TRAINING_BACKEND else _resolve(None, ENV_TRAINING_BACKEND, None, DEFAULT_TRAINING_BACKEND)
+    prefetch_tasks = args.prefetch_tasks if args.prefetch_tasks != DEFAULT_PREFETCH_TASKS else int(_resolve(None, ENV_PREFETCH_TASKS, None, str(DEFAULT_PREFETCH_TASKS)))
+    prefetch_bytes = args.prefetch_bytes if args.prefetch_bytes != DEFAULT_PREFETCH_BYTES else int(_resolve(None, ENV_PREFETCH_BYTES, None, str(DEFAULT_PREFETCH_BYTES)))
+    result_outbox_size = args.result_outbox_size if args.result_outbox_size != DEFAULT_RESULT_OUTBOX_SIZE else int(_resolve(None, ENV_RESULT_OUTBOX_SIZE, None, str(DEFAULT_RESULT_OUTBOX_SIZE)))
+
+    tensor_cache_bytes = args.tensor_cache_bytes if args.tensor_cache_bytes != DEFAULT_TENSOR_CACHE_BYTES else int(_resolve(None, ENV_TENSOR_CACHE_BYTES, None, str(DEFAULT_TENSOR_CACHE_BYTES)))
+    dataset_store_bytes = args.dataset_store_bytes if args.dataset_store_bytes != DEFAULT_DATASET_STORE_BYTES else int(_resolve(None, ENV_DATASET_STORE_BYTES, None, str(DEFAULT_DATASET_STORE_BYTES)))
+    result_cache_bytes = args.result_cache_bytes if args.result_cache_bytes != DEFAULT_RESULT_CACHE_BYTES else int(_resolve(None, ENV_RESULT_CACHE_BYTES, None, str(DEFAULT_RESULT_CACHE_BYTES)))
+    buffer_pool_bytes = args.buffer_pool_bytes if args.buffer_pool_bytes != DEFAULT_BUFFER_POOL_BYTES else int(_resolve(None, ENV_BUFFER_POOL_BYTES, None, str(DEFAULT_BUFFER_POOL_BYTES)))
+    result_replay_bytes = args.result_replay_bytes if args.result_replay_bytes != DEFAULT_RESULT_REPLAY_BYTES else int(_resolve(None, ENV_RESULT_REPLAY_BYTES, None, str(DEFAULT_RESULT_REPLAY_BYTES)))
+    send_buffer_bytes = args.send_buffer_bytes if args.send_buffer_bytes != DEFAULT_SEND_BUFFER_BYTES else int(_resolve(None, ENV_SEND_BUFFER_BYTES, None, str(DEFAULT_SEND_BUFFER_BYTES)))
+    frame_codec = args.frame_codec if args.frame_codec != DEFAULT_FRAME_CODEC else _resolve(None, ENV_FRAME_CODEC, None, DEFAULT_FRAME_CODEC)
+    frame_codec_level = args.frame_codec_level if args.frame_codec_level != DEFAULT_FRAME_CODEC_LEVEL else int(_resolve(None, ENV_FRAME_CODEC_LEVEL, None, str(DEFAULT_FRAME_CODEC_LEVEL)))
+    wire_precision = args.wire_precision if args.wire_precision != DEFAULT_WIRE_PRECISION else _resolve(None, ENV_WIRE_PRECISION, None, DEFAULT_WIRE_PRECISION)
+    max_message_bytes = args.max_message_bytes if args.max_message_bytes != DEFAULT_MAX_MESSAGE_BYTES else int(_resolve(None, ENV_MAX_MESSAGE_BYTES, None, str(DEFAULT_MAX_MESSAGE_BYTES)))
+
+    warmup = args.warmup or _resolve(None, ENV_WARMUP, None, str(DEFAULT_WARMUP)).strip().lower() in TRUTHY_ENV_VALUES
+    shm_transport = args.shm_transport or _resolve(None, ENV_SHM_TRANSPORT, None, str(DEFAULT_SHM_TRANSPORT)).strip().lower() in TRUTHY_ENV_VALUES
 
     config = WorkerConfig(
         server_url=server_url,
         auth_token=auth_token,
+        federation_urls=federation_urls,
         heartbeat_interval=args.heartbeat_interval,
         task_timeout=task_timeout,
+        task_slots=task_slots,
+        training_backend=training_backend,
+        prefetch_tasks=prefetch_tasks,
+        prefetch_bytes=prefetch_bytes,
+        result_outbox_size=result_outbox_size,
+        warmup=warmup,
+        tensor_cache_bytes=tensor_cache_bytes,
+        dataset_store_bytes=dataset_store_bytes,
+        result_cache_bytes=result_cache_bytes,
+        buffer_pool_bytes=buffer_pool_bytes,
+        result_replay_bytes=result_replay_bytes,
+        send_buffer_bytes=send_buffer_bytes,
+        frame_codec=frame_codec,
+        frame_codec_level=frame_codec_level,
+        wire_precision=wire_precision,
+        max_message_bytes=max_message_bytes,
+        shm_transport=shm_transport,
+        mp_context=args.mp_context,
         tls_cert=args.tls_cert,
         tls_key=args.tls_key,
         tls_ca=args.tls_ca,
     )
     config.validate(legacy=False)
 
-    agent = CascorWorkerAgent(config)
+    # One agent per endpoint when federated; both expose run() and stop().
+    agent = FederatedWorker(config) if config.federation_urls else CascorWorkerAgent(config)
 
     # Cross-platform shutdown via threading.Event (replaces signal.pause)
     shutdown_event = threading.Event()
@@ -121,7 +243,7 @@ def _run_websocket(args: argparse.Namespace) -> None:
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    logging.getLogger(__name__).info("Starting WebSocket worker — connecting to %s", config.server_url)
+    logging.getLogger(__name__).info("Starting WebSocket worker — connecting to %s", ", ".join((config.server_url, *config.federation_urls)))
 
     try:
         asyncio.run(agent.run())
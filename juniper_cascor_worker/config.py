@@ -8,32 +8,67 @@ from typing import Mapping
 from juniper_config_tools import env_with_legacy_alias
 
 from juniper_cascor_worker.constants import (
+    DEFAULT_BUFFER_POOL_BYTES,
+    DEFAULT_DATASET_STORE_BYTES,
+    DEFAULT_FRAME_CODEC,
+    DEFAULT_FRAME_CODEC_LEVEL,
     DEFAULT_HEALTH_BIND,
     DEFAULT_HEALTH_PORT,
     DEFAULT_HEARTBEAT_INTERVAL,
     DEFAULT_MANAGER_HOST,
     DEFAULT_MANAGER_PORT,
+    DEFAULT_MAX_MESSAGE_BYTES,
     DEFAULT_MP_CONTEXT,
     DEFAULT_NUM_WORKERS,
+    DEFAULT_PREFETCH_BYTES,
+    DEFAULT_PREFETCH_TASKS,
     DEFAULT_RECONNECT_BACKOFF_BASE,
     DEFAULT_RECONNECT_BACKOFF_MAX,
+    DEFAULT_RESULT_CACHE_BYTES,
+    DEFAULT_RESULT_OUTBOX_SIZE,
+    DEFAULT_RESULT_REPLAY_BYTES,
+    DEFAULT_SEND_BUFFER_BYTES,
+    DEFAULT_SHM_TRANSPORT,
     DEFAULT_STOP_TIMEOUT,
     DEFAULT_TASK_QUEUE_TIMEOUT,
+    DEFAULT_TASK_SLOTS,
     DEFAULT_TASK_TIMEOUT,
+    DEFAULT_TENSOR_CACHE_BYTES,
+    DEFAULT_TRAINING_BACKEND,
+    DEFAULT_WARMUP,
+    DEFAULT_WIRE_PRECISION,
     ENV_AUTH_TOKEN,
     ENV_AUTHKEY,
+    ENV_BUFFER_POOL_BYTES,
+    ENV_DATASET_STORE_BYTES,
+    ENV_FEDERATION_URLS,
+    ENV_FRAME_CODEC,
+    ENV_FRAME_CODEC_LEVEL,
     ENV_HEALTH_BIND,
     ENV_HEALTH_PORT,
     ENV_HEARTBEAT_INTERVAL,
     ENV_MANAGER_HOST,
     ENV_MANAGER_PORT,
+    ENV_MAX_MESSAGE_BYTES,
     ENV_MP_CONTEXT,
     ENV_NUM_WORKERS,
+    ENV_PREFETCH_BYTES,
+    ENV_PREFETCH_TASKS,
+    ENV_RESULT_CACHE_BYTES,
+    ENV_RESULT_OUTBOX_SIZE,
+    ENV_RESULT_REPLAY_BYTES,
+    ENV_SEND_BUFFER_BYTES,
     ENV_SERVER_URL,
+    ENV_SHM_TRANSPORT,
+    ENV_TASK_SLOTS,
     ENV_TASK_TIMEOUT,
+    ENV_TENSOR_CACHE_BYTES,
     ENV_TLS_CA,
     ENV_TLS_CERT,
     ENV_TLS_KEY,
+    ENV_TRAINING_BACKEND,
+    ENV_WARMUP,
+    ENV_WIRE_PRECISION,
     LEGACY_ENV_API_KEY,
     LEGACY_ENV_AUTH_TOKEN,
     LEGACY_ENV_AUTHKEY,
@@ -49,10 +84,27 @@ from juniper_cascor_worker.constants import (
     LEGACY_ENV_TLS_CA,
     LEGACY_ENV_TLS_CERT,
     LEGACY_ENV_TLS_KEY,
+    MAX_FRAME_CODEC_LEVEL,
     MAX_PORT,
+    MIN_BUFFER_POOL_BYTES,
+    MIN_DATASET_STORE_BYTES,
+    MIN_FRAME_CODEC_LEVEL,
+    MIN_MAX_MESSAGE_BYTES,
     MIN_NUM_WORKERS,
     MIN_PORT,
+    MIN_PREFETCH_BYTES,
+    MIN_PREFETCH_TASKS,
+    MIN_RESULT_CACHE_BYTES,
+    MIN_RESULT_OUTBOX_SIZE,
+    MIN_RESULT_REPLAY_BYTES,
+    MIN_SEND_BUFFER_BYTES,
+    MIN_TASK_SLOTS,
+    MIN_TENSOR_CACHE_BYTES,
+    TRUTHY_ENV_VALUES,
+    VALID_FRAME_CODECS,
     VALID_MP_CONTEXTS,
+    VALID_TRAINING_BACKENDS,
+    VALID_WIRE_PRECISIONS,
     VALID_WS_SCHEMES,
 )
 from juniper_cascor_worker.exceptions import WorkerConfigError
@@ -146,6 +198,11 @@ def _resolve(
     return default
 
 
+def _split_urls(value: str) -> tuple[str, ...]:
+    """Split a comma-separated URL list, dropping blanks."""
+    return tuple(url.strip() for url in value.split(",") if url.strip())
+
+
 # Retain the helper import surface even though we no longer call it on the
 # production path — `tests/test_cfg_06_env_prefix_aliases.py` and downstream
 # pinning lints scan the import for "did we accidentally drop the canonical
@@ -153,6 +210,30 @@ def _resolve(
 _ = env_with_legacy_alias  # noqa: F841
 
 
+# WebSocket tuning fields checked by ``WorkerConfig.validate``: ``(field,
+# minimum, maximum)`` with ``None`` for no upper bound, and ``(field,
+# choices)`` for the enumerated ones.
+_TUNING_BOUNDS: tuple[tuple[str, int, int | None], ...] = (
+    ("task_slots", MIN_TASK_SLOTS, None),
+    ("prefetch_tasks", MIN_PREFETCH_TASKS, None),
+    ("prefetch_bytes", MIN_PREFETCH_BYTES, None),
+    ("result_outbox_size", MIN_RESULT_OUTBOX_SIZE, None),
+    ("tensor_cache_bytes", MIN_TENSOR_CACHE_BYTES, None),
+    ("dataset_store_bytes", MIN_DATASET_STORE_BYTES, None),
+    ("result_cache_bytes", MIN_RESULT_CACHE_BYTES, None),
+    ("buffer_pool_bytes", MIN_BUFFER_POOL_BYTES, None),
+    ("result_replay_bytes", MIN_RESULT_REPLAY_BYTES, None),
+    ("send_buffer_bytes", MIN_SEND_BUFFER_BYTES, None),
+    ("frame_codec_level", MIN_FRAME_CODEC_LEVEL, MAX_FRAME_CODEC_LEVEL),
+    ("max_message_bytes", MIN_MAX_MESSAGE_BYTES, None),
+)
+_TUNING_CHOICES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("training_backend", VALID_TRAINING_BACKENDS),
+    ("frame_codec", VALID_FRAME_CODECS),
+    ("wire_precision", VALID_WIRE_PRECISIONS),
+)
+
+
 @dataclass
 class WorkerConfig:
     """Configuration for connecting to a CasCor training service.
@@ -165,10 +246,53 @@ class WorkerConfig:
     Attributes:
         server_url: WebSocket URL (e.g., ``ws://host:8200/ws/v1/workers``).
         auth_token: Auth token for ``X-API-Key`` header authentication.
+        federation_urls: Further cascor endpoints served by the same process
+            alongside ``server_url``; all connections share one training
+            backend, slot pool, tensor cache and buffer pool.
         heartbeat_interval: Seconds between heartbeat messages.
         reconnect_backoff_base: Initial reconnection delay in seconds.
         reconnect_backoff_max: Maximum reconnection delay in seconds.
         task_timeout: Maximum seconds for a single training task (default: 3600).
+        task_slots: Number of training tasks the agent runs concurrently and
+            advertises to the server in its ``register`` capabilities.
+        training_backend: Where training runs — ``"thread"`` (in-process
+            thread pool, default) or ``"process"`` (one pre-started worker
+            process per task slot, started with ``mp_context``).
+        prefetch_tasks: Extra tasks (beyond the slots) whose frames the
+            agent reads and decodes while every slot is training; 0 disables
+            prefetch.
+        prefetch_bytes: Cap on decoded tensor bytes held by prefetched
+            tasks waiting for a slot.
+        result_outbox_size: Finished results queued for the sender
+            coroutine before tasks wait for room (backpressure).
+        warmup: Import torch/CandidateUnit and run a tiny training pass on
+            every training thread/process while connecting; registration and
+            readiness wait for it.
+        tensor_cache_bytes: Byte budget of the content-addressed cache of
+            decoded tensors shared across a round's tasks; 0 disables it.
+        dataset_store_bytes: Byte budget of the per-session store that
+            appends column deltas to the previous round's input matrix; 0
+            disables it.
+        result_cache_bytes: Byte budget for result tensors withheld by a
+            ``result_tensors`` selection and kept for ``result_fetch``.
+        buffer_pool_bytes: Byte budget of idle buffers kept for reuse by
+            frame decoding and result encoding; 0 disables the pool.
+        result_replay_bytes: Byte budget of task results kept until the
+            server acknowledges them, for replay after a reconnect; 0
+            disables session resume.
+        send_buffer_bytes: High watermark of bytes queued for sending on
+            the connection; above it no new task is admitted until the
+            queue drains to a quarter of it. 0 disables the check.
+        frame_codec: Compression codec for result frames (``"none"`` or
+            one of ``FRAME_CODECS``); used only if the server accepts it.
+        frame_codec_level: Compression level for ``frame_codec`` (0-9).
+        wire_precision: Precision requested for bulk tensors on the wire —
+            ``"float32"`` (default), ``"float16"`` or ``"bfloat16"``; the
+            server confirms the mode in its registration_ack.
+        max_message_bytes: Largest incoming WebSocket message accepted;
+            larger tensors must be sent as chunked frames.
+        shm_transport: Offer the shared-memory tensor transport to a server
+            on the same host (confirmed by a probe-segment handshake).
         tls_cert: Client certificate path (for mTLS, Phase 4).
         tls_key: Client key path (for mTLS, Phase 4).
         tls_ca: CA certificate path (for mTLS, Phase 4).
@@ -178,16 +302,35 @@ class WorkerConfig:
         num_workers: Number of local worker processes to spawn (legacy mode).
         task_queue_timeout: Timeout (seconds) for polling the task queue (legacy).
         stop_timeout: Timeout (seconds) for graceful worker shutdown (legacy).
-        mp_context: Multiprocessing start method (legacy).
+        mp_context: Multiprocessing start method (legacy workers and the
+            ``process`` training backend).
     """
 
     # WebSocket mode configuration
     server_url: str = ""
     auth_token: str = ""
+    federation_urls: tuple[str, ...] = ()
     heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL
     reconnect_backoff_base: float = DEFAULT_RECONNECT_BACKOFF_BASE
     reconnect_backoff_max: float = DEFAULT_RECONNECT_BACKOFF_MAX
     task_timeout: float = DEFAULT_TASK_TIMEOUT
+    task_slots: int = DEFAULT_TASK_SLOTS
+    training_backend: str = DEFAULT_TRAINING_BACKEND
+    prefetch_tasks: int = DEFAULT_PREFETCH_TASKS
+    prefetch_bytes: int = DEFAULT_PREFETCH_BYTES
+    result_outbox_size: int = DEFAULT_RESULT_OUTBOX_SIZE
+    warmup: bool = DEFAULT_WARMUP
+    tensor_cache_bytes: int = DEFAULT_TENSOR_CACHE_BYTES
+    dataset_store_bytes: int = DEFAULT_DATASET_STORE_BYTES
+    result_cache_bytes: int = DEFAULT_RESULT_CACHE_BYTES
+    buffer_pool_bytes: int = DEFAULT_BUFFER_POOL_BYTES
+    result_replay_bytes: int = DEFAULT_RESULT_REPLAY_BYTES
+    send_buffer_bytes: int = DEFAULT_SEND_BUFFER_BYTES
+    frame_codec: str = DEFAULT_FRAME_CODEC
+    frame_codec_level: int = DEFAULT_FRAME_CODEC_LEVEL
+    wire_precision: str = DEFAULT_WIRE_PRECISION
+    max_message_bytes: int = DEFAULT_MAX_MESSAGE_BYTES
+    shm_transport: bool = DEFAULT_SHM_TRANSPORT
     tls_cert: str | None = None
     tls_key: str | None = None
     tls_ca: str | None = None
@@ -223,8 +366,26 @@ class WorkerConfig:
         Canonical env vars (WebSocket mode):
             JUNIPER_CASCOR_WORKER_SERVER_URL: WebSocket URL
             JUNIPER_CASCOR_WORKER_AUTH_TOKEN: API key for authentication
+            JUNIPER_CASCOR_WORKER_FEDERATION_URLS: Comma-separated further endpoints
             JUNIPER_CASCOR_WORKER_HEARTBEAT_INTERVAL: Heartbeat interval (s)
             JUNIPER_CASCOR_WORKER_TASK_TIMEOUT: Per-task timeout (s)
+            JUNIPER_CASCOR_WORKER_TASK_SLOTS: Concurrent task slots
+            JUNIPER_CASCOR_WORKER_TRAINING_BACKEND: ``thread`` or ``process``
+            JUNIPER_CASCOR_WORKER_PREFETCH_TASKS: Tasks prefetched beyond the slots
+            JUNIPER_CASCOR_WORKER_PREFETCH_BYTES: Byte budget for prefetched tensors
+            JUNIPER_CASCOR_WORKER_RESULT_OUTBOX_SIZE: Results queued for upload
+            JUNIPER_CASCOR_WORKER_WARMUP: ``1``/``true`` to warm up while connecting
+            JUNIPER_CASCOR_WORKER_TENSOR_CACHE_BYTES: Tensor cache budget (0 = off)
+            JUNIPER_CASCOR_WORKER_DATASET_STORE_BYTES: Session dataset store budget (0 = off)
+            JUNIPER_CASCOR_WORKER_RESULT_CACHE_BYTES: Withheld result tensor budget
+            JUNIPER_CASCOR_WORKER_BUFFER_POOL_BYTES: Idle pooled buffer budget (0 = off)
+            JUNIPER_CASCOR_WORKER_RESULT_REPLAY_BYTES: Unacknowledged result budget (0 = no resume)
+            JUNIPER_CASCOR_WORKER_SEND_BUFFER_BYTES: Send-queue high watermark (0 = off)
+            JUNIPER_CASCOR_WORKER_FRAME_CODEC: Result frame codec (``none``, ``shuffle+zlib``, ...)
+            JUNIPER_CASCOR_WORKER_FRAME_CODEC_LEVEL: Compression level (0-9)
+            JUNIPER_CASCOR_WORKER_WIRE_PRECISION: ``float32``, ``float16`` or ``bfloat16``
+            JUNIPER_CASCOR_WORKER_MAX_MESSAGE_BYTES: Largest incoming WebSocket message
+            JUNIPER_CASCOR_WORKER_SHM_TRANSPORT: ``1``/``true`` to offer shared memory
             JUNIPER_CASCOR_WORKER_TLS_CERT: Client certificate path
             JUNIPER_CASCOR_WORKER_TLS_KEY: Client key path
             JUNIPER_CASCOR_WORKER_TLS_CA: CA certificate path
@@ -254,8 +415,26 @@ class WorkerConfig:
         return cls(
             server_url=_resolve(env, ENV_SERVER_URL, LEGACY_ENV_SERVER_URL, ""),
             auth_token=auth_token,
+            federation_urls=_split_urls(_resolve(env, ENV_FEDERATION_URLS, None, "")),
             heartbeat_interval=float(_resolve(env, ENV_HEARTBEAT_INTERVAL, LEGACY_ENV_HEARTBEAT_INTERVAL, str(DEFAULT_HEARTBEAT_INTERVAL))),
             task_timeout=float(_resolve(env, ENV_TASK_TIMEOUT, LEGACY_ENV_TASK_TIMEOUT, str(DEFAULT_TASK_TIMEOUT))),
+            task_slots=int(_resolve(env, ENV_TASK_SLOTS, None, str(DEFAULT_TASK_SLOTS))),
+            training_backend=_resolve(env, ENV_TRAINING_BACKEND, None, DEFAULT_TRAINING_BACKEND),
+            prefetch_tasks=int(_resolve(env, ENV_PREFETCH_TASKS, None, str(DEFAULT_PREFETCH_TASKS))),
+            prefetch_bytes=int(_resolve(env, ENV_PREFETCH_BYTES, None, str(DEFAULT_PREFETCH_BYTES))),
+            result_outbox_size=int(_resolve(env, ENV_RESULT_OUTBOX_SIZE, None, str(DEFAULT_RESULT_OUTBOX_SIZE))),
+            warmup=_resolve(env, ENV_WARMUP, None, str(DEFAULT_WARMUP)).strip().lower() in TRUTHY_ENV_VALUES,
+            tensor_cache_bytes=int(_resolve(env, ENV_TENSOR_CACHE_BYTES, None, str(DEFAULT_TENSOR_CACHE_BYTES))),
+            dataset_store_bytes=int(_resolve(env, ENV_DATASET_STORE_BYTES, None, str(DEFAULT_DATASET_STORE_BYTES))),
+            result_cache_bytes=int(_resolve(env, ENV_RESULT_CACHE_BYTES, None, str(DEFAULT_RESULT_CACHE_BYTES))),
+            buffer_pool_bytes=int(_resolve(env, ENV_BUFFER_POOL_BYTES, None, str(DEFAULT_BUFFER_POOL_BYTES))),
+            result_replay_bytes=int(_resolve(env, ENV_RESULT_REPLAY_BYTES, None, str(DEFAULT_RESULT_REPLAY_BYTES))),
+            send_buffer_bytes=int(_resolve(env, ENV_SEND_BUFFER_BYTES, None, str(DEFAULT_SEND_BUFFER_BYTES))),
+            frame_codec=_resolve(env, ENV_FRAME_CODEC, None, DEFAULT_FRAME_CODEC),
+            frame_codec_level=int(_resolve(env, ENV_FRAME_CODEC_LEVEL, None, str(DEFAULT_FRAME_CODEC_LEVEL))),
+            wire_precision=_resolve(env, ENV_WIRE_PRECISION, None, DEFAULT_WIRE_PRECISION),
+            max_message_bytes=int(_resolve(env, ENV_MAX_MESSAGE_BYTES, None, str(DEFAULT_MAX_MESSAGE_BYTES))),
+            shm_transport=_resolve(env, ENV_SHM_TRANSPORT, None, str(DEFAULT_SHM_TRANSPORT)).strip().lower() in TRUTHY_ENV_VALUES,
             tls_cert=_resolve(env, ENV_TLS_CERT, LEGACY_ENV_TLS_CERT),
             tls_key=_resolve(env, ENV_TLS_KEY, LEGACY_ENV_TLS_KEY),
             tls_ca=_resolve(env, ENV_TLS_CA, LEGACY_ENV_TLS_CA),
@@ -276,29 +455,62 @@ class WorkerConfig:
                     If False, validate for WebSocket mode.
         """
         if legacy:
-            if not self.authkey:
-                raise WorkerConfigError(f"authkey is required — set {ENV_AUTHKEY} or pass --authkey")
-            if self.num_workers < MIN_NUM_WORKERS:
-                raise WorkerConfigError(f"num_workers must be >= {MIN_NUM_WORKERS}, got {self.num_workers}")
-            if self.manager_port < MIN_PORT or self.manager_port > MAX_PORT:
-                raise WorkerConfigError(f"manager_port must be {MIN_PORT}-{MAX_PORT}, got {self.manager_port}")
-            if self.mp_context not in VALID_MP_CONTEXTS:
-                raise WorkerConfigError(f"Invalid mp_context: {self.mp_context}")
+            self._validate_legacy()
         else:
-            if not self.server_url:
-                raise WorkerConfigError(f"server_url is required — set {ENV_SERVER_URL} or pass --server-url")
-            if not self.server_url.startswith(VALID_WS_SCHEMES):
-                raise WorkerConfigError(f"server_url must start with ws:// or wss://, got: {self.server_url}")
-            if self.heartbeat_interval <= 0:
-                raise WorkerConfigError(f"heartbeat_interval must be > 0, got {self.heartbeat_interval}")
-            if self.reconnect_backoff_base <= 0:
-                raise WorkerConfigError(f"reconnect_backoff_base must be > 0, got {self.reconnect_backoff_base}")
-            if self.task_timeout <= 0:
-                raise WorkerConfigError(f"task_timeout must be > 0, got {self.task_timeout}")
-            if self.health_port < MIN_PORT or self.health_port > MAX_PORT:
-                raise WorkerConfigError(f"health_port must be {MIN_PORT}-{MAX_PORT}, got {self.health_port}")
-            if not self.health_bind:
-                raise WorkerConfigError("health_bind must be a non-empty hostname/IP")
+            self._validate_websocket()
+
+    def _validate_legacy(self) -> None:
+        """Validate the legacy BaseManager fields."""
+        if not self.authkey:
+            raise WorkerConfigError(f"authkey is required — set {ENV_AUTHKEY} or pass --authkey")
+        if self.num_workers < MIN_NUM_WORKERS:
+            raise WorkerConfigError(f"num_workers must be >= {MIN_NUM_WORKERS}, got {self.num_workers}")
+        if self.manager_port < MIN_PORT or self.manager_port > MAX_PORT:
+            raise WorkerConfigError(f"manager_port must be {MIN_PORT}-{MAX_PORT}, got {self.manager_port}")
+        if self.mp_context not in VALID_MP_CONTEXTS:
+            raise WorkerConfigError(f"Invalid mp_context: {self.mp_context}")
+
+    def _validate_websocket(self) -> None:
+        """Validate the WebSocket-mode fields."""
+        self._validate_server_urls()
+        if self.heartbeat_interval <= 0:
+            raise WorkerConfigError(f"heartbeat_interval must be > 0, got {self.heartbeat_interval}")
+        if self.reconnect_backoff_base <= 0:
+            raise WorkerConfigError(f"reconnect_backoff_base must be > 0, got {self.reconnect_backoff_base}")
+        if self.task_timeout <= 0:
+            raise WorkerConfigError(f"task_timeout must be > 0, got {self.task_timeout}")
+        self._validate_tuning()
+        if self.mp_context not in VALID_MP_CONTEXTS:
+            raise WorkerConfigError(f"Invalid mp_context: {self.mp_context}")
+        if self.health_port < MIN_PORT or self.health_port > MAX_PORT:
+            raise WorkerConfigError(f"health_port must be {MIN_PORT}-{MAX_PORT}, got {self.health_port}")
+        if not self.health_bind:
+            raise WorkerConfigError("health_bind must be a non-empty hostname/IP")
+
+    def _validate_server_urls(self) -> None:
+        """The server URL and any federation URLs must be distinct ws:// or wss:// URLs."""
+        if not self.server_url:
+            raise WorkerConfigError(f"server_url is required — set {ENV_SERVER_URL} or pass --server-url")
+        if not self.server_url.startswith(VALID_WS_SCHEMES):
+            raise WorkerConfigError(f"server_url must start with ws:// or wss://, got: {self.server_url}")
+        for url in self.federation_urls:
+            if not url.startswith(VALID_WS_SCHEMES):
+                raise WorkerConfigError(f"federation_urls must start with ws:// or wss://, got: {url}")
+        if len({self.server_url, *self.federation_urls}) != 1 + len(self.federation_urls):
+            raise WorkerConfigError("federation_urls must not repeat server_url or each other")
+
+    def _validate_tuning(self) -> None:
+        """Check the slot, prefetch, cache, buffer and transport settings against their tables."""
+        for name, minimum, maximum in _TUNING_BOUNDS:
+            value = getattr(self, name)
+            if maximum is None and value < minimum:
+                raise WorkerConfigError(f"{name} must be >= {minimum}, got {value}")
+            if maximum is not None and not minimum <= value <= maximum:
+                raise WorkerConfigError(f"{name} must be {minimum}-{maximum}, got {value}")
+        for name, choices in _TUNING_CHOICES:
+            value = getattr(self, name)
+            if value not in choices:
+                raise WorkerConfigError(f"{name} must be one of {choices}, got {value!r}")
 
     @property
     def address(self) -> tuple:
@@ -0,0 +1,112 @@
+"""State kept across reconnects so a new connection is cheap to open.
+
+Every reconnect used to build a fresh ``SSLContext`` (re-reading the CA and
+client certificate files) and resolve the server's host name again. When a
+server restarts, hundreds of workers do all of that at once. A
+:class:`ConnectionCache` lives as long as the agent and is handed to each
+:class:`~juniper_cascor_worker.ws_connection.WorkerConnection`:
+
+- **SSL context** — built once per set of certificate files and rebuilt
+  only when one of the files changes (by mtime), so rotated certificates
+  are still picked up.
+- **Resolved addresses** — kept for ``dns_ttl`` seconds and dropped as soon
+  as a connection to them fails.
+
+Nothing here is required: without a cache the connection behaves as before.
+TLS sessions are not resumed: asyncio's TLS transport has no supported way
+to offer a saved session, so every connect runs a full handshake.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import os
+import socket
+import ssl
+import time
+from typing import Any, Callable
+
+from juniper_cascor_worker.constants import DNS_CACHE_TTL_SECONDS
+
+
+class ConnectionCache:
+    """SSL context and resolved addresses reused across reconnects."""
+
+    def __init__(self, dns_ttl: float = DNS_CACHE_TTL_SECONDS) -> None:
+        self.dns_ttl = dns_ttl
+        self._ssl_context: ssl.SSLContext | None = None
+        self._ssl_key: tuple[Any, ...] | None = None
+        self._addresses: dict[tuple[str, int], tuple[float, str]] = {}
+        self._ssl_context_builds = 0
+        self._dns_hits = 0
+        self._dns_misses = 0
+        self._last_connect_seconds: float | None = None
+
+    def ssl_context(self, build: Callable[[], ssl.SSLContext | None], paths: tuple[str | None, ...]) -> ssl.SSLContext | None:
+        """Return the cached context for ``paths``, calling ``build`` when a file changed."""
+        key = tuple((path, _mtime_ns(path)) for path in paths)
+        if self._ssl_context is None or key != self._ssl_key:
+            context = build()
+            if context is None:
+                return None
+            self._ssl_context, self._ssl_key = context, key
+            self._ssl_context_builds += 1
+        return self._ssl_context
+
+    async def resolve(self, host: str, port: int) -> str | None:
+        """Return a cached (or freshly resolved) address for ``host``.
+
+        ``None`` for IP literals and failed lookups — the caller then
+        connects by name and the failure surfaces there.
+        """
+        if _is_ip_literal(host):
+            return None
+        cached = self._addresses.get((host, port))
+        if cached is not None and cached[0] > time.monotonic():
+            self._dns_hits += 1
+            return cached[1]
+        self._dns_misses += 1
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return None
+        if not infos:
+            return None
+        address = infos[0][4][0]
+        self._addresses[(host, port)] = (time.monotonic() + self.dns_ttl, address)
+        return address
+
+    def forget_address(self, host: str, port: int) -> None:
+        """Drop a cached address after a connection to it failed."""
+        self._addresses.pop((host, port), None)
+
+    def record_connect(self, seconds: float) -> None:
+        """Note how long a finished connect took."""
+        self._last_connect_seconds = seconds
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing connection set-up costs."""
+        return {
+            "last_connect_seconds": None if self._last_connect_seconds is None else round(self._last_connect_seconds, 4),
+            "ssl_context_builds": self._ssl_context_builds,
+            "dns_cache_hits": self._dns_hits,
+            "dns_cache_misses": self._dns_misses,
+        }
+
+
+def _mtime_ns(path: str | None) -> int | None:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
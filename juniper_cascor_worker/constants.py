@@ -42,6 +42,14 @@ MSG_TYPE_RESULT_ACK: Final[str] = WorkerMessageType.RESULT_ACK.value
 MSG_TYPE_TOKEN_REFRESH: Final[str] = WorkerMessageType.TOKEN_REFRESH.value  # nosec B105 — protocol message type, not a password
 MSG_TYPE_ERROR: Final[str] = WorkerMessageType.ERROR.value
 
+# Worker-side extensions not (yet) in ``WorkerMessageType``: the server asks
+# for result tensors it had withheld, and the worker replies with them.
+MSG_TYPE_RESULT_FETCH: Final[str] = "result_fetch"
+MSG_TYPE_RESULT_TENSORS: Final[str] = "result_tensors"
+# The worker grants task credits; a server that confirmed ``task_credit``
+# sends task_assigns only up to the granted limit.
+MSG_TYPE_TASK_CREDIT: Final[str] = "task_credit"
+
 # ---------------------------------------------------------------------------
 # Activation Function Names
 # ---------------------------------------------------------------------------
@@ -74,6 +82,21 @@ DEFAULT_SEQUENCE_MAX_VALUE: Final[float] = 1.0
 # CandidateUnit log level (passed to CandidateUnit__log_level_name).
 CANDIDATE_UNIT_LOG_LEVEL: Final[str] = "INFO"
 
+# ---------------------------------------------------------------------------
+# Candidate Batches (batch_executor)
+# ---------------------------------------------------------------------------
+# A ``task_assign`` may carry a ``candidate_batch`` — several candidates that
+# share one ``candidate_input`` / ``residual_error`` — which the worker trains
+# together as a single (inputs x K) weight matrix. The cap is advertised as
+# the ``candidate_batch`` capability; larger batches are rejected.
+MAX_CANDIDATE_BATCH: Final[int] = 256
+
+# Activations that mix values across the sample/candidate axis (softmax over
+# dim=1, GLU halving it) cannot be applied to a stacked (samples x K) matrix
+# column-by-column; candidates using them train one at a time via
+# ``execute_training_task``. Compared case-insensitively.
+BATCH_SEQUENTIAL_ACTIVATIONS: Final[frozenset[str]] = frozenset({"softmax", "glu"})
+
 # ---------------------------------------------------------------------------
 # WebSocket Connection
 # ---------------------------------------------------------------------------
@@ -89,6 +112,11 @@ WS_SCHEME_INSECURE: Final[str] = "ws://"
 WS_SCHEME_SECURE: Final[str] = "wss://"
 VALID_WS_SCHEMES: Final[tuple[str, ...]] = (WS_SCHEME_INSECURE, WS_SCHEME_SECURE)
 
+# Largest incoming WebSocket message the connection accepts (the websockets
+# library default). Tensors larger than this arrive as chunked frames, and
+# the limit is advertised so the server can size its chunks.
+DEFAULT_MAX_MESSAGE_BYTES: Final[int] = 1024 * 1024
+
 # ---------------------------------------------------------------------------
 # Configuration Defaults — Single Source of Truth
 # ---------------------------------------------------------------------------
@@ -100,6 +128,12 @@ VALID_WS_SCHEMES: Final[tuple[str, ...]] = (WS_SCHEME_INSECURE, WS_SCHEME_SECURE
 DEFAULT_HEARTBEAT_INTERVAL: Final[float] = 10.0
 DEFAULT_RECONNECT_BACKOFF_BASE: Final[float] = 1.0
 DEFAULT_RECONNECT_BACKOFF_MAX: Final[float] = 60.0
+# A dropped connection is retried after a random delay of up to this many
+# seconds (capped by the backoff base), so a fleet reconnecting after a
+# server bounce is spread out but back well within a second.
+RECONNECT_JITTER_SECONDS: Final[float] = 0.25
+# Resolved server addresses are reused for this long across reconnects.
+DNS_CACHE_TTL_SECONDS: Final[float] = 60.0
 
 # METRICS-MON R1.3 / seed-04: HTTP health server defaults.
 # Bound to localhost by default; operators set CASCOR_WORKER_HEALTH_BIND=0.0.0.0
@@ -119,6 +153,117 @@ HEALTH_REQUEST_MAX_BYTES: Final[int] = 4096
 # Per-task training timeout (seconds). 1 hour by default.
 DEFAULT_TASK_TIMEOUT: Final[float] = 3600.0
 
+# Concurrent task slots — number of candidate trainings the WebSocket agent
+# runs at once. One slot reproduces the historical one-task-at-a-time
+# behaviour; operators raise it on many-core hosts.
+DEFAULT_TASK_SLOTS: Final[int] = 1
+
+# Frame prefetch — how many task_assigns beyond the busy slots the agent
+# reads and decodes while training runs, so the next task starts the moment
+# a slot frees up instead of after its transfer. ``prefetch_bytes`` caps the
+# decoded tensor bytes held by tasks waiting for a slot. Zero tasks keeps the
+# historical behaviour: the socket is not read while every slot is busy.
+DEFAULT_PREFETCH_TASKS: Final[int] = 0
+DEFAULT_PREFETCH_BYTES: Final[int] = 256 * 1024 * 1024
+
+# Result outbox — finished tasks enqueue their task_result group and a
+# per-connection sender uploads them in order. When the outbox is full, tasks
+# wait for room, which in turn holds back admission of new tasks.
+DEFAULT_RESULT_OUTBOX_SIZE: Final[int] = 8
+
+# Tensor cache — decoded tensors whose manifest entry declares a ``sha256``
+# are kept (LRU, up to this many bytes) so later tasks of the same round can
+# reference them with ``"cached": true`` instead of resending the frame.
+# Zero disables the cache.
+DEFAULT_TENSOR_CACHE_BYTES: Final[int] = 512 * 1024 * 1024
+
+# Session dataset store — a 2-D manifest entry with ``base_columns`` k holds
+# only the columns from k on; the worker appends them to the matrix it keeps
+# for the task's ``training_session`` (LRU, up to this many bytes). Zero
+# disables the store.
+DEFAULT_DATASET_STORE_BYTES: Final[int] = 512 * 1024 * 1024
+
+# Result cache — result tensors left out by a ``training_params``
+# ``result_tensors`` selection are kept (up to this many bytes, for this many
+# seconds) so the server can fetch them for the winning candidate.
+DEFAULT_RESULT_CACHE_BYTES: Final[int] = 256 * 1024 * 1024
+RESULT_CACHE_TTL_SECONDS: Final[float] = 300.0
+
+# Buffer pool — decoded frames and narrowed result tensors are allocated from
+# per-size-class free lists and returned when the task is done with them, so
+# long runs reuse the same blocks instead of fragmenting the heap. Up to this
+# many bytes of idle buffers are kept; zero disables the pool. Arrays below
+# BUFFER_POOL_MIN_BYTES come from the regular allocator.
+DEFAULT_BUFFER_POOL_BYTES: Final[int] = 256 * 1024 * 1024
+BUFFER_POOL_MIN_BYTES: Final[int] = 64 * 1024
+
+# Session resume — task_result groups are kept (up to this many frame bytes)
+# until the server's result_ack, and replayed after a reconnect if the
+# server confirms ``session_resume``; zero disables resume.
+DEFAULT_RESULT_REPLAY_BYTES: Final[int] = 256 * 1024 * 1024
+
+# Send-queue watermarks — bytes handed to WorkerConnection.send_* and not yet
+# accepted by the socket. Above the high watermark the connection reports
+# itself unwritable and the agent stops admitting tasks until the queue
+# drains to the low watermark (a quarter of it). Zero disables the check.
+DEFAULT_SEND_BUFFER_BYTES: Final[int] = 16 * 1024 * 1024
+SEND_LOW_WATERMARK_DIVISOR: Final[int] = 4
+
+# Task credits (pull scheduling) — the worker grants a cumulative
+# ``credit_limit`` of task_assigns: those received so far plus one per free
+# admission place (slot or prefetch place), fewer when available memory less
+# this reserve would not hold that many tasks the size of the largest seen.
+# Available memory is MemAvailable, capped by a cgroup v2 ``memory.max``.
+TASK_CREDIT_MEMORY_RESERVE_BYTES: Final[int] = 512 * 1024 * 1024
+PROC_MEMINFO_PATH: Final[str] = "/proc/meminfo"
+CGROUP_MEMORY_MAX_PATH: Final[str] = "/sys/fs/cgroup/memory.max"
+CGROUP_MEMORY_CURRENT_PATH: Final[str] = "/sys/fs/cgroup/memory.current"
+
+# Eager warm-up — opt-in. While the agent connects, every training thread or
+# process imports torch and CandidateUnit, touches each activation in
+# ACTIVATION_MAP once and runs a tiny training pass, so the first real task
+# does not pay those costs. Registration and readiness wait for it.
+DEFAULT_WARMUP: Final[bool] = False
+WARMUP_SAMPLES: Final[int] = 8
+WARMUP_INPUT_SIZE: Final[int] = 2
+WARMUP_EPOCHS: Final[int] = 2
+
+# Env values read as "on" for boolean settings (compared case-insensitively).
+TRUTHY_ENV_VALUES: Final[frozenset[str]] = frozenset({"1", "true", "yes", "on"})
+
+# Thread-name prefix for the agent's dedicated training executor, so the
+# training threads are identifiable in py-spy / faulthandler dumps.
+TASK_EXECUTOR_THREAD_PREFIX: Final[str] = "cascor-task"
+
+# Training backends for the WebSocket agent. ``thread`` runs training on an
+# in-process thread pool; ``process`` runs it in pre-started worker processes
+# (one per task slot, started with ``mp_context``) so CandidateUnit's Python
+# loop does not contend for the agent's GIL.
+TRAINING_BACKEND_THREAD: Final[str] = "thread"
+TRAINING_BACKEND_PROCESS: Final[str] = "process"
+VALID_TRAINING_BACKENDS: Final[tuple[str, ...]] = (
+    TRAINING_BACKEND_THREAD,
+    TRAINING_BACKEND_PROCESS,
+)
+DEFAULT_TRAINING_BACKEND: Final[str] = TRAINING_BACKEND_THREAD
+
+# Process-name prefix for the process backend's training processes.
+TRAINING_PROCESS_NAME_PREFIX: Final[str] = "cascor-train"
+
+# Compute-thread partitioning (thread_layout). Each running task gets
+# ``usable CPUs // task_slots`` (at least one) torch/BLAS threads, so
+# concurrent slots share the host instead of each starting a thread per
+# core. "Usable" honours the CPU affinity mask and a cgroup v2 ``cpu.max``
+# quota. An operator-set ``OMP_NUM_THREADS`` overrides the computed budget.
+COMPUTE_THREAD_ENV_VARS: Final[tuple[str, ...]] = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+)
+CGROUP_CPU_MAX_PATH: Final[str] = "/sys/fs/cgroup/cpu.max"
+THREAD_LAYOUT_SOURCE_AUTO: Final[str] = "auto"
+THREAD_LAYOUT_SOURCE_ENV: Final[str] = "OMP_NUM_THREADS"
+
 # Legacy BaseManager mode defaults
 DEFAULT_MANAGER_HOST: Final[str] = "127.0.0.1"
 DEFAULT_MANAGER_PORT: Final[int] = 50000
@@ -193,6 +338,27 @@ LEGACY_ENV_AUTHKEY: Final[str] = "CASCOR_AUTHKEY"  # nosec B105 — env var name
 LEGACY_ENV_NUM_WORKERS: Final[str] = "CASCOR_NUM_WORKERS"
 LEGACY_ENV_MP_CONTEXT: Final[str] = "CASCOR_MP_CONTEXT"
 
+# Canonical-only — env vars introduced after CFG-06 have no legacy alias;
+# read them via ``_resolve(env, ENV_X, None, default)``.
+ENV_TASK_SLOTS: Final[str] = "JUNIPER_CASCOR_WORKER_TASK_SLOTS"
+ENV_TRAINING_BACKEND: Final[str] = "JUNIPER_CASCOR_WORKER_TRAINING_BACKEND"
+ENV_PREFETCH_TASKS: Final[str] = "JUNIPER_CASCOR_WORKER_PREFETCH_TASKS"
+ENV_PREFETCH_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_PREFETCH_BYTES"
+ENV_RESULT_OUTBOX_SIZE: Final[str] = "JUNIPER_CASCOR_WORKER_RESULT_OUTBOX_SIZE"
+ENV_WARMUP: Final[str] = "JUNIPER_CASCOR_WORKER_WARMUP"
+ENV_TENSOR_CACHE_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_TENSOR_CACHE_BYTES"
+ENV_FRAME_CODEC: Final[str] = "JUNIPER_CASCOR_WORKER_FRAME_CODEC"
+ENV_FRAME_CODEC_LEVEL: Final[str] = "JUNIPER_CASCOR_WORKER_FRAME_CODEC_LEVEL"
+ENV_WIRE_PRECISION: Final[str] = "JUNIPER_CASCOR_WORKER_WIRE_PRECISION"
+ENV_MAX_MESSAGE_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_MAX_MESSAGE_BYTES"
+ENV_SHM_TRANSPORT: Final[str] = "JUNIPER_CASCOR_WORKER_SHM_TRANSPORT"
+ENV_DATASET_STORE_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_DATASET_STORE_BYTES"
+ENV_RESULT_CACHE_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_RESULT_CACHE_BYTES"
+ENV_BUFFER_POOL_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_BUFFER_POOL_BYTES"
+ENV_FEDERATION_URLS: Final[str] = "JUNIPER_CASCOR_WORKER_FEDERATION_URLS"
+ENV_RESULT_REPLAY_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_RESULT_REPLAY_BYTES"
+ENV_SEND_BUFFER_BYTES: Final[str] = "JUNIPER_CASCOR_WORKER_SEND_BUFFER_BYTES"
+
 # ---------------------------------------------------------------------------
 # Validation Bounds
 # ---------------------------------------------------------------------------
@@ -204,6 +370,37 @@ MAX_PORT: Final[int] = 65535
 # Minimum allowed worker count for the legacy mode.
 MIN_NUM_WORKERS: Final[int] = 1
 
+# Minimum allowed concurrent task slots for the WebSocket agent.
+MIN_TASK_SLOTS: Final[int] = 1
+
+# Minimum prefetch depth (0 disables prefetch) and byte budget.
+MIN_PREFETCH_TASKS: Final[int] = 0
+MIN_PREFETCH_BYTES: Final[int] = 1
+
+# Minimum result outbox capacity (message groups).
+MIN_RESULT_OUTBOX_SIZE: Final[int] = 1
+
+# Minimum incoming WebSocket message size limit.
+MIN_MAX_MESSAGE_BYTES: Final[int] = 4096
+
+# Minimum tensor cache budget (0 disables the cache).
+MIN_TENSOR_CACHE_BYTES: Final[int] = 0
+
+# Minimum session dataset store budget (0 disables the store).
+MIN_DATASET_STORE_BYTES: Final[int] = 0
+
+# Minimum result cache budget (0 keeps nothing; withheld tensors are dropped).
+MIN_RESULT_CACHE_BYTES: Final[int] = 0
+
+# Minimum buffer pool budget (0 disables pooling).
+MIN_BUFFER_POOL_BYTES: Final[int] = 0
+
+# Minimum result replay budget (0 disables session resume).
+MIN_RESULT_REPLAY_BYTES: Final[int] = 0
+
+# Minimum send-queue high watermark (0 disables the writable check).
+MIN_SEND_BUFFER_BYTES: Final[int] = 0
+
 # ---------------------------------------------------------------------------
 # Error Handling / Diagnostics
 # ---------------------------------------------------------------------------
@@ -238,3 +435,100 @@ BINARY_FRAME_DTYPE_ENCODING: Final[str] = "utf-8"
 # struct format characters used by the binary frame header.
 BINARY_FRAME_HEADER_LENGTH_FORMAT: Final[str] = "<I"
 BINARY_FRAME_HEADER_LENGTH_BYTES: Final[int] = 4
+
+# Chunked frames: a manifest entry with ``"chunks": N`` is sent as a
+# header-only frame followed by N raw payload chunks, each written straight
+# into the preallocated destination array.
+MAX_FRAME_CHUNKS: Final[int] = 65536
+
+# Packed result frames: once the registration_ack accepts
+# ``packed_results``, a task_result's tensors travel as one binary message
+# — a table of contents (count, then name and frame length per tensor)
+# followed by the regular frames back to back.
+PACKED_FRAME_MAX_TENSORS: Final[int] = 64
+PACKED_FRAME_MAX_NAME_BYTES: Final[int] = 128
+
+# Scatter-gather result frames: a raw payload of at least this many bytes
+# is sent as a fragmented WebSocket message (header, then a view of the
+# array) instead of being copied behind its header. Smaller frames are
+# joined, since a copy is cheaper than an extra fragment.
+SCATTER_GATHER_MIN_BYTES: Final[int] = 64 * 1024
+
+# ---------------------------------------------------------------------------
+# Frame Compression Codecs
+# ---------------------------------------------------------------------------
+# Optional per-frame compression (see frame_codec.py). A manifest entry's
+# ``codec`` names one of FRAME_CODECS; the worker advertises them all in its
+# capabilities and compresses result frames with ``frame_codec`` only when
+# the server's registration_ack lists it in ``frame_codecs``.
+
+FRAME_CODEC_NONE: Final[str] = "none"
+FRAME_CODEC_SHUFFLE_PREFIX: Final[str] = "shuffle+"
+FRAME_CODECS: Final[tuple[str, ...]] = ("shuffle+zlib", "shuffle+lzma", "zlib", "lzma")
+VALID_FRAME_CODECS: Final[tuple[str, ...]] = (FRAME_CODEC_NONE, *FRAME_CODECS)
+DEFAULT_FRAME_CODEC: Final[str] = FRAME_CODEC_NONE
+
+# Compression level (zlib level / lzma preset).
+DEFAULT_FRAME_CODEC_LEVEL: Final[int] = 6
+MIN_FRAME_CODEC_LEVEL: Final[int] = 0
+MAX_FRAME_CODEC_LEVEL: Final[int] = 9
+
+# Automatic bypass: payloads smaller than this are sent raw, as are those
+# whose compressed size exceeds this fraction of the raw size.
+FRAME_CODEC_MIN_BYTES: Final[int] = 4096
+FRAME_CODEC_MAX_RATIO: Final[float] = 0.9
+
+# Memory cap for the lzma decoder, so a crafted header cannot demand a huge
+# dictionary (preset 9 needs ~65 MiB).
+FRAME_CODEC_LZMA_MEMLIMIT: Final[int] = 128 * 1024 * 1024
+
+# ---------------------------------------------------------------------------
+# Wire Precision
+# ---------------------------------------------------------------------------
+# Opt-in reduced precision for bulk tensors. The worker requests
+# ``wire_precision`` at registration; the server's registration_ack confirms
+# the mode it will use. Half-precision task frames are upcast to float32 on
+# decode, and the listed result tensors are narrowed before upload.
+# ``bfloat16`` has no numpy dtype: it travels as the top 16 bits of each
+# float32 and is named ``"bfloat16"`` in the frame header.
+
+WIRE_PRECISION_FLOAT32: Final[str] = "float32"
+WIRE_PRECISION_FLOAT16: Final[str] = "float16"
+WIRE_PRECISION_BFLOAT16: Final[str] = "bfloat16"
+VALID_WIRE_PRECISIONS: Final[tuple[str, ...]] = (WIRE_PRECISION_FLOAT32, WIRE_PRECISION_FLOAT16, WIRE_PRECISION_BFLOAT16)
+DEFAULT_WIRE_PRECISION: Final[str] = WIRE_PRECISION_FLOAT32
+
+# Result tensors sent at reduced precision; weights and bias stay float32.
+REDUCED_PRECISION_RESULT_TENSORS: Final[frozenset[str]] = frozenset({"norm_output", "norm_error"})
+
+# ---------------------------------------------------------------------------
+# Shared-Memory Transport
+# ---------------------------------------------------------------------------
+# Opt-in zero-copy transport for a server on the same host. A manifest entry
+# ``{"shm": name, "offset": n, "shape": [...], "dtype": ...}`` names a region
+# of a POSIX shared-memory segment that the worker maps instead of receiving
+# a binary frame. Such entries are accepted only after the server proves it
+# shares this host's shared memory: the worker advertises a probe segment
+# holding a random token, and the registration_ack must echo that token.
+
+DEFAULT_SHM_TRANSPORT: Final[bool] = False
+SHM_TRANSPORT_DIR: Final[str] = "/dev/shm"  # nosec B108 — POSIX shm segments are exposed as files in this directory on Linux
+SHM_PROBE_TOKEN_BYTES: Final[int] = 16
+
+# Segment names are plain file names inside SHM_TRANSPORT_DIR.
+SHM_SEGMENT_NAME_PATTERN: Final[str] = r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,254}"
+
+# ---------------------------------------------------------------------------
+# Correlation Trace
+# ---------------------------------------------------------------------------
+# A server that sets ``training_params["correlation_trace"]`` receives the
+# per-epoch ``all_correlations`` trace as a float32 result tensor instead of
+# a JSON list, optionally downsampled:
+#   {"policy": "full"}                   — every epoch
+#   {"policy": "stride", "k": K}         — every K-th epoch (and the last)
+#   {"policy": "minmax", "buckets": B}   — (min, max) of B equal buckets
+CORRELATION_TRACE_FULL: Final[str] = "full"
+CORRELATION_TRACE_STRIDE: Final[str] = "stride"
+CORRELATION_TRACE_MINMAX: Final[str] = "minmax"
+CORRELATION_TRACE_POLICIES: Final[tuple[str, ...]] = (CORRELATION_TRACE_FULL, CORRELATION_TRACE_STRIDE, CORRELATION_TRACE_MINMAX)
+MAX_CORRELATION_TRACE_BUCKETS: Final[int] = 65536
@@ -0,0 +1,70 @@
+"""Binary, optionally downsampled ``all_correlations`` traces.
+
+By default a result carries the per-epoch correlation trace as a JSON list,
+which grows with the epoch count and is serialised on the event loop. A
+server that sets ``training_params["correlation_trace"]`` gets the trace as
+an ``all_correlations`` float32 result tensor instead; the JSON list is
+left empty and ``correlation_trace`` records the policy and the original
+epoch count, so the JSON size no longer depends on the number of epochs.
+
+The conversion runs in the backend wrappers, off the event loop.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from juniper_cascor_worker.constants import CORRELATION_TRACE_FULL, CORRELATION_TRACE_MINMAX, CORRELATION_TRACE_POLICIES, CORRELATION_TRACE_STRIDE, MAX_CORRELATION_TRACE_BUCKETS
+
+TRACE_TENSOR_NAME = "all_correlations"
+
+
+def validate_trace_request(spec: Any) -> str | None:
+    """Validate a ``correlation_trace`` request, returning an error string or None."""
+    if spec is None:
+        return None
+    if not isinstance(spec, dict) or spec.get("policy") not in CORRELATION_TRACE_POLICIES:
+        return f"correlation_trace must be an object with policy in {list(CORRELATION_TRACE_POLICIES)}"
+    policy = spec["policy"]
+    if policy == CORRELATION_TRACE_STRIDE:
+        k = spec.get("k")
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            return f"correlation_trace stride needs an integer k >= 1, got {k!r}"
+    elif policy == CORRELATION_TRACE_MINMAX:
+        buckets = spec.get("buckets")
+        if isinstance(buckets, bool) or not isinstance(buckets, int) or not 1 <= buckets <= MAX_CORRELATION_TRACE_BUCKETS:
+            return f"correlation_trace minmax needs integer buckets in 1-{MAX_CORRELATION_TRACE_BUCKETS}, got {buckets!r}"
+    return None
+
+
+def downsample_trace(trace: np.ndarray, spec: dict[str, Any]) -> np.ndarray:
+    """Apply the requested policy to a 1-D float32 trace.
+
+    ``stride`` keeps every k-th epoch plus the final one; ``minmax`` returns
+    a ``(buckets, 2)`` array of per-bucket minimum and maximum (fewer rows
+    when there are fewer epochs than buckets).
+    """
+    policy = spec["policy"]
+    if policy == CORRELATION_TRACE_FULL or trace.size == 0:
+        return trace if policy != CORRELATION_TRACE_MINMAX else trace.reshape(0, 2)
+    if policy == CORRELATION_TRACE_STRIDE:
+        k = spec["k"]
+        picked = trace[::k]
+        return picked if (trace.size - 1) % k == 0 else np.append(picked, trace[-1])
+    buckets = min(spec["buckets"], trace.size)
+    starts = (np.arange(buckets) * trace.size) // buckets
+    return np.stack([np.minimum.reduceat(trace, starts), np.maximum.reduceat(trace, starts)], axis=1)
+
+
+def apply_trace_request(result: tuple[dict[str, Any], dict[str, np.ndarray]], spec: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Move a result's ``all_correlations`` into its tensors when ``spec`` asks for it."""
+    if spec is None:
+        return result
+    result_dict, tensor_dict = result
+    trace = np.asarray(result_dict.get("all_correlations") or [], dtype=np.float32).reshape(-1)
+    tensor_dict[TRACE_TENSOR_NAME] = np.ascontiguousarray(downsample_trace(trace, spec))
+    result_dict["all_correlations"] = []
+    result_dict["correlation_trace"] = {**spec, "epochs": int(trace.size)}
+    return result_dict, tensor_dict
@@ -0,0 +1,113 @@
+"""Per-session store of column-growing input matrices.
+
+In cascade-correlation every installed hidden unit adds one column to
+``candidate_input``; the other columns do not change for the rest of the
+training session. A ``task_assign`` carrying ``training_session`` may mark
+a 2-D manifest entry with ``base_columns``:
+
+- ``{"base_columns": 0, ...}`` — the frame is the whole matrix; the worker
+  stores it for the session.
+- ``{"base_columns": k, ...}`` — the frame holds only the columns from
+  ``k`` on; the worker places them after the first ``k`` stored columns.
+
+A round therefore ships O(samples) bytes instead of O(samples × features).
+If the session is unknown, has fewer than ``k`` columns or a different row
+count, the task fails with ``session_miss`` so the server resends in full.
+
+Matrices are kept C-contiguous, the layout torch and the shared-memory
+export of the process backend read without a strided gather. An append
+therefore builds the extended matrix once per round; every task of the
+round then shares it. A stored matrix is never written again: tasks still
+holding an earlier one are unaffected by later appends or by a task that
+diverges from the stored columns. Returned arrays are shared by concurrent
+tasks, so they are read-only.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+
+class DatasetStore:
+    """LRU of session matrices keyed by ``(training_session, tensor_name)``."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._appended_columns = 0
+        self._rebuilds = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def extend(self, key: tuple[str, str], base_columns: int, columns: np.ndarray) -> np.ndarray | None:
+        """Return the session matrix with ``columns`` placed after its first ``base_columns``.
+
+        Returns None (a miss) when the stored matrix cannot supply the base.
+        A repeated delta (every task of a round carries the same one) is
+        recognised and served without copying.
+        """
+        matrix = self._entries.get(key)
+        if base_columns == 0:
+            if not self.enabled:
+                return columns
+            # Copied: ``columns`` is a pooled buffer the caller gets back.
+            stored = self._store(key, _read_only(np.array(columns, order="C")))
+            return stored if stored is not None else columns
+        if matrix is None or matrix.shape[1] < base_columns or matrix.shape[0] != columns.shape[0] or matrix.dtype != columns.dtype:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        end = base_columns + columns.shape[1]
+        if matrix.shape[1] >= end and np.array_equal(matrix[:, base_columns:end], columns):
+            # A task of an earlier round needs only a prefix; that one is copied.
+            return matrix if matrix.shape[1] == end else _read_only(np.ascontiguousarray(matrix[:, :end]))
+        if matrix.shape[1] > base_columns:
+            self._rebuilds += 1
+        extended = _read_only(np.concatenate([matrix[:, :base_columns], columns], axis=1))
+        self._appended_columns += columns.shape[1]
+        self._store(key, extended)
+        return extended
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing store occupancy and effectiveness."""
+        return {
+            "dataset_store_sessions": len({key[0] for key in self._entries}),
+            "dataset_store_bytes": self._bytes,
+            "dataset_store_appended_columns": self._appended_columns,
+            "dataset_store_rebuilds": self._rebuilds,
+            "dataset_store_misses": self._misses,
+            "dataset_store_evictions": self._evictions,
+        }
+
+    def _store(self, key: tuple[str, str], matrix: np.ndarray) -> np.ndarray | None:
+        self._discard(key)
+        if matrix.nbytes > self.max_bytes:
+            return None
+        self._entries[key] = matrix
+        self._bytes += matrix.nbytes
+        while self._bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+            self._evictions += 1
+        return matrix
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        matrix = self._entries.pop(key, None)
+        if matrix is not None:
+            self._bytes -= matrix.nbytes
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
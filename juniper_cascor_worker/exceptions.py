@@ -17,3 +17,9 @@ class WorkerConfigError(WorkerError):
     """Raised when worker configuration is invalid."""
 
     pass
+
+
+class TrainingBackendError(WorkerError):
+    """Raised when the training backend cannot run or finish a task."""
+
+    pass
@@ -0,0 +1,129 @@
+"""Training slots shared fairly between the servers of one worker process.
+
+A federated worker (``federation_urls``) holds one connection per cascor
+endpoint but a single training backend, so every connection competes for
+the same ``task_slots``. :class:`FairShareSlots` owns those slots; each
+connection acquires them through its own :class:`SlotShare`.
+
+The policy is work-conserving max-min fairness: a free slot goes to a
+waiting task straight away, and when several servers are waiting it goes
+to the one currently holding the fewest slots (first come, first served
+between equals). A lone busy server may therefore use every slot, but as
+soon as a second server has work, each newly freed slot evens out the
+split. Running tasks are never preempted.
+
+Admission places (the slots plus ``prefetch_tasks``) are pooled as well:
+every connection admits through the one ``admission`` semaphore, so the
+process never holds more tasks than it has places for. Places promised
+ahead of time — task credits — cannot be taken back, so they follow a
+fixed even split instead (:meth:`FairShareSlots.place_quota`).
+
+A plain (single-server) agent uses the same class with one share, so
+``SlotShare`` is a drop-in for the ``asyncio.Semaphore`` it replaces.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+
+class SlotShare:
+    """One server's handle on a :class:`FairShareSlots` pool, with its accounting."""
+
+    def __init__(self, pool: FairShareSlots, name: str) -> None:
+        self._pool = pool
+        self.name = name
+        self.held = 0
+        self.waiting = 0
+        self.grants = 0
+        self.wait_seconds = 0.0
+
+    async def acquire(self) -> None:
+        await self._pool._acquire(self)
+
+    def release(self) -> None:
+        self._pool._release(self)
+
+    def locked(self) -> bool:
+        """True when an ``acquire()`` would have to wait."""
+        return self._pool.locked()
+
+    def metrics(self) -> dict[str, Any]:
+        """Per-server slot accounting for heartbeats."""
+        return {
+            "server_url": self.name,
+            "slots_held": self.held,
+            "slots_waiting": self.waiting,
+            "slot_grants": self.grants,
+            "slot_wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class FairShareSlots:
+    """``total`` training slots granted to the least-served waiting share, and ``places`` admission places."""
+
+    def __init__(self, total: int, places: int | None = None) -> None:
+        self.total = total
+        self.places = total if places is None else places
+        self.admission = asyncio.Semaphore(self.places)
+        self._free = total
+        self._shares: list[SlotShare] = []
+        self._waiters: list[tuple[SlotShare, asyncio.Future[None]]] = []
+
+    def share(self, name: str) -> SlotShare:
+        share = SlotShare(self, name)
+        self._shares.append(share)
+        return share
+
+    def locked(self) -> bool:
+        return self._free == 0 or bool(self._waiters)
+
+    def place_quota(self, share: SlotShare) -> int:
+        """``share``'s even split of the admission places; at least one, so every server makes progress."""
+        base, extra = divmod(self.places, len(self._shares))
+        return max(base + (self._shares.index(share) < extra), 1)
+
+    def metrics(self) -> list[dict[str, Any]]:
+        """Slot accounting of every share, in registration order."""
+        return [share.metrics() for share in self._shares]
+
+    async def _acquire(self, share: SlotShare) -> None:
+        if not self.locked():
+            self._grant(share)
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append((share, waiter))
+        share.waiting += 1
+        started = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before the cancellation landed: hand it on.
+                self._release(share)
+            else:
+                self._waiters.remove((share, waiter))
+                share.waiting -= 1
+            raise
+        finally:
+            share.wait_seconds += time.monotonic() - started
+
+    def _release(self, share: SlotShare) -> None:
+        share.held -= 1
+        self._free += 1
+        self._wake()
+
+    def _grant(self, share: SlotShare) -> None:
+        self._free -= 1
+        share.held += 1
+        share.grants += 1
+
+    def _wake(self) -> None:
+        while self._free and self._waiters:
+            index = min(range(len(self._waiters)), key=lambda i: self._waiters[i][0].held)
+            share, waiter = self._waiters.pop(index)
+            share.waiting -= 1
+            self._grant(share)
+            waiter.set_result(None)
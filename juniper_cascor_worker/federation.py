@@ -0,0 +1,138 @@
+"""One worker process serving several cascor endpoints.
+
+:class:`FederatedWorker` runs one :class:`CascorWorkerAgent` per endpoint
+(``server_url`` plus ``federation_urls``). Each agent keeps its own
+connection, registration, outbox, dataset store and result cache (task
+ids and session ids are only unique per server), while the expensive
+parts are built once and shared:
+
+- the training backend (thread or process pool) and its warm-up;
+- the training slots, granted by :class:`FairShareSlots` so a busy server
+  cannot starve the others, and the admission places (slots plus
+  ``prefetch_tasks``), of which each server is credited an even split;
+- the content-addressed tensor cache and the buffer pool.
+
+Every agent heartbeats its own server with its own task counters plus a
+``slot_shares`` entry per server. A single HTTP health server covers the
+process: it is live and ready while at least one endpoint is.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import uuid
+from typing import TYPE_CHECKING, Optional
+
+from juniper_cascor_worker.buffer_pool import BufferPool
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.fair_share import FairShareSlots
+from juniper_cascor_worker.tensor_cache import TensorCache
+from juniper_cascor_worker.training_backend import build_training_backend
+from juniper_cascor_worker.worker import CascorWorkerAgent, _resolve_build_date, _resolve_git_sha, _resolve_version
+
+if TYPE_CHECKING:
+    from juniper_cascor_worker.http_health import HealthServer
+
+logger = logging.getLogger(__name__)
+
+
+class FederatedWorker:
+    """Serve ``config.server_url`` and every ``config.federation_urls`` endpoint from one process.
+
+    Example:
+        >>> config = WorkerConfig(server_url="ws://a:8200/ws/v1/workers", federation_urls=("ws://b:8200/ws/v1/workers",))
+        >>> asyncio.run(FederatedWorker(config).run())
+    """
+
+    def __init__(self, config: WorkerConfig) -> None:
+        config.validate(legacy=False)
+        self.config = config
+        # One identity for the process, so the servers' views of this
+        # worker can be correlated.
+        self.worker_id = str(uuid.uuid4())
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._health_server: Optional["HealthServer"] = None
+        self._backend = build_training_backend(config)
+        self._slots = FairShareSlots(config.task_slots, config.task_slots + config.prefetch_tasks)
+        self._tensor_cache = TensorCache(config.tensor_cache_bytes)
+        self._buffer_pool = BufferPool(config.buffer_pool_bytes)
+        self._warmup_task: asyncio.Task[None] | None = None
+        self.agents: list[CascorWorkerAgent] = []
+        for url in (config.server_url, *config.federation_urls):
+            agent = CascorWorkerAgent(
+                dataclasses.replace(config, server_url=url, federation_urls=()),
+                backend=self._backend,
+                task_slots=self._slots,
+                tensor_cache=self._tensor_cache,
+                buffer_pool=self._buffer_pool,
+            )
+            agent.worker_id = self.worker_id
+            self.agents.append(agent)
+
+    def _liveness_tick(self) -> None:
+        """Live while any endpoint's agent is live."""
+        self._any_tick(lambda agent: agent._liveness_tick())
+
+    def _readiness_tick(self) -> None:
+        """Ready while any endpoint's agent is registered and warm."""
+        self._any_tick(lambda agent: agent._readiness_tick())
+
+    def _any_tick(self, tick) -> None:
+        errors = []
+        for agent in self.agents:
+            try:
+                tick(agent)
+                return
+            except RuntimeError as e:
+                errors.append(f"{agent.config.server_url}: {e}")
+        raise RuntimeError("; ".join(errors))
+
+    async def run(self) -> None:
+        """Start the shared backend and health server, then run every agent until ``stop()``."""
+        from juniper_cascor_worker.http_health import HealthServer
+        from juniper_cascor_worker.ws_connection import WorkerConnection
+
+        self._loop = asyncio.get_running_loop()
+        for agent in self.agents:
+            agent._loop = self._loop
+        self._health_server = HealthServer(
+            liveness_tick=self._liveness_tick,
+            readiness_tick=self._readiness_tick,
+            worker_id_provider=lambda: self.worker_id if any(agent._registered for agent in self.agents) else None,
+            version=_resolve_version(),
+            git_sha=_resolve_git_sha(),
+            build_date=_resolve_build_date(),
+            host=self.config.health_bind,
+            port=self.config.health_port,
+        )
+        await self._health_server.start()
+
+        try:
+            await self._backend.start()
+            layout = self._backend.layout
+            logger.info("Thread layout: %d usable CPUs, %d slot(s) x %d thread(s) (%s) shared by %d servers", layout.usable_cpus, layout.task_slots, layout.threads_per_task, layout.source, len(self.agents))
+            if self.config.warmup:
+                # Every agent registers once the one shared backend is warm.
+                self._warmup_task = asyncio.create_task(self._warm_up())
+                for agent in self.agents:
+                    agent._warmup_task = self._warmup_task
+            await asyncio.gather(*(agent._run_inner(WorkerConnection) for agent in self.agents))
+        finally:
+            if self._warmup_task is not None:
+                self._warmup_task.cancel()
+            await self._backend.shutdown()
+            await self._health_server.stop()
+
+    async def _warm_up(self) -> None:
+        try:
+            await self.agents[0]._warm_up()
+        finally:
+            for agent in self.agents:
+                agent._warm = True
+
+    def stop(self) -> None:
+        """Signal every agent to stop (thread-safe, like :meth:`CascorWorkerAgent.stop`)."""
+        for agent in self.agents:
+            agent.stop()
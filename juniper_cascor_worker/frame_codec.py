@@ -0,0 +1,81 @@
+"""Byte-shuffle compression codecs for binary tensor frames.
+
+Float32 tensors compress poorly as raw bytes: the mantissa bytes look random
+and hide the redundancy in the sign/exponent bytes. A byte-shuffle filter
+regroups the payload so byte 0 of every element comes first, then byte 1,
+and so on, which lets a general-purpose compressor find long runs.
+
+A compressed frame keeps the regular header (ndim, shape, dtype) and
+replaces the payload with the compressed bytes; the manifest entry names
+the codec (``"codec": "shuffle+zlib"``). Codec names are ``zlib`` or
+``lzma``, optionally prefixed with ``shuffle+``.
+
+Decompression is bounded by the size the header declares, so a small
+compressed payload can never expand past the SEC-18 element limit.
+"""
+
+from __future__ import annotations
+
+import lzma
+import zlib
+
+import numpy as np
+
+from juniper_cascor_worker.constants import FRAME_CODEC_LZMA_MEMLIMIT, FRAME_CODEC_MAX_RATIO, FRAME_CODEC_MIN_BYTES, FRAME_CODEC_SHUFFLE_PREFIX, FRAME_CODECS
+
+
+class FrameCodecError(ValueError):
+    """Raised when a compressed payload is malformed or names an unknown codec."""
+
+
+def _split(codec: str) -> tuple[bool, str]:
+    if codec not in FRAME_CODECS:
+        raise FrameCodecError(f"unsupported frame codec {codec!r} (supported: {list(FRAME_CODECS)})")
+    shuffle = codec.startswith(FRAME_CODEC_SHUFFLE_PREFIX)
+    return shuffle, codec.removeprefix(FRAME_CODEC_SHUFFLE_PREFIX)
+
+
+def compress_payload(array: np.ndarray, codec: str, level: int) -> bytes | None:
+    """Compress an array's bytes with ``codec``; None when it does not pay off.
+
+    Payloads under ``FRAME_CODEC_MIN_BYTES`` and results larger than
+    ``FRAME_CODEC_MAX_RATIO`` of the raw size are not worth the decode cost.
+    """
+    shuffle, compressor = _split(codec)
+    array = np.ascontiguousarray(array)
+    if array.nbytes < FRAME_CODEC_MIN_BYTES:
+        return None
+    raw = array.view(np.uint8).reshape(-1, array.itemsize).T.tobytes() if shuffle and array.itemsize > 1 else array.tobytes()
+    packed = zlib.compress(raw, level) if compressor == "zlib" else lzma.compress(raw, format=lzma.FORMAT_XZ, preset=level)
+    if len(packed) > array.nbytes * FRAME_CODEC_MAX_RATIO:
+        return None
+    return packed
+
+
+def decompress_into(payload: memoryview, codec: str, out: np.ndarray) -> None:
+    """Decompress ``payload`` into the preallocated ``out`` array.
+
+    Stops reading once ``out.nbytes`` are produced; a payload that is
+    shorter, longer or trailing garbage raises :class:`FrameCodecError`.
+    """
+    shuffle, compressor = _split(codec)
+    expected = out.nbytes
+    try:
+        if compressor == "zlib":
+            decompressor = zlib.decompressobj()
+            raw = decompressor.decompress(payload, expected + 1)
+            complete = decompressor.eof and not decompressor.unconsumed_tail and not decompressor.unused_data
+        else:
+            decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ, memlimit=FRAME_CODEC_LZMA_MEMLIMIT)
+            raw = decompressor.decompress(payload, max_length=expected + 1)
+            complete = decompressor.eof and not decompressor.unused_data
+    except (zlib.error, lzma.LZMAError) as e:
+        raise FrameCodecError(f"{codec} payload is corrupt: {e}") from e
+    if len(raw) != expected or not complete:
+        raise FrameCodecError(f"{codec} payload does not decompress to the declared {expected} bytes")
+
+    target = out.reshape(-1).view(np.uint8)
+    if shuffle and out.itemsize > 1:
+        target.reshape(-1, out.itemsize)[...] = np.frombuffer(raw, dtype=np.uint8).reshape(out.itemsize, -1).T
+    else:
+        target[...] = np.frombuffer(raw, dtype=np.uint8)
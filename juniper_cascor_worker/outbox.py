@@ -0,0 +1,93 @@
+"""Bounded result outbox for the WebSocket worker agent.
+
+A finished task used to upload its ``task_result`` and binary frames itself,
+so a slow uplink held the task (and its admission) until every frame was
+written. The outbox decouples the two: a task enqueues its message group and
+moves on, and one sender coroutine per connection drains the queue in order.
+
+The queue is bounded. When it is full, :meth:`ResultOutbox.put` waits for
+room, which backpressures admission of new tasks rather than buffering
+results without limit. How often and how long producers waited is kept as
+metrics for the heartbeat.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from juniper_cascor_worker.ws_connection import FrameData
+
+logger = logging.getLogger(__name__)
+
+SendGroup = Callable[[dict[str, Any], list[FrameData]], Awaitable[None]]
+
+
+class ResultOutbox:
+    """FIFO of ``(message, frames)`` groups drained by :meth:`run`."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._queue: asyncio.Queue[tuple[dict[str, Any], list[FrameData]]] = asyncio.Queue(maxsize=capacity)
+        self._blocked_total = 0
+        self._blocked_seconds_total = 0.0
+        self._sent_total = 0
+        self._max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def put(self, msg: dict[str, Any], frames: list[FrameData] | None = None) -> None:
+        """Enqueue one message group, waiting for room if the outbox is full."""
+        item = (msg, list(frames or []))
+        if self._queue.full():
+            self._blocked_total += 1
+            started = time.monotonic()
+            try:
+                await self._queue.put(item)
+            finally:
+                self._blocked_seconds_total += time.monotonic() - started
+        else:
+            self._queue.put_nowait(item)
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    async def run(self, send_group: SendGroup) -> None:
+        """Send queued groups in order until cancelled or a send fails."""
+        while True:
+            msg, frames = await self._queue.get()
+            try:
+                await send_group(msg, frames)
+                self._sent_total += 1
+            finally:
+                self._queue.task_done()
+
+    async def drain(self, sender: asyncio.Task[None]) -> None:
+        """Wait until every queued group is sent, or ``sender`` stops."""
+        joined = asyncio.create_task(self._queue.join())
+        try:
+            await asyncio.wait({joined, sender}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            joined.cancel()
+
+    def clear(self) -> int:
+        """Drop every queued group (e.g. after the connection is lost); returns the count."""
+        dropped = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            dropped += 1
+        return dropped
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing queue depth and backpressure."""
+        return {
+            "outbox_depth": self._queue.qsize(),
+            "outbox_capacity": self.capacity,
+            "outbox_max_depth": self._max_depth,
+            "outbox_sent_total": self._sent_total,
+            "outbox_blocked_total": self._blocked_total,
+            "outbox_blocked_seconds_total": round(self._blocked_seconds_total, 3),
+        }
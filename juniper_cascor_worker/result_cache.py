@@ -0,0 +1,96 @@
+"""Short-lived cache of result tensors the server chose not to receive yet.
+
+``norm_output`` and ``norm_error`` are O(samples) each, but the server
+usually needs them only for the round's winning candidate. A task whose
+``training_params`` carry ``result_tensors`` (a list of names) gets only
+those tensors with its ``task_result``; the rest are withheld, listed in
+``withheld_tensors`` and kept here under the task id. A later
+``result_fetch`` message retrieves them as a ``result_tensors`` reply.
+
+Entries expire after ``ttl`` seconds and are evicted oldest-first once
+``max_bytes`` is exceeded; a fetch for an expired entry reports the tensors
+as ``missing``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+
+class ResultCache:
+    """Withheld result tensors keyed by task id, bounded by bytes and age."""
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, np.ndarray]]] = OrderedDict()
+        self._bytes = 0
+        self._fetches = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def put(self, task_id: str, tensors: dict[str, np.ndarray]) -> bool:
+        """Keep ``tensors`` for ``task_id``; returns False if they cannot fit."""
+        self._expire()
+        nbytes = sum(array.nbytes for array in tensors.values())
+        if not tensors or nbytes > self.max_bytes:
+            return False
+        self._discard(task_id)
+        self._entries[task_id] = (time.monotonic(), tensors)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+            self._evictions += 1
+        return True
+
+    def get(self, task_id: str, names: list[str] | None = None) -> tuple[dict[str, np.ndarray], list[str]]:
+        """Return the cached tensors of ``task_id`` (all, or ``names``) and the names not found."""
+        self._expire()
+        entry = self._entries.get(task_id)
+        cached = entry[1] if entry is not None else {}
+        wanted = list(cached) if names is None else names
+        found = {name: cached[name] for name in wanted if name in cached}
+        missing = [name for name in wanted if name not in cached]
+        if entry is None or missing:
+            self._misses += 1
+        else:
+            self._fetches += 1
+        return found, missing
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing cache occupancy and use."""
+        self._expire()
+        return {
+            "result_cache_entries": len(self._entries),
+            "result_cache_bytes": self._bytes,
+            "result_cache_fetches": self._fetches,
+            "result_cache_misses": self._misses,
+            "result_cache_evictions": self._evictions,
+        }
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            task_id, (stored_at, _) = next(iter(self._entries.items()))
+            if stored_at > cutoff:
+                break
+            self._discard(task_id)
+            self._evictions += 1
+
+    def _discard(self, task_id: str) -> None:
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self._bytes -= sum(array.nbytes for array in entry[1].values())
+
+
+def validate_result_selection(selection: Any) -> str | None:
+    """Validate a ``result_tensors`` selection, returning an error string or None."""
+    if selection is None:
+        return None
+    if not isinstance(selection, list) or not all(isinstance(name, str) for name in selection):
+        return f"result_tensors must be a list of tensor names, got {selection!r}"
+    return None
@@ -0,0 +1,107 @@
+"""Task results kept until the server acknowledges them.
+
+When the connection drops while a result is queued or on the wire, the
+server never sees it and re-dispatches the task, repeating the training.
+With ``session_resume`` confirmed by the server, every ``task_result``
+group (message plus frames) is kept here from the moment it is handed to
+the outbox until a ``result_ack`` names its task id. After a reconnect the
+worker registers under the same ``worker_id``, lists the pending task ids
+as ``pending_results`` and replays the groups the server asks for.
+
+The buffer is bounded by ``max_bytes`` of frame payload; the oldest groups
+are dropped first, which only falls back to the old re-dispatch behaviour
+for them.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+from juniper_cascor_worker.ws_connection import FrameData
+
+ResultGroup = tuple[dict[str, Any], list[FrameData]]
+
+
+class ResultReplayBuffer:
+    """Unacknowledged ``task_result`` groups keyed by task id, oldest first."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._groups: OrderedDict[str, tuple[ResultGroup, int]] = OrderedDict()
+        self._bytes = 0
+        self._acked = 0
+        self._replayed = 0
+        self._dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def add(self, task_id: str, msg: dict[str, Any], frames: list[FrameData], nbytes: int) -> bool:
+        """Keep a group until it is acknowledged; returns False if it cannot fit."""
+        if not self.enabled or nbytes > self.max_bytes:
+            return False
+        self._discard(task_id)
+        self._groups[task_id] = ((msg, frames), nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            self._discard(next(iter(self._groups)))
+            self._dropped += 1
+        return True
+
+    def holds(self, msg: dict[str, Any]) -> bool:
+        """True if ``msg`` is the message of a kept group."""
+        entry = self._groups.get(msg.get("task_id", ""))
+        return entry is not None and entry[0][0] is msg
+
+    def ack(self, task_id: str) -> ResultGroup | None:
+        """Forget the group of an acknowledged task and return it."""
+        entry = self._discard(task_id)
+        if entry is None:
+            return None
+        self._acked += 1
+        return entry[0]
+
+    def task_ids(self) -> list[str]:
+        return list(self._groups)
+
+    def replay(self, wanted: list[str] | None = None) -> list[ResultGroup]:
+        """Groups to send again after a resume, oldest first.
+
+        ``wanted`` (the server's ``replay_results``) limits the replay to
+        those task ids; the other groups are dropped, the server no longer
+        needs them. ``None`` replays every group.
+        """
+        if wanted is not None:
+            keep = set(wanted)
+            for task_id in [task_id for task_id in self._groups if task_id not in keep]:
+                self._discard(task_id)
+                self._dropped += 1
+        groups = [group for group, _ in self._groups.values()]
+        self._replayed += len(groups)
+        return groups
+
+    def clear(self) -> int:
+        """Drop every group (e.g. the server did not confirm a resume); returns the count."""
+        dropped = len(self._groups)
+        self._groups.clear()
+        self._bytes = 0
+        self._dropped += dropped
+        return dropped
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing the unacknowledged results."""
+        return {
+            "unacked_results": len(self._groups),
+            "unacked_result_bytes": self._bytes,
+            "results_acked": self._acked,
+            "results_replayed": self._replayed,
+            "unacked_results_dropped": self._dropped,
+        }
+
+    def _discard(self, task_id: str) -> tuple[ResultGroup, int] | None:
+        entry = self._groups.pop(task_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        return entry
@@ -0,0 +1,107 @@
+"""Shared-memory tensor transport for a server on the same host.
+
+When the server and the worker share a host, a manifest entry can name a
+region of a POSIX shared-memory segment instead of announcing a binary
+frame::
+
+    {"shm": "psm_1f2e", "offset": 0, "shape": [4096, 8], "dtype": "float32"}
+
+The worker maps the segment and wraps the region in a numpy array, so no
+tensor bytes cross the socket and nothing is copied, whatever the size.
+The mapping is copy-on-write (``MAP_PRIVATE``): the array is writable and
+``torch.from_numpy`` can share it, but writes stay private to the worker
+and never reach the server's segment.
+
+Cross-host use is prevented by a handshake: :class:`ShmProbe` creates a
+tiny segment holding a random token and only its *name* is advertised in
+the ``register`` capabilities. A server can echo the token in its
+registration_ack only by reading that segment, i.e. only if it sees this
+host's shared memory.
+"""
+
+from __future__ import annotations
+
+import hmac
+import math
+import mmap
+import os
+import re
+import secrets
+import stat
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from juniper_cascor_worker.constants import SHM_PROBE_TOKEN_BYTES, SHM_SEGMENT_NAME_PATTERN, SHM_TRANSPORT_DIR
+
+_SEGMENT_NAME = re.compile(SHM_SEGMENT_NAME_PATTERN)
+
+
+class ShmTransportError(ValueError):
+    """Raised when a shared-memory manifest entry cannot be mapped."""
+
+
+def shm_transport_available() -> bool:
+    """Whether POSIX shared memory is reachable as files in ``SHM_TRANSPORT_DIR``."""
+    return os.path.isdir(SHM_TRANSPORT_DIR)
+
+
+def valid_segment_name(name: object) -> bool:
+    """Whether ``name`` is a plain segment name (no path components)."""
+    return isinstance(name, str) and _SEGMENT_NAME.fullmatch(name) is not None
+
+
+class ShmProbe:
+    """A one-off segment whose token the server must echo to enable the transport."""
+
+    def __init__(self) -> None:
+        self.token = secrets.token_hex(SHM_PROBE_TOKEN_BYTES)
+        encoded = self.token.encode("ascii")
+        self._segment = shared_memory.SharedMemory(create=True, size=len(encoded))
+        self._segment.buf[: len(encoded)] = encoded
+        self.name = self._segment.name.lstrip("/")
+
+    def confirms(self, echoed: object) -> bool:
+        """Whether ``echoed`` (from the registration_ack) is this probe's token."""
+        return isinstance(echoed, str) and hmac.compare_digest(echoed, self.token)
+
+    def close(self) -> None:
+        """Close and unlink the probe segment; safe to call twice."""
+        segment, self._segment = self._segment, None
+        if segment is not None:
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def map_shared_tensor(name: str, offset: int, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """Map ``shape``/``dtype`` elements at ``offset`` of segment ``name``, without copying.
+
+    The segment is opened read-only (never following symlinks) and mapped
+    copy-on-write. The region must lie inside the segment and ``offset``
+    must be aligned to the dtype. The mapping lives as long as the array.
+    """
+    if not valid_segment_name(name):
+        raise ShmTransportError(f"invalid shared-memory segment name {name!r}")
+    count = math.prod(shape)
+    nbytes = count * dtype.itemsize
+    if offset % dtype.alignment:
+        raise ShmTransportError(f"segment {name!r} offset {offset} is not aligned for {dtype}")
+    try:
+        fd = os.open(os.path.join(SHM_TRANSPORT_DIR, name), os.O_RDONLY | os.O_NOFOLLOW)
+    except OSError as e:
+        raise ShmTransportError(f"cannot open shared-memory segment {name!r}: {e.strerror}") from e
+    try:
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode):
+            raise ShmTransportError(f"shared-memory segment {name!r} is not a regular segment")
+        if offset + nbytes > info.st_size:
+            raise ShmTransportError(f"segment {name!r} region [{offset}, {offset + nbytes}) exceeds its {info.st_size} bytes")
+        if nbytes == 0:
+            return np.empty(shape, dtype=dtype)
+        mapping = mmap.mmap(fd, info.st_size, access=mmap.ACCESS_COPY)
+    finally:
+        os.close(fd)
+    return np.frombuffer(mapping, dtype=dtype, count=count, offset=offset).reshape(shape)
@@ -23,11 +23,12 @@ CW-08 (Phase 4E):
 """
 
 import logging
+import time
 from typing import Any
 
 import numpy as np
 
-from juniper_cascor_worker.constants import CANDIDATE_UNIT_LOG_LEVEL, DEFAULT_ACTIVATION, DEFAULT_CORRELATION, DEFAULT_DENOMINATOR, DEFAULT_DISPLAY_FREQUENCY, DEFAULT_LEARNING_RATE, DEFAULT_NUMERATOR, DEFAULT_RANDOM_MAX_VALUE, DEFAULT_RANDOM_VALUE_SCALE, DEFAULT_SEQUENCE_MAX_VALUE, DEFAULT_TRAINING_EPOCHS, NO_BEST_CORR_IDX, NO_EPOCHS_COMPLETED
+from juniper_cascor_worker.constants import CANDIDATE_UNIT_LOG_LEVEL, DEFAULT_ACTIVATION, DEFAULT_CORRELATION, DEFAULT_DENOMINATOR, DEFAULT_DISPLAY_FREQUENCY, DEFAULT_LEARNING_RATE, DEFAULT_NUMERATOR, DEFAULT_RANDOM_MAX_VALUE, DEFAULT_RANDOM_VALUE_SCALE, DEFAULT_SEQUENCE_MAX_VALUE, DEFAULT_TRAINING_EPOCHS, NO_BEST_CORR_IDX, NO_EPOCHS_COMPLETED, WARMUP_EPOCHS, WARMUP_INPUT_SIZE, WARMUP_SAMPLES
 
 logger = logging.getLogger(__name__)
 
@@ -73,42 +74,19 @@ def execute_training_task(
     Raises:
         ImportError: If CandidateUnit is not importable (cascor not on sys.path).
     """
-    # CW-08: lazy-load torch to keep worker process startup fast. The first
+    # CW-08: torch is lazy-loaded (by _get_candidate_unit_class and
+    # _as_float32_tensor) to keep worker process startup fast. The first
     # task pays the ~2-5s import cost; subsequent tasks hit the cache.
-    import torch
-
     CandidateUnit = _get_candidate_unit_class()
 
     candidate_index = candidate_data.get("candidate_index", 0)
-    candidate_uuid = candidate_data.get("candidate_uuid", "")
 
     try:
-        # Resolve activation function
-        activation_fn = _get_activation_function(candidate_data.get("activation_name", DEFAULT_ACTIVATION))
-
-        # Create CandidateUnit
-        candidate = CandidateUnit(
-            CandidateUnit__input_size=candidate_data["input_size"],
-            CandidateUnit__activation_function=activation_fn,
-            CandidateUnit__epochs=training_params.get("epochs", DEFAULT_TRAINING_EPOCHS),
-            CandidateUnit__learning_rate=training_params.get("learning_rate", DEFAULT_LEARNING_RATE),
-            CandidateUnit__display_frequency=training_params.get("display_frequency", DEFAULT_DISPLAY_FREQUENCY),
-            CandidateUnit__random_seed=candidate_data.get("candidate_seed"),
-            CandidateUnit__random_value_scale=candidate_data.get("random_value_scale", DEFAULT_RANDOM_VALUE_SCALE),
-            # CW-05 gap #5: cascor's remote dispatch float()-coerces these int-valued params for
-            # the wire, but CandidateUnit feeds them to random.randint()/range(); coerce back to
-            # int so candidate training does not raise
-            # "'float' object cannot be interpreted as an integer".
-            CandidateUnit__random_max_value=int(candidate_data.get("random_max_value", DEFAULT_RANDOM_MAX_VALUE)),
-            CandidateUnit__sequence_max_value=int(candidate_data.get("sequence_max_value", DEFAULT_SEQUENCE_MAX_VALUE)),
-            CandidateUnit__uuid=candidate_uuid,
-            CandidateUnit__candidate_index=candidate_index,
-            CandidateUnit__log_level_name=CANDIDATE_UNIT_LOG_LEVEL,
-        )
+        candidate = _build_candidate_unit(CandidateUnit, candidate_data, training_params)
 
-        # Convert numpy tensors to torch
-        candidate_input = torch.tensor(tensors["candidate_input"], dtype=torch.float32)
-        residual_error = torch.tensor(tensors["residual_error"], dtype=torch.float32)
+        # Convert numpy tensors to torch (shared, not copied, when possible)
+        candidate_input = _as_float32_tensor(tensors["candidate_input"])
+        residual_error = _as_float32_tensor(tensors["residual_error"])
 
         # Train
         training_result = candidate.train_detailed(
@@ -123,73 +101,177 @@ def execute_training_task(
         candidate.clear_display_progress()
         candidate.clear_display_status()
 
-        # Extract result fields
-        correlation = float(training_result.correlation) if training_result.correlation is not None else DEFAULT_CORRELATION
-        all_correlations = training_result.all_correlations if training_result.all_correlations is not None else []
-        if isinstance(all_correlations, (torch.Tensor, np.ndarray)):
-            all_correlations = [float(c) for c in all_correlations]
-
-        result_dict = {
-            "candidate_id": candidate_index,
-            "candidate_uuid": str(candidate_uuid),
-            "correlation": correlation,
-            "success": training_result.success if hasattr(training_result, "success") else True,
-            "epochs_completed": training_result.epochs_completed if hasattr(training_result, "epochs_completed") else training_params.get("epochs", DEFAULT_TRAINING_EPOCHS),
-            "activation_name": candidate_data.get("activation_name", DEFAULT_ACTIVATION),
-            "all_correlations": all_correlations,
-            "numerator": float(training_result.numerator) if hasattr(training_result, "numerator") and training_result.numerator is not None else DEFAULT_NUMERATOR,
-            "denominator": float(training_result.denominator) if hasattr(training_result, "denominator") and training_result.denominator is not None else DEFAULT_DENOMINATOR,
-            "best_corr_idx": int(training_result.best_corr_idx) if hasattr(training_result, "best_corr_idx") and training_result.best_corr_idx is not None else NO_BEST_CORR_IDX,
-            "error_message": None,
-        }
-
-        # Extract tensors — convert torch to numpy
-        tensor_dict: dict[str, np.ndarray] = {}
-
-        weights = candidate.weights if hasattr(candidate, "weights") else None
-        if weights is not None:
-            tensor_dict["weights"] = weights.detach().cpu().numpy().astype(np.float32)
-
-        bias = candidate.bias if hasattr(candidate, "bias") else None
-        if bias is not None:
-            tensor_dict["bias"] = bias.detach().cpu().numpy().astype(np.float32)
-
-        norm_output = training_result.norm_output if hasattr(training_result, "norm_output") and training_result.norm_output is not None else None
-        if norm_output is not None:
-            if isinstance(norm_output, torch.Tensor):
-                norm_output = norm_output.detach().cpu().numpy()
-            tensor_dict["norm_output"] = np.asarray(norm_output, dtype=np.float32)
-
-        norm_error = training_result.norm_error if hasattr(training_result, "norm_error") and training_result.norm_error is not None else None
-        if norm_error is not None:
-            if isinstance(norm_error, torch.Tensor):
-                norm_error = norm_error.detach().cpu().numpy()
-            tensor_dict["norm_error"] = np.asarray(norm_error, dtype=np.float32)
-
-        logger.info(
-            "Task completed: candidate %d (uuid=%s) correlation=%.4f",
-            candidate_index,
-            candidate_uuid,
-            correlation,
-        )
-        return result_dict, tensor_dict
+        return _package_result(candidate, candidate_data, training_params, training_result)
 
     except Exception as e:
         logger.error("Training failed for candidate %d: %s", candidate_index, e)
-        result_dict = {
-            "candidate_id": candidate_index,
-            "candidate_uuid": str(candidate_uuid),
-            "correlation": DEFAULT_CORRELATION,
-            "success": False,
-            "epochs_completed": NO_EPOCHS_COMPLETED,
-            "activation_name": candidate_data.get("activation_name", DEFAULT_ACTIVATION),
-            "all_correlations": [],
-            "numerator": DEFAULT_NUMERATOR,
-            "denominator": DEFAULT_DENOMINATOR,
-            "best_corr_idx": NO_BEST_CORR_IDX,
-            "error_message": str(e),
-        }
-        return result_dict, {}
+        return _build_failure_result(candidate_data, str(e)), {}
+
+
+def warm_up() -> dict[str, Any]:
+    """Pay the first-task costs up front: imports, activations, one tiny training.
+
+    Imports torch and ``CandidateUnit``, calls every activation in
+    ``ACTIVATION_MAP`` once on a small tensor (first-call dispatch and
+    allocator set-up), then trains one throwaway candidate through
+    :func:`execute_training_task`. Used by the agent's opt-in warm-up; a
+    failure here only means the first real task pays these costs instead.
+
+    Returns:
+        ``{"activations": <count warmed>, "seconds": <elapsed>}``.
+    """
+    started = time.monotonic()
+    import torch
+
+    _get_candidate_unit_class()
+    from utils.activation import ActivationWithDerivative
+
+    sample = torch.zeros(WARMUP_SAMPLES, WARMUP_INPUT_SIZE)
+    warmed = 0
+    for name in ActivationWithDerivative.ACTIVATION_MAP:
+        try:
+            _get_activation_function(name)(sample)
+            warmed += 1
+        except Exception as e:  # noqa: BLE001 — a bad entry must not abort warm-up
+            logger.debug("Warm-up skipped activation %s: %s", name, e)
+
+    rng = np.random.default_rng(0)
+    result, _ = execute_training_task(
+        {"input_size": WARMUP_INPUT_SIZE, "activation_name": DEFAULT_ACTIVATION, "candidate_uuid": "warm-up", "candidate_seed": 0},
+        {"epochs": WARMUP_EPOCHS, "display_frequency": WARMUP_EPOCHS + 1},
+        {
+            "candidate_input": rng.standard_normal((WARMUP_SAMPLES, WARMUP_INPUT_SIZE)).astype(np.float32),
+            "residual_error": rng.standard_normal((WARMUP_SAMPLES, 1)).astype(np.float32),
+        },
+    )
+    if not result["success"]:
+        logger.warning("Warm-up training pass failed: %s", result["error_message"])
+    return {"activations": warmed, "seconds": time.monotonic() - started}
+
+
+def _as_float32_tensor(array: np.ndarray) -> Any:
+    """Hand a decoded tensor to torch as float32, without copying when possible.
+
+    A writable float32 C-contiguous array (what ``_decode_binary_frame``
+    produces for the usual wire dtype) is shared via ``torch.from_numpy``.
+    Other dtypes are converted once; read-only arrays (tensor-cache entries
+    and dataset-store matrices, shared across tasks) are copied so no task
+    can write another's input. Both are C-contiguous float32, so that copy
+    is a flat memcpy (about 0.4 ms for a 20000 x 64 matrix).
+    """
+    import torch
+
+    if array.flags.writeable:
+        return torch.from_numpy(np.ascontiguousarray(array, dtype=np.float32))
+    return torch.tensor(array, dtype=torch.float32)
+
+
+def _build_candidate_unit(CandidateUnit: Any, candidate_data: dict[str, Any], training_params: dict[str, Any]) -> Any:
+    """Construct a ``CandidateUnit`` from the structured task data.
+
+    Shared by the single-task path and the batch engine so both seed and
+    initialise candidates identically.
+    """
+    activation_fn = _get_activation_function(candidate_data.get("activation_name", DEFAULT_ACTIVATION))
+    return CandidateUnit(
+        CandidateUnit__input_size=candidate_data["input_size"],
+        CandidateUnit__activation_function=activation_fn,
+        CandidateUnit__epochs=training_params.get("epochs", DEFAULT_TRAINING_EPOCHS),
+        CandidateUnit__learning_rate=training_params.get("learning_rate", DEFAULT_LEARNING_RATE),
+        CandidateUnit__display_frequency=training_params.get("display_frequency", DEFAULT_DISPLAY_FREQUENCY),
+        CandidateUnit__random_seed=candidate_data.get("candidate_seed"),
+        CandidateUnit__random_value_scale=candidate_data.get("random_value_scale", DEFAULT_RANDOM_VALUE_SCALE),
+        # CW-05 gap #5: cascor's remote dispatch float()-coerces these int-valued params for
+        # the wire, but CandidateUnit feeds them to random.randint()/range(); coerce back to
+        # int so candidate training does not raise
+        # "'float' object cannot be interpreted as an integer".
+        CandidateUnit__random_max_value=int(candidate_data.get("random_max_value", DEFAULT_RANDOM_MAX_VALUE)),
+        CandidateUnit__sequence_max_value=int(candidate_data.get("sequence_max_value", DEFAULT_SEQUENCE_MAX_VALUE)),
+        CandidateUnit__uuid=candidate_data.get("candidate_uuid", ""),
+        CandidateUnit__candidate_index=candidate_data.get("candidate_index", 0),
+        CandidateUnit__log_level_name=CANDIDATE_UNIT_LOG_LEVEL,
+    )
+
+
+def _package_result(
+    candidate: Any,
+    candidate_data: dict[str, Any],
+    training_params: dict[str, Any],
+    training_result: Any,
+) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Convert a trained candidate + ``CandidateTrainingResult`` into the wire result shape."""
+    import torch
+
+    candidate_index = candidate_data.get("candidate_index", 0)
+    candidate_uuid = candidate_data.get("candidate_uuid", "")
+
+    # Extract result fields
+    correlation = float(training_result.correlation) if training_result.correlation is not None else DEFAULT_CORRELATION
+    all_correlations = training_result.all_correlations if training_result.all_correlations is not None else []
+    if isinstance(all_correlations, (torch.Tensor, np.ndarray)):
+        all_correlations = [float(c) for c in all_correlations]
+
+    result_dict = {
+        "candidate_id": candidate_index,
+        "candidate_uuid": str(candidate_uuid),
+        "correlation": correlation,
+        "success": training_result.success if hasattr(training_result, "success") else True,
+        "epochs_completed": training_result.epochs_completed if hasattr(training_result, "epochs_completed") else training_params.get("epochs", DEFAULT_TRAINING_EPOCHS),
+        "activation_name": candidate_data.get("activation_name", DEFAULT_ACTIVATION),
+        "all_correlations": all_correlations,
+        "numerator": float(training_result.numerator) if hasattr(training_result, "numerator") and training_result.numerator is not None else DEFAULT_NUMERATOR,
+        "denominator": float(training_result.denominator) if hasattr(training_result, "denominator") and training_result.denominator is not None else DEFAULT_DENOMINATOR,
+        "best_corr_idx": int(training_result.best_corr_idx) if hasattr(training_result, "best_corr_idx") and training_result.best_corr_idx is not None else NO_BEST_CORR_IDX,
+        "error_message": None,
+    }
+
+    # Extract tensors — convert torch to numpy
+    tensor_dict: dict[str, np.ndarray] = {}
+
+    weights = candidate.weights if hasattr(candidate, "weights") else None
+    if weights is not None:
+        tensor_dict["weights"] = weights.detach().cpu().numpy().astype(np.float32)
+
+    bias = candidate.bias if hasattr(candidate, "bias") else None
+    if bias is not None:
+        tensor_dict["bias"] = bias.detach().cpu().numpy().astype(np.float32)
+
+    norm_output = training_result.norm_output if hasattr(training_result, "norm_output") and training_result.norm_output is not None else None
+    if norm_output is not None:
+        if isinstance(norm_output, torch.Tensor):
+            norm_output = norm_output.detach().cpu().numpy()
+        tensor_dict["norm_output"] = np.asarray(norm_output, dtype=np.float32)
+
+    norm_error = training_result.norm_error if hasattr(training_result, "norm_error") and training_result.norm_error is not None else None
+    if norm_error is not None:
+        if isinstance(norm_error, torch.Tensor):
+            norm_error = norm_error.detach().cpu().numpy()
+        tensor_dict["norm_error"] = np.asarray(norm_error, dtype=np.float32)
+
+    logger.info(
+        "Task completed: candidate %d (uuid=%s) correlation=%.4f",
+        candidate_index,
+        candidate_uuid,
+        correlation,
+    )
+    return result_dict, tensor_dict
+
+
+def _build_failure_result(candidate_data: dict[str, Any], error_message: str) -> dict[str, Any]:
+    """Result dict for a candidate whose training raised."""
+    return {
+        "candidate_id": candidate_data.get("candidate_index", 0),
+        "candidate_uuid": str(candidate_data.get("candidate_uuid", "")),
+        "correlation": DEFAULT_CORRELATION,
+        "success": False,
+        "epochs_completed": NO_EPOCHS_COMPLETED,
+        "activation_name": candidate_data.get("activation_name", DEFAULT_ACTIVATION),
+        "all_correlations": [],
+        "numerator": DEFAULT_NUMERATOR,
+        "denominator": DEFAULT_DENOMINATOR,
+        "best_corr_idx": NO_BEST_CORR_IDX,
+        "error_message": error_message,
+    }
 
 
 def _get_activation_function(name: str):
@@ -0,0 +1,104 @@
+"""Content-addressed cache for tensors shared across a cascade round.
+
+Every candidate in a round trains on the same ``candidate_input`` and
+``residual_error``, yet each ``task_assign`` used to ship them again. A
+manifest entry may now carry the SHA-256 of its encoded frame:
+
+- ``{"sha256": "<hex>", ...}`` — the frame follows as usual; the worker
+  decodes it and, if the digest matches, caches the array under that key.
+- ``{"sha256": "<hex>", "cached": true}`` — no frame follows; the worker
+  uses the cached array. A miss fails the task with ``cache_miss`` listing
+  the digests, so the server can resend them in full.
+
+Entries are evicted least-recently-used once ``max_bytes`` is exceeded, and
+by round: a task carrying ``round_id`` R drops every entry stored for an
+earlier round, since the residual error is stale once a unit is installed.
+Round ids are only comparable within one server, so entries carry the
+``scope`` (server URL) they were stored for, and a round only evicts
+entries of its own scope; a federated worker shares one cache between
+servers at different rounds.
+
+Cached arrays are shared by concurrent tasks, so they are made read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+
+class TensorCache:
+    """LRU of decoded tensors keyed by the SHA-256 of their encoded frame."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[np.ndarray, Any, Any]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Return the cached array for ``key`` (marking it recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def put(self, key: str, array: np.ndarray, round_id: Any = None, scope: Any = None) -> bool:
+        """Cache ``array`` under ``key`` for ``round_id`` of ``scope``; returns False if it cannot fit."""
+        if not self.enabled or array.nbytes > self.max_bytes:
+            return False
+        self._discard(key)
+        array.flags.writeable = False
+        self._entries[key] = (array, scope, round_id)
+        self._bytes += array.nbytes
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._evictions += 1
+        return True
+
+    def evict_before(self, round_id: Any, scope: Any = None) -> int:
+        """Drop entries of ``scope`` stored for a round older than ``round_id``; returns the count."""
+        if not isinstance(round_id, int):
+            return 0
+        stale = [key for key, (_, entry_scope, entry_round) in self._entries.items() if entry_scope == scope and isinstance(entry_round, int) and entry_round < round_id]
+        for key in stale:
+            self._discard(key)
+        self._evictions += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing cache occupancy and effectiveness."""
+        return {
+            "tensor_cache_entries": len(self._entries),
+            "tensor_cache_bytes": self._bytes,
+            "tensor_cache_hits": self._hits,
+            "tensor_cache_misses": self._misses,
+            "tensor_cache_evictions": self._evictions,
+        }
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0].nbytes
+
+
+def frame_digest(frame: bytes) -> str:
+    """Hex SHA-256 of an encoded binary frame (the cache key)."""
+    return hashlib.sha256(frame).hexdigest()
@@ -0,0 +1,118 @@
+"""Partition the host's CPUs between concurrently running training tasks.
+
+torch, OpenMP and the BLAS libraries each default to one compute thread per
+core. With several task slots training at once that means ``slots x cores``
+busy threads competing for ``cores`` CPUs, and every task runs slower than it
+would alone. The agent instead plans one :class:`ThreadLayout` at startup:
+each task slot gets ``usable CPUs // task_slots`` threads (at least one).
+
+The layout is static. It is sized for every slot being busy and does not grow
+when fewer tasks are running, so a single task on a multi-slot worker uses
+only its share of the cores. ``torch.set_num_threads`` is process-wide, so
+with the thread backend there is one setting shared by all slots, which could
+not follow the number of active tasks without changing the threads of
+trainings already running.
+
+The budget is applied in two places, because torch is imported lazily
+(CW-08) and may not be loaded yet when the agent starts:
+
+- :func:`export_thread_env` sets ``OMP_NUM_THREADS`` and friends, which torch
+  and the BLAS libraries read when they initialise;
+- :func:`apply_thread_budget` calls ``torch.set_num_threads`` (a process-wide
+  setting) before each training, once torch is loaded.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from dataclasses import dataclass
+
+from juniper_cascor_worker.constants import CGROUP_CPU_MAX_PATH, COMPUTE_THREAD_ENV_VARS, THREAD_LAYOUT_SOURCE_AUTO, THREAD_LAYOUT_SOURCE_ENV
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ThreadLayout:
+    """How many compute threads each task slot may use.
+
+    Attributes:
+        usable_cpus: CPUs this process may run on (affinity mask and cgroup
+            quota applied).
+        task_slots: Concurrent training tasks the budget is split between.
+        threads_per_task: torch/BLAS threads each running task uses.
+        source: ``"auto"`` when computed, ``"OMP_NUM_THREADS"`` when the
+            operator fixed it through the environment.
+    """
+
+    usable_cpus: int
+    task_slots: int
+    threads_per_task: int
+    source: str = THREAD_LAYOUT_SOURCE_AUTO
+
+
+def plan_thread_layout(task_slots: int, environ: dict[str, str] | None = None) -> ThreadLayout:
+    """Split the usable CPUs evenly between ``task_slots`` concurrent tasks."""
+    env = os.environ if environ is None else environ
+    usable = usable_cpu_count()
+    override = env.get(COMPUTE_THREAD_ENV_VARS[0], "").strip()
+    if override:
+        try:
+            return ThreadLayout(usable, task_slots, max(1, int(override)), THREAD_LAYOUT_SOURCE_ENV)
+        except ValueError:
+            logger.warning("Ignoring non-integer %s=%r", COMPUTE_THREAD_ENV_VARS[0], override)
+    return ThreadLayout(usable, task_slots, max(1, usable // max(1, task_slots)))
+
+
+def usable_cpu_count() -> int:
+    """CPUs available to this process: affinity mask, capped by a cgroup v2 quota."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover — macOS / Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(1, cpus)
+
+
+def _cgroup_cpu_quota(path: str = CGROUP_CPU_MAX_PATH) -> int | None:
+    """Whole CPUs granted by a cgroup v2 ``cpu.max`` limit, or None if unlimited/unknown."""
+    try:
+        with open(path, encoding="ascii") as f:
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    try:
+        return max(1, int(quota) // int(period))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def export_thread_env(threads: int, *, override: bool = False) -> None:
+    """Publish the budget to OpenMP/MKL/OpenBLAS before they initialise.
+
+    Without ``override`` only unset variables are filled in, so an operator's
+    explicit settings survive; training processes pass ``override=True`` to
+    pin their own environment to the planned layout.
+    """
+    for name in COMPUTE_THREAD_ENV_VARS:
+        if override or name not in os.environ:
+            os.environ[name] = str(threads)
+
+
+def apply_thread_budget(threads: int) -> None:
+    """Limit torch's process-wide intra-op threads, if torch is loaded.
+
+    Never imports torch itself (CW-08); a task that imports it afterwards
+    starts from the exported ``OMP_NUM_THREADS`` instead.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return
+    if torch.get_num_threads() != threads:
+        torch.set_num_threads(threads)
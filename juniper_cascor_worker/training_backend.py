@@ -0,0 +1,442 @@
+"""Training execution backends for the WebSocket worker agent.
+
+The agent hands every admitted task to one backend, selected with
+``WorkerConfig.training_backend``:
+
+- :class:`ThreadTrainingBackend` (``"thread"``, default): runs training on a
+  dedicated thread pool inside the agent process. Cheap to start, but
+  CandidateUnit's Python-level training loop shares the GIL with the event
+  loop (heartbeats, frame decoding, other slots).
+- :class:`ProcessTrainingBackend` (``"process"``): runs training in a pool of
+  pre-started worker processes, one per task slot. Input tensors are handed
+  over through :mod:`multiprocessing.shared_memory` segments rather than
+  pickled through the pipe, so only small descriptors cross the process
+  boundary on the way in. Results (small dicts plus O(samples) arrays) come
+  back over the pipe.
+
+Both backends expose the same coroutine, ``run(fn, task_data,
+training_params, tensors)``; ``fn`` must be a module-level callable so the
+process backend can send it to a child by reference. ``task_data`` is the
+candidate spec (one task) or list of specs (a candidate batch) and the
+return value is whatever ``fn`` returns.
+
+Cancelling ``run()`` (e.g. when ``asyncio.wait_for`` hits ``task_timeout``)
+stops the training itself, not just the wait for it: the thread backend
+raises an asynchronous exception in the training thread, which unwinds at
+the next Python bytecode boundary (between torch ops, so well within one
+epoch), and the process backend kills the child and starts a replacement.
+Either way the task's tensors are released instead of being held by a
+training nobody will read.
+
+Both backends also carry the agent's :class:`ThreadLayout` and cap torch/BLAS
+threads to ``threads_per_task`` in whichever process trains (the agent itself
+or a training child), so concurrent slots do not oversubscribe the host's
+cores.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import logging
+import multiprocessing as mp
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+import numpy as np
+
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import TASK_EXECUTOR_THREAD_PREFIX, TRAINING_BACKEND_PROCESS, TRAINING_PROCESS_NAME_PREFIX
+from juniper_cascor_worker.exceptions import TrainingBackendError
+from juniper_cascor_worker.thread_layout import ThreadLayout, apply_thread_budget, export_thread_env, plan_thread_layout
+
+logger = logging.getLogger(__name__)
+
+TrainingFn = Callable[[Any, dict[str, Any], dict[str, np.ndarray]], Any]
+
+# Descriptor for one tensor placed in shared memory: (segment name, shape, dtype.str).
+SharedTensorSpec = tuple[str, tuple[int, ...], str]
+
+
+def build_training_backend(config: WorkerConfig) -> ThreadTrainingBackend | ProcessTrainingBackend:
+    """Construct the backend selected by ``config.training_backend``, sized to the task slots."""
+    layout = plan_thread_layout(config.task_slots)
+    if config.training_backend == TRAINING_BACKEND_PROCESS:
+        return ProcessTrainingBackend(config.task_slots, config.mp_context, config.stop_timeout, layout)
+    return ThreadTrainingBackend(config.task_slots, layout)
+
+
+class ThreadTrainingBackend:
+    """Run training on a dedicated thread pool sized to the task slots."""
+
+    name = "thread"
+
+    def __init__(self, workers: int, layout: ThreadLayout | None = None) -> None:
+        self.layout = layout or plan_thread_layout(workers)
+        # Threads are created lazily on first submit, so constructing an
+        # agent (e.g. in tests) does not spin any up.
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=TASK_EXECUTOR_THREAD_PREFIX)
+
+    async def start(self) -> None:
+        """Publish the thread budget; the pool itself starts lazily."""
+        export_thread_env(self.layout.threads_per_task)
+
+    async def run(
+        self,
+        fn: TrainingFn,
+        task_data: Any,
+        training_params: dict[str, Any],
+        tensors: dict[str, np.ndarray],
+    ) -> Any:
+        """Run ``fn`` on a pool thread; cancelling the call interrupts the thread."""
+        loop = asyncio.get_running_loop()
+        token = _ThreadCancelToken()
+        try:
+            return await loop.run_in_executor(self._executor, _run_cancellable, token, self.layout.threads_per_task, fn, task_data, training_params, tensors)
+        except asyncio.CancelledError:
+            if token.cancel():
+                logger.info("Interrupted training thread after cancellation")
+            raise
+
+    async def warm_up(self, fn: TrainingFn) -> list[Any]:
+        """Run ``fn`` once; pool threads share the process, so one is enough."""
+        return [await self.run(fn, None, {}, {})]
+
+    async def shutdown(self) -> None:
+        """Stop accepting work; running trainings are not waited for."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessTrainingBackend:
+    """Run training in a pool of pre-started worker processes.
+
+    Each process serves one task at a time over a duplex pipe. The parent
+    copies the task's input tensors into freshly created shared-memory
+    segments, sends their descriptors, and blocks a helper thread on the
+    reply so the event loop stays free. A process that dies mid-task is
+    replaced and the task fails with :class:`TrainingBackendError`.
+    """
+
+    name = "process"
+
+    def __init__(self, processes: int, mp_context: str, stop_timeout: float, layout: ThreadLayout | None = None) -> None:
+        self.layout = layout or plan_thread_layout(processes)
+        self._ctx = mp.get_context(mp_context)
+        self._size = processes
+        self._stop_timeout = stop_timeout
+        self._processes: list[_TrainingProcess] = []
+        self._idle: asyncio.Queue[_TrainingProcess] | None = None
+        self._started = asyncio.Event()
+        self._spawned = 0
+        # One waiter thread per process: each blocks on its pipe's recv().
+        self._waiters = ThreadPoolExecutor(max_workers=processes, thread_name_prefix=f"{TRAINING_PROCESS_NAME_PREFIX}-wait")
+
+    async def start(self) -> None:
+        """Spawn the worker processes (idempotent)."""
+        if self._idle is not None:
+            await self._started.wait()
+            return
+        self._idle = asyncio.Queue()
+        processes = await asyncio.to_thread(lambda: [self._spawn() for _ in range(self._size)])
+        for process in processes:
+            self._idle.put_nowait(process)
+        self._started.set()
+        logger.info("Started %d training processes (%s)", len(processes), self._ctx.get_start_method())
+
+    async def run(
+        self,
+        fn: TrainingFn,
+        task_data: Any,
+        training_params: dict[str, Any],
+        tensors: dict[str, np.ndarray],
+    ) -> Any:
+        """Run ``fn`` in an idle worker process with tensors in shared memory."""
+        await self.start()
+        assert self._idle is not None
+        process = await self._idle.get()
+
+        segments: list[shared_memory.SharedMemory] = []
+        try:
+            specs = {name: _export_shared_tensor(arr, segments) for name, arr in tensors.items()}
+        except BaseException:
+            _release_segments(segments)
+            self._idle.put_nowait(process)
+            raise
+
+        loop = asyncio.get_running_loop()
+        reply = loop.run_in_executor(self._waiters, process.call, (fn, task_data, training_params, specs))
+        try:
+            status, payload = await asyncio.shield(reply)
+        except asyncio.CancelledError:
+            # Kill the child rather than let it finish work nobody will read.
+            # The waiter thread then sees the pipe close; only at that point
+            # are the segments released and a replacement process started,
+            # so the next task never shares a pipe with the dead one.
+            logger.info("Killing training process %s after cancellation", process.name)
+            process.kill()
+            reply.add_done_callback(lambda f: (f.exception(), self._finish(process, segments)))
+            raise
+        except TrainingBackendError:
+            self._finish(process, segments)
+            raise
+        self._finish(process, segments)
+        if status != "ok":
+            raise TrainingBackendError(f"training process {process.name} failed: {payload}")
+        return payload
+
+    async def warm_up(self, fn: TrainingFn) -> list[Any]:
+        """Run ``fn`` once in every process.
+
+        The calls are issued together, so each holds a different idle
+        process until it finishes.
+        """
+        return list(await asyncio.gather(*(self.run(fn, None, {}, {}) for _ in range(self._size))))
+
+    async def shutdown(self) -> None:
+        """Ask every process to exit, terminating any that do not."""
+        processes, self._processes = self._processes, []
+        await asyncio.to_thread(_stop_processes, processes, self._stop_timeout)
+        self._waiters.shutdown(wait=False, cancel_futures=True)
+
+    def _spawn(self) -> _TrainingProcess:
+        self._spawned += 1
+        process = _TrainingProcess(self._ctx, f"{TRAINING_PROCESS_NAME_PREFIX}-{self._spawned}", self.layout.threads_per_task)
+        self._processes.append(process)
+        return process
+
+    def _finish(self, process: _TrainingProcess, segments: list[shared_memory.SharedMemory]) -> None:
+        """Release a task's segments and return its process (or a replacement) to the idle queue."""
+        _release_segments(segments)
+        if not process.alive:
+            if not process.killed:
+                logger.warning("Training process %s exited — starting a replacement", process.name)
+            self._processes.remove(process)
+            process.close()
+            process = self._spawn()
+        if self._idle is not None:
+            self._idle.put_nowait(process)
+
+
+class _TrainingProcess:
+    """Parent-side handle for one pre-started training process."""
+
+    def __init__(self, ctx: Any, name: str, threads: int) -> None:
+        self.name = name
+        self._conn, child_conn = ctx.Pipe(duplex=True)
+        self._process = ctx.Process(target=_training_process_main, args=(child_conn, threads), name=name, daemon=True)
+        self._process.start()
+        child_conn.close()
+        # Set once the pipe breaks: the child may not be reaped yet, so
+        # ``is_alive()`` alone can still report a dying process as alive.
+        self._broken = False
+        self.killed = False
+
+    @property
+    def alive(self) -> bool:
+        return not self._broken and self._process.is_alive()
+
+    def call(self, request: tuple[Any, ...]) -> tuple[str, Any]:
+        """Send one request and block for its reply (runs on a waiter thread)."""
+        try:
+            self._conn.send(request)
+            return self._conn.recv()
+        except (EOFError, OSError) as e:
+            self._broken = True
+            self._process.join(timeout=1.0)
+            raise TrainingBackendError(f"training process {self.name} exited (exitcode={self._process.exitcode})") from e
+
+    def kill(self) -> None:
+        """Terminate the child immediately (used to cancel a running task)."""
+        self._broken = True
+        self.killed = True
+        self._process.kill()
+
+    def request_stop(self) -> None:
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+
+    def join(self, timeout: float) -> None:
+        self._process.join(timeout)
+        if self._process.is_alive():
+            logger.warning("Training process %s did not stop gracefully, terminating", self.name)
+            self._process.terminate()
+            self._process.join(timeout)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _stop_processes(processes: list[_TrainingProcess], timeout: float) -> None:
+    for process in processes:
+        process.request_stop()
+    for process in processes:
+        process.join(timeout)
+        process.close()
+
+
+def _export_shared_tensor(array: np.ndarray, segments: list[shared_memory.SharedMemory]) -> SharedTensorSpec:
+    """Copy ``array`` into a new shared-memory segment and return its descriptor."""
+    # Zero-size segments are rejected by the OS; allocate at least one byte.
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    view[...] = array
+    del view
+    return segment.name, tuple(array.shape), array.dtype.str
+
+
+def _release_segments(segments: list[shared_memory.SharedMemory]) -> None:
+    for segment in segments:
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+    segments.clear()
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to a parent-owned segment without registering it for cleanup here."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13, attaching registers the segment with the resource tracker
+    # the child shares with the parent, and a later unregister from either
+    # side races the other (bpo-39959). The parent owns the segment, so the
+    # child attaches with registration suppressed. The child's serve loop is
+    # single-threaded, so the temporary swap is not observable elsewhere.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *_args: None  # type: ignore[assignment]
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register  # type: ignore[assignment]
+
+
+def _training_process_main(conn: Connection, threads: int) -> None:
+    """Child-process loop: serve training requests until told to stop."""
+    # Ctrl+C is delivered to the whole process group; shutdown is driven by
+    # the parent, so the children ignore SIGINT instead of dying mid-task.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Pin this process to its slot's share of the CPUs before torch loads
+    # (spawn/forkserver); under fork torch may already be loaded.
+    export_thread_env(threads, override=True)
+    apply_thread_budget(threads)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        fn, task_data, training_params, specs = request
+        apply_thread_budget(threads)
+        try:
+            reply: tuple[str, Any] = ("ok", _call_with_shared_tensors(fn, task_data, training_params, specs))
+        except Exception as e:  # noqa: BLE001 — reported to the parent, never raised here
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+def _call_with_shared_tensors(
+    fn: TrainingFn,
+    task_data: Any,
+    training_params: dict[str, Any],
+    specs: dict[str, SharedTensorSpec],
+) -> Any:
+    segments = [_attach_shared_memory(name) for name, _shape, _dtype in specs.values()]
+    try:
+        tensors = {tensor_name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf) for (tensor_name, (_name, shape, dtype)), segment in zip(specs.items(), segments)}
+        try:
+            return fn(task_data, training_params, tensors)
+        finally:
+            tensors.clear()
+    finally:
+        for segment in segments:
+            try:
+                segment.close()
+            except BufferError:
+                # Something still holds a view into the segment; the mapping
+                # is released when that view is garbage-collected.
+                logger.debug("Shared-memory segment %s still referenced at close", segment.name)
+
+
+class _TrainingCancelled(BaseException):
+    """Raised inside a training thread to abort it.
+
+    Derives from :class:`BaseException` so the ``except Exception`` handlers
+    in ``execute_training_task`` and CandidateUnit do not swallow it and keep
+    training.
+    """
+
+
+class _ThreadCancelToken:
+    """Binds one task to the pool thread running it, so it can be interrupted.
+
+    The lock orders :meth:`cancel` against :meth:`bind`/:meth:`unbind`: an
+    exception is only ever injected while the thread is still inside this
+    task's ``fn``, never into whatever the pool thread runs next.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread_id: int | None = None
+        self._cancelled = False
+        self._injected = False
+
+    def bind(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                raise _TrainingCancelled()
+            self._thread_id = threading.get_ident()
+
+    def unbind(self) -> None:
+        with self._lock:
+            if self._injected and self._thread_id is not None:
+                # Drop an injected exception that has not fired yet so it
+                # cannot escape into the pool's own code.
+                _set_async_exc(self._thread_id, None)
+            self._thread_id = None
+
+    def cancel(self) -> bool:
+        """Mark cancelled and interrupt the bound thread; True if one was interrupted."""
+        with self._lock:
+            self._cancelled = True
+            if self._thread_id is None:
+                return False
+            self._injected = _set_async_exc(self._thread_id, _TrainingCancelled)
+            return self._injected
+
+
+def _set_async_exc(thread_id: int, exc_type: type[BaseException] | None) -> bool:
+    """Schedule (or with ``None``, clear) an asynchronous exception in a thread."""
+    set_async_exc = getattr(getattr(ctypes, "pythonapi", None), "PyThreadState_SetAsyncExc", None)
+    if set_async_exc is None:
+        return False
+    return set_async_exc(ctypes.c_ulong(thread_id), ctypes.py_object(exc_type) if exc_type is not None else None) == 1
+
+
+def _run_cancellable(
+    token: _ThreadCancelToken,
+    threads: int,
+    fn: TrainingFn,
+    task_data: Any,
+    training_params: dict[str, Any],
+    tensors: dict[str, np.ndarray],
+) -> Any:
+    token.bind()
+    try:
+        # torch's intra-op thread count is process-wide and every slot uses
+        # the same budget, so this is a no-op once it matches. It still runs
+        # per call because torch is imported lazily, by whichever task first
+        # needs it, possibly after the pool threads have started.
+        apply_thread_budget(threads)
+        return fn(task_data, training_params, tensors)
+    finally:
+        token.unbind()
@@ -10,11 +10,14 @@ Two worker implementations:
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import dataclasses
 import json
 import logging
 import multiprocessing as mp
 import os
 import platform
+import random
 import struct
 import time
 import uuid
@@ -31,13 +34,62 @@ _RECENT_TASK_WINDOW: int = 16
 
 if TYPE_CHECKING:
     from juniper_cascor_worker.http_health import HealthServer
-    from juniper_cascor_worker.ws_connection import WorkerConnection
+    from juniper_cascor_worker.ws_connection import FrameData, WorkerConnection
 
 import numpy as np
 
+from juniper_cascor_worker.buffer_pool import BufferPool
 from juniper_cascor_worker.config import WorkerConfig
-from juniper_cascor_worker.constants import BINARY_FRAME_DTYPE_ENCODING, BINARY_FRAME_HEADER_LENGTH_BYTES, BINARY_FRAME_HEADER_LENGTH_FORMAT, DEFAULT_CORRELATION, DEFAULT_DENOMINATOR, DEFAULT_NUMERATOR, MAX_JSON_ERROR_PREVIEW_LENGTH, MSG_TYPE_CONNECTION_ESTABLISHED, MSG_TYPE_ERROR, MSG_TYPE_HEARTBEAT, MSG_TYPE_REGISTER, MSG_TYPE_REGISTRATION_ACK, MSG_TYPE_RESULT_ACK, MSG_TYPE_TASK_ASSIGN, MSG_TYPE_TASK_RESULT, NO_BEST_CORR_IDX, NO_EPOCHS_COMPLETED
-from juniper_cascor_worker.exceptions import WorkerConnectionError, WorkerError
+from juniper_cascor_worker.connection_cache import ConnectionCache
+from juniper_cascor_worker.constants import (
+    BINARY_FRAME_DTYPE_ENCODING,
+    BINARY_FRAME_HEADER_LENGTH_BYTES,
+    BINARY_FRAME_HEADER_LENGTH_FORMAT,
+    CGROUP_MEMORY_CURRENT_PATH,
+    CGROUP_MEMORY_MAX_PATH,
+    DEFAULT_CORRELATION,
+    DEFAULT_DENOMINATOR,
+    DEFAULT_NUMERATOR,
+    FRAME_CODECS,
+    MAX_CANDIDATE_BATCH,
+    MAX_FRAME_CHUNKS,
+    MAX_JSON_ERROR_PREVIEW_LENGTH,
+    MSG_TYPE_CONNECTION_ESTABLISHED,
+    MSG_TYPE_ERROR,
+    MSG_TYPE_HEARTBEAT,
+    MSG_TYPE_REGISTER,
+    MSG_TYPE_REGISTRATION_ACK,
+    MSG_TYPE_RESULT_ACK,
+    MSG_TYPE_RESULT_FETCH,
+    MSG_TYPE_RESULT_TENSORS,
+    MSG_TYPE_TASK_ASSIGN,
+    MSG_TYPE_TASK_CREDIT,
+    MSG_TYPE_TASK_RESULT,
+    NO_BEST_CORR_IDX,
+    NO_EPOCHS_COMPLETED,
+    PROC_MEMINFO_PATH,
+    RECONNECT_JITTER_SECONDS,
+    REDUCED_PRECISION_RESULT_TENSORS,
+    RESULT_CACHE_TTL_SECONDS,
+    SCATTER_GATHER_MIN_BYTES,
+    TASK_CREDIT_MEMORY_RESERVE_BYTES,
+    VALID_WIRE_PRECISIONS,
+    WIRE_PRECISION_BFLOAT16,
+    WIRE_PRECISION_FLOAT16,
+    WIRE_PRECISION_FLOAT32,
+)
+from juniper_cascor_worker.correlation_trace import apply_trace_request, validate_trace_request
+from juniper_cascor_worker.dataset_store import DatasetStore
+from juniper_cascor_worker.exceptions import TrainingBackendError, WorkerConnectionError, WorkerError
+from juniper_cascor_worker.fair_share import FairShareSlots
+from juniper_cascor_worker.frame_codec import FrameCodecError, compress_payload, decompress_into
+from juniper_cascor_worker.outbox import ResultOutbox
+from juniper_cascor_worker.result_cache import ResultCache, validate_result_selection
+from juniper_cascor_worker.result_replay import ResultReplayBuffer
+from juniper_cascor_worker.shm_transport import ShmProbe, ShmTransportError, map_shared_tensor, shm_transport_available, valid_segment_name
+from juniper_cascor_worker.tensor_cache import TensorCache, frame_digest
+from juniper_cascor_worker.training_backend import ProcessTrainingBackend, ThreadTrainingBackend, build_training_backend
+from juniper_cascor_worker.ws_connection import SendFlowControl
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +104,8 @@ class CascorWorkerAgent:
     The agent runs an async event loop with:
     - A message loop for receiving tasks and sending results
     - A heartbeat loop for keepalive
-    - Training execution offloaded to a thread pool
+    - Up to ``config.task_slots`` concurrent training tasks, each offloaded
+      to a dedicated training executor
 
     Example:
         >>> config = WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers")
@@ -60,7 +113,21 @@ class CascorWorkerAgent:
         >>> asyncio.run(agent.run())
     """
 
-    def __init__(self, config: WorkerConfig) -> None:
+    def __init__(
+        self,
+        config: WorkerConfig,
+        *,
+        backend: ThreadTrainingBackend | ProcessTrainingBackend | None = None,
+        task_slots: FairShareSlots | None = None,
+        tensor_cache: TensorCache | None = None,
+        buffer_pool: BufferPool | None = None,
+    ) -> None:
+        """Build an agent for ``config.server_url``.
+
+        The keyword arguments let a :class:`~juniper_cascor_worker.federation.FederatedWorker`
+        hand every per-server agent the same training backend, slot pool,
+        tensor cache and buffer pool; a standalone agent builds its own.
+        """
         config.validate(legacy=False)
         self.config = config
         self.worker_id = str(uuid.uuid4())
@@ -85,6 +152,89 @@ class CascorWorkerAgent:
         # The HTTP health server is built lazily in ``run()`` so tests can
         # construct an agent without binding a port.
         self._health_server: Optional["HealthServer"] = None
+        # Concurrent task slots: the slot pool lets at most ``task_slots``
+        # tasks train at once, and training runs on a backend of the same
+        # size (thread pool or process pool, per ``config.training_backend``)
+        # so slots never queue behind asyncio's shared default pool. A
+        # federated worker shares one pool between its servers.
+        self._slots = task_slots if task_slots is not None else FairShareSlots(config.task_slots, config.task_slots + config.prefetch_tasks)
+        self._task_slots = self._slots.share(config.server_url)
+        # Admission covers the slots plus ``prefetch_tasks`` tasks whose
+        # frames are read and decoded while every slot is busy. Prefetched
+        # tasks wait in ``_training_slot``; their decoded bytes are capped
+        # by ``prefetch_bytes`` before the next one is admitted. The places
+        # belong to the slot pool, so federated servers admit from one set.
+        self._admission = self._slots.admission
+        self._prefetched_tasks: int = 0
+        self._prefetched_bytes: int = 0
+        self._prefetch_room = asyncio.Event()
+        self._backend = backend if backend is not None else build_training_backend(config)
+        self._slot_tasks: set[asyncio.Task[None]] = set()
+        # A task_result is followed by its binary frames on the shared
+        # socket; the lock keeps concurrent slots and the heartbeat loop
+        # from interleaving messages inside such a group.
+        self._send_lock = asyncio.Lock()
+        # Finished tasks hand their task_result group to the outbox and
+        # move on; one sender coroutine per connection uploads them.
+        self._outbox = ResultOutbox(config.result_outbox_size)
+        self._outbox_sender: asyncio.Task[None] | None = None
+        # Bytes queued on the socket, shared by every connection: above
+        # ``send_buffer_bytes`` no new task is admitted until the uplink
+        # has drained, so results cannot pile up behind a slow upload.
+        self._send_flow = SendFlowControl(config.send_buffer_bytes)
+        # Task credits, once the server confirms ``task_credit``: it sends
+        # task_assigns only up to ``_credit_limit`` (cumulative for the
+        # connection), which grows as admitted tasks finish. Tasks kept
+        # training across a reconnect still count as admitted.
+        self._task_credit: bool = False
+        self._credit_limit: int = 0
+        self._assigns_received: int = 0
+        self._credit_overruns: int = 0
+        self._admitted_tasks: int = 0
+        self._task_bytes_estimate: int = 0
+        # Decoded round tensors keyed by the sha256 the manifest declares;
+        # content-addressed, so it survives reconnects.
+        self._tensor_cache = tensor_cache if tensor_cache is not None else TensorCache(config.tensor_cache_bytes)
+        # Column-growing input matrices keyed by training session, so a
+        # round only ships the columns added since the previous one.
+        self._dataset_store = DatasetStore(config.dataset_store_bytes)
+        # Result tensors left out by a ``result_tensors`` selection, kept
+        # briefly so the server can fetch them for the winning candidate.
+        self._result_cache = ResultCache(config.result_cache_bytes, RESULT_CACHE_TTL_SECONDS)
+        # Reusable buffers for decoded frames and narrowed result tensors;
+        # a task's buffers come back once its training has returned.
+        self._buffer_pool = buffer_pool if buffer_pool is not None else BufferPool(config.buffer_pool_bytes)
+        # task_result groups kept until their result_ack. ``worker_id`` is
+        # fixed for the agent's lifetime, so after a reconnect the server
+        # sees the same worker and (once it confirms ``session_resume``)
+        # gets the pending results replayed instead of re-dispatching.
+        self._result_replay = ResultReplayBuffer(config.result_replay_bytes)
+        self._session_resume: bool = False
+        self._pending_replay: list[tuple[dict[str, Any], list[FrameData]]] = []
+        # SSL context, TLS sessions and resolved addresses outlive each
+        # WorkerConnection, so a reconnect skips the expensive set-up.
+        # Reconnect-to-ready latency runs from losing a registered
+        # connection to the next registration_ack.
+        self._connection_cache = ConnectionCache()
+        self._disconnected_at: float | None = None
+        self._reconnects: int = 0
+        self._last_reconnect_seconds: float | None = None
+        # Result frames are compressed with ``config.frame_codec`` only once
+        # the server's registration_ack lists it in ``frame_codecs``.
+        self._result_codec: str | None = None
+        # Reduced wire precision is requested at registration and used only
+        # as confirmed by the registration_ack.
+        self._wire_precision: str = WIRE_PRECISION_FLOAT32
+        # Shared-memory manifest entries are accepted only once the server
+        # has echoed the token of this connection's probe segment.
+        self._shm_transport: bool = False
+        # Result tensors go out as one packed binary message once the
+        # server's registration_ack accepts ``packed_results``.
+        self._packed_results: bool = False
+        # Opt-in warm-up (``config.warmup``) runs while the first connection
+        # is being made; registration and readiness wait for it.
+        self._warmup_task: asyncio.Task[None] | None = None
+        self._warm: bool = not config.warmup
 
     def _bump_liveness(self) -> None:
         """Record forward progress for the liveness probe."""
@@ -114,6 +264,8 @@ class CascorWorkerAgent:
             raise RuntimeError("websocket connection not bound")
         if not self._registered:
             raise RuntimeError("worker registration handshake not complete")
+        if not self._warm:
+            raise RuntimeError("warm-up not complete")
 
     async def run(self) -> None:
         """Main entry point — connect, register, and process tasks.
@@ -144,8 +296,18 @@ class CascorWorkerAgent:
         await self._health_server.start()
 
         try:
+            # Process backends are pre-started here so the first task does
+            # not pay the interpreter start-up cost.
+            await self._backend.start()
+            layout = self._backend.layout
+            logger.info("Thread layout: %d usable CPUs, %d slot(s) x %d thread(s) (%s)", layout.usable_cpus, layout.task_slots, layout.threads_per_task, layout.source)
+            if self.config.warmup:
+                self._warmup_task = asyncio.create_task(self._warm_up())
             await self._run_inner(WorkerConnection)
         finally:
+            if self._warmup_task is not None:
+                self._warmup_task.cancel()
+            await self._backend.shutdown()
             await self._health_server.stop()
 
     async def _run_inner(self, WorkerConnection: type) -> None:
@@ -157,6 +319,9 @@ class CascorWorkerAgent:
                 tls_cert=self.config.tls_cert,
                 tls_key=self.config.tls_key,
                 tls_ca=self.config.tls_ca,
+                max_message_size=self.config.max_message_bytes,
+                cache=self._connection_cache,
+                flow=self._send_flow,
             )
 
             try:
@@ -171,14 +336,32 @@ class CascorWorkerAgent:
                 if ack.get("type") != MSG_TYPE_CONNECTION_ESTABLISHED:
                     logger.warning("Unexpected first message: %s", ack)
 
+                # Register only once warm, so the server does not hand out a
+                # task that would pay the warm-up cost anyway.
+                if self._warmup_task is not None:
+                    await asyncio.shield(self._warmup_task)
+
                 # Register
                 await self._register()
 
-                # Run heartbeat and message loop concurrently
+                # Run heartbeat, result sender and message loop concurrently
                 heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+                self._outbox_sender = asyncio.create_task(self._outbox.run(self._send_message_group))
                 try:
+                    await self._replay_results()
+                    await self._grant_credits()
                     await self._message_loop()
                 finally:
+                    # A requested stop lets in-flight slots finish and report
+                    # (the pre-slot inline loop did the same); a lost or
+                    # failed connection abandons them, unless the server
+                    # resumes sessions: then they keep training and their
+                    # results are replayed after the next registration.
+                    if self._stop_event.is_set() or not self._session_resume:
+                        await self._finish_slot_tasks(cancel=not self._stop_event.is_set())
+                    elif self._slot_tasks:
+                        logger.info("Keeping %d in-flight task(s) training across the reconnect", len(self._slot_tasks))
+                    await self._stop_outbox_sender(drain=self._stop_event.is_set())
                     heartbeat_task.cancel()
                     try:
                         await heartbeat_task
@@ -189,7 +372,9 @@ class CascorWorkerAgent:
                 if self._stop_event.is_set():
                     break
                 logger.warning("Connection lost: %s — reconnecting", e)
-                await asyncio.sleep(self.config.reconnect_backoff_base)
+                # Jittered and short: workers dropped by the same server
+                # restart come back spread out, not a full backoff later.
+                await asyncio.sleep(random.uniform(0, min(self.config.reconnect_backoff_base, RECONNECT_JITTER_SECONDS)))
             except Exception:
                 if self._stop_event.is_set():
                     break
@@ -201,10 +386,51 @@ class CascorWorkerAgent:
                 # METRICS-MON R1.3 / seed-04: a closed WS means readiness
                 # 503 until the next register-ack lands. Make the flag
                 # cycle visible to the probe layer.
+                if self._registered and not self._stop_event.is_set():
+                    self._disconnected_at = time.monotonic()
                 self._registered = False
 
+        # Tasks kept across a reconnect that never came back.
+        await self._finish_slot_tasks(cancel=True)
         logger.info("Worker agent stopped")
 
+    async def _finish_slot_tasks(self, *, cancel: bool) -> None:
+        """Wait for (or cancel) every in-flight slot task."""
+        if not self._slot_tasks:
+            return
+        pending = list(self._slot_tasks)
+        if cancel:
+            logger.warning("Abandoning %d in-flight task(s)", len(pending))
+            for task in pending:
+                task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _warm_up(self) -> None:
+        """Warm every training thread/process; failures only log (training still works lazily)."""
+        try:
+            reports = await self._backend.warm_up(_warm_up_backend)
+            logger.info("Warm-up complete: %s", ", ".join(f"{r['activations']} activations in {r['seconds']:.2f}s" for r in reports))
+        except Exception as e:  # noqa: BLE001 — warm-up is best effort
+            logger.warning("Warm-up failed, first task will load lazily: %s", e)
+        finally:
+            self._warm = True
+
+    async def _stop_outbox_sender(self, *, drain: bool) -> None:
+        """Stop the result sender, first uploading queued results if ``drain``."""
+        sender, self._outbox_sender = self._outbox_sender, None
+        if sender is None:
+            return
+        if drain:
+            await self._outbox.drain(sender)
+        sender.cancel()
+        try:
+            await sender
+        except (asyncio.CancelledError, WorkerConnectionError):
+            pass
+        dropped = self._outbox.clear()
+        if dropped:
+            logger.warning("Dropped %d unsent task result(s)", dropped)
+
     def stop(self) -> None:
         """Signal the agent to stop.
 
@@ -220,22 +446,61 @@ class CascorWorkerAgent:
     async def _register(self) -> None:
         """Send registration message and wait for acknowledgment."""
         capabilities = self._build_capabilities()
+        probe = ShmProbe() if self.config.shm_transport and shm_transport_available() else None
+        if probe is not None:
+            capabilities["shm_transport"] = {"probe": probe.name}
         msg = {
             "type": MSG_TYPE_REGISTER,
             "worker_id": self.worker_id,
             "capabilities": capabilities,
         }
-        await self._connection.send_json(msg)
-
-        ack = await self._connection.receive_json()
+        if self._result_replay.enabled:
+            msg["pending_results"] = self._result_replay.task_ids()
+        try:
+            await self._connection.send_json(msg)
+            ack = await self._connection.receive_json()
+        finally:
+            if probe is not None:
+                probe.close()
         if ack.get("type") != MSG_TYPE_REGISTRATION_ACK:
             raise WorkerConnectionError(f"Registration failed: {ack}")
 
+        # Only a server that read the probe segment (same host) knows its token.
+        self._shm_transport = probe is not None and probe.confirms(ack.get("shm_transport"))
+
+        accepted_codecs = ack.get("frame_codecs") or ()
+        self._result_codec = self.config.frame_codec if self.config.frame_codec in accepted_codecs else None
+        # Reduced precision only when the server confirms the mode we asked for.
+        self._wire_precision = self.config.wire_precision if ack.get("wire_precision") == self.config.wire_precision else WIRE_PRECISION_FLOAT32
+        self._packed_results = ack.get("packed_results") is True
+        # Credits are per connection; the first grant follows registration.
+        self._task_credit = ack.get("task_credit") is True
+        self._credit_limit = 0
+        self._assigns_received = 0
+
+        # A resuming server may narrow the replay to the results it still
+        # needs; one that does not resume re-dispatches the tasks instead.
+        self._session_resume = self._result_replay.enabled and ack.get("session_resume") is True
+        if self._session_resume:
+            wanted = ack.get("replay_results")
+            self._pending_replay = self._result_replay.replay(wanted if isinstance(wanted, list) else None)
+        else:
+            self._pending_replay = []
+            dropped = self._result_replay.clear()
+            if dropped:
+                logger.warning("Server did not resume the session; dropped %d unacknowledged result(s)", dropped)
+
         # METRICS-MON R1.3 / seed-04: readiness anchor — once the ack lands
         # the worker is eligible to receive tasks.
         self._registered = True
         self._bump_liveness()
-        logger.info("Registered as worker %s", self.worker_id)
+        if self._disconnected_at is not None:
+            self._last_reconnect_seconds = time.monotonic() - self._disconnected_at
+            self._disconnected_at = None
+            self._reconnects += 1
+            logger.info("Registered as worker %s, %.3fs after the connection was lost", self.worker_id, self._last_reconnect_seconds)
+        else:
+            logger.info("Registered as worker %s", self.worker_id)
 
     async def _heartbeat_loop(self) -> None:
         """Send periodic heartbeat messages.
@@ -270,13 +535,34 @@ class CascorWorkerAgent:
                         "rss_mb": sample_rss_mb(),
                         "tasks_completed": self._tasks_completed,
                         "tasks_failed": self._tasks_failed,
+                        "task_slots": self.config.task_slots,
+                        "prefetched_tasks": self._prefetched_tasks,
+                        "prefetched_bytes": self._prefetched_bytes,
+                        "task_queue_depth": self._admitted_tasks,
+                        "task_credits": self._credit_limit - self._assigns_received if self._task_credit else None,
+                        "task_credit_limit": self._credit_limit if self._task_credit else None,
+                        "task_credit_overruns": self._credit_overruns,
+                        "slot_shares": self._slots.metrics(),
+                        **self._outbox.metrics(),
+                        **self._send_flow.metrics(),
+                        **self._tensor_cache.metrics(),
+                        **self._dataset_store.metrics(),
+                        **self._result_cache.metrics(),
+                        **self._buffer_pool.metrics(),
+                        **self._result_replay.metrics(),
+                        **self._connection_cache.metrics(),
+                        "reconnects": self._reconnects,
+                        "last_reconnect_seconds": None if self._last_reconnect_seconds is None else round(self._last_reconnect_seconds, 4),
                         # R4.4 training-loop instrumentation fields:
                         "last_task_duration_seconds": self._last_task_duration_seconds,
                         "recent_task_durations_seconds": list(self._recent_task_durations_seconds),
                         "gpu_utilization_pct": _sample_gpu_utilization_pct(),
                     }
-                    await self._connection.send_json(msg)
+                    async with self._send_lock:
+                        await self._connection.send_json(msg)
                     self._bump_liveness()
+                    # Memory freed elsewhere may allow a larger grant.
+                    await self._grant_credits()
             except WorkerConnectionError:
                 break
             except asyncio.CancelledError:
@@ -298,12 +584,19 @@ class CascorWorkerAgent:
             msg_type = msg.get("type")
 
             if msg_type == MSG_TYPE_TASK_ASSIGN:
-                await self._handle_task_assign(msg)
+                self._assigns_received += 1
+                if self._task_credit and self._assigns_received > self._credit_limit:
+                    self._credit_overruns += 1
+                    logger.warning("task_assign %s arrived beyond the granted credit limit %d", msg.get("task_id", ""), self._credit_limit)
+                await self._dispatch_task_assign(msg)
+            elif msg_type == MSG_TYPE_RESULT_FETCH:
+                await self._handle_result_fetch(msg)
             elif msg_type == MSG_TYPE_HEARTBEAT:
                 pass  # Server heartbeat response — no action needed
             elif msg_type == MSG_TYPE_RESULT_ACK:
                 status = msg.get("status", "unknown")
                 logger.debug("Result ack: task %s — %s", msg.get("task_id"), status)
+                self._release_acked_result(msg.get("task_id", ""))
             elif msg_type == MSG_TYPE_ERROR:
                 logger.error("Server error: %s", msg.get("error"))
             else:
@@ -318,8 +611,122 @@ class CascorWorkerAgent:
                     extra={"type": msg_type, "worker_id": self.worker_id},
                 )
 
-    async def _handle_task_assign(self, msg: dict[str, Any]) -> None:
-        """Handle a task_assign message: receive tensors, train, send result."""
+    async def _dispatch_task_assign(self, msg: dict[str, Any]) -> None:
+        """Admit a task_assign and run it in the background.
+
+        Waits for admission (a free slot, or a free prefetch place within
+        the byte budget), starts the task, and returns as soon as the
+        task's binary frames are off the socket — they follow the
+        ``task_assign`` on the shared connection, so the message loop must
+        not read ahead of them. Training and the result upload continue in
+        the slot task while the loop accepts the next message; a prefetched
+        task starts training as soon as a slot frees up. While the send
+        queue is above its high watermark nothing new is admitted.
+        """
+        await self._send_flow.wait_writable()
+        while self._prefetched_bytes >= self.config.prefetch_bytes:
+            self._prefetch_room.clear()
+            await self._prefetch_room.wait()
+        await self._admission.acquire()
+        self._admitted_tasks += 1
+        frames_received = asyncio.Event()
+        try:
+            slot_task = asyncio.create_task(self._run_task_slot(msg, frames_received))
+        except BaseException:
+            self._admitted_tasks -= 1
+            self._admission.release()
+            raise
+        self._slot_tasks.add(slot_task)
+        slot_task.add_done_callback(self._slot_tasks.discard)
+
+        frames_waiter = asyncio.create_task(frames_received.wait())
+        try:
+            await asyncio.wait({slot_task, frames_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            frames_waiter.cancel()
+
+    async def _run_task_slot(self, msg: dict[str, Any], frames_received: asyncio.Event) -> None:
+        """Slot-task body: run one task and always give its admission back."""
+        try:
+            await self._handle_task_assign(msg, frames_received=frames_received)
+        except WorkerConnectionError as e:
+            # The message loop sees the same dead connection and reconnects;
+            # nothing more to do for this task.
+            logger.warning("Task %s abandoned: %s", msg.get("task_id", ""), e)
+        except Exception:
+            logger.exception("Unexpected error in task %s", msg.get("task_id", ""))
+        finally:
+            frames_received.set()
+            self._admitted_tasks -= 1
+            self._admission.release()
+        # The freed place becomes a new credit.
+        with contextlib.suppress(WorkerConnectionError):
+            await self._grant_credits()
+
+    def _credit_window(self) -> int:
+        """Task_assigns the worker can take on now: free places of its share, bounded by memory.
+
+        A lone server's share is every admission place. Federated servers
+        split the places evenly, since a credit granted to one server
+        cannot be withdrawn when another gets busy.
+        """
+        window = self._slots.place_quota(self._task_slots) - self._admitted_tasks
+        available = _available_memory_bytes()
+        if available is not None and self._task_bytes_estimate:
+            fits = (available - TASK_CREDIT_MEMORY_RESERVE_BYTES) // self._task_bytes_estimate
+            # An idle worker always takes one task, or it could never make progress.
+            window = min(window, max(fits, 0 if self._admitted_tasks else 1))
+        return max(window, 0)
+
+    async def _grant_credits(self) -> None:
+        """Raise the credit limit to cover the current window and tell the server.
+
+        The limit is cumulative (task_assigns received on this connection
+        plus the window), so a grant crossing a task_assign in flight is
+        never counted twice. It only ever grows; under memory pressure the
+        worker simply stops granting.
+        """
+        if not self._task_credit or not self._registered or self._connection is None:
+            return
+        limit = self._assigns_received + self._credit_window()
+        if limit <= self._credit_limit:
+            return
+        self._credit_limit = limit
+        msg = {
+            "type": MSG_TYPE_TASK_CREDIT,
+            "worker_id": self.worker_id,
+            "credit_limit": limit,
+            "credits": limit - self._assigns_received,
+            "task_queue_depth": self._admitted_tasks,
+        }
+        async with self._send_lock:
+            await self._connection.send_json(msg)
+
+    @contextlib.asynccontextmanager
+    async def _training_slot(self, tensors: dict[str, np.ndarray]):
+        """Hold a training slot; while waiting for one the task counts as prefetched."""
+        nbytes = sum(arr.nbytes for arr in tensors.values())
+        self._task_bytes_estimate = max(self._task_bytes_estimate, nbytes)
+        self._prefetched_tasks += 1
+        self._prefetched_bytes += nbytes
+        try:
+            await self._task_slots.acquire()
+        finally:
+            self._prefetched_tasks -= 1
+            self._prefetched_bytes -= nbytes
+            self._prefetch_room.set()
+        try:
+            yield
+        finally:
+            self._task_slots.release()
+
+    async def _handle_task_assign(self, msg: dict[str, Any], frames_received: asyncio.Event | None = None) -> None:
+        """Handle a task_assign message: receive tensors, train, send result.
+
+        ``frames_received`` (set by the body once the task's binary frames
+        have been read) lets :meth:`_dispatch_task_assign` hand the socket
+        back to the message loop while training continues.
+        """
         # METRICS-MON R1.3 / seed-04: task accounting wraps the entire
         # task lifecycle — protocol-level rejections, timeouts, and
         # successful completions all flow through the finally block so
@@ -332,8 +739,13 @@ class CascorWorkerAgent:
         # window — timeouts and slow failures are exactly the
         # distributions operators want to see.
         task_start = time.monotonic()
+        tensors: dict[str, np.ndarray] = {}
         try:
-            success = await self._handle_task_assign_body(msg)
+            success = await self._handle_task_assign_body(msg, frames_received, tensors)
+            # Nothing reads the task's tensors any more; a training that was
+            # abandoned (timeout, backend error) left ``tensors`` empty.
+            for array in tensors.values():
+                self._buffer_pool.release(array)
         finally:
             duration = time.monotonic() - task_start
             self._in_flight_tasks -= 1
@@ -346,10 +758,19 @@ class CascorWorkerAgent:
                 self._tasks_failed += 1
             self._bump_liveness()
 
-    async def _handle_task_assign_body(self, msg: dict[str, Any]) -> bool:
-        """Inner task handler — returns True on training success, False otherwise."""
+    async def _handle_task_assign_body(self, msg: dict[str, Any], frames_received: asyncio.Event | None = None, tensors: dict[str, np.ndarray] | None = None) -> bool:
+        """Inner task handler — returns True on training success, False otherwise.
+
+        A ``task_assign`` carrying ``candidate_batch`` trains every listed
+        candidate against the one set of frames and sends one ``task_result``
+        per entry; it succeeds only if every candidate does.
+
+        The task's tensors are collected in ``tensors`` so the caller can
+        return their pooled buffers afterwards.
+        """
         task_id = msg.get("task_id", "")
         manifest = msg.get("tensor_manifest", {})
+        batch = msg.get("candidate_batch")
 
         # CW-07: validate that the manifest declares the tensors the
         # task_executor depends on before we start blocking on
@@ -360,23 +781,42 @@ class CascorWorkerAgent:
         # clear protocol violation back to the server.
         candidate_data = msg.get("candidate_data", {})
         candidate_data["candidate_index"] = msg.get("candidate_index", 0)
-        manifest_validation_error = _validate_tensor_manifest(manifest)
-        if manifest_validation_error is not None:
-            logger.error("Tensor manifest invalid for task %s: %s", task_id, manifest_validation_error)
-            await self._connection.send_json(
-                _build_task_failure_message(
-                    task_id=task_id,
-                    candidate_data=candidate_data,
-                    error_message=f"Tensor manifest invalid: {manifest_validation_error}",
-                )
-            )
+        entries = _candidate_batch_entries(batch, task_id) if batch is not None else [(task_id, candidate_data)]
+        training_session = msg.get("training_session")
+        if not await self._accept_tensor_manifest(task_id, manifest, training_session, entries):
             return False
 
-        # Receive binary tensor frames
-        tensors: dict[str, np.ndarray] = {}
-        for tensor_name in manifest:
-            raw_bytes = await self._connection.receive_bytes()
-            tensors[tensor_name] = _decode_binary_frame(raw_bytes)
+        # A task of a newer round makes the previous round's cached tensors
+        # stale. Round ids are per server, and a federated worker shares
+        # the cache, so only this server's entries are evicted.
+        round_id = msg.get("round_id")
+        self._tensor_cache.evict_before(round_id, scope=self.config.server_url)
+
+        # Receive binary tensor frames. A frame that fails to decode fails
+        # the task, not the connection: the server gets a failure result
+        # right away, and any frames of the task still on the socket are
+        # skipped by the message loop as binary frames outside a task.
+        tensors = {} if tensors is None else tensors
+        try:
+            _, cache_misses = await self._receive_tensors(manifest, round_id, tensors)
+        except BinaryFrameProtocolError as e:
+            logger.error("Binary frame invalid for task %s: %s", task_id, e)
+            await self._send_failures(entries, f"Binary frame invalid: {e}")
+            return False
+        finally:
+            if frames_received is not None:
+                frames_received.set()
+
+        if not await self._attach_shared_tensors(task_id, manifest, entries, tensors):
+            return False
+
+        if cache_misses:
+            logger.warning("Tensor cache miss for task %s: %s", task_id, cache_misses)
+            await self._send_failures(entries, f"Tensor cache miss: {cache_misses}", cache_miss=cache_misses)
+            return False
+
+        if not await self._attach_session_tensors(task_id, training_session, manifest, entries, tensors):
+            return False
 
         # CW-07 (defence-in-depth): once decoded, verify the populated tensor
         # set still matches the declared manifest. This will only flag a
@@ -392,99 +832,402 @@ class CascorWorkerAgent:
                 sorted(missing),
                 sorted(extra),
             )
-            await self._connection.send_json(
-                _build_task_failure_message(
-                    task_id=task_id,
-                    candidate_data=candidate_data,
-                    error_message=f"Tensor manifest/frame mismatch: missing={sorted(missing)} extra={sorted(extra)}",
-                )
-            )
+            await self._send_failures(entries, f"Tensor manifest/frame mismatch: missing={sorted(missing)} extra={sorted(extra)}")
             return False
 
-        logger.info("Received task %s (%d tensors)", task_id, len(tensors))
+        # The batch is validated only after its frames are off the socket,
+        # so a rejected batch never leaves binary frames for the message
+        # loop to misread as JSON.
+        if batch is not None:
+            batch_validation_error = _validate_candidate_batch(batch)
+            if batch_validation_error is not None:
+                logger.error("Candidate batch invalid for task %s: %s", task_id, batch_validation_error)
+                await self._send_failures(entries, f"Candidate batch invalid: {batch_validation_error}")
+                return False
 
-        # Execute training in a thread to avoid blocking the event loop
         training_params = msg.get("training_params", {})
+        params_validation_error = validate_trace_request(training_params.get("correlation_trace")) or validate_result_selection(training_params.get("result_tensors"))
+        if params_validation_error is not None:
+            logger.error("Training params invalid for task %s: %s", task_id, params_validation_error)
+            await self._send_failures(entries, f"Training params invalid: {params_validation_error}")
+            return False
+
+        logger.info("Received task %s (%d tensors, %d candidate(s))", task_id, len(tensors), len(entries))
+
+        # Execute training on the training backend to avoid blocking the event
+        # loop. On timeout ``wait_for`` cancels ``_run_training``, and the
+        # backend turns that into a real stop of the training thread/process.
+        # ``task_timeout`` covers training only, not a prefetched task's wait
+        # for a slot; the slot is freed before the result is uploaded.
 
         try:
-            result_dict, result_tensors = await asyncio.wait_for(
-                asyncio.to_thread(_execute_task, candidate_data, training_params, tensors),
-                timeout=self.config.task_timeout,
-            )
+            async with self._training_slot(tensors):
+                if batch is not None:
+                    results = await asyncio.wait_for(
+                        self._run_training_batch([data for _, data in entries], training_params, tensors),
+                        timeout=self.config.task_timeout,
+                    )
+                else:
+                    results = [
+                        await asyncio.wait_for(
+                            self._run_training(candidate_data, training_params, tensors),
+                            timeout=self.config.task_timeout,
+                        )
+                    ]
         except asyncio.TimeoutError:
             logger.error("Task %s timed out after %.0fs", task_id, self.config.task_timeout)
+            # The stopped training may still touch its inputs for a moment;
+            # leave them to the garbage collector rather than the pool.
+            tensors.clear()
             # CW-04: thread the actual candidate_uuid through so the server can
             # correlate the timeout error with the assigned candidate. The
             # previous code unconditionally sent ``""`` which broke server-side
             # correlation logging.
-            error_msg = {
-                "type": MSG_TYPE_TASK_RESULT,
-                "task_id": task_id,
-                "candidate_id": candidate_data.get("candidate_index", 0),
-                "candidate_uuid": candidate_data.get("candidate_uuid", ""),
-                "correlation": DEFAULT_CORRELATION,
-                "success": False,
-                "epochs_completed": NO_EPOCHS_COMPLETED,
-                "activation_name": candidate_data.get("activation_name", ""),
-                "all_correlations": [],
-                "numerator": DEFAULT_NUMERATOR,
-                "denominator": DEFAULT_DENOMINATOR,
-                "best_corr_idx": NO_BEST_CORR_IDX,
-                "error_message": f"Task timed out after {self.config.task_timeout:.0f}s",
-                "tensor_manifest": {},
-            }
-            await self._connection.send_json(error_msg)
+            await self._send_failures(entries, f"Task timed out after {self.config.task_timeout:.0f}s")
+            return False
+        except TrainingBackendError as e:
+            logger.error("Training backend failed for task %s: %s", task_id, e)
+            tensors.clear()
+            await self._send_failures(entries, f"Training backend error: {e}")
             return False
 
-        # Build tensor manifest for result
-        tensor_manifest = {}
-        frames = []
-        for name, arr in result_tensors.items():
-            tensor_manifest[name] = {"shape": list(arr.shape), "dtype": str(arr.dtype)}
-            frames.append(_encode_binary_frame(arr))
+        # METRICS-MON R1.3: a returned-with-success result counts toward
+        # ``tasks_completed``; everything else (timeout, manifest reject,
+        # exception) counts as failed via the surrounding try/finally.
+        return await self._send_task_results(entries, results, training_params.get("result_tensors"))
+
+    async def _accept_tensor_manifest(self, task_id: str, manifest: dict[str, Any], training_session: Any, entries: list[tuple[str, dict[str, Any]]]) -> bool:
+        """Check the manifest before any frame is read; on rejection, fail the task's entries."""
+        manifest_validation_error = _validate_tensor_manifest(manifest, training_session=training_session)
+        if manifest_validation_error is not None:
+            logger.error("Tensor manifest invalid for task %s: %s", task_id, manifest_validation_error)
+            await self._send_failures(entries, f"Tensor manifest invalid: {manifest_validation_error}")
+            return False
+        if not self._shm_transport and any(isinstance(entry, dict) and "shm" in entry for entry in manifest.values()):
+            logger.error("Task %s references shared memory, but the transport was not negotiated", task_id)
+            await self._send_failures(entries, "Tensor manifest invalid: shared-memory transport not negotiated")
+            return False
+        return True
 
-        # Send result JSON
-        result_msg = {
-            "type": MSG_TYPE_TASK_RESULT,
+    async def _attach_shared_tensors(self, task_id: str, manifest: dict[str, Any], entries: list[tuple[str, dict[str, Any]]], tensors: dict[str, np.ndarray]) -> bool:
+        """Map the manifest's shared-memory entries into ``tensors``; on failure, fail the task's entries."""
+        try:
+            tensors.update(_map_shared_tensors(manifest, self._buffer_pool))
+        except (BinaryFrameProtocolError, ShmTransportError) as e:
+            logger.error("Shared-memory tensor unavailable for task %s: %s", task_id, e)
+            await self._send_failures(entries, f"Shared-memory tensor unavailable: {e}")
+            return False
+        return True
+
+    async def _attach_session_tensors(self, task_id: str, training_session: Any, manifest: dict[str, Any], entries: list[tuple[str, dict[str, Any]]], tensors: dict[str, np.ndarray]) -> bool:
+        """Expand dataset-store references into ``tensors``; on an invalid delta or a miss, fail the task's entries."""
+        try:
+            session_misses = self._extend_session_tensors(training_session, manifest, tensors)
+        except BinaryFrameProtocolError as e:
+            logger.error("Session tensor invalid for task %s: %s", task_id, e)
+            await self._send_failures(entries, f"Session tensor invalid: {e}")
+            return False
+        if session_misses:
+            logger.warning("Dataset store miss for task %s (session %s): %s", task_id, training_session, session_misses)
+            await self._send_failures(entries, f"Dataset store miss: {session_misses}", session_miss=session_misses)
+            return False
+        return True
+
+    async def _send_task_results(self, entries: list[tuple[str, dict[str, Any]]], results: list[tuple[dict[str, Any], dict[str, np.ndarray]]], selection: Any) -> bool:
+        """Send one ``task_result`` per candidate; True if every candidate succeeded."""
+        success = True
+        for (entry_task_id, _), (result_dict, result_tensors) in zip(entries, results):
+            result_tensors, withheld = self._withhold_unselected(entry_task_id, result_tensors, selection)
+            tensor_manifest, frames, packed = await self._encode_result_tensors(result_tensors)
+            result_msg = _build_task_result_message(task_id=entry_task_id, result_dict=result_dict, tensor_manifest=tensor_manifest)
+            result_msg["wire_precision"] = self._wire_precision
+            if packed:
+                result_msg["packed_frames"] = True
+            if withheld:
+                result_msg["withheld_tensors"] = withheld
+            await self._send_result(result_msg, frames)
+
+            logger.info(
+                "Queued result for task %s (corr=%.4f, success=%s)",
+                entry_task_id,
+                result_dict.get("correlation", DEFAULT_CORRELATION),
+                result_dict.get("success", False),
+            )
+            success = success and bool(result_dict.get("success", False))
+        return success
+
+    def _withhold_unselected(self, task_id: str, result_tensors: dict[str, np.ndarray], selection: Any) -> tuple[dict[str, np.ndarray], list[str]]:
+        """Split the tensors outside the server's selection off into the result cache.
+
+        Withheld tensors are not encoded; they wait in the result cache for a
+        ``result_fetch``. If the cache cannot hold them (disabled or over
+        budget) they are sent after all. Returns the tensors to send and the
+        names withheld.
+        """
+        if selection is None:
+            return result_tensors, []
+        withheld = [name for name in result_tensors if name not in selection]
+        if not withheld or not self._result_cache.put(task_id, {name: result_tensors[name] for name in withheld}):
+            return result_tensors, []
+        return {name: arr for name, arr in result_tensors.items() if name in selection}, withheld
+
+    async def _receive_tensors(self, manifest: dict[str, Any], round_id: Any = None, tensors: dict[str, np.ndarray] | None = None) -> tuple[dict[str, np.ndarray], list[str]]:
+        """Read the binary frames a manifest declares, resolving cached references.
+
+        An entry with ``"cached": true`` has no frame on the socket; its
+        tensor comes from the tensor cache by ``sha256``. A received frame
+        whose entry declares a ``sha256`` is cached if the digest matches.
+        Half-precision frames (reduced wire precision) are upcast to float32.
+        Shared-memory entries have no frame either; they are mapped by
+        :func:`_map_shared_tensors`. Returns the tensors and the digests that
+        missed the cache. Tensors are collected in ``tensors`` if given, so
+        the ones decoded before a bad frame can still go back to the pool.
+        """
+        tensors = {} if tensors is None else tensors
+        cache_misses: list[str] = []
+        for tensor_name, entry in manifest.items():
+            entry = entry if isinstance(entry, dict) else {}
+            if "shm" in entry:
+                continue
+            digest = entry.get("sha256")
+            if entry.get("cached"):
+                cached = self._tensor_cache.get(digest) if isinstance(digest, str) else None
+                if cached is None:
+                    cache_misses.append(str(digest))
+                else:
+                    tensors[tensor_name] = cached
+                continue
+            if "chunks" in entry:
+                tensors[tensor_name] = await self._receive_chunked_tensor(entry["chunks"])
+                raw_bytes = None
+            else:
+                raw_bytes = await self._connection.receive_bytes()
+                tensors[tensor_name] = await self._decode_frame(raw_bytes, entry.get("codec"))
+            if tensors[tensor_name].dtype == np.float16:
+                tensors[tensor_name] = _upcast_float16(tensors[tensor_name], self._buffer_pool)
+            if isinstance(digest, str) and self._tensor_cache.enabled and raw_bytes is not None:
+                if frame_digest(raw_bytes) == digest:
+                    # The cache now owns the array; its buffer never returns to the pool.
+                    if self._tensor_cache.put(digest, tensors[tensor_name], round_id, scope=self.config.server_url):
+                        self._buffer_pool.detach(tensors[tensor_name])
+                else:
+                    logger.warning("Frame %r does not match its declared sha256; not cached", tensor_name)
+        return tensors, cache_misses
+
+    def _extend_session_tensors(self, training_session: Any, manifest: dict[str, Any], tensors: dict[str, np.ndarray]) -> list[str]:
+        """Replace column deltas (entries with ``base_columns``) by the full session matrices.
+
+        Returns the names of tensors the dataset store could not complete.
+        """
+        misses: list[str] = []
+        for tensor_name, entry in manifest.items():
+            if not isinstance(entry, dict) or "base_columns" not in entry:
+                continue
+            columns = tensors[tensor_name]
+            if columns.ndim != 2:
+                raise BinaryFrameProtocolError(f"tensor {tensor_name!r} with base_columns must be 2-D, got shape={columns.shape}")
+            matrix = self._dataset_store.extend((training_session, tensor_name), entry["base_columns"], columns)
+            if matrix is None:
+                misses.append(tensor_name)
+            else:
+                tensors[tensor_name] = matrix
+                # The store copied the columns; the delta's buffer is free again.
+                if matrix is not columns:
+                    self._buffer_pool.release(columns)
+        return misses
+
+    async def _decode_frame(self, raw_bytes: bytes, codec: str | None) -> np.ndarray:
+        """Decode a received frame; a compressed payload is decompressed in a worker thread.
+
+        zlib and lzma release the GIL while they work, so a large payload no
+        longer stalls heartbeats and the other connections. The header is
+        parsed and the pooled array allocated on the event loop.
+        """
+        if codec is None:
+            return _decode_binary_frame(raw_bytes, None, self._buffer_pool)
+        array, payload, bfloat16 = _allocate_frame(memoryview(raw_bytes), self._buffer_pool)
+        await asyncio.to_thread(_fill_frame, array, payload, codec)
+        return _from_bfloat16_bits(array, self._buffer_pool) if bfloat16 else array
+
+    async def _receive_chunked_tensor(self, chunks: int) -> np.ndarray:
+        """Receive a chunked frame: a header-only frame, then ``chunks`` payload frames."""
+        reader = _ChunkedFrameReader(await self._connection.receive_bytes(), self._buffer_pool)
+        for _ in range(chunks):
+            reader.add(await self._connection.receive_bytes())
+        return reader.finish()
+
+    async def _handle_result_fetch(self, msg: dict[str, Any]) -> None:
+        """Reply to a ``result_fetch`` with the withheld tensors of a finished task.
+
+        ``tensors`` optionally names a subset; names no longer cached
+        (expired, evicted or never withheld) are listed in ``missing``.
+        """
+        task_id = msg.get("task_id", "")
+        names = msg.get("tensors")
+        names = names if isinstance(names, list) and all(isinstance(name, str) for name in names) else None
+        found, missing = self._result_cache.get(task_id, names)
+        if missing or not found:
+            logger.warning("Result fetch for task %s: missing %s", task_id, missing or "all tensors")
+        tensor_manifest, frames, packed = await self._encode_result_tensors(found)
+        reply: dict[str, Any] = {
+            "type": MSG_TYPE_RESULT_TENSORS,
             "task_id": task_id,
-            "candidate_id": result_dict.get("candidate_id", 0),
-            "candidate_uuid": result_dict.get("candidate_uuid", ""),
-            "correlation": result_dict.get("correlation", DEFAULT_CORRELATION),
-            "success": result_dict.get("success", False),
-            "epochs_completed": result_dict.get("epochs_completed", NO_EPOCHS_COMPLETED),
-            "activation_name": result_dict.get("activation_name", ""),
-            "all_correlations": result_dict.get("all_correlations", []),
-            "numerator": result_dict.get("numerator", DEFAULT_NUMERATOR),
-            "denominator": result_dict.get("denominator", DEFAULT_DENOMINATOR),
-            "best_corr_idx": result_dict.get("best_corr_idx", NO_BEST_CORR_IDX),
-            "error_message": result_dict.get("error_message"),
             "tensor_manifest": tensor_manifest,
+            "missing": missing,
+            "wire_precision": self._wire_precision,
         }
-        await self._connection.send_json(result_msg)
-
-        # Send binary tensor frames
+        if packed:
+            reply["packed_frames"] = True
+        await self._send_result(reply, frames)
+
+    async def _encode_result_tensors(self, result_tensors: dict[str, np.ndarray]) -> tuple[dict[str, Any], list[FrameData], bool]:
+        """Encode result tensors; returns the manifest, the frames and whether they are packed into one."""
+        tensor_manifest: dict[str, Any] = {}
+        frames: list[FrameData] = []
+        for name, arr in result_tensors.items():
+            tensor_manifest[name], frame = await self._encode_result_tensor(name, arr)
+            frames.append(frame)
+        if self._packed_results and frames:
+            return tensor_manifest, [_pack_result_fragments(list(tensor_manifest), frames)], True
+        return tensor_manifest, frames, False
+
+    async def _encode_result_tensor(self, name: str, array: np.ndarray) -> tuple[dict[str, Any], FrameData]:
+        """Encode one result tensor at the negotiated wire precision and codec.
+
+        Only ``REDUCED_PRECISION_RESULT_TENSORS`` are narrowed, into a
+        pooled buffer; compression is applied when it pays off, in a worker
+        thread so the event loop keeps serving heartbeats meanwhile.
+        """
+        dtype_name = str(array.dtype)
+        narrowed = self._wire_precision != WIRE_PRECISION_FLOAT32 and name in REDUCED_PRECISION_RESULT_TENSORS and array.dtype.kind == "f"
+        if narrowed:
+            array, dtype_name = _narrow_for_wire(array, self._wire_precision, self._buffer_pool)
+        entry: dict[str, Any] = {"shape": list(array.shape), "dtype": dtype_name}
+        frame: FrameData | None = None
+        if self._result_codec is not None:
+            frame = await asyncio.to_thread(_encode_compressed_frame, array, self._result_codec, self.config.frame_codec_level, dtype_name)
+            if frame is not None:
+                entry["codec"] = self._result_codec
+        if frame is None:
+            frame = _encode_frame_fragments(array, dtype_name)
+        # A joined frame holds its own copy of the payload; a fragmented one
+        # views the narrowed buffer until _send_message_group releases it.
+        if narrowed and isinstance(frame, bytes):
+            self._buffer_pool.release(array)
+        return entry, frame
+
+    async def _send_failures(
+        self,
+        entries: list[tuple[str, dict[str, Any]]],
+        error_message: str,
+        *,
+        cache_miss: list[str] | None = None,
+        session_miss: list[str] | None = None,
+    ) -> None:
+        """Send a failure ``task_result`` for every candidate of a task.
+
+        ``cache_miss`` lists tensor digests the server must resend in full;
+        ``session_miss`` names tensors it must resend with ``base_columns: 0``.
+        """
+        for entry_task_id, entry_data in entries:
+            msg = _build_task_failure_message(task_id=entry_task_id, candidate_data=entry_data, error_message=error_message)
+            if cache_miss:
+                msg["cache_miss"] = cache_miss
+            if session_miss:
+                msg["session_miss"] = session_miss
+            await self._send_result(msg)
+
+    async def _run_training(
+        self,
+        candidate_data: dict[str, Any],
+        training_params: dict[str, Any],
+        tensors: dict[str, np.ndarray],
+    ) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """Run ``_execute_task`` on the agent's training backend."""
+        return await self._backend.run(_execute_task, candidate_data, training_params, tensors)
+
+    async def _run_training_batch(
+        self,
+        candidates: list[dict[str, Any]],
+        training_params: dict[str, Any],
+        tensors: dict[str, np.ndarray],
+    ) -> list[tuple[dict[str, Any], dict[str, np.ndarray]]]:
+        """Run ``_execute_batch`` (vectorized multi-candidate training) on the training backend."""
+        return await self._backend.run(_execute_batch, candidates, training_params, tensors)
+
+    async def _send_result(self, msg: dict[str, Any], frames: list[FrameData] | tuple[FrameData, ...] = ()) -> None:
+        """Hand a task_result group to the outbox sender.
+
+        Waits only while the outbox is full. Without a running sender (the
+        handler driven outside the connection loop) the group is sent inline.
+        With session resume, a task_result is first kept for replay; while
+        the worker is between connections it is only kept.
+        """
+        frames = list(frames)
+        kept = False
+        if self._session_resume and msg.get("type") == MSG_TYPE_TASK_RESULT:
+            kept = self._result_replay.add(msg.get("task_id", ""), msg, frames, sum(_frame_nbytes(frame) for frame in frames))
+        if self._outbox_sender is not None and not self._outbox_sender.done():
+            await self._outbox.put(msg, frames)
+        elif kept and not self._registered:
+            logger.info("Connection down; task %s result kept for replay", msg.get("task_id", ""))
+        else:
+            await self._send_message_group(msg, frames)
+
+    async def _replay_results(self) -> None:
+        """Queue the unacknowledged results the server asked for at registration."""
+        pending, self._pending_replay = self._pending_replay, []
+        if pending:
+            logger.info("Replaying %d unacknowledged result(s)", len(pending))
+        for msg, frames in pending:
+            await self._outbox.put(msg, frames)
+
+    def _release_acked_result(self, task_id: str) -> None:
+        """Forget an acknowledged result and return its pooled buffers."""
+        group = self._result_replay.ack(task_id)
+        if group is not None:
+            for frame in group[1]:
+                for part in _frame_parts(frame):
+                    self._buffer_pool.release(part)
+
+    async def _send_message_group(self, msg: dict[str, Any], frames: list[FrameData] | tuple[FrameData, ...] = ()) -> None:
+        """Send a JSON message and its trailing binary frames as one uninterrupted group."""
+        async with self._send_lock:
+            await self._connection.send_json(msg)
+            for frame in frames:
+                await self._connection.send_bytes(frame)
+        # Sending masks (copies) every payload, so pooled buffers behind
+        # fragmented frames can be reused now — unless the group is kept
+        # for replay, then they go back once it is acknowledged.
+        if self._result_replay.holds(msg):
+            return
         for frame in frames:
-            await self._connection.send_bytes(frame)
+            for part in _frame_parts(frame):
+                self._buffer_pool.release(part)
 
-        logger.info(
-            "Sent result for task %s (corr=%.4f, success=%s)",
-            task_id,
-            result_dict.get("correlation", DEFAULT_CORRELATION),
-            result_dict.get("success", False),
-        )
-        # METRICS-MON R1.3: a returned-with-success result counts toward
-        # ``tasks_completed``; everything else (timeout, manifest reject,
-        # exception) counts as failed via the surrounding try/finally.
-        return bool(result_dict.get("success", False))
-
-    @staticmethod
-    def _build_capabilities() -> dict[str, Any]:
+    def _build_capabilities(self) -> dict[str, Any]:
         """Collect worker capability metadata."""
         import torch
 
         gpu = torch.cuda.is_available()
         return {
             "cpu_cores": os.cpu_count() or 1,
+            "task_slots": self.config.task_slots,
+            "prefetch_tasks": self.config.prefetch_tasks,
+            "training_backend": self.config.training_backend,
+            "thread_layout": dataclasses.asdict(self._backend.layout),
+            "candidate_batch": MAX_CANDIDATE_BATCH,
+            "tensor_cache_bytes": self.config.tensor_cache_bytes,
+            "dataset_store_bytes": self.config.dataset_store_bytes,
+            "result_cache_bytes": self.config.result_cache_bytes,
+            "frame_codecs": list(FRAME_CODECS),
+            "wire_precisions": list(VALID_WIRE_PRECISIONS),
+            "wire_precision": self.config.wire_precision,
+            "max_message_bytes": self.config.max_message_bytes,
+            "frame_chunks": MAX_FRAME_CHUNKS,
+            "packed_results": True,
+            "task_credit": True,
+            "session_resume": self._result_replay.enabled,
             "gpu": gpu,
             "gpu_name": torch.cuda.get_device_name(0) if gpu else None,
             "python_version": platform.python_version(),
@@ -504,10 +1247,60 @@ def _execute_task(
     training_params: dict[str, Any],
     tensors: dict[str, np.ndarray],
 ) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
-    """Wrapper for task_executor.execute_training_task (called in thread)."""
+    """Wrapper for task_executor.execute_training_task (runs on the training backend).
+
+    A requested ``correlation_trace`` is packaged here, off the event loop.
+    """
     from juniper_cascor_worker.task_executor import execute_training_task
 
-    return execute_training_task(candidate_data, training_params, tensors)
+    return apply_trace_request(execute_training_task(candidate_data, training_params, tensors), training_params.get("correlation_trace"))
+
+
+def _warm_up_backend(_task_data: Any, _training_params: dict[str, Any], _tensors: dict[str, np.ndarray]) -> dict[str, Any]:
+    """Wrapper for task_executor.warm_up (runs on the training backend)."""
+    from juniper_cascor_worker.task_executor import warm_up
+
+    return warm_up()
+
+
+def _execute_batch(
+    candidates: list[dict[str, Any]],
+    training_params: dict[str, Any],
+    tensors: dict[str, np.ndarray],
+) -> list[tuple[dict[str, Any], dict[str, np.ndarray]]]:
+    """Wrapper for batch_executor.execute_training_batch (runs on the training backend)."""
+    from juniper_cascor_worker.batch_executor import execute_training_batch
+
+    spec = training_params.get("correlation_trace")
+    return [apply_trace_request(result, spec) for result in execute_training_batch(candidates, training_params, tensors)]
+
+
+def _available_memory_bytes() -> int | None:
+    """Memory the worker may still allocate, or None where it cannot be read.
+
+    ``MemAvailable`` from ``/proc/meminfo``, capped by the room left under a
+    cgroup v2 ``memory.max`` (a container's limit is usually far below the
+    host's free memory). Never raises.
+    """
+    available: int | None = None
+    try:
+        with open(PROC_MEMINFO_PATH) as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(CGROUP_MEMORY_MAX_PATH) as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open(CGROUP_MEMORY_CURRENT_PATH) as f:
+                room = max(int(limit) - int(f.read()), 0)
+            available = room if available is None else min(available, room)
+    except (OSError, ValueError):
+        pass
+    return available
 
 
 def _sample_gpu_utilization_pct() -> float | None:
@@ -594,7 +1387,7 @@ def _parse_json(raw: str) -> dict[str, Any] | None:
 REQUIRED_TENSOR_NAMES: tuple[str, ...] = ("candidate_input", "residual_error")
 
 
-def _validate_tensor_manifest(manifest: Any) -> str | None:
+def _validate_tensor_manifest(manifest: Any, *, training_session: Any = None) -> str | None:
     """Validate a ``tensor_manifest`` payload, returning an error string or None.
 
     CW-07 (Phase 4E): the cascor server sends a tensor_manifest dict
@@ -602,6 +1395,9 @@ def _validate_tensor_manifest(manifest: Any) -> str | None:
     not a dict, is empty, or omits a required tensor name, the worker has no
     safe way to receive frames and must reject the task instead of blocking
     forever on ``receive_bytes()``.
+
+    Entries with ``base_columns`` (column deltas) need the task's
+    ``training_session``.
     """
     if not isinstance(manifest, dict):
         return f"manifest is not a dict (got {type(manifest).__name__})"
@@ -610,9 +1406,158 @@ def _validate_tensor_manifest(manifest: Any) -> str | None:
     missing_required = [name for name in REQUIRED_TENSOR_NAMES if name not in manifest]
     if missing_required:
         return f"manifest missing required tensor(s): {missing_required}"
+    for name, entry in manifest.items():
+        error = _validate_manifest_entry(name, entry if isinstance(entry, dict) else {}, training_session)
+        if error is not None:
+            return error
     return None
 
 
+def _validate_manifest_entry(name: str, entry: dict[str, Any], training_session: Any) -> str | None:
+    """Validate one manifest entry by how its tensor arrives, then any dataset-store delta on top."""
+    if "shm" in entry:
+        error = _validate_shm_entry(name, entry)
+    elif entry.get("cached"):
+        error = _validate_cached_entry(name, entry)
+    else:
+        error = _validate_frame_entry(name, entry)
+    if error is None and "base_columns" in entry:
+        error = _validate_store_entry(name, entry, training_session)
+    return error
+
+
+def _validate_frame_entry(name: str, entry: dict[str, Any]) -> str | None:
+    """A tensor sent as one binary frame, optionally compressed, or as uncompressed chunks."""
+    codec = entry.get("codec")
+    if codec is not None and codec not in FRAME_CODECS:
+        return f"tensor {name!r} uses unsupported codec {codec!r}"
+    if "chunks" in entry:
+        chunks = entry["chunks"]
+        if isinstance(chunks, bool) or not isinstance(chunks, int) or not 1 <= chunks <= MAX_FRAME_CHUNKS:
+            return f"tensor {name!r} has invalid chunks={chunks!r} (1-{MAX_FRAME_CHUNKS})"
+        if codec is not None:
+            return f"tensor {name!r} cannot combine chunks with codec or cached"
+    return None
+
+
+def _validate_cached_entry(name: str, entry: dict[str, Any]) -> str | None:
+    """A reference to a tensor already in the tensor cache; no frame follows."""
+    codec = entry.get("codec")
+    if codec is not None and codec not in FRAME_CODECS:
+        return f"tensor {name!r} uses unsupported codec {codec!r}"
+    if "chunks" in entry:
+        return f"tensor {name!r} cannot combine chunks with codec or cached"
+    return None
+
+
+def _validate_shm_entry(name: str, entry: dict[str, Any]) -> str | None:
+    """A tensor placed in a shared-memory segment; no frame follows."""
+    if not valid_segment_name(entry["shm"]):
+        return f"tensor {name!r} has invalid shm segment name {entry['shm']!r}"
+    offset = entry.get("offset", 0)
+    if isinstance(offset, bool) or not isinstance(offset, int) or offset < 0:
+        return f"tensor {name!r} has invalid shm offset={offset!r}"
+    shape = entry.get("shape")
+    if not isinstance(shape, list) or not all(isinstance(dim, int) and not isinstance(dim, bool) for dim in shape):
+        return f"tensor {name!r} has invalid shm shape={shape!r}"
+    if not isinstance(entry.get("dtype"), str):
+        return f"tensor {name!r} has invalid shm dtype={entry.get('dtype')!r}"
+    if entry.get("codec") is not None or entry.get("cached") or "chunks" in entry:
+        return f"tensor {name!r} cannot combine shm with codec, cached or chunks"
+    return None
+
+
+def _validate_store_entry(name: str, entry: dict[str, Any], training_session: Any) -> str | None:
+    """A column delta the dataset store appends to the session's matrix."""
+    base_columns = entry["base_columns"]
+    if isinstance(base_columns, bool) or not isinstance(base_columns, int) or base_columns < 0:
+        return f"tensor {name!r} has invalid base_columns={base_columns!r}"
+    if not isinstance(training_session, str) or not training_session:
+        return f"tensor {name!r} has base_columns but the task has no training_session"
+    return None
+
+
+def _map_shared_tensors(manifest: dict[str, Any], pool: BufferPool | None = None) -> dict[str, np.ndarray]:
+    """Map every shared-memory manifest entry (no copy).
+
+    The declared shape and dtype pass the same SEC-18 checks as a frame
+    header; bfloat16 regions are widened (copied) to float32 and float16
+    ones upcast, like their frame counterparts.
+    """
+    tensors: dict[str, np.ndarray] = {}
+    for tensor_name, entry in manifest.items():
+        if not isinstance(entry, dict) or "shm" not in entry:
+            continue
+        shape = _check_frame_shape(tuple(entry["shape"]))
+        dtype, bfloat16 = _resolve_frame_dtype(entry["dtype"])
+        array = map_shared_tensor(entry["shm"], entry.get("offset", 0), shape, dtype)
+        if bfloat16:
+            array = _from_bfloat16_bits(array, pool)
+        elif array.dtype == np.float16:
+            array = _upcast_float16(array, pool)
+        tensors[tensor_name] = array
+    return tensors
+
+
+def _candidate_batch_entries(batch: Any, task_id: str) -> list[tuple[str, dict[str, Any]]]:
+    """Resolve a ``candidate_batch`` into ``(task_id, candidate_data)`` pairs.
+
+    Tolerant of malformed entries (they are rejected by
+    :func:`_validate_candidate_batch`, but still need an envelope to report
+    the failure against). An entry without its own ``task_id`` inherits the
+    batch message's.
+    """
+    entries: list[tuple[str, dict[str, Any]]] = []
+    for entry in batch if isinstance(batch, list) else []:
+        entry = entry if isinstance(entry, dict) else {}
+        candidate_data = entry.get("candidate_data")
+        candidate_data = dict(candidate_data) if isinstance(candidate_data, dict) else {}
+        candidate_data["candidate_index"] = entry.get("candidate_index", 0)
+        entries.append((entry.get("task_id", task_id), candidate_data))
+    return entries
+
+
+def _validate_candidate_batch(batch: Any) -> str | None:
+    """Validate a ``candidate_batch`` payload, returning an error string or None."""
+    if not isinstance(batch, list):
+        return f"candidate_batch is not a list (got {type(batch).__name__})"
+    if not batch:
+        return "candidate_batch is empty"
+    if len(batch) > MAX_CANDIDATE_BATCH:
+        return f"candidate_batch has {len(batch)} entries (max {MAX_CANDIDATE_BATCH})"
+    for i, entry in enumerate(batch):
+        if not isinstance(entry, dict) or not isinstance(entry.get("candidate_data"), dict):
+            return f"candidate_batch[{i}] has no candidate_data object"
+    return None
+
+
+def _build_task_result_message(*, task_id: str, result_dict: dict[str, Any], tensor_manifest: dict[str, Any]) -> dict[str, Any]:
+    """Build the ``task_result`` payload for a candidate that finished training.
+
+    With a requested ``correlation_trace`` the trace travels as the
+    ``all_correlations`` result tensor; the message records the policy.
+    """
+    msg = {
+        "type": MSG_TYPE_TASK_RESULT,
+        "task_id": task_id,
+        "candidate_id": result_dict.get("candidate_id", 0),
+        "candidate_uuid": result_dict.get("candidate_uuid", ""),
+        "correlation": result_dict.get("correlation", DEFAULT_CORRELATION),
+        "success": result_dict.get("success", False),
+        "epochs_completed": result_dict.get("epochs_completed", NO_EPOCHS_COMPLETED),
+        "activation_name": result_dict.get("activation_name", ""),
+        "all_correlations": result_dict.get("all_correlations", []),
+        "numerator": result_dict.get("numerator", DEFAULT_NUMERATOR),
+        "denominator": result_dict.get("denominator", DEFAULT_DENOMINATOR),
+        "best_corr_idx": result_dict.get("best_corr_idx", NO_BEST_CORR_IDX),
+        "error_message": result_dict.get("error_message"),
+        "tensor_manifest": tensor_manifest,
+    }
+    if "correlation_trace" in result_dict:
+        msg["correlation_trace"] = result_dict["correlation_trace"]
+    return msg
+
+
 def _build_task_failure_message(
     *,
     task_id: str,
@@ -665,6 +1610,102 @@ def _encode_binary_frame(array: np.ndarray) -> bytes:
     return _SharedBinaryFrame.encode(array)
 
 
+def _encode_frame_fragments(array: np.ndarray, dtype_name: str | None = None) -> FrameData:
+    """Encode ``array`` as a raw binary frame without copying a large payload.
+
+    A payload of ``SCATTER_GATHER_MIN_BYTES`` or more is returned as
+    ``[header, memoryview]`` for :meth:`WorkerConnection.send_bytes` to send
+    as fragments of one message; the bytes on the wire are those of
+    :func:`_encode_binary_frame`. ``dtype_name`` overrides the header dtype
+    (reduced wire precision). The array must not change until it is sent.
+    """
+    array = np.ascontiguousarray(array)
+    if array.nbytes < SCATTER_GATHER_MIN_BYTES:
+        if dtype_name is None or dtype_name == str(array.dtype):
+            return _encode_binary_frame(array)
+        return _encode_frame_header(array.shape, dtype_name) + array.tobytes()
+    return [_encode_frame_header(array.shape, dtype_name or str(array.dtype)), memoryview(array).cast("B")]
+
+
+def _frame_nbytes(frame: FrameData) -> int:
+    """Length of an encoded frame, whether one buffer or a list of fragments."""
+    if isinstance(frame, (bytes, bytearray, memoryview)):
+        return memoryview(frame).nbytes
+    return sum(memoryview(part).nbytes for part in frame)
+
+
+def _frame_parts(frame: FrameData) -> list[bytes | memoryview]:
+    """The buffers of an encoded frame, in wire order."""
+    if isinstance(frame, (bytes, bytearray, memoryview)):
+        return [frame]
+    return list(frame)
+
+
+def _packed_frame_toc(names: list[str], frames: list[FrameData]) -> bytes:
+    """Build the table of contents that precedes the frames of a packed message."""
+    length_format = BINARY_FRAME_HEADER_LENGTH_FORMAT
+    toc = [struct.pack(length_format, len(frames))]
+    for name, frame in zip(names, frames):
+        encoded = name.encode(BINARY_FRAME_DTYPE_ENCODING)
+        toc += [struct.pack(length_format, len(encoded)), encoded, struct.pack(length_format, _frame_nbytes(frame))]
+    return b"".join(toc)
+
+
+def _pack_result_frames(names: list[str], frames: list[FrameData]) -> bytes:
+    """Pack encoded frames into one message behind a table of contents.
+
+    Layout (all lengths ``<I``): tensor count, then per tensor the UTF-8
+    name length, the name and the frame length; then the frames in the same
+    order.
+    """
+    return b"".join([_packed_frame_toc(names, frames), *(part for frame in frames for part in _frame_parts(frame))])
+
+
+def _pack_result_fragments(names: list[str], frames: list[FrameData]) -> FrameData:
+    """Pack frames like :func:`_pack_result_frames`, keeping large payloads as fragments.
+
+    If every frame is a single buffer the message is joined; otherwise the
+    table of contents and the frames' parts are returned as fragments, so
+    no payload is copied.
+    """
+    if all(isinstance(frame, (bytes, bytearray, memoryview)) for frame in frames):
+        return _pack_result_frames(names, frames)
+    return [_packed_frame_toc(names, frames), *(part for frame in frames for part in _frame_parts(frame))]
+
+
+def _encode_compressed_frame(array: np.ndarray, codec: str, level: int, dtype_name: str | None = None) -> bytes | None:
+    """Encode ``array`` as a frame whose payload is compressed with ``codec``.
+
+    The header is the regular one (ndim, shape, dtype). Returns None when
+    compression does not pay off, so the caller sends the raw frame.
+    """
+    payload = compress_payload(array, codec, level)
+    if payload is None:
+        return None
+    return _encode_frame_header(array.shape, dtype_name or str(array.dtype)) + payload
+
+
+def _encode_frame_header(shape: tuple[int, ...], dtype_name: str) -> bytes:
+    """Encode the ndim/shape/dtype header of a binary frame."""
+    dtype_bytes = dtype_name.encode(BINARY_FRAME_DTYPE_ENCODING)
+    header = struct.pack(BINARY_FRAME_HEADER_LENGTH_FORMAT, len(shape))
+    header += struct.pack(f"<{len(shape)}I", *shape)
+    header += struct.pack(BINARY_FRAME_HEADER_LENGTH_FORMAT, len(dtype_bytes)) + dtype_bytes
+    return header
+
+
+def _narrow_for_wire(array: np.ndarray, precision: str, pool: BufferPool | None = None) -> tuple[np.ndarray, str]:
+    """Convert a float tensor to the reduced wire ``precision``; returns the array and its header dtype.
+
+    With ``pool`` the narrowed array is allocated from the pool.
+    """
+    if precision == WIRE_PRECISION_BFLOAT16:
+        return _to_bfloat16_bits(array, pool), WIRE_PRECISION_BFLOAT16
+    narrowed = pool.empty(array.shape, np.float16) if pool is not None else np.empty(array.shape, dtype=np.float16)
+    narrowed[...] = array
+    return narrowed, WIRE_PRECISION_FLOAT16
+
+
 # SEC-18: Bounds for attacker-controlled binary-frame headers. A crafted
 # frame could otherwise make ``np.frombuffer().reshape(shape)`` attempt a
 # huge allocation and exhaust worker memory. The limits here are generous
@@ -679,21 +1720,119 @@ class BinaryFrameProtocolError(Exception):
     """Raised when a binary frame header violates declared bounds."""
 
 
-def _decode_binary_frame(data: bytes) -> np.ndarray:
+def _decode_binary_frame(data: bytes, codec: str | None = None, pool: BufferPool | None = None) -> np.ndarray:
     """Decode a binary frame into a numpy array (matches Phase 1b BinaryFrame.decode).
 
     Validates every attacker-controlled field in the header (ndim, shape
-    extents, dtype length) before calling ``np.frombuffer`` so a malformed
-    or malicious frame cannot trigger an OOM allocation (SEC-18).
+    extents, dtype length) and the payload length before allocating, so a
+    malformed or malicious frame cannot trigger an OOM allocation (SEC-18).
+
+    The header and payload are read through a ``memoryview`` so nothing is
+    sliced out of ``data``; the payload is copied exactly once, into a fresh
+    aligned, writable array that ``torch.from_numpy`` can share.
+
+    With ``codec`` (from the manifest entry) the payload is decompressed
+    into that array; decompression stops at the size the header declares,
+    so the SEC-18 bounds hold for the decompressed data too.
+
+    A ``"bfloat16"`` frame (reduced wire precision) is widened to float32.
+    With ``pool`` the array is allocated from (and any intermediate returned
+    to) the agent's buffer pool.
+    """
+    array, payload, bfloat16 = _allocate_frame(memoryview(data), pool)
+    _fill_frame(array, payload, codec)
+    return _from_bfloat16_bits(array, pool) if bfloat16 else array
+
+
+def _allocate_frame(view: memoryview, pool: BufferPool | None = None) -> tuple[np.ndarray, memoryview, bool]:
+    """Validate a frame header and allocate its array; returns the array, the payload and whether it is bfloat16."""
+    shape, dtype, bfloat16, offset = _parse_frame_header(view)
+    array = pool.empty(shape, dtype) if pool is not None else np.empty(shape, dtype=dtype)
+    return array, view[offset:], bfloat16
+
+
+def _fill_frame(array: np.ndarray, payload: memoryview, codec: str | None = None) -> None:
+    """Copy a frame payload into ``array``, decompressing it with ``codec`` if given.
+
+    Touches nothing but its arguments, so it may run in a worker thread.
+    """
+    if codec is not None:
+        try:
+            decompress_into(payload, codec, array)
+        except FrameCodecError as e:
+            raise BinaryFrameProtocolError(f"binary frame {e}") from e
+    else:
+        if payload.nbytes != array.nbytes:
+            raise BinaryFrameProtocolError(f"binary frame payload is {payload.nbytes} bytes, expected {array.nbytes} for shape={array.shape} dtype={array.dtype}")
+        array.reshape(-1)[...] = np.frombuffer(payload, dtype=array.dtype)
+
+
+class _ChunkedFrameReader:
+    """Assembles a chunked frame into its preallocated destination array.
+
+    The header-only first frame is validated like any other (SEC-18) and
+    sizes the array; each payload chunk is then copied straight into place,
+    so the full payload is never buffered separately.
+    """
+
+    def __init__(self, header: bytes, pool: BufferPool | None = None) -> None:
+        view = memoryview(header)
+        shape, dtype, self._bfloat16, offset = _parse_frame_header(view)
+        if offset != view.nbytes:
+            raise BinaryFrameProtocolError("chunked frame header must not carry payload bytes")
+        self._pool = pool
+        self._array = pool.empty(shape, dtype) if pool is not None else np.empty(shape, dtype=dtype)
+        self._target = self._array.reshape(-1).view(np.uint8)
+        self._filled = 0
+
+    def add(self, chunk: bytes) -> None:
+        end = self._filled + len(chunk)
+        if end > self._target.nbytes:
+            raise BinaryFrameProtocolError(f"chunked frame payload exceeds the declared {self._target.nbytes} bytes")
+        self._target[self._filled : end] = np.frombuffer(chunk, dtype=np.uint8)
+        self._filled = end
+
+    def finish(self) -> np.ndarray:
+        if self._filled != self._target.nbytes:
+            raise BinaryFrameProtocolError(f"chunked frame payload is {self._filled} bytes, expected {self._target.nbytes}")
+        return _from_bfloat16_bits(self._array, self._pool) if self._bfloat16 else self._array
+
+
+def _parse_frame_header(view: memoryview) -> tuple[tuple[int, ...], np.dtype, bool, int]:
+    """Parse and bounds-check a frame header (SEC-18).
+
+    Returns the shape, the payload dtype (``uint16`` bit patterns for
+    bfloat16), whether the frame is bfloat16, and the payload offset.
     """
     offset = 0
-    (ndim,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, data, offset)
-    if ndim < 0 or ndim > BINARY_FRAME_MAX_NDIM:
-        raise BinaryFrameProtocolError(f"binary frame ndim={ndim} exceeds maximum {BINARY_FRAME_MAX_NDIM}")
-    offset += BINARY_FRAME_HEADER_LENGTH_BYTES
-    shape = struct.unpack_from(f"<{ndim}I", data, offset)
-    offset += ndim * BINARY_FRAME_HEADER_LENGTH_BYTES
+    try:
+        (ndim,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, view, offset)
+        if ndim < 0 or ndim > BINARY_FRAME_MAX_NDIM:
+            raise BinaryFrameProtocolError(f"binary frame ndim={ndim} exceeds maximum {BINARY_FRAME_MAX_NDIM}")
+        offset += BINARY_FRAME_HEADER_LENGTH_BYTES
+        shape = _check_frame_shape(struct.unpack_from(f"<{ndim}I", view, offset))
+        offset += ndim * BINARY_FRAME_HEADER_LENGTH_BYTES
+
+        (dtype_len,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, view, offset)
+        if dtype_len < 0 or dtype_len > BINARY_FRAME_MAX_DTYPE_LEN:
+            raise BinaryFrameProtocolError(f"binary frame dtype_len={dtype_len} exceeds maximum {BINARY_FRAME_MAX_DTYPE_LEN}")
+        offset += BINARY_FRAME_HEADER_LENGTH_BYTES
+        if offset + dtype_len > view.nbytes:
+            raise BinaryFrameProtocolError(f"binary frame header is truncated: dtype needs {dtype_len} bytes at offset {offset}")
+        dtype_str = bytes(view[offset : offset + dtype_len]).decode(BINARY_FRAME_DTYPE_ENCODING)
+    except struct.error as e:
+        raise BinaryFrameProtocolError(f"binary frame header is truncated: {e}") from e
+    except UnicodeDecodeError as e:
+        raise BinaryFrameProtocolError(f"binary frame dtype is not valid {BINARY_FRAME_DTYPE_ENCODING}") from e
+    offset += dtype_len
+    dtype, bfloat16 = _resolve_frame_dtype(dtype_str)
+    return shape, dtype, bfloat16, offset
+
 
+def _check_frame_shape(shape: tuple[int, ...]) -> tuple[int, ...]:
+    """Bounds-check a declared shape (SEC-18 ndim and total-element limits)."""
+    if len(shape) > BINARY_FRAME_MAX_NDIM:
+        raise BinaryFrameProtocolError(f"binary frame ndim={len(shape)} exceeds maximum {BINARY_FRAME_MAX_NDIM}")
     total_elements = 1
     for dim in shape:
         if dim < 0:
@@ -701,16 +1840,55 @@ def _decode_binary_frame(data: bytes) -> np.ndarray:
         total_elements *= dim
         if total_elements > BINARY_FRAME_MAX_TOTAL_ELEMENTS:
             raise BinaryFrameProtocolError(f"binary frame total_elements>{BINARY_FRAME_MAX_TOTAL_ELEMENTS} (shape={shape})")
+    return shape
 
-    (dtype_len,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, data, offset)
-    if dtype_len < 0 or dtype_len > BINARY_FRAME_MAX_DTYPE_LEN:
-        raise BinaryFrameProtocolError(f"binary frame dtype_len={dtype_len} exceeds maximum {BINARY_FRAME_MAX_DTYPE_LEN}")
-    offset += BINARY_FRAME_HEADER_LENGTH_BYTES
-    dtype_str = data[offset : offset + dtype_len].decode(BINARY_FRAME_DTYPE_ENCODING)
-    offset += dtype_len
-    dtype = np.dtype(dtype_str)
-    array = np.frombuffer(data[offset:], dtype=dtype).reshape(shape)
-    return array.copy()
+
+def _resolve_frame_dtype(dtype_str: str) -> tuple[np.dtype, bool]:
+    """Resolve a declared dtype name; bfloat16 maps to its ``uint16`` bit patterns."""
+    if len(dtype_str) > BINARY_FRAME_MAX_DTYPE_LEN:
+        raise BinaryFrameProtocolError(f"binary frame dtype_len={len(dtype_str)} exceeds maximum {BINARY_FRAME_MAX_DTYPE_LEN}")
+    # bfloat16 has no numpy dtype: the payload holds uint16 bit patterns.
+    bfloat16 = dtype_str == WIRE_PRECISION_BFLOAT16
+    try:
+        dtype = np.dtype(np.uint16 if bfloat16 else dtype_str)
+    except TypeError as e:
+        raise BinaryFrameProtocolError(f"binary frame dtype {dtype_str!r} is not a numpy dtype") from e
+    if dtype.hasobject:
+        raise BinaryFrameProtocolError(f"binary frame dtype {dtype_str!r} is not a plain numeric dtype")
+    return dtype, bfloat16
+
+
+def _to_bfloat16_bits(array: np.ndarray, pool: BufferPool | None = None) -> np.ndarray:
+    """Round float32 values to bfloat16 (nearest-even), returned as their uint16 bit patterns."""
+    bits = np.ascontiguousarray(array, dtype=np.float32).view(np.uint32)
+    rounded = pool.empty(bits.shape, np.uint16) if pool is not None else np.empty(bits.shape, dtype=np.uint16)
+    rounded[...] = (bits + 0x7FFF + ((bits >> 16) & 1)) >> 16
+    # Rounding could carry a NaN's mantissa into the exponent; keep it a quiet NaN.
+    rounded[np.isnan(array)] = 0x7FC0
+    return rounded
+
+
+def _from_bfloat16_bits(bits: np.ndarray, pool: BufferPool | None = None) -> np.ndarray:
+    """Widen bfloat16 bit patterns (uint16) to float32.
+
+    With ``pool`` the result comes from the pool and a pooled ``bits``
+    buffer is returned to it.
+    """
+    widened = pool.empty(bits.shape, np.float32) if pool is not None else np.empty(bits.shape, dtype=np.float32)
+    np.left_shift(bits, 16, out=widened.view(np.uint32), dtype=np.uint32)
+    if pool is not None:
+        pool.release(bits)
+    return widened
+
+
+def _upcast_float16(array: np.ndarray, pool: BufferPool | None = None) -> np.ndarray:
+    """Upcast a float16 tensor to float32, through ``pool`` like :func:`_from_bfloat16_bits`."""
+    if pool is None:
+        return array.astype(np.float32)
+    widened = pool.empty(array.shape, np.float32)
+    widened[...] = array
+    pool.release(array)
+    return widened
 
 
 # ---------------------------------------------------------------------------
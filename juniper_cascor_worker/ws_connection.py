@@ -5,19 +5,128 @@ reconnection. No cascor imports — this is a pure WebSocket client layer.
 """
 
 import asyncio
+import contextlib
 import json
 import logging
+import socket
 import ssl
-from typing import Any
+import time
+import urllib.parse
+import urllib.request
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
 
 import websockets
 from websockets.asyncio.client import ClientConnection
 
-from juniper_cascor_worker.constants import AUTH_HEADER_NAME, DEFAULT_RECONNECT_BACKOFF_BASE, DEFAULT_RECONNECT_BACKOFF_MAX, MAX_JSON_ERROR_PREVIEW_LENGTH, WEBSOCKET_STATE_OPEN, WS_SCHEME_SECURE
+from juniper_cascor_worker.constants import AUTH_HEADER_NAME, DEFAULT_MAX_MESSAGE_BYTES, DEFAULT_RECONNECT_BACKOFF_BASE, DEFAULT_RECONNECT_BACKOFF_MAX, DEFAULT_SEND_BUFFER_BYTES, MAX_JSON_ERROR_PREVIEW_LENGTH, SEND_LOW_WATERMARK_DIVISOR, WEBSOCKET_STATE_OPEN, WS_SCHEME_SECURE
 from juniper_cascor_worker.exceptions import WorkerConnectionError
 
+if TYPE_CHECKING:
+    from juniper_cascor_worker.connection_cache import ConnectionCache
+
 logger = logging.getLogger(__name__)
 
+# A binary message: one buffer, or a sequence of buffers sent as the
+# fragments of a single message (never joined in memory).
+FrameData = bytes | bytearray | memoryview | Sequence[bytes | memoryview]
+
+
+class SendFlowControl:
+    """Queued-bytes accounting, watermarks and latency for outgoing messages.
+
+    ``queued_bytes`` is the payload of every send still in progress: handed
+    to ``send_json`` / ``send_bytes`` and not yet accepted by websockets,
+    which itself waits for the transport buffer to drain below its write
+    limit. Once the queue rises above ``high_watermark`` the flow is
+    unwritable until it drains to ``low_watermark`` (or empties), so a
+    producer awaiting :meth:`wait_writable` is held back while the uplink
+    is saturated instead of piling more results into memory. A
+    ``high_watermark`` of 0 never blocks.
+
+    One instance may outlive several connections, so its counters cover
+    the agent's lifetime.
+    """
+
+    def __init__(self, high_watermark: int = DEFAULT_SEND_BUFFER_BYTES, low_watermark: int | None = None) -> None:
+        self.high_watermark = high_watermark
+        self.low_watermark = high_watermark // SEND_LOW_WATERMARK_DIVISOR if low_watermark is None else low_watermark
+        self._queued = 0
+        self._in_flight = 0
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._unwritable_total = 0
+        self._blocked_total = 0
+        self._blocked_seconds_total = 0.0
+        self._messages_sent = 0
+        self._bytes_sent = 0
+        self._latency_last: float | None = None
+        self._latency_max = 0.0
+        self._latency_total = 0.0
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._queued
+
+    @property
+    def writable(self) -> bool:
+        return self._writable.is_set()
+
+    async def wait_writable(self) -> None:
+        """Return once the queue is below the high watermark (or drained to the low one)."""
+        if self._writable.is_set():
+            return
+        self._blocked_total += 1
+        started = time.monotonic()
+        try:
+            await self._writable.wait()
+        finally:
+            self._blocked_seconds_total += time.monotonic() - started
+
+    @contextlib.contextmanager
+    def sending(self, nbytes: int):
+        """Account one message of ``nbytes`` for as long as its send is in progress."""
+        self._queued += nbytes
+        self._in_flight += 1
+        self._update()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._queued -= nbytes
+            self._in_flight -= 1
+            self._update()
+        self._messages_sent += 1
+        self._bytes_sent += nbytes
+        self._latency_last = elapsed
+        self._latency_max = max(self._latency_max, elapsed)
+        self._latency_total += elapsed
+
+    def metrics(self) -> dict[str, Any]:
+        """Heartbeat fields describing the send queue and per-message latency."""
+        return {
+            "send_queued_bytes": self._queued,
+            "send_high_watermark": self.high_watermark,
+            "send_writable": self.writable,
+            "send_unwritable_total": self._unwritable_total,
+            "send_blocked_total": self._blocked_total,
+            "send_blocked_seconds_total": round(self._blocked_seconds_total, 3),
+            "messages_sent": self._messages_sent,
+            "bytes_sent": self._bytes_sent,
+            "send_latency_last_seconds": None if self._latency_last is None else round(self._latency_last, 4),
+            "send_latency_max_seconds": round(self._latency_max, 4),
+            "send_latency_avg_seconds": round(self._latency_total / self._messages_sent, 4) if self._messages_sent else None,
+        }
+
+    def _update(self) -> None:
+        if self.high_watermark and self._queued > self.high_watermark:
+            if self._writable.is_set():
+                self._writable.clear()
+                self._unwritable_total += 1
+        elif self._queued <= self.low_watermark or not self._in_flight:
+            self._writable.set()
+
 
 class WorkerConnection:
     """Manages a WebSocket connection to the juniper-cascor worker endpoint.
@@ -25,9 +134,13 @@ class WorkerConnection:
     Handles:
     - Connection with API key authentication (``X-API-Key`` header)
     - TLS/mTLS when certificate paths are provided
-    - Sending JSON messages and binary frames
-    - Receiving text and binary messages
+    - Sending JSON messages and binary frames (optionally as fragments)
+    - Receiving text and binary messages, up to ``max_message_size`` bytes
+    - Queued-bytes accounting with high/low watermarks, an awaitable
+      writable signal and per-message send latency (:class:`SendFlowControl`)
     - Exponential backoff reconnection
+    - With a :class:`ConnectionCache`, reuse of the SSL context and the
+      resolved address of earlier connections
     """
 
     def __init__(
@@ -38,6 +151,9 @@ class WorkerConnection:
         tls_key: str | None = None,
         tls_ca: str | None = None,
         receive_timeout: float | None = None,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_BYTES,
+        cache: "ConnectionCache | None" = None,
+        flow: SendFlowControl | None = None,
     ) -> None:
         self._server_url = server_url
         self._api_key = api_key
@@ -45,13 +161,31 @@ class WorkerConnection:
         self._tls_key = tls_key
         self._tls_ca = tls_ca
         self._receive_timeout = receive_timeout
+        self._max_message_size = max_message_size
+        self._cache = cache
+        self.flow = flow if flow is not None else SendFlowControl()
         self._ws: ClientConnection | None = None
+        self._corked = False
 
     @property
     def connected(self) -> bool:
         """Whether the WebSocket is currently open."""
         return self._ws is not None and self._ws.protocol.state.name == WEBSOCKET_STATE_OPEN
 
+    @property
+    def queued_bytes(self) -> int:
+        """Bytes handed to ``send_json`` / ``send_bytes`` and not yet accepted by the socket."""
+        return self.flow.queued_bytes
+
+    @property
+    def writable(self) -> bool:
+        """False while the send queue is above its high watermark."""
+        return self.flow.writable
+
+    async def wait_writable(self) -> None:
+        """Wait until the send queue has drained (see :class:`SendFlowControl`)."""
+        await self.flow.wait_writable()
+
     async def connect(self) -> None:
         """Open a WebSocket connection to the server.
 
@@ -65,7 +199,22 @@ class WorkerConnection:
         if self._api_key:
             headers[AUTH_HEADER_NAME] = self._api_key
 
-        ssl_context = self._build_ssl_context()
+        started = time.monotonic()
+        if self._cache is None:
+            ssl_context = self._build_ssl_context()
+        else:
+            ssl_context = self._cache.ssl_context(self._build_ssl_context, (self._tls_ca, self._tls_cert, self._tls_key))
+
+        # With a cache, connect to the cached address; the URL's host name
+        # still goes into the Host header and TLS server_hostname. Proxied
+        # connections resolve through the proxy, so they are left alone.
+        address: dict[str, Any] = {}
+        url = urllib.parse.urlsplit(self._server_url)
+        if self._cache is not None and url.hostname and not urllib.request.getproxies():
+            port = url.port or (443 if ssl_context is not None else 80)
+            resolved = await self._cache.resolve(url.hostname, port)
+            if resolved is not None:
+                address = {"host": resolved, "port": port}
 
         try:
             self._ws = await websockets.connect(
@@ -73,10 +222,16 @@ class WorkerConnection:
                 additional_headers=headers,
                 origin=None,
                 ssl=ssl_context,
+                max_size=self._max_message_size,
+                **address,
             )
             logger.info("Connected to %s", self._server_url)
         except Exception as e:
+            if address:
+                self._cache.forget_address(url.hostname, address["port"])
             raise WorkerConnectionError(f"Failed to connect to {self._server_url}: {e}") from e
+        if self._cache is not None:
+            self._cache.record_connect(time.monotonic() - started)
 
     async def connect_with_retry(
         self,
@@ -140,13 +295,55 @@ class WorkerConnection:
         """Send a JSON message."""
         if not self.connected:
             raise WorkerConnectionError("Not connected")
-        await self._ws.send(json.dumps(msg))
+        self._cork_for_iteration()
+        text = json.dumps(msg)
+        with self.flow.sending(len(text)):
+            await self._ws.send(text)
+
+    async def send_bytes(self, data: FrameData) -> None:
+        """Send a binary frame.
 
-    async def send_bytes(self, data: bytes) -> None:
-        """Send a binary frame."""
+        A sequence of buffers is sent as the fragments of one message, so a
+        header and a view of a large array reach the wire without first
+        being concatenated.
+        """
         if not self.connected:
             raise WorkerConnectionError("Not connected")
-        await self._ws.send(data)
+        self._cork_for_iteration()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            with self.flow.sending(memoryview(data).nbytes):
+                await self._ws.send(data)
+        else:
+            parts = list(data)
+            with self.flow.sending(sum(memoryview(part).nbytes for part in parts)):
+                await self._ws.send(parts)
+
+    def _cork_for_iteration(self) -> None:
+        """Hold back partial TCP segments until this event-loop iteration ends.
+
+        The event loop sets ``TCP_NODELAY``, so a ``task_result`` and each
+        small frame after it would otherwise leave as separate packets. Where
+        ``TCP_CORK`` is available (Linux) the first send of a loop iteration
+        corks the socket and a ``call_soon`` callback uncorks it, so messages
+        sent back to back share full segments. Elsewhere this is a no-op.
+        """
+        cork = getattr(socket, "TCP_CORK", None)
+        if self._corked or cork is None or self._ws is None:
+            return
+        sock = self._ws.transport.get_extra_info("socket")
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, cork, 1)
+        except OSError:
+            return
+        self._corked = True
+        asyncio.get_running_loop().call_soon(self._uncork, sock, cork)
+
+    def _uncork(self, sock: Any, cork: int) -> None:
+        self._corked = False
+        with contextlib.suppress(OSError):
+            sock.setsockopt(socket.IPPROTO_TCP, cork, 0)
 
     async def receive(self) -> str | bytes:
         """Receive the next message (text or binary).
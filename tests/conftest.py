@@ -32,12 +32,36 @@ if sysconfig.get_config_var("Py_GIL_DISABLED") and not os.environ.get("JUNIPER_C
     )
     raise SystemExit(2)
 
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
 import pytest
 
 from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.worker import CascorWorkerAgent, _encode_binary_frame
 
 
 @pytest.fixture()
 def valid_config():
     """Return a WorkerConfig with a test authkey that passes validation."""
     return WorkerConfig(authkey="test-authkey")
+
+
+@pytest.fixture()
+def make_agent():
+    """Return a factory for WebSocket agents wired to a mocked connection.
+
+    Keyword arguments override ``WorkerConfig`` fields. ``receive_bytes``
+    answers every read with a 2x2 float32 zero frame.
+    """
+
+    def make(**overrides) -> CascorWorkerAgent:
+        agent = CascorWorkerAgent(WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers", auth_token="k", **overrides))  # nosec B106 — dummy test token
+        conn = MagicMock()
+        conn.send_json = AsyncMock()
+        conn.send_bytes = AsyncMock()
+        conn.receive_bytes = AsyncMock(return_value=_encode_binary_frame(np.zeros((2, 2), dtype=np.float32)))
+        agent._connection = conn
+        return agent
+
+    return make
@@ -0,0 +1,42 @@
+"""Shared helpers for the test suite."""
+
+from __future__ import annotations
+
+import struct
+
+from juniper_cascor_worker.constants import BINARY_FRAME_DTYPE_ENCODING, BINARY_FRAME_HEADER_LENGTH_BYTES, BINARY_FRAME_HEADER_LENGTH_FORMAT, PACKED_FRAME_MAX_NAME_BYTES, PACKED_FRAME_MAX_TENSORS
+from juniper_cascor_worker.worker import BinaryFrameProtocolError
+
+
+def unpack_result_frames(data: bytes) -> dict[str, memoryview]:
+    """Split a packed result message into its frames (views, no copies).
+
+    The reference decoder for ``worker._pack_result_frames``; every count and
+    length is checked against the message before it is used.
+    """
+    view = memoryview(data)
+    length_bytes = BINARY_FRAME_HEADER_LENGTH_BYTES
+    try:
+        (count,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, view, 0)
+        if count > PACKED_FRAME_MAX_TENSORS:
+            raise BinaryFrameProtocolError(f"packed frame declares {count} tensors (max {PACKED_FRAME_MAX_TENSORS})")
+        offset = length_bytes
+        toc: list[tuple[str, int]] = []
+        for _ in range(count):
+            (name_len,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, view, offset)
+            if name_len > PACKED_FRAME_MAX_NAME_BYTES:
+                raise BinaryFrameProtocolError(f"packed frame tensor name length {name_len} exceeds maximum {PACKED_FRAME_MAX_NAME_BYTES}")
+            name = bytes(view[offset + length_bytes : offset + length_bytes + name_len]).decode(BINARY_FRAME_DTYPE_ENCODING)
+            offset += length_bytes + name_len
+            (frame_len,) = struct.unpack_from(BINARY_FRAME_HEADER_LENGTH_FORMAT, view, offset)
+            offset += length_bytes
+            toc.append((name, frame_len))
+    except (struct.error, UnicodeDecodeError) as e:
+        raise BinaryFrameProtocolError(f"packed frame table of contents is malformed: {e}") from e
+    if offset + sum(frame_len for _, frame_len in toc) != view.nbytes:
+        raise BinaryFrameProtocolError("packed frame lengths do not add up to the message size")
+    frames: dict[str, memoryview] = {}
+    for name, frame_len in toc:
+        frames[name] = view[offset : offset + frame_len]
+        offset += frame_len
+    return frames
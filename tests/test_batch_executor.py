@@ -0,0 +1,157 @@
+"""Tests for the vectorized multi-candidate engine and the ``candidate_batch`` protocol."""
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import MAX_CANDIDATE_BATCH
+from juniper_cascor_worker.worker import _candidate_batch_entries, _validate_candidate_batch
+
+
+def _candidate(index, activation_name="tanh", seed=42):
+    return {
+        "input_size": 3,
+        "activation_name": activation_name,
+        "candidate_uuid": f"uuid-{index}",
+        "candidate_index": index,
+        "candidate_seed": seed,
+        "random_value_scale": 1.0,
+        "random_max_value": 1,
+        "sequence_max_value": 1,
+    }
+
+
+def _tensors():
+    rng = np.random.default_rng(0)
+    return {
+        "candidate_input": rng.standard_normal((40, 3)).astype(np.float32),
+        "residual_error": rng.standard_normal((40, 2)).astype(np.float32),
+    }
+
+
+@pytest.mark.unit
+class TestBatchMatchesSingleTask:
+    """The batched loop reproduces ``CandidateUnit.train_detailed`` per candidate."""
+
+    @pytest.fixture(autouse=True)
+    def _require_model(self):
+        pytest.importorskip("torch")
+        pytest.importorskip("candidate_unit.candidate_unit", reason="juniper-cascor-model not installed")
+
+    def test_results_match_execute_training_task(self):
+        from juniper_cascor_worker.batch_executor import execute_training_batch
+        from juniper_cascor_worker.task_executor import execute_training_task
+
+        candidates = [_candidate(0, "tanh"), _candidate(1, "sigmoid", seed=7), _candidate(2, "tanh", seed=3)]
+        training_params = {"epochs": 12, "learning_rate": 0.5, "display_frequency": 1000}
+        tensors = _tensors()
+
+        single = [execute_training_task(dict(c), training_params, tensors) for c in candidates]
+        batch = execute_training_batch([dict(c) for c in candidates], training_params, tensors)
+
+        assert len(batch) == len(candidates)
+        for (s_result, s_tensors), (b_result, b_tensors) in zip(single, batch):
+            assert b_result["candidate_uuid"] == s_result["candidate_uuid"]
+            assert b_result["success"] is True
+            assert b_result["best_corr_idx"] == s_result["best_corr_idx"]
+            assert b_result["epochs_completed"] == s_result["epochs_completed"]
+            assert b_result["correlation"] == pytest.approx(s_result["correlation"], abs=1e-4)
+            assert b_result["all_correlations"] == pytest.approx(s_result["all_correlations"], abs=1e-4)
+            assert sorted(b_tensors) == sorted(s_tensors)
+            np.testing.assert_allclose(b_tensors["weights"], s_tensors["weights"], atol=1e-4)
+
+    def test_failed_group_reports_every_member(self):
+        from juniper_cascor_worker.batch_executor import execute_training_batch
+
+        candidates = [_candidate(0), _candidate(1)]
+        tensors = _tensors()
+        tensors["candidate_input"] = tensors["candidate_input"][:, :2]  # input_size mismatch
+
+        results = execute_training_batch(candidates, {"epochs": 3}, tensors)
+
+        assert [r["candidate_uuid"] for r, _ in results] == ["uuid-0", "uuid-1"]
+        assert all(r["success"] is False and r["error_message"] for r, _ in results)
+
+
+@pytest.mark.unit
+class TestCandidateBatchValidation:
+    def test_valid_batch(self):
+        assert _validate_candidate_batch([{"candidate_data": {}}]) is None
+
+    @pytest.mark.parametrize(
+        ("batch", "match"),
+        [
+            ({}, "not a list"),
+            ([], "empty"),
+            ([{"candidate_data": {}}] * (MAX_CANDIDATE_BATCH + 1), "max"),
+            ([{"candidate_data": {}}, {"task_id": "t"}], r"candidate_batch\[1\]"),
+        ],
+    )
+    def test_invalid_batch(self, batch, match):
+        import re
+
+        assert re.search(match, _validate_candidate_batch(batch))
+
+    def test_entries_inherit_task_id_and_index(self):
+        entries = _candidate_batch_entries([{"candidate_index": 3, "candidate_data": {"candidate_uuid": "u"}}, {"task_id": "own"}], "t1")
+        assert entries == [("t1", {"candidate_uuid": "u", "candidate_index": 3}), ("own", {"candidate_index": 0})]
+
+
+def _batch_msg(batch):
+    return {
+        "type": "task_assign",
+        "task_id": "batch-1",
+        "candidate_batch": batch,
+        "training_params": {},
+        "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+    }
+
+
+@pytest.mark.unit
+class TestCandidateBatchProtocol:
+    def test_capabilities_advertise_batch_limit(self, make_agent):
+        agent = make_agent()
+        assert agent._build_capabilities()["candidate_batch"] == MAX_CANDIDATE_BATCH
+
+    @pytest.mark.asyncio
+    async def test_one_result_per_entry(self, make_agent):
+        agent = make_agent()
+        conn = agent._connection
+        batch = [
+            {"task_id": "t-a", "candidate_index": 0, "candidate_data": {"candidate_uuid": "a"}},
+            {"task_id": "t-b", "candidate_index": 1, "candidate_data": {"candidate_uuid": "b"}},
+        ]
+        results = [
+            ({"candidate_id": 0, "candidate_uuid": "a", "success": True, "correlation": 0.5}, {"weights": np.ones(3, dtype=np.float32)}),
+            ({"candidate_id": 1, "candidate_uuid": "b", "success": True, "correlation": 0.7}, {}),
+        ]
+
+        with patch.object(agent, "_run_training_batch", AsyncMock(return_value=results)) as run:
+            await agent._handle_task_assign(_batch_msg(batch))
+
+        candidates = run.call_args[0][0]
+        assert [c["candidate_uuid"] for c in candidates] == ["a", "b"]
+        assert [c["candidate_index"] for c in candidates] == [0, 1]
+        sent = [call[0][0] for call in conn.send_json.call_args_list]
+        assert [(m["task_id"], m["candidate_uuid"], m["correlation"]) for m in sent] == [("t-a", "a", 0.5), ("t-b", "b", 0.7)]
+        assert list(sent[0]["tensor_manifest"]) == ["weights"]
+        assert conn.send_bytes.await_count == 1
+        assert agent._tasks_completed == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch_drains_frames_and_fails_entries(self, make_agent):
+        agent = make_agent()
+        conn = agent._connection
+        batch = [{"candidate_data": {"candidate_uuid": "a"}}, {"candidate_data": "nope"}]
+
+        with patch.object(agent, "_run_training_batch", AsyncMock()) as run:
+            await agent._handle_task_assign(_batch_msg(batch))
+
+        run.assert_not_awaited()
+        assert conn.receive_bytes.await_count == 2
+        sent = [call[0][0] for call in conn.send_json.call_args_list]
+        assert len(sent) == 2
+        assert all(m["success"] is False and "Candidate batch invalid" in m["error_message"] for m in sent)
+        assert sent[0]["candidate_uuid"] == "a"
+        assert agent._tasks_failed == 1
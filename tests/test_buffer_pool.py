@@ -0,0 +1,144 @@
+"""Tests for the size-classed buffer pool and its use by the agent."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.buffer_pool import BufferPool, size_class
+from juniper_cascor_worker.constants import BUFFER_POOL_MIN_BYTES
+from juniper_cascor_worker.tensor_cache import frame_digest
+from juniper_cascor_worker.worker import CascorWorkerAgent, _decode_binary_frame, _encode_binary_frame, _encode_frame_header, _to_bfloat16_bits
+
+_ROWS = BUFFER_POOL_MIN_BYTES // 4
+_INPUT = np.arange(_ROWS * 2, dtype=np.float32).reshape(_ROWS, 2)
+_RESIDUAL = np.ones((_ROWS, 1), dtype=np.float32)
+
+
+def _task_msg(**entry: Any) -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": "t",
+        "candidate_data": {},
+        "tensor_manifest": {"candidate_input": dict(entry), "residual_error": {}},
+    }
+
+
+@pytest.mark.unit
+class TestBufferPool:
+    @pytest.mark.parametrize("nbytes", [BUFFER_POOL_MIN_BYTES, BUFFER_POOL_MIN_BYTES + 1, 3 * BUFFER_POOL_MIN_BYTES + 7, 10**9])
+    def test_size_classes_waste_at_most_a_quarter(self, nbytes):
+        assert nbytes <= size_class(nbytes) <= nbytes * 1.25
+
+    def test_released_buffer_is_reused(self):
+        pool = BufferPool(1 << 24)
+        first = pool.empty((_ROWS + 100, 2), np.float32)
+        assert pool.release(first)
+        second = pool.empty((_ROWS + 50, 2), np.float32)
+        assert np.shares_memory(first, second)
+        assert pool.metrics()["buffer_pool_hits"] == 1 and pool.metrics()["buffer_pool_misses"] == 1
+
+    def test_release_through_a_view(self):
+        pool = BufferPool(1 << 24)
+        array = pool.empty((_ROWS, 2), np.float32)
+        assert pool.release(memoryview(array.reshape(-1)).cast("B"))
+        assert pool.metrics()["buffer_pool_idle_bytes"] == size_class(array.nbytes)
+
+    def test_foreign_and_double_release_are_ignored(self):
+        pool = BufferPool(1 << 24)
+        array = pool.empty((_ROWS, 2), np.float32)
+        assert pool.release(np.empty_like(array)) is False
+        assert pool.release(b"frame") is False
+        assert pool.release(array) and pool.release(array) is False
+
+    def test_small_arrays_bypass_the_pool(self):
+        pool = BufferPool(1 << 24)
+        pool.release(pool.empty((4,), np.float32))
+        assert pool.metrics()["buffer_pool_misses"] == 0 and pool.metrics()["buffer_pool_idle_bytes"] == 0
+
+    def test_detached_buffer_is_not_reused(self):
+        pool = BufferPool(1 << 24)
+        array = pool.empty((_ROWS, 2), np.float32)
+        pool.detach(array)
+        assert pool.release(array) is False
+
+    def test_idle_budget(self):
+        pool = BufferPool(BUFFER_POOL_MIN_BYTES)
+        arrays = [pool.empty((BUFFER_POOL_MIN_BYTES,), np.uint8) for _ in range(2)]
+        for array in arrays:
+            pool.release(array)
+        assert pool.metrics()["buffer_pool_idle_bytes"] == BUFFER_POOL_MIN_BYTES
+        assert pool.metrics()["buffer_pool_dropped"] == 1
+
+    def test_unreleased_buffers_are_garbage_collected(self):
+        pool = BufferPool(1 << 24)
+        array = pool.empty((_ROWS, 2), np.float32)
+        assert pool.metrics()["buffer_pool_leased_bytes"] > 0
+        del array
+        gc.collect()
+        assert pool.metrics()["buffer_pool_leased_bytes"] == 0
+
+    def test_disabled(self):
+        pool = BufferPool(0)
+        pool.release(pool.empty((_ROWS, 2), np.float32))
+        assert pool.metrics()["buffer_pool_misses"] == 0
+
+    def test_decode_into_pool(self):
+        pool = BufferPool(1 << 24)
+        decoded = _decode_binary_frame(_encode_binary_frame(_INPUT), pool=pool)
+        np.testing.assert_array_equal(decoded, _INPUT)
+        widened = _decode_binary_frame(_encode_frame_header(_INPUT.shape, "bfloat16") + _to_bfloat16_bits(_INPUT).tobytes(), pool=pool)
+        np.testing.assert_allclose(widened, _INPUT, rtol=1e-2)
+        # The bit-pattern intermediate went back to the pool.
+        assert pool.metrics()["buffer_pool_idle_bytes"] == size_class(_INPUT.nbytes // 2)
+
+
+@pytest.mark.unit
+class TestAgentBufferPool:
+    @staticmethod
+    async def _run(agent: CascorWorkerAgent, msg: dict[str, Any], result: Any = None) -> None:
+        agent._connection.receive_bytes.side_effect = [_encode_binary_frame(_INPUT), _encode_binary_frame(_RESIDUAL)]
+        training = AsyncMock(return_value=result or ({"success": True}, {}))
+        with patch.object(agent, "_run_training", training):
+            await agent._handle_task_assign(msg)
+
+    @pytest.mark.asyncio
+    async def test_task_inputs_are_reused_by_the_next_task(self, make_agent):
+        agent = make_agent()
+        await self._run(agent, _task_msg())
+        await self._run(agent, _task_msg())
+        metrics = agent._buffer_pool.metrics()
+        assert metrics["buffer_pool_hits"] == 2 and metrics["buffer_pool_misses"] == 2
+        assert metrics["buffer_pool_hit_rate"] == 0.5 and metrics["buffer_pool_leased_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_tensor_is_not_returned(self, make_agent):
+        agent = make_agent()
+        await self._run(agent, _task_msg(sha256=frame_digest(_encode_binary_frame(_INPUT))))
+        assert agent._buffer_pool.metrics()["buffer_pool_idle_bytes"] == size_class(_RESIDUAL.nbytes)
+
+    @pytest.mark.asyncio
+    async def test_timed_out_task_keeps_its_buffers_out_of_the_pool(self, make_agent):
+        agent = make_agent(task_timeout=0.01)
+
+        async def stuck(*_args):
+            await asyncio.sleep(60)
+
+        agent._connection.receive_bytes.side_effect = [_encode_binary_frame(_INPUT), _encode_binary_frame(_RESIDUAL)]
+        with patch.object(agent, "_run_training", stuck):
+            await agent._handle_task_assign(_task_msg())
+        assert agent._buffer_pool.metrics()["buffer_pool_idle_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_narrowed_result_is_released_after_send(self, make_agent):
+        agent = make_agent()
+        agent._wire_precision = "float16"
+        await self._run(agent, _task_msg(), ({"success": True}, {"norm_output": np.ones(BUFFER_POOL_MIN_BYTES // 2, dtype=np.float32)}))
+        parts = agent._connection.send_bytes.await_args.args[0]
+        assert isinstance(parts, list) and parts[-1].obj.dtype == np.float16
+        assert agent._buffer_pool.metrics()["buffer_pool_leased_bytes"] == 0
@@ -0,0 +1,94 @@
+"""Tests for chunked tensor frames and the WebSocket message size limit."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import MAX_FRAME_CHUNKS
+from juniper_cascor_worker.worker import BinaryFrameProtocolError, _ChunkedFrameReader, _encode_binary_frame, _encode_frame_header, _to_bfloat16_bits, _validate_tensor_manifest
+from juniper_cascor_worker.ws_connection import WorkerConnection
+
+
+def _chunked(array: np.ndarray, chunk_bytes: int, dtype_name: str | None = None) -> list[bytes]:
+    payload = np.ascontiguousarray(array).tobytes()
+    header = _encode_frame_header(array.shape, dtype_name or str(array.dtype))
+    return [header] + [payload[i : i + chunk_bytes] for i in range(0, len(payload), chunk_bytes)]
+
+
+@pytest.mark.unit
+class TestMaxMessageLimit:
+    @pytest.mark.asyncio
+    async def test_connection_passes_limit_to_websockets(self):
+        conn = WorkerConnection("ws://localhost:8200/ws/v1/workers", max_message_size=65536)
+        with patch("juniper_cascor_worker.ws_connection.websockets.connect", new_callable=AsyncMock, return_value=MagicMock()) as mock_connect:
+            await conn.connect()
+        assert mock_connect.call_args.kwargs["max_size"] == 65536
+
+
+@pytest.mark.unit
+class TestChunkedFrameReader:
+    def test_assembles_chunks_in_place(self):
+        array = np.arange(1000, dtype=np.float32).reshape(250, 4)
+        header, *chunks = _chunked(array, 333)
+        reader = _ChunkedFrameReader(header)
+        for chunk in chunks:
+            reader.add(chunk)
+        result = reader.finish()
+        np.testing.assert_array_equal(result, array)
+        assert result.flags.writeable and result.base is None
+
+    def test_bfloat16_chunks_widen_to_float32(self):
+        array = np.linspace(0, 1, 64, dtype=np.float32)
+        header, *chunks = _chunked(_to_bfloat16_bits(array), 30, "bfloat16")
+        reader = _ChunkedFrameReader(header)
+        for chunk in chunks:
+            reader.add(chunk)
+        np.testing.assert_allclose(reader.finish(), array, rtol=2**-8)
+
+    def test_overflow_rejected(self):
+        header, chunk = _chunked(np.zeros(4, dtype=np.float32), 64)
+        reader = _ChunkedFrameReader(header)
+        with pytest.raises(BinaryFrameProtocolError, match="exceeds"):
+            reader.add(chunk + b"\0")
+
+    def test_short_payload_rejected(self):
+        header, chunk = _chunked(np.zeros(4, dtype=np.float32), 64)
+        reader = _ChunkedFrameReader(header)
+        reader.add(chunk[:-4])
+        with pytest.raises(BinaryFrameProtocolError, match="expected"):
+            reader.finish()
+
+    def test_header_with_payload_rejected(self):
+        with pytest.raises(BinaryFrameProtocolError, match="header"):
+            _ChunkedFrameReader(_encode_binary_frame(np.zeros(4, dtype=np.float32)))
+
+
+@pytest.mark.unit
+class TestAgentChunkedFrames:
+    @pytest.mark.parametrize(
+        ("entry", "error"),
+        [({"chunks": 0}, "invalid chunks"), ({"chunks": MAX_FRAME_CHUNKS + 1}, "invalid chunks"), ({"chunks": 2, "codec": "zlib"}, "cannot combine")],
+    )
+    def test_manifest_validation(self, entry, error):
+        assert error in _validate_tensor_manifest({"candidate_input": entry, "residual_error": {}})
+
+    @pytest.mark.asyncio
+    async def test_chunked_and_plain_frames_mix(self, make_agent):
+        agent = make_agent()
+        big = np.arange(2048, dtype=np.float32).reshape(512, 4)
+        small = np.ones((512, 1), dtype=np.float32)
+        frames = _chunked(big, 1024)
+        agent._connection.receive_bytes.side_effect = frames + [_encode_binary_frame(small)]
+
+        tensors, _ = await agent._receive_tensors({"candidate_input": {"chunks": len(frames) - 1}, "residual_error": {}})
+
+        np.testing.assert_array_equal(tensors["candidate_input"], big)
+        np.testing.assert_array_equal(tensors["residual_error"], small)
+
+    def test_capabilities_advertise_limits(self, make_agent):
+        pytest.importorskip("torch")
+        caps = make_agent(max_message_bytes=65536)._build_capabilities()
+        assert (caps["max_message_bytes"], caps["frame_chunks"]) == (65536, MAX_FRAME_CHUNKS)
@@ -1,11 +1,42 @@
 """Tests for WorkerConfig."""
 
 import os
+import sys
 from unittest.mock import patch
 
 import pytest
 
+from juniper_cascor_worker.cli import main
 from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import (
+    DEFAULT_BUFFER_POOL_BYTES,
+    DEFAULT_DATASET_STORE_BYTES,
+    DEFAULT_MAX_MESSAGE_BYTES,
+    DEFAULT_RESULT_CACHE_BYTES,
+    DEFAULT_RESULT_OUTBOX_SIZE,
+    DEFAULT_RESULT_REPLAY_BYTES,
+    DEFAULT_SEND_BUFFER_BYTES,
+    DEFAULT_TENSOR_CACHE_BYTES,
+    ENV_BUFFER_POOL_BYTES,
+    ENV_DATASET_STORE_BYTES,
+    ENV_FRAME_CODEC,
+    ENV_FRAME_CODEC_LEVEL,
+    ENV_MAX_MESSAGE_BYTES,
+    ENV_PREFETCH_BYTES,
+    ENV_PREFETCH_TASKS,
+    ENV_RESULT_CACHE_BYTES,
+    ENV_RESULT_OUTBOX_SIZE,
+    ENV_RESULT_REPLAY_BYTES,
+    ENV_SEND_BUFFER_BYTES,
+    ENV_SHM_TRANSPORT,
+    ENV_TASK_SLOTS,
+    ENV_TENSOR_CACHE_BYTES,
+    ENV_TRAINING_BACKEND,
+    ENV_WARMUP,
+    ENV_WIRE_PRECISION,
+    TRAINING_BACKEND_PROCESS,
+    TRAINING_BACKEND_THREAD,
+)
 from juniper_cascor_worker.exceptions import WorkerConfigError
 
 
@@ -272,3 +303,114 @@ class TestWorkerConfigWebSocket:
         with patch.dict(os.environ, {}, clear=True):
             config = WorkerConfig.from_env()
             assert config.task_timeout == 3600.0
+
+
+_WS_URL = "ws://localhost:8200/ws/v1/workers"
+
+
+@pytest.mark.unit
+class TestWorkerConfigTuning:
+    """Default, validation, env and CLI checks for the WebSocket tuning fields."""
+
+    @pytest.mark.parametrize(
+        ("field", "expected"),
+        [
+            ("buffer_pool_bytes", DEFAULT_BUFFER_POOL_BYTES),
+            ("dataset_store_bytes", DEFAULT_DATASET_STORE_BYTES),
+            ("frame_codec", "none"),
+            ("max_message_bytes", DEFAULT_MAX_MESSAGE_BYTES),
+            ("prefetch_tasks", 0),
+            ("result_cache_bytes", DEFAULT_RESULT_CACHE_BYTES),
+            ("result_outbox_size", DEFAULT_RESULT_OUTBOX_SIZE),
+            ("result_replay_bytes", DEFAULT_RESULT_REPLAY_BYTES),
+            ("send_buffer_bytes", DEFAULT_SEND_BUFFER_BYTES),
+            ("shm_transport", False),
+            ("task_slots", 1),
+            ("tensor_cache_bytes", DEFAULT_TENSOR_CACHE_BYTES),
+            ("training_backend", TRAINING_BACKEND_THREAD),
+            ("warmup", False),
+            ("wire_precision", "float32"),
+        ],
+    )
+    def test_default(self, field, expected):
+        assert getattr(WorkerConfig(), field) == expected
+
+    @pytest.mark.parametrize(
+        ("field", "value"),
+        [
+            ("buffer_pool_bytes", -1),
+            ("dataset_store_bytes", -1),
+            ("frame_codec", "brotli"),
+            ("frame_codec_level", 10),
+            ("max_message_bytes", 16),
+            ("prefetch_bytes", 0),
+            ("prefetch_tasks", -1),
+            ("result_cache_bytes", -1),
+            ("result_outbox_size", 0),
+            ("result_replay_bytes", -1),
+            ("send_buffer_bytes", -1),
+            ("task_slots", 0),
+            ("tensor_cache_bytes", -1),
+            ("training_backend", "gpu"),
+            ("wire_precision", "float8"),
+        ],
+    )
+    def test_validate_rejects(self, field, value):
+        cfg = WorkerConfig(server_url=_WS_URL, **{field: value})
+        with pytest.raises(WorkerConfigError, match=field):
+            cfg.validate(legacy=False)
+
+    @pytest.mark.parametrize(
+        ("env", "expected"),
+        [
+            ({ENV_BUFFER_POOL_BYTES: "0"}, {"buffer_pool_bytes": 0}),
+            ({ENV_DATASET_STORE_BYTES: "0"}, {"dataset_store_bytes": 0}),
+            ({ENV_FRAME_CODEC: "shuffle+lzma", ENV_FRAME_CODEC_LEVEL: "1"}, {"frame_codec": "shuffle+lzma", "frame_codec_level": 1}),
+            ({ENV_MAX_MESSAGE_BYTES: "65536"}, {"max_message_bytes": 65536}),
+            ({ENV_PREFETCH_TASKS: "2", ENV_PREFETCH_BYTES: "1024"}, {"prefetch_tasks": 2, "prefetch_bytes": 1024}),
+            ({ENV_RESULT_CACHE_BYTES: "4096"}, {"result_cache_bytes": 4096}),
+            ({ENV_RESULT_OUTBOX_SIZE: "3"}, {"result_outbox_size": 3}),
+            ({ENV_RESULT_REPLAY_BYTES: "0"}, {"result_replay_bytes": 0}),
+            ({ENV_SEND_BUFFER_BYTES: "0"}, {"send_buffer_bytes": 0}),
+            ({ENV_SHM_TRANSPORT: "true"}, {"shm_transport": True}),
+            ({ENV_TASK_SLOTS: "8"}, {"task_slots": 8}),
+            ({ENV_TENSOR_CACHE_BYTES: "0"}, {"tensor_cache_bytes": 0}),
+            ({ENV_TRAINING_BACKEND: TRAINING_BACKEND_PROCESS}, {"training_backend": TRAINING_BACKEND_PROCESS}),
+            ({ENV_WARMUP: "1"}, {"warmup": True}),
+            ({ENV_WARMUP: "TRUE"}, {"warmup": True}),
+            ({ENV_WARMUP: "on"}, {"warmup": True}),
+            ({ENV_WARMUP: "0"}, {"warmup": False}),
+            ({ENV_WARMUP: ""}, {"warmup": False}),
+            ({ENV_WIRE_PRECISION: "bfloat16"}, {"wire_precision": "bfloat16"}),
+        ],
+    )
+    def test_from_env(self, env, expected):
+        cfg = WorkerConfig.from_env(env=env)
+        assert {field: getattr(cfg, field) for field in expected} == expected
+
+    @pytest.mark.parametrize(
+        ("flags", "expected"),
+        [
+            (["--buffer-pool-bytes", "4096"], {"buffer_pool_bytes": 4096}),
+            (["--dataset-store-bytes", "1024"], {"dataset_store_bytes": 1024}),
+            (["--frame-codec", "shuffle+zlib", "--frame-codec-level", "9"], {"frame_codec": "shuffle+zlib", "frame_codec_level": 9}),
+            (["--max-message-bytes", "65536"], {"max_message_bytes": 65536}),
+            (["--prefetch-tasks", "3", "--prefetch-bytes", "4096"], {"prefetch_tasks": 3, "prefetch_bytes": 4096}),
+            (["--result-cache-bytes", "4096"], {"result_cache_bytes": 4096}),
+            (["--result-outbox-size", "2"], {"result_outbox_size": 2}),
+            (["--result-replay-bytes", "4096"], {"result_replay_bytes": 4096}),
+            (["--send-buffer-bytes", "4096"], {"send_buffer_bytes": 4096}),
+            (["--shm-transport"], {"shm_transport": True}),
+            (["--task-slots", "4"], {"task_slots": 4}),
+            (["--tensor-cache-bytes", "1024"], {"tensor_cache_bytes": 1024}),
+            (["--training-backend", "process", "--mp-context", "spawn"], {"training_backend": TRAINING_BACKEND_PROCESS, "mp_context": "spawn"}),
+            (["--warmup"], {"warmup": True}),
+            (["--wire-precision", "float16"], {"wire_precision": "float16"}),
+        ],
+    )
+    @patch("juniper_cascor_worker.cli._run_websocket")
+    def test_cli_flag(self, mock_run_ws, flags, expected):
+        with patch.object(sys, "argv", ["juniper-cascor-worker", "--server-url", "ws://h:8200/ws/v1/workers", *flags]):
+            main()
+        config = mock_run_ws.call_args[0][0]
+        assert {field: getattr(config, field) for field in expected} == expected
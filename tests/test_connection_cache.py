@@ -0,0 +1,185 @@
+"""Tests for the reconnect cache (SSL context, resolved addresses)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import ssl
+import subprocess  # nosec B404 — test-only: runs the openssl CLI to make a throwaway certificate
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import websockets
+
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.connection_cache import ConnectionCache
+from juniper_cascor_worker.exceptions import WorkerConnectionError
+from juniper_cascor_worker.worker import CascorWorkerAgent
+from juniper_cascor_worker.ws_connection import WorkerConnection
+
+
+def _addrinfo(address: str) -> list[tuple[Any, ...]]:
+    return [(2, 1, 6, "", (address, 8200))]
+
+
+def _mock_ws() -> AsyncMock:
+    ws = AsyncMock()
+    ws.protocol.state.name = "OPEN"
+    ws.transport = MagicMock()
+    ws.transport.get_extra_info.return_value = None
+    return ws
+
+
+@pytest.mark.unit
+class TestSslContextCache:
+    def test_built_once_per_file_set(self, tmp_path):
+        ca = tmp_path / "ca.pem"
+        ca.write_text("ca")
+        cache = ConnectionCache()
+        build = MagicMock(side_effect=lambda: ssl.create_default_context())
+        first = cache.ssl_context(build, (str(ca), None, None))
+        assert cache.ssl_context(build, (str(ca), None, None)) is first
+        assert build.call_count == 1
+
+    def test_rebuilt_when_a_file_changes(self, tmp_path):
+        ca = tmp_path / "ca.pem"
+        ca.write_text("ca")
+        cache = ConnectionCache()
+        build = MagicMock(side_effect=lambda: ssl.create_default_context())
+        first = cache.ssl_context(build, (str(ca), None, None))
+        stat = ca.stat()
+        os.utime(ca, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert cache.ssl_context(build, (str(ca), None, None)) is not first
+        assert cache.metrics()["ssl_context_builds"] == 2
+
+    def test_plain_ws_has_no_context(self):
+        assert ConnectionCache().ssl_context(lambda: None, (None, None, None)) is None
+
+
+@pytest.mark.unit
+class TestAddressCache:
+    @pytest.mark.asyncio
+    async def test_resolved_once_within_ttl(self):
+        cache = ConnectionCache()
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "getaddrinfo", AsyncMock(return_value=_addrinfo("10.0.0.5"))) as lookup:
+            assert await cache.resolve("cascor", 8200) == "10.0.0.5"
+            assert await cache.resolve("cascor", 8200) == "10.0.0.5"
+        lookup.assert_awaited_once()
+        assert cache.metrics()["dns_cache_hits"] == 1 and cache.metrics()["dns_cache_misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_and_forgotten_entries_are_resolved_again(self):
+        cache = ConnectionCache(dns_ttl=0.0)
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "getaddrinfo", AsyncMock(return_value=_addrinfo("10.0.0.5"))) as lookup:
+            await cache.resolve("cascor", 8200)
+            await cache.resolve("cascor", 8200)
+            cache.dns_ttl = 60.0
+            await cache.resolve("cascor", 8200)
+            cache.forget_address("cascor", 8200)
+            await cache.resolve("cascor", 8200)
+        assert lookup.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_ip_literals_and_failures_are_not_cached(self):
+        cache = ConnectionCache()
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "getaddrinfo", AsyncMock(side_effect=OSError("no such host"))):
+            assert await cache.resolve("127.0.0.1", 8200) is None
+            assert await cache.resolve("cascor", 8200) is None
+
+
+@pytest.mark.unit
+class TestCachedConnect:
+    @pytest.mark.asyncio
+    async def test_connects_to_the_cached_address(self, monkeypatch):
+        monkeypatch.setattr("urllib.request.getproxies", dict)
+        cache = ConnectionCache()
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "getaddrinfo", AsyncMock(return_value=_addrinfo("10.0.0.5"))), patch("juniper_cascor_worker.ws_connection.websockets.connect", new_callable=AsyncMock, return_value=_mock_ws()) as connect:
+            await WorkerConnection("ws://cascor:8200/ws/v1/workers", cache=cache).connect()
+        assert connect.call_args.args[0] == "ws://cascor:8200/ws/v1/workers"
+        assert connect.call_args.kwargs["host"] == "10.0.0.5" and connect.call_args.kwargs["port"] == 8200
+        assert cache.metrics()["last_connect_seconds"] is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_forgets_the_address(self, monkeypatch):
+        monkeypatch.setattr("urllib.request.getproxies", dict)
+        cache = ConnectionCache()
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "getaddrinfo", AsyncMock(return_value=_addrinfo("10.0.0.5"))) as lookup, patch("juniper_cascor_worker.ws_connection.websockets.connect", new_callable=AsyncMock, side_effect=ConnectionRefusedError("refused")):
+            for _ in range(2):
+                with pytest.raises(WorkerConnectionError):
+                    await WorkerConnection("ws://cascor:8200/ws/v1/workers", cache=cache).connect()
+        assert lookup.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_proxied_connections_resolve_by_name(self, monkeypatch):
+        monkeypatch.setattr("urllib.request.getproxies", lambda: {"http": "http://proxy:3128"})
+        with patch("juniper_cascor_worker.ws_connection.websockets.connect", new_callable=AsyncMock, return_value=_mock_ws()) as connect:
+            await WorkerConnection("ws://cascor:8200/ws/v1/workers", cache=ConnectionCache()).connect()
+        assert "host" not in connect.call_args.kwargs
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(shutil.which("openssl") is None, reason="needs the openssl CLI to make a test certificate")
+    async def test_tls_reconnect_reuses_context_and_address(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("urllib.request.getproxies", dict)
+        cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+        subprocess.run(  # nosec B603 B607 — fixed openssl argv, no shell, no untrusted input
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", str(key), "-out", str(cert), "-days", "1", "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost"],
+            check=True,
+            capture_output=True,
+        )
+        server_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_ctx.load_cert_chain(cert, key)
+
+        async def greet(ws):
+            await ws.send("hello")
+            await ws.wait_closed()
+
+        cache = ConnectionCache()
+        async with websockets.serve(greet, "127.0.0.1", 0, ssl=server_ctx) as server:
+            port = next(iter(server.sockets)).getsockname()[1]
+            for _ in range(2):
+                conn = WorkerConnection(f"wss://localhost:{port}/ws/v1/workers", tls_ca=str(cert), cache=cache)
+                await conn.connect()
+                assert await conn.receive() == "hello"
+                await conn.close()
+        metrics = cache.metrics()
+        assert metrics["ssl_context_builds"] == 1 and metrics["dns_cache_hits"] == 1
+
+
+@pytest.mark.unit
+class TestAgentReconnect:
+    @pytest.mark.asyncio
+    async def test_reconnect_latency_and_shared_cache(self, monkeypatch):
+        agent = CascorWorkerAgent(WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers", auth_token="k"))  # nosec B106 — dummy test token
+        conns = []
+        delays: list[float] = []
+
+        def make_connection(**kwargs):
+            assert kwargs["cache"] is agent._connection_cache
+            conn = AsyncMock()
+            conn.receive_json.side_effect = [{"type": "connection_established"}, {"type": "registration_ack"}]
+            conn.receive.side_effect = WorkerConnectionError("socket closed")
+            conns.append(conn)
+            return conn
+
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(seconds):
+            if seconds >= agent.config.heartbeat_interval:
+                return await real_sleep(seconds)
+            delays.append(seconds)
+            if agent._reconnects:
+                agent._stop_event.set()
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        with patch.object(agent, "_build_capabilities", return_value={}):
+            await agent._run_inner(make_connection)
+
+        assert len(conns) == 2 and all(delay <= 0.25 for delay in delays)
+        assert agent._reconnects == 1 and agent._last_reconnect_seconds is not None
@@ -0,0 +1,99 @@
+"""Tests for the binary, downsampled ``all_correlations`` trace."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.correlation_trace import apply_trace_request, downsample_trace, validate_trace_request
+from juniper_cascor_worker.worker import _decode_binary_frame, _encode_binary_frame, _execute_batch, _execute_task
+
+
+def _result(epochs: int) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    return {"success": True, "all_correlations": [i / epochs for i in range(epochs)]}, {"weights": np.zeros(3, dtype=np.float32)}
+
+
+@pytest.mark.unit
+class TestDownsampleTrace:
+    def test_stride_keeps_last_epoch(self):
+        trace = np.arange(10, dtype=np.float32)
+        np.testing.assert_array_equal(downsample_trace(trace, {"policy": "stride", "k": 4}), [0, 4, 8, 9])
+        np.testing.assert_array_equal(downsample_trace(trace, {"policy": "stride", "k": 3}), [0, 3, 6, 9])
+
+    def test_minmax_buckets(self):
+        trace = np.array([3, 1, 4, 1, 5, 9, 2, 6], dtype=np.float32)
+        np.testing.assert_array_equal(downsample_trace(trace, {"policy": "minmax", "buckets": 2}), [[1, 4], [2, 9]])
+        assert downsample_trace(trace, {"policy": "minmax", "buckets": 100}).shape == (8, 2)
+        assert downsample_trace(np.empty(0, dtype=np.float32), {"policy": "minmax", "buckets": 4}).shape == (0, 2)
+
+    @pytest.mark.parametrize(
+        "spec",
+        ["full", {"policy": "every"}, {"policy": "stride"}, {"policy": "stride", "k": 0}, {"policy": "minmax", "buckets": True}, {"policy": "minmax", "buckets": 10**6}],
+    )
+    def test_invalid_requests(self, spec):
+        assert validate_trace_request(spec) is not None
+
+    def test_valid_requests(self):
+        assert validate_trace_request(None) is None
+        assert validate_trace_request({"policy": "full"}) is None
+        assert validate_trace_request({"policy": "minmax", "buckets": 64}) is None
+
+
+@pytest.mark.unit
+class TestApplyTraceRequest:
+    def test_json_size_is_constant_in_epochs(self):
+        spec = {"policy": "minmax", "buckets": 16}
+        sizes = []
+        for epochs in (100, 10_000):
+            result_dict, tensors = apply_trace_request(_result(epochs), spec)
+            assert tensors["all_correlations"].dtype == np.float32
+            assert tensors["all_correlations"].shape == (16, 2)
+            assert result_dict["all_correlations"] == []
+            assert result_dict["correlation_trace"] == {**spec, "epochs": epochs}
+            sizes.append(len(json.dumps(result_dict)))
+        assert abs(sizes[0] - sizes[1]) <= 2
+
+    def test_not_requested_leaves_result_alone(self):
+        result = _result(5)
+        assert apply_trace_request(result, None) is result
+        assert "all_correlations" not in result[1]
+
+    def test_backend_wrappers_apply_request(self):
+        params = {"correlation_trace": {"policy": "full"}}
+        with patch("juniper_cascor_worker.task_executor.execute_training_task", return_value=_result(4)):
+            _, tensors = _execute_task({}, params, {})
+        np.testing.assert_allclose(tensors["all_correlations"], [0, 0.25, 0.5, 0.75])
+        with patch("juniper_cascor_worker.batch_executor.execute_training_batch", return_value=[_result(4), _result(2)]):
+            results = _execute_batch([{}, {}], params, {})
+        assert [r[1]["all_correlations"].size for r in results] == [4, 2]
+
+
+@pytest.mark.unit
+class TestAgentCorrelationTrace:
+    @pytest.mark.asyncio
+    async def test_trace_sent_as_result_tensor(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_bytes.return_value = _encode_binary_frame(np.zeros((2, 2), dtype=np.float32))
+        spec = {"policy": "stride", "k": 2}
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "training_params": {"correlation_trace": spec}, "tensor_manifest": {"candidate_input": {}, "residual_error": {}}}
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=apply_trace_request(_result(6), spec))):
+            await agent._handle_task_assign(msg)
+
+        sent = agent._connection.send_json.call_args[0][0]
+        assert sent["all_correlations"] == [] and sent["correlation_trace"]["epochs"] == 6
+        assert list(sent["tensor_manifest"]) == ["weights", "all_correlations"]
+        frame = agent._connection.send_bytes.await_args_list[1].args[0]
+        np.testing.assert_allclose(_decode_binary_frame(frame), np.float32([0, 2, 4, 5]) / 6)
+
+    @pytest.mark.asyncio
+    async def test_invalid_request_fails_task(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_bytes.return_value = _encode_binary_frame(np.zeros((2, 2), dtype=np.float32))
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "training_params": {"correlation_trace": {"policy": "median"}}, "tensor_manifest": {"candidate_input": {}, "residual_error": {}}}
+        await agent._handle_task_assign(msg)
+        assert "Training params invalid" in agent._connection.send_json.call_args[0][0]["error_message"]
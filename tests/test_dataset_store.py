@@ -0,0 +1,150 @@
+"""Tests for the per-session dataset store (incremental candidate_input columns)."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.dataset_store import DatasetStore
+from juniper_cascor_worker.worker import _encode_binary_frame, _validate_tensor_manifest
+
+_KEY = ("session-1", "candidate_input")
+
+
+def _matrix(columns: int, rows: int = 16) -> np.ndarray:
+    return np.arange(rows * columns, dtype=np.float32).reshape(columns, rows).T.copy()
+
+
+def _task_msg(task_id: str, base_columns: int, *, session: str = "session-1") -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": task_id,
+        "training_session": session,
+        "candidate_data": {},
+        "tensor_manifest": {"candidate_input": {"base_columns": base_columns}, "residual_error": {}},
+    }
+
+
+@pytest.mark.unit
+class TestDatasetStore:
+    def test_appends_columns_into_a_c_contiguous_matrix(self):
+        store = DatasetStore(max_bytes=1 << 20)
+        full = _matrix(5)
+        held = store.extend(_KEY, 0, full[:, :3])
+
+        result = store.extend(_KEY, 3, full[:, 3:4])
+        result = store.extend(_KEY, 4, full[:, 4:5])
+
+        np.testing.assert_array_equal(result, full)
+        np.testing.assert_array_equal(held, full[:, :3])
+        assert result.flags.c_contiguous and not result.flags.writeable
+        assert store.metrics()["dataset_store_appended_columns"] == 2
+        assert store.metrics()["dataset_store_bytes"] == full.nbytes
+
+    def test_repeated_delta_is_served_without_rewrite(self):
+        store = DatasetStore(max_bytes=1 << 20)
+        full = _matrix(4)
+        store.extend(_KEY, 0, full[:, :3])
+        first = store.extend(_KEY, 3, full[:, 3:])
+        second = store.extend(_KEY, 3, full[:, 3:])
+        assert second is first
+        assert store.metrics()["dataset_store_appended_columns"] == 1
+
+    def test_earlier_round_gets_a_contiguous_prefix(self):
+        store = DatasetStore(max_bytes=1 << 20)
+        full = _matrix(4)
+        store.extend(_KEY, 0, full[:, :3])
+        store.extend(_KEY, 3, full[:, 3:])
+        prefix = store.extend(_KEY, 2, full[:, 2:3])
+        np.testing.assert_array_equal(prefix, full[:, :3])
+        assert prefix.flags.c_contiguous and not prefix.flags.writeable
+
+    def test_divergent_delta_rebuilds_without_touching_held_views(self):
+        store = DatasetStore(max_bytes=1 << 20)
+        full = _matrix(4)
+        store.extend(_KEY, 0, full[:, :3])
+        held = store.extend(_KEY, 3, full[:, 3:])
+        replacement = np.full((16, 1), -1.0, dtype=np.float32)
+
+        result = store.extend(_KEY, 3, replacement)
+
+        np.testing.assert_array_equal(result[:, 3:], replacement)
+        np.testing.assert_array_equal(held, full)
+        assert store.metrics()["dataset_store_rebuilds"] == 1
+
+    def test_growth_over_many_rounds(self):
+        store = DatasetStore(max_bytes=1 << 20)
+        full = _matrix(40)
+        store.extend(_KEY, 0, full[:, :1])
+        for column in range(1, 40):
+            result = store.extend(_KEY, column, full[:, column : column + 1])
+        np.testing.assert_array_equal(result, full)
+
+    @pytest.mark.parametrize(
+        ("base", "delta"),
+        [(5, _matrix(1)), (3, _matrix(1, rows=8)), (3, _matrix(1).astype(np.float64))],
+    )
+    def test_misses(self, base, delta):
+        store = DatasetStore(max_bytes=1 << 20)
+        store.extend(_KEY, 0, _matrix(3))
+        assert store.extend(_KEY, base, delta) is None
+        assert store.extend(("other", "candidate_input"), 3, _matrix(1)) is None
+        assert store.metrics()["dataset_store_misses"] == 2
+
+    def test_lru_eviction_and_disabled_store(self):
+        store = DatasetStore(max_bytes=16 * 3 * 4)
+        store.extend(("a", "x"), 0, _matrix(3))
+        store.extend(("b", "x"), 0, _matrix(3))
+        assert store.metrics()["dataset_store_evictions"] == 1
+        assert store.extend(("a", "x"), 3, _matrix(1)) is None
+
+        disabled = DatasetStore(max_bytes=0)
+        assert disabled.extend(_KEY, 0, _matrix(3)) is not None
+        assert disabled.extend(_KEY, 3, _matrix(1)) is None
+
+
+@pytest.mark.unit
+class TestAgentDatasetStore:
+    def test_manifest_needs_training_session(self):
+        manifest = {"candidate_input": {"base_columns": 2}, "residual_error": {}}
+        assert "training_session" in _validate_tensor_manifest(manifest)
+        assert _validate_tensor_manifest(manifest, training_session="s") is None
+        assert "invalid base_columns" in _validate_tensor_manifest({"candidate_input": {"base_columns": -1}, "residual_error": {}}, training_session="s")
+
+    @pytest.mark.asyncio
+    async def test_rounds_ship_only_new_columns(self, make_agent):
+        agent = make_agent()
+        full = _matrix(4)
+        residual = _encode_binary_frame(np.ones((16, 1), dtype=np.float32))
+        agent._connection.receive_bytes.side_effect = [_encode_binary_frame(full[:, :3]), residual, _encode_binary_frame(np.ascontiguousarray(full[:, 3:])), residual]
+        seen: list[np.ndarray] = []
+
+        async def training(candidate_data, training_params, tensors):
+            seen.append(tensors["candidate_input"])
+            return {"success": True}, {}
+
+        with patch.object(agent, "_run_training", training):
+            await agent._handle_task_assign(_task_msg("a", 0))
+            await agent._handle_task_assign(_task_msg("b", 3))
+
+        assert agent._tasks_completed == 2
+        np.testing.assert_array_equal(seen[1], full)
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_fails_with_session_miss(self, make_agent):
+        agent = make_agent()
+        frames = [_encode_binary_frame(_matrix(1)), _encode_binary_frame(np.ones((16, 1), dtype=np.float32))]
+        agent._connection.receive_bytes.side_effect = frames
+        await agent._handle_task_assign(_task_msg("a", 3))
+
+        sent = agent._connection.send_json.call_args[0][0]
+        assert sent["success"] is False
+        assert sent["session_miss"] == ["candidate_input"]
+        assert agent._connection.receive_bytes.await_count == 2
+
+    def test_capabilities_advertise_budget(self, make_agent):
+        pytest.importorskip("torch")
+        assert make_agent(dataset_store_bytes=4096)._build_capabilities()["dataset_store_bytes"] == 4096
@@ -0,0 +1,239 @@
+"""Tests for multi-server federation and fair-share training slots."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.cli import main
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import ENV_FEDERATION_URLS
+from juniper_cascor_worker.exceptions import WorkerConfigError
+from juniper_cascor_worker.fair_share import FairShareSlots
+from juniper_cascor_worker.federation import FederatedWorker
+from juniper_cascor_worker.tensor_cache import frame_digest
+from juniper_cascor_worker.worker import _encode_binary_frame
+
+_URL_A = "ws://a:8200/ws/v1/workers"
+_URL_B = "ws://b:8200/ws/v1/workers"
+_URL_C = "ws://c:8200/ws/v1/workers"
+_FRAMES_A = (_encode_binary_frame(np.arange(6, dtype=np.float32).reshape(3, 2)), _encode_binary_frame(np.ones((3, 1), dtype=np.float32)))
+_FRAMES_B = (_encode_binary_frame(np.zeros((3, 2), dtype=np.float32)), _encode_binary_frame(np.full((3, 1), 2.0, dtype=np.float32)))
+
+
+def _federation(**overrides: Any) -> FederatedWorker:
+    cfg = {"server_url": _URL_A, "federation_urls": (_URL_B,), "auth_token": "k"}
+    cfg.update(overrides)
+    return FederatedWorker(WorkerConfig(**cfg))
+
+
+def _task_msg(task_id: str, frames: tuple[bytes, bytes], *, round_id: int, cached: bool) -> dict[str, Any]:
+    manifest = {
+        "candidate_input": {"shape": [3, 2], "dtype": "float32", "sha256": frame_digest(frames[0]), "cached": cached},
+        "residual_error": {"shape": [3, 1], "dtype": "float32", "sha256": frame_digest(frames[1]), "cached": cached},
+    }
+    return {"type": "task_assign", "task_id": task_id, "round_id": round_id, "candidate_data": {}, "training_params": {}, "tensor_manifest": manifest}
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+class TestFederationConfig:
+    def test_default(self):
+        assert WorkerConfig().federation_urls == ()
+
+    def test_from_env_splits_commas(self):
+        cfg = WorkerConfig.from_env(env={ENV_FEDERATION_URLS: f" {_URL_B}, ,{_URL_C}"})
+        assert cfg.federation_urls == (_URL_B, _URL_C)
+
+    def test_validate_rejects_non_ws_url(self):
+        with pytest.raises(WorkerConfigError, match="federation_urls"):
+            WorkerConfig(server_url=_URL_A, federation_urls=("http://b",)).validate(legacy=False)
+
+    @pytest.mark.parametrize("urls", [(_URL_A,), (_URL_B, _URL_B)])
+    def test_validate_rejects_repeats(self, urls):
+        with pytest.raises(WorkerConfigError, match="repeat"):
+            WorkerConfig(server_url=_URL_A, federation_urls=urls).validate(legacy=False)
+
+    @patch("juniper_cascor_worker.cli._run_websocket")
+    def test_cli_flag_repeats(self, mock_run_ws):
+        with patch.object(sys, "argv", ["juniper-cascor-worker", "--server-url", _URL_A, "--federation-url", _URL_B, "--federation-url", _URL_C]):
+            main()
+        assert mock_run_ws.call_args[0][0].federation_url == [_URL_B, _URL_C]
+
+    @patch("juniper_cascor_worker.cli.asyncio.run")
+    def test_cli_runs_a_federated_worker(self, mock_run, monkeypatch):
+        monkeypatch.setenv(ENV_FEDERATION_URLS, _URL_B)
+        with patch.object(sys, "argv", ["juniper-cascor-worker", "--server-url", _URL_A]), patch("juniper_cascor_worker.federation.FederatedWorker") as federated:
+            main()
+        assert federated.call_args[0][0].federation_urls == (_URL_B,)
+        mock_run.assert_called_once()
+        mock_run.call_args[0][0].close()
+
+
+@pytest.mark.unit
+class TestFairShareSlots:
+    @pytest.mark.asyncio
+    async def test_lone_share_may_use_every_slot(self):
+        slots = FairShareSlots(2)
+        share = slots.share(_URL_A)
+        await share.acquire()
+        await share.acquire()
+        assert share.locked() and share.held == 2
+
+    @pytest.mark.asyncio
+    async def test_freed_slot_goes_to_least_served_share(self):
+        slots = FairShareSlots(2)
+        busy, idle = slots.share(_URL_A), slots.share(_URL_B)
+        await busy.acquire()
+        await busy.acquire()
+        order: list[str] = []
+
+        async def wait(share):
+            await share.acquire()
+            order.append(share.name)
+
+        # The busy server queued first, but the idle one holds no slot.
+        waiters = [asyncio.create_task(wait(busy)), asyncio.create_task(wait(idle))]
+        await _settle()
+        busy.release()
+        await _settle()
+        assert order == [_URL_B] and (busy.held, idle.held) == (1, 1)
+        busy.release()
+        await asyncio.gather(*waiters)
+        assert order == [_URL_B, _URL_A]
+
+    @pytest.mark.asyncio
+    async def test_equal_shares_are_served_in_arrival_order(self):
+        slots = FairShareSlots(1)
+        first, second = slots.share(_URL_A), slots.share(_URL_B)
+        holder = slots.share(_URL_C)
+        await holder.acquire()
+        waiters = [asyncio.create_task(second.acquire()), asyncio.create_task(first.acquire())]
+        await _settle()
+        holder.release()
+        await _settle()
+        assert (second.held, first.held) == (1, 0)
+        second.release()
+        await asyncio.gather(*waiters)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        slots = FairShareSlots(1)
+        share = slots.share(_URL_A)
+        await share.acquire()
+        waiter = asyncio.create_task(share.acquire())
+        await _settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        share.release()
+        assert not share.locked() and share.metrics()["slots_waiting"] == 0
+
+    @pytest.mark.parametrize(("places", "servers", "quotas"), [(5, 1, [5]), (5, 2, [3, 2]), (1, 3, [1, 1, 1])])
+    def test_places_split_evenly_with_at_least_one_each(self, places, servers, quotas):
+        slots = FairShareSlots(1, places)
+        shares = [slots.share(f"s{i}") for i in range(servers)]
+        assert [slots.place_quota(share) for share in shares] == quotas
+
+    @pytest.mark.asyncio
+    async def test_metrics(self):
+        slots = FairShareSlots(1)
+        a, b = slots.share(_URL_A), slots.share(_URL_B)
+        await a.acquire()
+        assert slots.metrics() == [
+            {"server_url": _URL_A, "slots_held": 1, "slots_waiting": 0, "slot_grants": 1, "slot_wait_seconds": 0.0},
+            {"server_url": _URL_B, "slots_held": 0, "slots_waiting": 0, "slot_grants": 0, "slot_wait_seconds": 0.0},
+        ]
+        assert b.metrics()["slots_held"] == 0
+
+
+@pytest.mark.unit
+class TestFederatedWorker:
+    def test_one_agent_per_endpoint(self):
+        fed = _federation()
+        assert [agent.config.server_url for agent in fed.agents] == [_URL_A, _URL_B]
+        assert all(agent.config.federation_urls == () for agent in fed.agents)
+        assert {agent.worker_id for agent in fed.agents} == {fed.worker_id}
+
+    def test_training_resources_are_shared(self):
+        a, b = _federation().agents
+        assert a._backend is b._backend and a._slots is b._slots
+        assert a._tensor_cache is b._tensor_cache and a._buffer_pool is b._buffer_pool
+
+    @pytest.mark.asyncio
+    async def test_round_eviction_stays_within_its_server(self):
+        a, b = _federation().agents
+        for agent, frames in ((a, _FRAMES_A), (b, _FRAMES_B)):
+            agent._connection = MagicMock(send_json=AsyncMock(), receive_bytes=AsyncMock(side_effect=list(frames)))
+
+        with patch("juniper_cascor_worker.worker.CascorWorkerAgent._run_training", AsyncMock(return_value=({"success": True}, {}))):
+            # Server B is at round 2 while server A has moved on to round 9.
+            await b._handle_task_assign(_task_msg("b1", _FRAMES_B, round_id=2, cached=False))
+            await a._handle_task_assign(_task_msg("a1", _FRAMES_A, round_id=9, cached=False))
+            await b._handle_task_assign(_task_msg("b2", _FRAMES_B, round_id=2, cached=True))
+
+        assert b._tasks_completed == 2 and b._tasks_failed == 0
+        assert b._connection.receive_bytes.await_count == 2
+
+    def test_per_server_state_is_not_shared(self):
+        a, b = _federation().agents
+        assert a._outbox is not b._outbox and a._result_cache is not b._result_cache
+        assert a._dataset_store is not b._dataset_store
+
+    def test_health_ticks_pass_while_any_endpoint_is_up(self):
+        fed = _federation()
+        with pytest.raises(RuntimeError, match="a:8200.*b:8200"):
+            fed._readiness_tick()
+        up = fed.agents[1]
+        up._connection = MagicMock(connected=True)
+        up._registered = True
+        up._bump_liveness()
+        fed._liveness_tick()
+        fed._readiness_tick()
+
+    @pytest.mark.asyncio
+    async def test_run_shares_one_backend_and_health_server(self):
+        fed = _federation()
+        fed._backend = MagicMock(start=AsyncMock(), shutdown=AsyncMock(), layout=MagicMock(usable_cpus=2, task_slots=1, threads_per_task=2, source="test"))
+        health = MagicMock(start=AsyncMock(), stop=AsyncMock())
+        with patch("juniper_cascor_worker.http_health.HealthServer", return_value=health), patch("juniper_cascor_worker.worker.CascorWorkerAgent._run_inner", AsyncMock()) as run_inner:
+            await fed.run()
+        assert run_inner.await_count == 2
+        fed._backend.start.assert_awaited_once()
+        fed._backend.shutdown.assert_awaited_once()
+        health.start.assert_awaited_once()
+        health.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_carries_per_server_slot_accounting(self):
+        fed = _federation(heartbeat_interval=0.01)
+        agent = fed.agents[1]
+        captured: list[dict] = []
+
+        async def capture(msg):
+            captured.append(msg)
+            agent._stop_event.set()
+
+        agent._connection = MagicMock(connected=True, send_json=AsyncMock(side_effect=capture))
+        await fed.agents[0]._task_slots.acquire()
+
+        with patch("juniper_cascor_worker.worker._sample_gpu_utilization_pct", return_value=None):
+            await agent._heartbeat_loop()
+
+        shares = captured[0]["slot_shares"]
+        assert [share["server_url"] for share in shares] == [_URL_A, _URL_B]
+        assert [share["slots_held"] for share in shares] == [1, 0]
+
+    def test_stop_reaches_every_agent(self):
+        fed = _federation()
+        fed.stop()
+        assert all(agent._stop_event.is_set() for agent in fed.agents)
@@ -0,0 +1,128 @@
+"""Tests for the negotiated byte-shuffle frame compression codecs."""
+
+from __future__ import annotations
+
+import struct
+import threading
+import zlib
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker import worker as worker_module
+from juniper_cascor_worker.constants import BINARY_FRAME_HEADER_LENGTH_FORMAT, FRAME_CODECS
+from juniper_cascor_worker.frame_codec import FrameCodecError, compress_payload, decompress_into
+from juniper_cascor_worker.worker import BinaryFrameProtocolError, CascorWorkerAgent, _decode_binary_frame, _encode_binary_frame, _encode_compressed_frame
+
+
+def _smooth(n: int = 4096) -> np.ndarray:
+    """Compressible float32 data (a rounded random walk)."""
+    rng = np.random.default_rng(0)
+    return np.round(np.cumsum(rng.standard_normal(n)), 2).astype(np.float32).reshape(-1, 4)
+
+
+def _header(shape: tuple[int, ...], dtype: bytes = b"float32") -> bytes:
+    header = struct.pack(BINARY_FRAME_HEADER_LENGTH_FORMAT, len(shape)) + struct.pack(f"<{len(shape)}I", *shape)
+    return header + struct.pack(BINARY_FRAME_HEADER_LENGTH_FORMAT, len(dtype)) + dtype
+
+
+@pytest.mark.unit
+class TestFrameCodec:
+    @pytest.mark.parametrize("codec", FRAME_CODECS)
+    def test_roundtrip(self, codec):
+        array = _smooth()
+        frame = _encode_compressed_frame(array, codec, 6)
+        assert frame is not None and len(frame) < array.nbytes
+        decoded = _decode_binary_frame(frame, codec)
+        np.testing.assert_array_equal(decoded, array)
+        assert decoded.flags.writeable
+
+    def test_shuffle_beats_plain_on_float32(self):
+        array = _smooth(16384)
+        assert len(compress_payload(array, "shuffle+zlib", 6)) < len(compress_payload(array, "zlib", 6))
+
+    def test_bypass_small_and_incompressible(self):
+        assert compress_payload(np.zeros(8, dtype=np.float32), "shuffle+zlib", 6) is None
+        noise = np.random.default_rng(0).integers(0, 256, 65536, dtype=np.uint8)
+        assert compress_payload(noise, "zlib", 6) is None
+
+    def test_decompression_is_bounded_by_declared_shape(self):
+        bomb = zlib.compress(bytes(16 * 1024 * 1024))
+        with pytest.raises(BinaryFrameProtocolError, match="declared"):
+            _decode_binary_frame(_header((4,)) + bomb, "zlib")
+
+    def test_truncated_payload_rejected(self):
+        frame = _encode_compressed_frame(_smooth(), "shuffle+zlib", 6)
+        with pytest.raises(BinaryFrameProtocolError):
+            _decode_binary_frame(frame[:-16], "shuffle+zlib")
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(FrameCodecError, match="unsupported"):
+            decompress_into(memoryview(b""), "snappy", np.empty(0))
+
+
+@pytest.mark.unit
+class TestAgentFrameCodec:
+    def test_capabilities_advertise_codecs(self, make_agent):
+        pytest.importorskip("torch")
+        assert make_agent()._build_capabilities()["frame_codecs"] == list(FRAME_CODECS)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("accepted", "expected"), [(["shuffle+zlib"], "shuffle+zlib"), ([], None)])
+    async def test_result_codec_is_negotiated(self, make_agent, accepted, expected):
+        agent = make_agent(frame_codec="shuffle+zlib")
+        agent._connection.receive_json = AsyncMock(return_value={"type": "registration_ack", "frame_codecs": accepted})
+        with patch.object(CascorWorkerAgent, "_build_capabilities", return_value={}):
+            await agent._register()
+        assert agent._result_codec == expected
+
+    @pytest.mark.asyncio
+    async def test_result_tensor_compressed_only_when_negotiated(self, make_agent):
+        agent = make_agent(frame_codec="shuffle+zlib")
+        array = _smooth()
+        entry, frame = await agent._encode_result_tensor("norm_output", array)
+        assert "codec" not in entry and frame == _encode_binary_frame(array)
+
+        agent._result_codec = "shuffle+zlib"
+        entry, frame = await agent._encode_result_tensor("norm_output", array)
+        assert entry["codec"] == "shuffle+zlib"
+        np.testing.assert_array_equal(_decode_binary_frame(frame, entry["codec"]), array)
+
+    @pytest.mark.asyncio
+    async def test_compressed_task_frame_is_decoded(self, make_agent):
+        agent = make_agent()
+        array = _smooth()
+        agent._connection.receive_bytes.side_effect = [_encode_compressed_frame(array, "shuffle+lzma", 6), _encode_binary_frame(array)]
+        manifest = {"candidate_input": {"codec": "shuffle+lzma"}, "residual_error": {}}
+        tensors, _ = await agent._receive_tensors(manifest)
+        np.testing.assert_array_equal(tensors["candidate_input"], array)
+
+    @pytest.mark.asyncio
+    async def test_codecs_run_off_the_event_loop(self, make_agent):
+        agent = make_agent()
+        agent._result_codec = "shuffle+zlib"
+        array = _smooth()
+        threads: list[int] = []
+
+        def recording(fn):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return fn(*args)
+
+            return wrapper
+
+        agent._connection.receive_bytes.side_effect = [_encode_compressed_frame(array, "shuffle+zlib", 6), _encode_binary_frame(array)]
+        with patch.object(worker_module, "compress_payload", recording(compress_payload)), patch.object(worker_module, "decompress_into", recording(decompress_into)):
+            await agent._encode_result_tensor("norm_output", array)
+            await agent._receive_tensors({"candidate_input": {"codec": "shuffle+zlib"}, "residual_error": {}})
+        assert len(threads) == 2 and threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_unsupported_manifest_codec_fails_task(self, make_agent):
+        agent = make_agent()
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": {"candidate_input": {"codec": "snappy"}, "residual_error": {}}}
+        await agent._handle_task_assign(msg)
+        sent = agent._connection.send_json.call_args[0][0]
+        assert "unsupported codec" in sent["error_message"]
+        agent._connection.receive_bytes.assert_not_awaited()
@@ -0,0 +1,105 @@
+"""Tests for pipelined frame prefetch while every task slot is training."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+# Two float32 (2, 2) frames per task.
+_TASK_BYTES = 2 * 16
+
+
+def _task_msg(task_id: str) -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": task_id,
+        "candidate_index": 0,
+        "candidate_data": {"candidate_uuid": f"uuid-{task_id}"},
+        "training_params": {},
+        "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+    }
+
+
+class _GatedTraining:
+    """Stand-in for ``_run_training`` that blocks until released."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, candidate_data, training_params, tensors):
+        self.started.append(candidate_data["candidate_uuid"])
+        await self.release.wait()
+        return {"candidate_uuid": candidate_data["candidate_uuid"], "success": True}, {}
+
+
+@pytest.mark.unit
+class TestPrefetch:
+    @pytest.mark.asyncio
+    async def test_next_task_is_received_while_slot_trains(self, make_agent):
+        agent = make_agent(task_slots=1, prefetch_tasks=1)
+        training = _GatedTraining()
+
+        with patch.object(agent, "_run_training", training):
+            await agent._dispatch_task_assign(_task_msg("a"))
+            await asyncio.wait_for(agent._dispatch_task_assign(_task_msg("b")), timeout=2.0)
+            await asyncio.sleep(0)
+
+            assert agent._connection.receive_bytes.await_count == 4
+            assert training.started == ["uuid-a"]
+            assert (agent._prefetched_tasks, agent._prefetched_bytes) == (1, _TASK_BYTES)
+
+            third = asyncio.create_task(agent._dispatch_task_assign(_task_msg("c")))
+            await asyncio.sleep(0.01)
+            assert not third.done(), "prefetch depth is bounded by prefetch_tasks"
+
+            training.release.set()
+            await asyncio.wait_for(third, timeout=2.0)
+            await agent._finish_slot_tasks(cancel=False)
+
+        assert training.started == ["uuid-a", "uuid-b", "uuid-c"]
+        assert agent._tasks_completed == 3
+        assert (agent._prefetched_tasks, agent._prefetched_bytes) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_bounds_prefetch(self, make_agent):
+        agent = make_agent(task_slots=1, prefetch_tasks=2, prefetch_bytes=_TASK_BYTES)
+        training = _GatedTraining()
+
+        with patch.object(agent, "_run_training", training):
+            await agent._dispatch_task_assign(_task_msg("a"))
+            await agent._dispatch_task_assign(_task_msg("b"))
+            await asyncio.sleep(0)
+
+            third = asyncio.create_task(agent._dispatch_task_assign(_task_msg("c")))
+            await asyncio.sleep(0.01)
+            assert not third.done(), "budget is full until the prefetched task starts training"
+            assert agent._connection.receive_bytes.await_count == 4
+
+            training.release.set()
+            await asyncio.wait_for(third, timeout=2.0)
+            await agent._finish_slot_tasks(cancel=False)
+
+        assert agent._tasks_completed == 3
+
+    @pytest.mark.asyncio
+    async def test_slot_wait_does_not_count_toward_task_timeout(self, make_agent):
+        agent = make_agent(task_slots=1, prefetch_tasks=1, task_timeout=0.2)
+
+        async def slow_training(candidate_data, training_params, tensors):
+            await asyncio.sleep(0.15)
+            return {"candidate_uuid": candidate_data["candidate_uuid"], "success": True}, {}
+
+        with patch.object(agent, "_run_training", side_effect=slow_training):
+            await agent._dispatch_task_assign(_task_msg("a"))
+            await agent._dispatch_task_assign(_task_msg("b"))
+            await agent._finish_slot_tasks(cancel=False)
+
+        assert (agent._tasks_completed, agent._tasks_failed) == (2, 0)
+
+    def test_capabilities_advertise_prefetch_depth(self, make_agent):
+        pytest.importorskip("torch")
+        assert make_agent(prefetch_tasks=2)._build_capabilities()["prefetch_tasks"] == 2
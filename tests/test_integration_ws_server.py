@@ -279,7 +279,7 @@ async def test_task_timeout_preserves_candidate_uuid_cw04() -> None:
         agent = _make_agent(server.url, task_timeout=0.1)
         agent_task = asyncio.create_task(agent.run())
         try:
-            with patch("juniper_cascor_worker.worker.asyncio.to_thread", side_effect=hang_forever):
+            with patch.object(CascorWorkerAgent, "_run_training", side_effect=hang_forever):
                 result_msg = await _wait_for_task_result(server, "task-timeout-001")
                 assert result_msg["candidate_uuid"] == "uuid-timeout-zzz", "CW-04: timeout response must carry the original UUID"
                 assert result_msg["success"] is False
@@ -0,0 +1,81 @@
+"""Tests for the negotiated packed multi-tensor result frame."""
+
+from __future__ import annotations
+
+import struct
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import PACKED_FRAME_MAX_TENSORS
+from juniper_cascor_worker.worker import BinaryFrameProtocolError, CascorWorkerAgent, _decode_binary_frame, _encode_binary_frame, _pack_result_frames
+from tests.helpers import unpack_result_frames
+
+_RESULT_TENSORS = {
+    "weights": np.arange(6, dtype=np.float32),
+    "bias": np.array([0.5], dtype=np.float32),
+    "norm_output": np.linspace(0, 1, 8, dtype=np.float32).reshape(8, 1),
+    "norm_error": np.ones((8, 2), dtype=np.float32),
+}
+
+
+@pytest.mark.unit
+class TestPackedFrame:
+    def test_roundtrip(self):
+        frames = [_encode_binary_frame(array) for array in _RESULT_TENSORS.values()]
+        unpacked = unpack_result_frames(_pack_result_frames(list(_RESULT_TENSORS), frames))
+        assert list(unpacked) == list(_RESULT_TENSORS)
+        for name, array in _RESULT_TENSORS.items():
+            np.testing.assert_array_equal(_decode_binary_frame(unpacked[name]), array)
+
+    def test_empty(self):
+        assert unpack_result_frames(_pack_result_frames([], [])) == {}
+
+    def test_truncated_rejected(self):
+        packed = _pack_result_frames(["weights"], [_encode_binary_frame(_RESULT_TENSORS["weights"])])
+        with pytest.raises(BinaryFrameProtocolError, match="add up"):
+            unpack_result_frames(packed[:-1])
+        with pytest.raises(BinaryFrameProtocolError, match="malformed"):
+            unpack_result_frames(packed[:6])
+
+    def test_tensor_count_bounded(self):
+        with pytest.raises(BinaryFrameProtocolError, match="max"):
+            unpack_result_frames(struct.pack("<I", PACKED_FRAME_MAX_TENSORS + 1))
+
+
+@pytest.mark.unit
+class TestAgentPackedResults:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("acked", "expected"), [(True, True), (None, False), ("yes", False)])
+    async def test_packing_is_negotiated(self, make_agent, acked, expected):
+        agent = make_agent()
+        agent._connection.receive_json = AsyncMock(return_value={"type": "registration_ack", "packed_results": acked})
+        with patch.object(CascorWorkerAgent, "_build_capabilities", return_value={}):
+            await agent._register()
+        assert agent._packed_results is expected
+
+    def test_capabilities_offer_packing(self, make_agent):
+        pytest.importorskip("torch")
+        assert make_agent()._build_capabilities()["packed_results"] is True
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("packed", [True, False])
+    async def test_result_tensors_sent_as_one_message(self, make_agent, packed):
+        agent = make_agent()
+        agent._packed_results = packed
+        agent._connection.receive_bytes.return_value = _encode_binary_frame(np.zeros((8, 2), dtype=np.float32))
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": {"candidate_input": {}, "residual_error": {}}}
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=({"success": True}, dict(_RESULT_TENSORS)))):
+            await agent._handle_task_assign(msg)
+
+        sent = agent._connection.send_json.call_args[0][0]
+        frames = [call.args[0] for call in agent._connection.send_bytes.await_args_list]
+        if packed:
+            assert sent["packed_frames"] is True and len(frames) == 1
+            unpacked = unpack_result_frames(frames[0])
+            assert list(unpacked) == list(sent["tensor_manifest"])
+            np.testing.assert_array_equal(_decode_binary_frame(unpacked["norm_error"]), _RESULT_TENSORS["norm_error"])
+        else:
+            assert "packed_frames" not in sent and len(frames) == len(_RESULT_TENSORS)
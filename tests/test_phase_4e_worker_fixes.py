@@ -131,7 +131,7 @@ async def test_handle_task_assign_timeout_carries_uuid_cw04(monkeypatch: pytest.
     async def hang_forever(*_args: Any, **_kwargs: Any) -> Any:
         await asyncio.sleep(60)
 
-    monkeypatch.setattr(worker_mod.asyncio, "to_thread", hang_forever)
+    monkeypatch.setattr(worker_mod.CascorWorkerAgent, "_run_training", hang_forever)
 
     msg = {
         "task_id": "t-timeout",
@@ -293,20 +293,11 @@ class TestCliFileIndirection:
     """
 
     def _build_args(self) -> "object":  # noqa: ANN001
-        from unittest.mock import MagicMock
+        # The real parser, so every flag ``_run_websocket`` reads has its
+        # default — a hand-built mock silently misses newly added flags.
+        from juniper_cascor_worker.cli import _build_parser
 
-        mock_args = MagicMock()
-        mock_args.legacy = False
-        mock_args.cascor_path = None
-        mock_args.log_level = "WARNING"
-        mock_args.server_url = None
-        mock_args.auth_token = None
-        mock_args.heartbeat_interval = 10.0
-        mock_args.task_timeout = 3600.0
-        mock_args.tls_cert = None
-        mock_args.tls_key = None
-        mock_args.tls_ca = None
-        return mock_args
+        return _build_parser().parse_args(["--log-level", "WARNING"])
 
     def _fake_agent_factory(self) -> "tuple[type, list]":  # noqa: ANN001
         captured_config: list = []
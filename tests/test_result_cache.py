@@ -0,0 +1,149 @@
+"""Tests for result-tensor selection, the result cache and ``result_fetch``."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.result_cache import ResultCache, validate_result_selection
+from juniper_cascor_worker.worker import CascorWorkerAgent, _decode_binary_frame, _encode_binary_frame
+from tests.helpers import unpack_result_frames
+
+_RESULT_TENSORS = {
+    "weights": np.arange(3, dtype=np.float32),
+    "bias": np.array([0.5], dtype=np.float32),
+    "norm_output": np.linspace(0, 1, 64, dtype=np.float32),
+    "norm_error": np.ones(64, dtype=np.float32),
+}
+
+
+class _StopLoop(Exception):
+    pass
+
+
+def _task_msg(selection: Any) -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": "t1",
+        "candidate_data": {},
+        "training_params": {"result_tensors": selection},
+        "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+    }
+
+
+@pytest.mark.unit
+class TestResultCache:
+    def test_get_subset_and_missing(self):
+        cache = ResultCache(max_bytes=1 << 20, ttl=60)
+        cache.put("t", {"norm_output": np.zeros(4), "norm_error": np.ones(4)})
+        found, missing = cache.get("t", ["norm_error", "weights"])
+        assert list(found) == ["norm_error"] and missing == ["weights"]
+        assert cache.get("t")[1] == []
+
+    def test_entries_expire(self):
+        cache = ResultCache(max_bytes=1 << 20, ttl=60)
+        with patch("juniper_cascor_worker.result_cache.time.monotonic", return_value=100.0):
+            cache.put("t", {"norm_output": np.zeros(4)})
+        with patch("juniper_cascor_worker.result_cache.time.monotonic", return_value=161.0):
+            assert cache.get("t", ["norm_output"]) == ({}, ["norm_output"])
+            assert cache.metrics()["result_cache_evictions"] == 1
+
+    def test_evicts_oldest_over_budget(self):
+        cache = ResultCache(max_bytes=64, ttl=60)
+        cache.put("a", {"x": np.zeros(8)})
+        cache.put("b", {"x": np.zeros(8)})
+        assert cache.get("a", ["x"])[1] == ["x"]
+        assert cache.metrics()["result_cache_bytes"] == 64
+        assert cache.put("c", {"x": np.zeros(9)}) is False
+
+    def test_selection_validation(self):
+        assert validate_result_selection(None) is None
+        assert validate_result_selection(["weights"]) is None
+        assert validate_result_selection("weights") is not None
+        assert validate_result_selection([1]) is not None
+
+
+@pytest.mark.unit
+class TestAgentResultSelection:
+    @staticmethod
+    async def _run_task(agent: CascorWorkerAgent, selection: Any) -> None:
+        agent._connection.receive_bytes.return_value = _encode_binary_frame(np.zeros((64, 2), dtype=np.float32))
+        result = ({"success": True}, dict(_RESULT_TENSORS))
+        with patch.object(agent, "_run_training", AsyncMock(return_value=result)):
+            await agent._handle_task_assign(_task_msg(selection))
+
+    @pytest.mark.asyncio
+    async def test_unselected_tensors_are_withheld(self, make_agent):
+        agent = make_agent()
+        await self._run_task(agent, ["weights", "bias"])
+
+        sent = agent._connection.send_json.call_args[0][0]
+        assert list(sent["tensor_manifest"]) == ["weights", "bias"]
+        assert sent["withheld_tensors"] == ["norm_output", "norm_error"]
+        assert agent._connection.send_bytes.await_count == 2
+        assert agent._result_cache.metrics()["result_cache_entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_selection_sends_everything(self, make_agent):
+        agent = make_agent()
+        await self._run_task(agent, None)
+        sent = agent._connection.send_json.call_args[0][0]
+        assert list(sent["tensor_manifest"]) == list(_RESULT_TENSORS) and "withheld_tensors" not in sent
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_sends_everything(self, make_agent):
+        agent = make_agent(result_cache_bytes=0)
+        await self._run_task(agent, ["weights"])
+        sent = agent._connection.send_json.call_args[0][0]
+        assert list(sent["tensor_manifest"]) == list(_RESULT_TENSORS) and "withheld_tensors" not in sent
+
+    @pytest.mark.asyncio
+    async def test_invalid_selection_fails_task(self, make_agent):
+        agent = make_agent()
+        await self._run_task(agent, "norm_output")
+        assert "Training params invalid" in agent._connection.send_json.call_args[0][0]["error_message"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_returns_withheld_tensors(self, make_agent):
+        agent = make_agent()
+        await self._run_task(agent, ["weights", "bias"])
+        agent._connection.send_json.reset_mock()
+        agent._connection.send_bytes.reset_mock()
+
+        await agent._handle_result_fetch({"type": "result_fetch", "task_id": "t1", "tensors": ["norm_output", "gone"]})
+
+        reply = agent._connection.send_json.call_args[0][0]
+        assert reply["type"] == "result_tensors" and reply["task_id"] == "t1"
+        assert list(reply["tensor_manifest"]) == ["norm_output"] and reply["missing"] == ["gone"]
+        frame = agent._connection.send_bytes.await_args.args[0]
+        np.testing.assert_array_equal(_decode_binary_frame(frame), _RESULT_TENSORS["norm_output"])
+
+    @pytest.mark.asyncio
+    async def test_fetch_reply_is_packed_when_negotiated(self, make_agent):
+        agent = make_agent()
+        agent._packed_results = True
+        await self._run_task(agent, [])
+        await agent._handle_result_fetch({"type": "result_fetch", "task_id": "t1"})
+        reply = agent._connection.send_json.call_args[0][0]
+        assert reply["packed_frames"] is True
+        assert list(unpack_result_frames(agent._connection.send_bytes.await_args.args[0])) == list(_RESULT_TENSORS)
+
+    @pytest.mark.asyncio
+    async def test_fetch_for_unknown_task_reports_missing(self, make_agent):
+        agent = make_agent()
+        await agent._handle_result_fetch({"type": "result_fetch", "task_id": "nope", "tensors": ["norm_output"]})
+        reply = agent._connection.send_json.call_args[0][0]
+        assert reply["tensor_manifest"] == {} and reply["missing"] == ["norm_output"]
+        agent._connection.send_bytes.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_message_loop_dispatches_fetch(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive = AsyncMock(side_effect=['{"type": "result_fetch", "task_id": "x"}', _StopLoop()])
+        with patch.object(agent, "_handle_result_fetch", AsyncMock()) as handler:
+            with pytest.raises(_StopLoop):
+                await agent._message_loop()
+        handler.assert_awaited_once()
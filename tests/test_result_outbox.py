@@ -0,0 +1,126 @@
+"""Tests for the bounded result outbox and its sender coroutine."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import DEFAULT_RESULT_OUTBOX_SIZE
+from juniper_cascor_worker.outbox import ResultOutbox
+from juniper_cascor_worker.worker import CascorWorkerAgent, _encode_binary_frame
+
+
+def _task_msg(task_id: str) -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": task_id,
+        "candidate_index": 0,
+        "candidate_data": {"candidate_uuid": f"uuid-{task_id}"},
+        "training_params": {},
+        "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+    }
+
+
+@pytest.mark.unit
+class TestResultOutbox:
+    @pytest.mark.asyncio
+    async def test_sends_groups_in_order(self):
+        outbox = ResultOutbox(4)
+        sent: list[Any] = []
+
+        async def send_group(msg, frames):
+            sent.append((msg["id"], frames))
+
+        await outbox.put({"id": 1}, [b"a"])
+        await outbox.put({"id": 2})
+        sender = asyncio.create_task(outbox.run(send_group))
+        await outbox.drain(sender)
+        sender.cancel()
+
+        assert sent == [(1, [b"a"]), (2, [])]
+        assert outbox.metrics()["outbox_sent_total"] == 2
+        assert outbox.metrics()["outbox_max_depth"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_outbox_backpressures_producer(self):
+        outbox = ResultOutbox(1)
+        await outbox.put({"id": 1})
+        blocked = asyncio.create_task(outbox.put({"id": 2}))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        sender = asyncio.create_task(outbox.run(AsyncMock()))
+        await asyncio.wait_for(blocked, timeout=2.0)
+        await outbox.drain(sender)
+        sender.cancel()
+
+        metrics = outbox.metrics()
+        assert metrics["outbox_blocked_total"] == 1
+        assert metrics["outbox_blocked_seconds_total"] > 0
+        assert metrics["outbox_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_returns_when_sender_fails(self):
+        outbox = ResultOutbox(4)
+        await outbox.put({"id": 1})
+        await outbox.put({"id": 2})
+        sender = asyncio.create_task(outbox.run(AsyncMock(side_effect=ConnectionError("gone"))))
+        await asyncio.wait_for(outbox.drain(sender), timeout=2.0)
+        assert outbox.clear() == 1
+
+
+@pytest.mark.unit
+class TestAgentOutbox:
+    @pytest.mark.asyncio
+    async def test_task_finishes_before_slow_upload(self):
+        agent = CascorWorkerAgent(WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers", auth_token="k"))  # nosec B106 — dummy test token
+        upload = asyncio.Event()
+
+        async def slow_send_bytes(_frame):
+            await upload.wait()
+
+        conn = MagicMock()
+        conn.send_json = AsyncMock()
+        conn.send_bytes = AsyncMock(side_effect=slow_send_bytes)
+        conn.receive_bytes = AsyncMock(return_value=_encode_binary_frame(np.zeros((2, 2), dtype=np.float32)))
+        agent._connection = conn
+        agent._outbox_sender = asyncio.create_task(agent._outbox.run(agent._send_message_group))
+        result = ({"candidate_uuid": "uuid-a", "success": True}, {"weights": np.ones(3, dtype=np.float32)})
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=result)):
+            await asyncio.wait_for(agent._handle_task_assign(_task_msg("a")), timeout=2.0)
+
+        assert agent._tasks_completed == 1
+        await asyncio.sleep(0)
+        assert conn.send_json.await_count == 1
+        assert agent._outbox.metrics()["outbox_sent_total"] == 0, "upload still in progress"
+
+        upload.set()
+        await agent._stop_outbox_sender(drain=True)
+        assert agent._outbox.metrics()["outbox_sent_total"] == 1
+        assert agent._outbox_sender is None
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_reports_outbox_metrics(self):
+        agent = CascorWorkerAgent(WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers", auth_token="k", heartbeat_interval=0.01))  # nosec B106 — dummy test token
+        captured: list[dict] = []
+
+        async def capture(msg):
+            captured.append(msg)
+            agent._stop_event.set()
+
+        conn = MagicMock()
+        conn.connected = True
+        conn.send_json = AsyncMock(side_effect=capture)
+        agent._connection = conn
+
+        with patch("juniper_cascor_worker.worker._sample_gpu_utilization_pct", return_value=None):
+            await agent._heartbeat_loop()
+
+        assert captured[0]["outbox_capacity"] == DEFAULT_RESULT_OUTBOX_SIZE
+        assert captured[0]["outbox_depth"] == 0
@@ -0,0 +1,188 @@
+"""Tests for unacknowledged-result replay after a reconnect (session resume)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import BUFFER_POOL_MIN_BYTES
+from juniper_cascor_worker.exceptions import WorkerConnectionError
+from juniper_cascor_worker.result_replay import ResultReplayBuffer
+from juniper_cascor_worker.worker import CascorWorkerAgent, _encode_binary_frame
+
+_FRAME = _encode_binary_frame(np.zeros((4, 2), dtype=np.float32))
+
+
+def _task_msg(task_id: str = "t1") -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": task_id,
+        "candidate_data": {},
+        "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+    }
+
+
+def _result(task_id: str) -> dict[str, Any]:
+    return {"type": "task_result", "task_id": task_id}
+
+
+async def _register(agent: CascorWorkerAgent, ack: dict[str, Any]) -> dict[str, Any]:
+    agent._connection.receive_json = AsyncMock(return_value={"type": "registration_ack", **ack})
+    await agent._register()
+    return agent._connection.send_json.await_args.args[0]
+
+
+@pytest.mark.unit
+class TestResultReplayBuffer:
+    def test_ack_forgets_the_group(self):
+        buffer = ResultReplayBuffer(1024)
+        msg = _result("a")
+        assert buffer.add("a", msg, [b"x"], 1) and buffer.holds(msg)
+        assert buffer.ack("a") == (msg, [b"x"])
+        assert buffer.ack("a") is None and not buffer.holds(msg)
+        assert buffer.metrics()["results_acked"] == 1 and buffer.metrics()["unacked_result_bytes"] == 0
+
+    def test_oldest_groups_are_dropped_over_budget(self):
+        buffer = ResultReplayBuffer(10)
+        for task_id in "abc":
+            buffer.add(task_id, _result(task_id), [], 4)
+        assert buffer.task_ids() == ["b", "c"] and buffer.metrics()["unacked_results_dropped"] == 1
+
+    def test_oversized_group_and_disabled_buffer_keep_nothing(self):
+        assert ResultReplayBuffer(10).add("a", _result("a"), [], 11) is False
+        assert ResultReplayBuffer(0).add("a", _result("a"), [], 0) is False
+
+    def test_replay_narrowed_by_the_server(self):
+        buffer = ResultReplayBuffer(1024)
+        for task_id in "abc":
+            buffer.add(task_id, _result(task_id), [], 1)
+        assert [msg["task_id"] for msg, _ in buffer.replay(["c", "a", "zz"])] == ["a", "c"]
+        assert buffer.task_ids() == ["a", "c"]
+        assert buffer.metrics()["results_replayed"] == 2 and buffer.metrics()["unacked_results_dropped"] == 1
+
+    def test_clear(self):
+        buffer = ResultReplayBuffer(1024)
+        buffer.add("a", _result("a"), [], 1)
+        assert buffer.clear() == 1 and buffer.task_ids() == []
+
+
+@pytest.mark.unit
+class TestResumeHandshake:
+    @pytest.mark.asyncio
+    async def test_register_lists_pending_results(self, make_agent):
+        agent = make_agent()
+        agent._result_replay.add("a", _result("a"), [], 1)
+        register = await _register(agent, {"session_resume": True})
+        assert register["capabilities"]["session_resume"] is True
+        assert register["pending_results"] == ["a"]
+        assert agent._session_resume and [msg["task_id"] for msg, _ in agent._pending_replay] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_server_selects_results_to_replay(self, make_agent):
+        agent = make_agent()
+        for task_id in "ab":
+            agent._result_replay.add(task_id, _result(task_id), [], 1)
+        await _register(agent, {"session_resume": True, "replay_results": ["b"]})
+        assert [msg["task_id"] for msg, _ in agent._pending_replay] == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_server_without_resume_gets_nothing_replayed(self, make_agent):
+        agent = make_agent()
+        agent._result_replay.add("a", _result("a"), [], 1)
+        await _register(agent, {})
+        assert not agent._session_resume and agent._pending_replay == []
+        assert agent._result_replay.task_ids() == []
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, make_agent):
+        agent = make_agent(result_replay_bytes=0)
+        register = await _register(agent, {"session_resume": True})
+        assert register["capabilities"]["session_resume"] is False and "pending_results" not in register
+        assert not agent._session_resume
+
+
+@pytest.mark.unit
+class TestAgentResultReplay:
+    @pytest.mark.asyncio
+    async def test_result_is_kept_until_acked(self, make_agent):
+        agent = make_agent()
+        agent._session_resume = True
+        agent._registered = True
+        agent._connection.receive_bytes.return_value = _FRAME
+        with patch.object(agent, "_run_training", AsyncMock(return_value=({"success": True}, {}))):
+            await agent._handle_task_assign(_task_msg())
+        agent._connection.send_json.assert_awaited_once()
+        assert agent._result_replay.task_ids() == ["t1"]
+        agent._release_acked_result("t1")
+        assert agent._result_replay.task_ids() == []
+
+    @pytest.mark.asyncio
+    async def test_result_finished_between_connections_is_only_kept(self, make_agent):
+        agent = make_agent()
+        agent._session_resume = True
+        await agent._send_result(_result("t1"), [b"frame"])
+        agent._connection.send_json.assert_not_awaited()
+        assert agent._result_replay.task_ids() == ["t1"]
+
+    @pytest.mark.asyncio
+    async def test_kept_pooled_buffers_return_on_ack(self, make_agent):
+        agent = make_agent()
+        agent._session_resume = True
+        agent._registered = True
+        agent._wire_precision = "float16"
+        agent._connection.receive_bytes.return_value = _FRAME
+        norm_output = np.ones(BUFFER_POOL_MIN_BYTES // 2, dtype=np.float32)
+        with patch.object(agent, "_run_training", AsyncMock(return_value=({"success": True}, {"norm_output": norm_output}))):
+            await agent._handle_task_assign(_task_msg())
+        assert agent._buffer_pool.metrics()["buffer_pool_leased_bytes"] > 0
+        agent._release_acked_result("t1")
+        assert agent._buffer_pool.metrics()["buffer_pool_leased_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_training_survives_a_reconnect_and_its_result_is_replayed(self, make_agent):
+        agent = make_agent(reconnect_backoff_base=0.01)
+        training_may_finish = asyncio.Event()
+        result_sent = asyncio.Event()
+
+        async def train(*_args):
+            await training_may_finish.wait()
+            return {"success": True}, {}
+
+        first = AsyncMock()
+        first.receive_json.side_effect = [{"type": "connection_established"}, {"type": "registration_ack", "session_resume": True}]
+        first.receive.side_effect = [json.dumps(_task_msg()), WorkerConnectionError("socket closed")]
+        first.receive_bytes.return_value = _FRAME
+
+        async def reconnect(**_kwargs):
+            training_may_finish.set()
+            while not agent._result_replay.task_ids():
+                await asyncio.sleep(0)
+
+        async def sent(msg):
+            if msg.get("type") == "task_result":
+                result_sent.set()
+
+        async def ack_result():
+            await result_sent.wait()
+            agent.stop()
+            return json.dumps({"type": "result_ack", "task_id": "t1", "status": "ok"})
+
+        second = AsyncMock()
+        second.connect_with_retry.side_effect = reconnect
+        second.receive_json.side_effect = [{"type": "connection_established"}, {"type": "registration_ack", "session_resume": True}]
+        second.receive.side_effect = ack_result
+        second.send_json.side_effect = sent
+
+        connections = iter([first, second])
+        with patch.object(agent, "_run_training", train), patch("juniper_cascor_worker.worker._sample_gpu_utilization_pct", return_value=None):
+            await asyncio.wait_for(agent._run_inner(lambda **_kwargs: next(connections)), timeout=10)
+
+        register = next(call.args[0] for call in second.send_json.await_args_list if call.args[0]["type"] == "register")
+        assert register["pending_results"] == ["t1"] and register["worker_id"] == agent.worker_id
+        assert agent._tasks_completed == 1 and agent._result_replay.task_ids() == []
+        assert agent._result_replay.metrics()["results_replayed"] == 1
@@ -0,0 +1,78 @@
+"""Tests for scatter-gather result frames (header plus a view of the array)."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import SCATTER_GATHER_MIN_BYTES
+from juniper_cascor_worker.worker import _decode_binary_frame, _encode_binary_frame, _encode_frame_fragments, _pack_result_fragments
+from tests.helpers import unpack_result_frames
+
+_LARGE = np.arange(SCATTER_GATHER_MIN_BYTES // 4, dtype=np.float32).reshape(-1, 2)
+_SMALL = np.arange(6, dtype=np.float32)
+
+
+def _shares_memory(part: Any, array: np.ndarray) -> bool:
+    return np.shares_memory(np.frombuffer(part, dtype=np.uint8), array)
+
+
+@pytest.mark.unit
+class TestEncodeFrameFragments:
+    def test_large_payload_is_a_view(self):
+        header, payload = _encode_frame_fragments(_LARGE)
+        assert isinstance(payload, memoryview) and _shares_memory(payload, _LARGE)
+        assert b"".join([header, payload]) == _encode_binary_frame(_LARGE)
+
+    def test_small_payload_is_joined(self):
+        frame = _encode_frame_fragments(_SMALL)
+        assert isinstance(frame, bytes) and frame == _encode_binary_frame(_SMALL)
+
+    def test_non_contiguous_array_is_copied_once(self):
+        strided = np.asfortranarray(_LARGE)
+        parts = _encode_frame_fragments(strided)
+        np.testing.assert_array_equal(_decode_binary_frame(b"".join(parts)), _LARGE)
+
+    def test_header_dtype_override(self):
+        bits = _LARGE.view(np.uint16)
+        parts = _encode_frame_fragments(bits, "bfloat16")
+        assert b"bfloat16" in parts[0] and _shares_memory(parts[1], bits)
+
+
+@pytest.mark.unit
+class TestPackedFragments:
+    def test_large_frames_stay_fragments(self):
+        frames = [_encode_frame_fragments(_SMALL), _encode_frame_fragments(_LARGE)]
+        parts = _pack_result_fragments(["bias", "norm_output"], frames)
+        assert _shares_memory(parts[-1], _LARGE)
+        unpacked = unpack_result_frames(b"".join(parts))
+        np.testing.assert_array_equal(_decode_binary_frame(unpacked["norm_output"]), _LARGE)
+        np.testing.assert_array_equal(_decode_binary_frame(unpacked["bias"]), _SMALL)
+
+    def test_small_frames_are_joined(self):
+        packed = _pack_result_fragments(["bias"], [_encode_frame_fragments(_SMALL)])
+        assert isinstance(packed, bytes) and list(unpack_result_frames(packed)) == ["bias"]
+
+
+@pytest.mark.unit
+class TestAgentScatterGather:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("packed", [False, True])
+    async def test_large_result_is_sent_without_copy(self, make_agent, packed):
+        agent = make_agent()
+        agent._packed_results = packed
+        agent._connection.receive_bytes.return_value = _encode_binary_frame(np.zeros((4, 2), dtype=np.float32))
+        norm_output = _LARGE.copy()
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": {"candidate_input": {}, "residual_error": {}}}
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=({"success": True}, {"weights": _SMALL, "norm_output": norm_output}))):
+            await agent._handle_task_assign(msg)
+
+        sent = [call.args[0] for call in agent._connection.send_bytes.await_args_list]
+        assert len(sent) == (1 if packed else 2)
+        assert isinstance(sent[-1], list) and _shares_memory(sent[-1][-1], norm_output)
+        if not packed:
+            assert isinstance(sent[0], bytes)
@@ -65,3 +65,29 @@ class TestBinaryFrameBoundsRejection:
         frame += np.zeros(1, dtype=np.float32).tobytes()
         decoded = _decode_binary_frame(frame)
         assert decoded.shape == shape
+
+    def test_rejects_payload_length_mismatch(self) -> None:
+        frame = _header(1, (4,), b"float32") + np.zeros(3, dtype=np.float32).tobytes()
+        with pytest.raises(BinaryFrameProtocolError, match="payload"):
+            _decode_binary_frame(frame)
+
+    def test_rejects_object_dtype(self) -> None:
+        with pytest.raises(BinaryFrameProtocolError, match="numeric dtype"):
+            _decode_binary_frame(_header(1, (1,), b"O") + b"\0" * 8)
+
+    @pytest.mark.parametrize("frame", [b"\x01\x00", _header(1, (4,), b"float32")[:6], _header(1, (4,), b"float32")[:-2]])
+    def test_rejects_truncated_header(self, frame: bytes) -> None:
+        with pytest.raises(BinaryFrameProtocolError, match="truncated"):
+            _decode_binary_frame(frame)
+
+    def test_rejects_undecodable_dtype(self) -> None:
+        with pytest.raises(BinaryFrameProtocolError, match="dtype"):
+            _decode_binary_frame(_header(1, (1,), b"\xff\xfe"))
+
+
+class TestBinaryFrameSingleCopy:
+    def test_decoded_array_is_writable_aligned_and_owned(self) -> None:
+        frame = _encode_binary_frame(np.arange(12, dtype=np.float32).reshape(3, 4))
+        decoded = _decode_binary_frame(frame)
+        assert decoded.flags.writeable and decoded.flags.aligned and decoded.flags.c_contiguous
+        assert decoded.base is None, "decode should allocate exactly one array, not a view"
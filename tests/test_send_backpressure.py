@@ -0,0 +1,161 @@
+"""Tests for send-queue accounting, watermarks and the writable signal."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from juniper_cascor_worker.constants import DEFAULT_SEND_BUFFER_BYTES
+from juniper_cascor_worker.exceptions import WorkerConnectionError
+from juniper_cascor_worker.ws_connection import SendFlowControl, WorkerConnection
+
+
+def _connection(flow: SendFlowControl) -> WorkerConnection:
+    conn = WorkerConnection("ws://localhost:8200/ws/v1/workers", flow=flow)
+    conn._ws = AsyncMock()
+    conn._ws.protocol.state.name = "OPEN"
+    conn._ws.transport = MagicMock()
+    conn._ws.transport.get_extra_info.return_value = None
+    return conn
+
+
+@pytest.mark.unit
+class TestSendFlowControl:
+    def test_watermarks_have_hysteresis(self):
+        flow = SendFlowControl(100)
+        assert flow.low_watermark == 25
+        with flow.sending(60):
+            with flow.sending(60):
+                assert flow.queued_bytes == 120 and not flow.writable
+            # Below the high watermark but above the low one: still held back.
+            assert flow.queued_bytes == 60 and not flow.writable
+        assert flow.queued_bytes == 0 and flow.writable
+        assert flow.metrics()["send_unwritable_total"] == 1
+
+    def test_drained_to_low_watermark_is_writable(self):
+        flow = SendFlowControl(100)
+        with flow.sending(20):
+            with flow.sending(90):
+                assert not flow.writable
+            assert flow.writable
+
+    def test_zero_watermark_never_blocks(self):
+        flow = SendFlowControl(0)
+        with flow.sending(1 << 30):
+            assert flow.writable
+
+    def test_failed_send_is_unwound_but_not_counted(self):
+        flow = SendFlowControl(10)
+        with pytest.raises(OSError):
+            with flow.sending(50):
+                raise OSError("reset")
+        assert flow.queued_bytes == 0 and flow.writable
+        assert flow.metrics()["messages_sent"] == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_writable_blocks_until_drained(self):
+        flow = SendFlowControl(10)
+        release = asyncio.Event()
+
+        async def send():
+            with flow.sending(50):
+                await release.wait()
+
+        sender = asyncio.create_task(send())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flow.wait_writable())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        release.set()
+        await asyncio.gather(sender, waiter)
+        metrics = flow.metrics()
+        assert metrics["send_blocked_total"] == 1 and metrics["send_blocked_seconds_total"] >= 0
+        assert metrics["messages_sent"] == 1 and metrics["bytes_sent"] == 50
+        assert metrics["send_latency_last_seconds"] is not None and metrics["send_latency_avg_seconds"] is not None
+
+
+@pytest.mark.unit
+class TestConnectionAccounting:
+    @pytest.mark.asyncio
+    async def test_bytes_are_queued_while_the_send_is_in_progress(self):
+        conn = _connection(SendFlowControl(1024))
+        seen: list[int] = []
+
+        async def send(payload):
+            seen.append(conn.queued_bytes)
+
+        conn._ws.send.side_effect = send
+        await conn.send_bytes((b"head", memoryview(bytearray(2000))))
+        await conn.send_json({"type": "heartbeat"})
+        assert seen == [2004, len('{"type": "heartbeat"}')]
+        assert conn.queued_bytes == 0 and conn.writable
+        assert conn.flow.metrics()["send_unwritable_total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_closed_socket_releases_queued_bytes(self):
+        conn = _connection(SendFlowControl(10))
+        conn._ws.send.side_effect = ConnectionResetError("reset")
+        with pytest.raises(ConnectionResetError):
+            await conn.send_bytes(b"x" * 100)
+        assert conn.queued_bytes == 0 and conn.writable
+
+    @pytest.mark.asyncio
+    async def test_wait_writable_delegates_to_the_flow(self):
+        conn = _connection(SendFlowControl(10))
+        await asyncio.wait_for(conn.wait_writable(), timeout=1)
+
+
+@pytest.mark.unit
+class TestAgentBackpressure:
+    def test_watermark_from_config(self, make_agent):
+        agent = make_agent(send_buffer_bytes=4096)
+        assert agent._send_flow.high_watermark == 4096
+
+    @pytest.mark.asyncio
+    async def test_no_task_is_admitted_while_unwritable(self, make_agent):
+        agent = make_agent(send_buffer_bytes=10)
+        admitted = asyncio.Event()
+
+        async def run_slot(msg, frames_received):
+            admitted.set()
+            frames_received.set()
+
+        with patch.object(agent, "_run_task_slot", run_slot):
+            with agent._send_flow.sending(100):
+                dispatch = asyncio.create_task(agent._dispatch_task_assign({"type": "task_assign", "task_id": "t1"}))
+                await asyncio.sleep(0.01)
+                assert not admitted.is_set()
+            await asyncio.wait_for(dispatch, timeout=1)
+        assert admitted.is_set() and agent._send_flow.metrics()["send_blocked_total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_run_inner_passes_the_flow_to_each_connection(self, make_agent):
+        agent = make_agent()
+        flows = []
+
+        def make_connection(**kwargs):
+            flows.append(kwargs["flow"])
+            agent._stop_event.set()
+            conn = AsyncMock()
+            conn.connect_with_retry.side_effect = WorkerConnectionError("stopping")
+            return conn
+
+        await agent._run_inner(make_connection)
+        assert flows == [agent._send_flow]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_reports_send_queue(self, make_agent):
+        agent = make_agent(heartbeat_interval=0.01)
+        captured: list[dict] = []
+
+        async def capture(msg):
+            captured.append(msg)
+            agent._stop_event.set()
+
+        agent._connection = MagicMock(connected=True, send_json=AsyncMock(side_effect=capture))
+        with patch("juniper_cascor_worker.worker._sample_gpu_utilization_pct", return_value=None):
+            await agent._heartbeat_loop()
+        assert captured[0]["send_high_watermark"] == DEFAULT_SEND_BUFFER_BYTES
+        assert captured[0]["send_queued_bytes"] == 0 and captured[0]["send_writable"] is True
@@ -0,0 +1,150 @@
+"""Tests for the same-host shared-memory tensor transport."""
+
+from __future__ import annotations
+
+import os
+from multiprocessing import shared_memory
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import SHM_TRANSPORT_DIR
+from juniper_cascor_worker.shm_transport import ShmProbe, ShmTransportError, map_shared_tensor
+from juniper_cascor_worker.worker import BinaryFrameProtocolError, CascorWorkerAgent, _encode_binary_frame, _map_shared_tensors, _validate_tensor_manifest
+
+pytestmark = pytest.mark.skipif(not os.path.isdir(SHM_TRANSPORT_DIR), reason="POSIX shared memory not exposed as files")
+
+
+@pytest.fixture
+def segment():
+    """A segment holding a (4, 3) float32 array at offset 64."""
+    shm = shared_memory.SharedMemory(create=True, size=4096)
+    np.ndarray((4, 3), dtype=np.float32, buffer=shm.buf, offset=64)[...] = np.arange(12, dtype=np.float32).reshape(4, 3)
+    yield shm
+    shm.close()
+    shm.unlink()
+
+
+def _entry(shm: shared_memory.SharedMemory, **overrides: Any) -> dict[str, Any]:
+    entry = {"shm": shm.name.lstrip("/"), "offset": 64, "shape": [4, 3], "dtype": "float32"}
+    entry.update(overrides)
+    return entry
+
+
+@pytest.mark.unit
+class TestMapSharedTensor:
+    def test_maps_without_copy_and_writes_stay_private(self, segment):
+        array = map_shared_tensor(segment.name.lstrip("/"), 64, (4, 3), np.dtype(np.float32))
+        np.testing.assert_array_equal(array, np.arange(12, dtype=np.float32).reshape(4, 3))
+        assert array.flags.writeable and not array.flags.owndata
+
+        array[0, 0] = 99.0
+        assert np.ndarray((1,), dtype=np.float32, buffer=segment.buf, offset=64)[0] == 0.0
+
+    def test_region_past_segment_end_rejected(self, segment):
+        with pytest.raises(ShmTransportError, match="exceeds"):
+            map_shared_tensor(segment.name.lstrip("/"), 4096 - 8, (4,), np.dtype(np.float32))
+
+    def test_misaligned_offset_rejected(self, segment):
+        with pytest.raises(ShmTransportError, match="aligned"):
+            map_shared_tensor(segment.name.lstrip("/"), 2, (4,), np.dtype(np.float32))
+
+    def test_missing_segment_rejected(self):
+        with pytest.raises(ShmTransportError, match="cannot open"):
+            map_shared_tensor("juniper-no-such-segment", 0, (1,), np.dtype(np.float32))
+
+    def test_oversized_shape_rejected_before_mapping(self, segment):
+        with pytest.raises(BinaryFrameProtocolError, match="total_elements"):
+            _map_shared_tensors({"candidate_input": _entry(segment, shape=[100_000, 100_000])})
+
+    @pytest.mark.parametrize(
+        ("entry", "error"),
+        [
+            ({"shm": "../etc/passwd", "shape": [1], "dtype": "float32"}, "segment name"),
+            ({"shm": "seg", "offset": -1, "shape": [1], "dtype": "float32"}, "offset"),
+            ({"shm": "seg", "shape": "1", "dtype": "float32"}, "shape"),
+            ({"shm": "seg", "shape": [1], "dtype": "float32", "codec": "zlib"}, "cannot combine"),
+        ],
+    )
+    def test_manifest_validation(self, entry, error):
+        assert error in _validate_tensor_manifest({"candidate_input": entry, "residual_error": {}})
+
+
+@pytest.mark.unit
+class TestShmProbe:
+    def test_token_is_readable_from_segment_and_confirmed(self):
+        probe = ShmProbe()
+        try:
+            with open(os.path.join(SHM_TRANSPORT_DIR, probe.name), "rb") as f:
+                token = f.read().decode("ascii")
+            assert probe.confirms(token)
+            assert not probe.confirms("0" * len(token)) and not probe.confirms(None)
+        finally:
+            probe.close()
+        assert not os.path.exists(os.path.join(SHM_TRANSPORT_DIR, probe.name))
+
+
+@pytest.mark.unit
+class TestAgentShmTransport:
+    @staticmethod
+    def _echo_probe(agent: CascorWorkerAgent, *, read_probe: bool) -> None:
+        async def ack() -> dict[str, Any]:
+            offer = agent._connection.send_json.call_args[0][0]["capabilities"].get("shm_transport")
+            msg: dict[str, Any] = {"type": "registration_ack"}
+            if offer is not None:
+                with open(os.path.join(SHM_TRANSPORT_DIR, offer["probe"]), "rb") as f:
+                    msg["shm_transport"] = f.read().decode("ascii") if read_probe else "guess"
+            return msg
+
+        agent._connection.receive_json = AsyncMock(side_effect=ack)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("enabled", "read_probe", "expected"), [(True, True, True), (True, False, False), (False, True, False)])
+    async def test_negotiated_only_by_same_host_server(self, make_agent, enabled, read_probe, expected):
+        agent = make_agent(shm_transport=enabled)
+        self._echo_probe(agent, read_probe=read_probe)
+        with patch.object(CascorWorkerAgent, "_build_capabilities", return_value={}):
+            await agent._register()
+        assert agent._shm_transport is expected
+
+    @pytest.mark.asyncio
+    async def test_shared_tensor_skips_the_socket(self, make_agent, segment):
+        agent = make_agent(shm_transport=True)
+        agent._shm_transport = True
+        residual = np.ones((4, 1), dtype=np.float32)
+        agent._connection.receive_bytes.side_effect = [_encode_binary_frame(residual)]
+        seen: list[dict[str, np.ndarray]] = []
+
+        async def training(candidate_data, training_params, tensors):
+            seen.append(tensors)
+            return {"success": True}, {}
+
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": {"candidate_input": _entry(segment), "residual_error": {}}}
+        with patch.object(agent, "_run_training", training):
+            await agent._handle_task_assign(msg)
+
+        assert agent._tasks_completed == 1
+        assert agent._connection.receive_bytes.await_count == 1
+        np.testing.assert_array_equal(seen[0]["candidate_input"], np.arange(12, dtype=np.float32).reshape(4, 3))
+
+    @pytest.mark.asyncio
+    async def test_rejected_when_not_negotiated(self, make_agent, segment):
+        agent = make_agent()
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": {"candidate_input": _entry(segment), "residual_error": {}}}
+        await agent._handle_task_assign(msg)
+        sent = agent._connection.send_json.call_args[0][0]
+        assert "not negotiated" in sent["error_message"]
+        agent._connection.receive_bytes.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unmappable_segment_fails_after_frames(self, make_agent, segment):
+        agent = make_agent(shm_transport=True)
+        agent._shm_transport = True
+        agent._connection.receive_bytes.side_effect = [_encode_binary_frame(np.ones((4, 1), dtype=np.float32))]
+        manifest = {"candidate_input": _entry(segment, offset=4096), "residual_error": {}}
+        await agent._handle_task_assign({"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": manifest})
+        sent = agent._connection.send_json.call_args[0][0]
+        assert "Shared-memory tensor unavailable" in sent["error_message"]
+        assert agent._connection.receive_bytes.await_count == 1
@@ -0,0 +1,174 @@
+"""Tests for credit-based task scheduling (``task_credit``)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from juniper_cascor_worker import worker as worker_module
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import MSG_TYPE_TASK_CREDIT, TASK_CREDIT_MEMORY_RESERVE_BYTES
+from juniper_cascor_worker.exceptions import WorkerConnectionError
+from juniper_cascor_worker.federation import FederatedWorker
+from juniper_cascor_worker.worker import CascorWorkerAgent, _available_memory_bytes
+
+_MIB = 1024 * 1024
+
+
+def _credited(agent: CascorWorkerAgent) -> CascorWorkerAgent:
+    agent._task_credit = True
+    agent._registered = True
+    return agent
+
+
+def _grants(agent: CascorWorkerAgent) -> list[dict[str, Any]]:
+    return [call.args[0] for call in agent._connection.send_json.await_args_list if call.args[0]["type"] == MSG_TYPE_TASK_CREDIT]
+
+
+@pytest.mark.unit
+class TestCreditHandshake:
+    @pytest.mark.asyncio
+    async def test_capability_and_confirmation(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_json = AsyncMock(return_value={"type": "registration_ack", "task_credit": True})
+        with patch.object(agent, "_build_capabilities", return_value={"task_credit": True}):
+            await agent._register()
+        assert agent._task_credit and agent._credit_limit == 0 and agent._assigns_received == 0
+
+    @pytest.mark.asyncio
+    async def test_server_without_credits_gets_no_grants(self, make_agent):
+        agent = make_agent()
+        agent._registered = True
+        await agent._grant_credits()
+        assert _grants(agent) == []
+
+    def test_capability_is_advertised(self, make_agent):
+        assert make_agent()._build_capabilities()["task_credit"] is True
+
+
+@pytest.mark.unit
+class TestCreditGrants:
+    @pytest.mark.asyncio
+    async def test_first_grant_covers_slots_and_prefetch_places(self, make_agent):
+        agent = _credited(make_agent(task_slots=2, prefetch_tasks=1))
+        with patch.object(worker_module, "_available_memory_bytes", return_value=None):
+            await agent._grant_credits()
+        assert _grants(agent) == [{"type": MSG_TYPE_TASK_CREDIT, "worker_id": agent.worker_id, "credit_limit": 3, "credits": 3, "task_queue_depth": 0}]
+
+    @pytest.mark.asyncio
+    async def test_limit_is_cumulative_and_only_grows(self, make_agent):
+        agent = _credited(make_agent(task_slots=2))
+        with patch.object(worker_module, "_available_memory_bytes", return_value=None):
+            await agent._grant_credits()
+            agent._assigns_received, agent._admitted_tasks = 2, 2
+            await agent._grant_credits()
+            agent._admitted_tasks = 1
+            await agent._grant_credits()
+        assert [grant["credit_limit"] for grant in _grants(agent)] == [2, 3]
+        assert _grants(agent)[-1]["credits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_bounds_the_window(self, make_agent):
+        agent = _credited(make_agent(task_slots=4))
+        agent._task_bytes_estimate = 64 * _MIB
+        with patch.object(worker_module, "_available_memory_bytes", return_value=TASK_CREDIT_MEMORY_RESERVE_BYTES + 150 * _MIB):
+            await agent._grant_credits()
+        assert _grants(agent)[0]["credit_limit"] == 2
+
+    @pytest.mark.parametrize(("admitted", "expected"), [(0, 1), (1, 0)])
+    def test_idle_worker_always_takes_one_task(self, make_agent, admitted, expected):
+        agent = _credited(make_agent(task_slots=4))
+        agent._task_bytes_estimate = 64 * _MIB
+        agent._admitted_tasks = admitted
+        with patch.object(worker_module, "_available_memory_bytes", return_value=0):
+            assert agent._credit_window() == expected
+
+    @pytest.mark.asyncio
+    async def test_finished_task_tops_up(self, make_agent):
+        agent = _credited(make_agent(task_slots=1))
+        agent._credit_limit = agent._assigns_received = 1
+        await agent._admission.acquire()
+        agent._admitted_tasks = 1
+        with patch.object(agent, "_handle_task_assign", AsyncMock()), patch.object(worker_module, "_available_memory_bytes", return_value=None):
+            await agent._run_task_slot({"type": "task_assign", "task_id": "t1"}, asyncio.Event())
+        assert agent._admitted_tasks == 0 and _grants(agent)[0]["credit_limit"] == 2
+
+    @pytest.mark.asyncio
+    async def test_grant_on_a_dead_connection_does_not_fail_the_slot(self, make_agent):
+        agent = _credited(make_agent(task_slots=1))
+        agent._connection.send_json.side_effect = WorkerConnectionError("socket closed")
+        await agent._admission.acquire()
+        agent._admitted_tasks = 1
+        with patch.object(agent, "_handle_task_assign", AsyncMock()):
+            await agent._run_task_slot({"type": "task_assign", "task_id": "t1"}, asyncio.Event())
+        assert agent._admitted_tasks == 0
+
+
+@pytest.mark.unit
+class TestFederatedCredits:
+    @pytest.mark.asyncio
+    async def test_servers_split_the_places_instead_of_each_taking_all(self):
+        fed = FederatedWorker(WorkerConfig(server_url="ws://a:8200/ws/v1/workers", federation_urls=("ws://b:8200/ws/v1/workers",), auth_token="k", task_slots=2, prefetch_tasks=1))  # nosec B106 — dummy test token
+        for agent in fed.agents:
+            agent._connection = MagicMock(send_json=AsyncMock())
+            agent._task_credit = agent._registered = True
+        with patch.object(worker_module, "_available_memory_bytes", return_value=None):
+            for agent in fed.agents:
+                await agent._grant_credits()
+        assert [_grants(agent)[0]["credit_limit"] for agent in fed.agents] == [2, 1]
+
+    def test_admission_places_are_shared(self):
+        a, b = FederatedWorker(WorkerConfig(server_url="ws://a:8200/ws/v1/workers", federation_urls=("ws://b:8200/ws/v1/workers",), auth_token="k", task_slots=2, prefetch_tasks=1)).agents  # nosec B106 — dummy test token
+        assert a._admission is b._admission and a._slots.places == 3
+
+
+@pytest.mark.unit
+class TestCreditAccounting:
+    @pytest.mark.asyncio
+    async def test_assign_beyond_the_limit_is_counted(self, make_agent):
+        agent = _credited(make_agent())
+        agent._connection.receive = AsyncMock(side_effect=[json.dumps({"type": "task_assign", "task_id": "t1"}), WorkerConnectionError("socket closed")])
+        with patch.object(agent, "_dispatch_task_assign", AsyncMock()), pytest.raises(WorkerConnectionError):
+            await agent._message_loop()
+        assert agent._assigns_received == 1 and agent._credit_overruns == 1
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_reports_queue_depth_and_credits(self, make_agent):
+        agent = _credited(make_agent(heartbeat_interval=0.01))
+        agent._credit_limit, agent._assigns_received, agent._admitted_tasks = 5, 3, 2
+        captured: list[dict] = []
+
+        async def capture(msg):
+            captured.append(msg)
+            agent._stop_event.set()
+
+        agent._connection = MagicMock(connected=True, send_json=AsyncMock(side_effect=capture))
+        with patch("juniper_cascor_worker.worker._sample_gpu_utilization_pct", return_value=None), patch.object(worker_module, "_available_memory_bytes", return_value=None):
+            await agent._heartbeat_loop()
+        heartbeat = captured[0]
+        assert heartbeat["task_queue_depth"] == 2 and heartbeat["task_credits"] == 2
+        assert heartbeat["task_credit_limit"] == 5 and heartbeat["task_credit_overruns"] == 0
+
+
+@pytest.mark.unit
+class TestAvailableMemory:
+    def test_cgroup_limit_caps_meminfo(self, tmp_path, monkeypatch):
+        meminfo, memory_max, memory_current = tmp_path / "meminfo", tmp_path / "memory.max", tmp_path / "memory.current"
+        meminfo.write_text("MemTotal: 4000 kB\nMemAvailable: 1000 kB\n")
+        memory_max.write_text("4096\n")
+        memory_current.write_text("1024\n")
+        monkeypatch.setattr(worker_module, "PROC_MEMINFO_PATH", str(meminfo))
+        monkeypatch.setattr(worker_module, "CGROUP_MEMORY_MAX_PATH", str(memory_max))
+        monkeypatch.setattr(worker_module, "CGROUP_MEMORY_CURRENT_PATH", str(memory_current))
+        assert _available_memory_bytes() == 3072
+        memory_max.write_text("max\n")
+        assert _available_memory_bytes() == 1000 * 1024
+
+    def test_unreadable(self, tmp_path, monkeypatch):
+        for name in ("PROC_MEMINFO_PATH", "CGROUP_MEMORY_MAX_PATH", "CGROUP_MEMORY_CURRENT_PATH"):
+            monkeypatch.setattr(worker_module, name, str(tmp_path / "missing"))
+        assert _available_memory_bytes() is None
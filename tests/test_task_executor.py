@@ -189,6 +189,33 @@ class TestTensorConversion:
             assert isinstance(arr, np.ndarray), f"Tensor '{name}' is not a numpy array"
             assert arr.dtype == np.float32, f"Tensor '{name}' dtype is {arr.dtype}, expected float32"
 
+    def test_float32_input_is_shared_not_copied(self):
+        """A writable float32 input reaches train_detailed without a copy."""
+        mock_cls, mock_instance = _make_mock_candidate_unit()
+        mock_module = MagicMock()
+        mock_module.CandidateUnit = mock_cls
+        tensors = _make_tensors()
+
+        with patch.dict(sys.modules, {"candidate_unit": MagicMock(), "candidate_unit.candidate_unit": mock_module}):
+            execute_training_task(_make_candidate_data(), _make_training_params(), tensors)
+
+        x = mock_instance.train_detailed.call_args.kwargs["x"]
+        assert np.shares_memory(x.numpy(), tensors["candidate_input"])
+
+    def test_read_only_input_is_copied(self):
+        """A read-only (tensor-cache) input is copied so it cannot be written through."""
+        mock_cls, mock_instance = _make_mock_candidate_unit()
+        mock_module = MagicMock()
+        mock_module.CandidateUnit = mock_cls
+        tensors = _make_tensors()
+        tensors["candidate_input"].flags.writeable = False
+
+        with patch.dict(sys.modules, {"candidate_unit": MagicMock(), "candidate_unit.candidate_unit": mock_module}):
+            execute_training_task(_make_candidate_data(), _make_training_params(), tensors)
+
+        x = mock_instance.train_detailed.call_args.kwargs["x"]
+        assert not np.shares_memory(x.numpy(), tensors["candidate_input"])
+
 
 @pytest.mark.unit
 class TestWireParameterCoercion:
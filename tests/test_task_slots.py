@@ -0,0 +1,146 @@
+"""Tests for concurrent task slots in CascorWorkerAgent."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+
+def _task_msg(task_id: str) -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": task_id,
+        "candidate_index": 0,
+        "candidate_data": {"candidate_uuid": f"uuid-{task_id}"},
+        "training_params": {},
+        "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+    }
+
+
+def _ok_result(task_id: str) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    return {"candidate_uuid": f"uuid-{task_id}", "success": True}, {}
+
+
+@pytest.mark.unit
+class TestConcurrentSlots:
+    @pytest.mark.asyncio
+    async def test_two_slots_train_concurrently_and_third_waits(self, make_agent):
+        agent = make_agent(task_slots=2)
+        release = asyncio.Event()
+        started: list[str] = []
+
+        async def blocking_training(candidate_data, training_params, tensors):
+            started.append(candidate_data["candidate_uuid"])
+            await release.wait()
+            return {"candidate_uuid": candidate_data["candidate_uuid"], "success": True}, {}
+
+        with patch.object(agent, "_run_training", side_effect=blocking_training):
+            await agent._dispatch_task_assign(_task_msg("a"))
+            await agent._dispatch_task_assign(_task_msg("b"))
+            await asyncio.sleep(0)
+            assert agent._in_flight_tasks == 2
+            assert started == ["uuid-a", "uuid-b"]
+
+            third = asyncio.create_task(agent._dispatch_task_assign(_task_msg("c")))
+            await asyncio.sleep(0.01)
+            assert not third.done(), "third task must wait for a free slot"
+
+            release.set()
+            await asyncio.wait_for(third, timeout=2.0)
+            await agent._finish_slot_tasks(cancel=False)
+
+        assert agent._in_flight_tasks == 0
+        assert agent._tasks_completed == 3
+        assert agent._connection.send_json.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_dispatch_returns_once_frames_are_read(self, make_agent):
+        agent = make_agent(task_slots=1)
+        release = asyncio.Event()
+
+        async def blocking_training(*_args):
+            await release.wait()
+            return _ok_result("a")
+
+        with patch.object(agent, "_run_training", side_effect=blocking_training):
+            await asyncio.wait_for(agent._dispatch_task_assign(_task_msg("a")), timeout=2.0)
+            assert agent._connection.receive_bytes.await_count == 2
+            assert agent._in_flight_tasks == 1
+            release.set()
+            await agent._finish_slot_tasks(cancel=False)
+
+    @pytest.mark.asyncio
+    async def test_finish_slot_tasks_cancel_releases_slots(self, make_agent):
+        agent = make_agent(task_slots=1)
+
+        async def hang(*_args):
+            await asyncio.sleep(60)
+
+        with patch.object(agent, "_run_training", side_effect=hang):
+            await agent._dispatch_task_assign(_task_msg("a"))
+            await agent._finish_slot_tasks(cancel=True)
+
+        assert agent._in_flight_tasks == 0
+        assert not agent._task_slots.locked()
+
+    @pytest.mark.asyncio
+    async def test_result_group_is_not_interleaved(self, make_agent):
+        agent = make_agent(task_slots=2)
+        sent: list[Any] = []
+
+        async def record(item):
+            sent.append(item)
+            await asyncio.sleep(0)
+
+        conn = MagicMock()
+        conn.send_json = AsyncMock(side_effect=record)
+        conn.send_bytes = AsyncMock(side_effect=record)
+        agent._connection = conn
+
+        await asyncio.gather(
+            agent._send_message_group({"id": 1}, [b"1a", b"1b"]),
+            agent._send_message_group({"id": 2}, [b"2a", b"2b"]),
+        )
+
+        assert sent in ([{"id": 1}, b"1a", b"1b", {"id": 2}, b"2a", b"2b"], [{"id": 2}, b"2a", b"2b", {"id": 1}, b"1a", b"1b"])
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_reports_slot_count(self, make_agent):
+        agent = make_agent(task_slots=4, heartbeat_interval=0.01)
+        captured: list[dict] = []
+
+        async def capture(msg):
+            captured.append(msg)
+            agent._stop_event.set()
+
+        conn = MagicMock()
+        conn.connected = True
+        conn.send_json = AsyncMock(side_effect=capture)
+        agent._connection = conn
+
+        with patch("juniper_cascor_worker.worker._sample_gpu_utilization_pct", return_value=None):
+            await agent._heartbeat_loop()
+
+        assert captured[0]["task_slots"] == 4
+
+
+@pytest.mark.unit
+class TestSlotFailures:
+    @pytest.mark.asyncio
+    async def test_malformed_frame_sends_a_failure_result(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_bytes = AsyncMock(return_value=b"\x01\x00")
+        run_training = AsyncMock()
+        frames_received = asyncio.Event()
+        await agent._admission.acquire()
+        with patch.object(agent, "_run_training", run_training):
+            await agent._run_task_slot(_task_msg("bad"), frames_received)
+        result = agent._connection.send_json.await_args.args[0]
+        assert result["type"] == "task_result" and result["task_id"] == "bad"
+        assert result["success"] is False and "Binary frame invalid" in result["error_message"]
+        assert frames_received.is_set() and agent._tasks_failed == 1
+        run_training.assert_not_awaited()
@@ -0,0 +1,132 @@
+"""Tests for the content-addressed tensor cache."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.tensor_cache import TensorCache, frame_digest
+from juniper_cascor_worker.worker import _encode_binary_frame
+
+_INPUT = _encode_binary_frame(np.arange(6, dtype=np.float32).reshape(3, 2))
+_RESIDUAL = _encode_binary_frame(np.ones((3, 1), dtype=np.float32))
+
+
+def _task_msg(task_id: str, *, cached: bool, round_id: int = 1) -> dict[str, Any]:
+    return {
+        "type": "task_assign",
+        "task_id": task_id,
+        "round_id": round_id,
+        "candidate_index": 0,
+        "candidate_data": {"candidate_uuid": f"uuid-{task_id}"},
+        "training_params": {},
+        "tensor_manifest": {
+            "candidate_input": {"shape": [3, 2], "dtype": "float32", "sha256": frame_digest(_INPUT), "cached": cached},
+            "residual_error": {"shape": [3, 1], "dtype": "float32", "sha256": frame_digest(_RESIDUAL), "cached": cached},
+        },
+    }
+
+
+@pytest.mark.unit
+class TestTensorCache:
+    def test_lru_evicts_over_budget(self):
+        cache = TensorCache(max_bytes=64)
+        cache.put("a", np.zeros(8, dtype=np.float32))
+        cache.put("b", np.zeros(8, dtype=np.float32))
+        assert cache.get("a") is not None  # "b" is now least recently used
+        cache.put("c", np.zeros(8, dtype=np.float32))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.metrics()["tensor_cache_bytes"] == 64
+        assert cache.metrics()["tensor_cache_evictions"] == 1
+
+    def test_evict_before_round(self):
+        cache = TensorCache(max_bytes=1024)
+        cache.put("old", np.zeros(2), round_id=1)
+        cache.put("new", np.zeros(2), round_id=2)
+        cache.put("untagged", np.zeros(2))
+
+        assert cache.evict_before(2) == 1
+        assert cache.get("old") is None
+        assert cache.get("new") is not None and cache.get("untagged") is not None
+
+    def test_evict_before_round_is_scoped(self):
+        cache = TensorCache(max_bytes=1024)
+        cache.put("a", np.zeros(2), round_id=7, scope="ws://a")
+        cache.put("b", np.zeros(2), round_id=2, scope="ws://b")
+
+        assert cache.evict_before(3, scope="ws://b") == 1
+        assert cache.get("a") is not None and cache.get("b") is None
+
+    def test_cached_arrays_are_read_only(self):
+        cache = TensorCache(max_bytes=1024)
+        array = np.zeros(2)
+        cache.put("a", array)
+        with pytest.raises(ValueError):
+            array[0] = 1.0
+
+    def test_oversized_or_disabled_is_not_cached(self):
+        assert TensorCache(max_bytes=8).put("a", np.zeros(4)) is False
+        assert TensorCache(max_bytes=0).put("a", np.zeros(1)) is False
+
+
+@pytest.mark.unit
+class TestAgentTensorCache:
+    @pytest.mark.asyncio
+    async def test_cached_reference_skips_frames(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_bytes.side_effect = [_INPUT, _RESIDUAL]
+        seen: list[dict[str, np.ndarray]] = []
+
+        async def training(candidate_data, training_params, tensors):
+            seen.append(tensors)
+            return {"candidate_uuid": candidate_data["candidate_uuid"], "success": True}, {}
+
+        with patch.object(agent, "_run_training", training):
+            await agent._handle_task_assign(_task_msg("a", cached=False))
+            await agent._handle_task_assign(_task_msg("b", cached=True))
+
+        assert agent._connection.receive_bytes.await_count == 2
+        assert agent._tasks_completed == 2
+        np.testing.assert_array_equal(seen[1]["candidate_input"], seen[0]["candidate_input"])
+        assert agent._tensor_cache.metrics()["tensor_cache_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_miss_fails_task_with_digests(self, make_agent):
+        agent = make_agent()
+        await agent._handle_task_assign(_task_msg("a", cached=True))
+
+        sent = agent._connection.send_json.call_args[0][0]
+        assert sent["success"] is False
+        assert sent["cache_miss"] == [frame_digest(_INPUT), frame_digest(_RESIDUAL)]
+        agent._connection.receive_bytes.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_digest_mismatch_is_not_cached(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_bytes.side_effect = [_RESIDUAL, _RESIDUAL]
+        msg = _task_msg("a", cached=False)
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=({"success": True}, {}))):
+            await agent._handle_task_assign(msg)
+
+        assert agent._tensor_cache.metrics()["tensor_cache_entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_newer_round_evicts_cached_tensors(self, make_agent):
+        agent = make_agent()
+        agent._connection.receive_bytes.side_effect = [_INPUT, _RESIDUAL]
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=({"success": True}, {}))):
+            await agent._handle_task_assign(_task_msg("a", cached=False, round_id=1))
+            await agent._handle_task_assign(_task_msg("b", cached=True, round_id=2))
+
+        assert agent._connection.send_json.call_args[0][0]["cache_miss"]
+
+    def test_capabilities_advertise_budget(self, make_agent):
+        pytest.importorskip("torch")
+        assert make_agent(tensor_cache_bytes=4096)._build_capabilities()["tensor_cache_bytes"] == 4096
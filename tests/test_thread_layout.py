@@ -0,0 +1,119 @@
+"""Tests for compute-thread partitioning across task slots."""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import COMPUTE_THREAD_ENV_VARS, THREAD_LAYOUT_SOURCE_AUTO, THREAD_LAYOUT_SOURCE_ENV
+from juniper_cascor_worker.thread_layout import ThreadLayout, _cgroup_cpu_quota, apply_thread_budget, export_thread_env, plan_thread_layout, usable_cpu_count
+from juniper_cascor_worker.training_backend import ProcessTrainingBackend, ThreadTrainingBackend
+from juniper_cascor_worker.worker import CascorWorkerAgent
+
+
+def _report_threads(*_args: Any) -> dict[str, Any]:
+    torch = sys.modules.get("torch")
+    return {"env": os.environ.get("OMP_NUM_THREADS"), "torch": torch.get_num_threads() if torch else None}
+
+
+@pytest.fixture
+def clean_thread_env():
+    """Unset the thread variables; anything the test exports is rolled back."""
+    with patch.dict(os.environ):
+        for name in COMPUTE_THREAD_ENV_VARS:
+            os.environ.pop(name, None)
+        yield
+
+
+@pytest.mark.unit
+class TestPlanThreadLayout:
+    @pytest.mark.parametrize(("cpus", "slots", "expected"), [(16, 4, 4), (16, 3, 5), (2, 8, 1), (1, 1, 1)])
+    def test_splits_usable_cpus_between_slots(self, cpus, slots, expected):
+        with patch("juniper_cascor_worker.thread_layout.usable_cpu_count", return_value=cpus):
+            layout = plan_thread_layout(slots, environ={})
+        assert layout == ThreadLayout(cpus, slots, expected, THREAD_LAYOUT_SOURCE_AUTO)
+
+    def test_omp_num_threads_overrides_budget(self):
+        layout = plan_thread_layout(4, environ={"OMP_NUM_THREADS": "3"})
+        assert (layout.threads_per_task, layout.source) == (3, THREAD_LAYOUT_SOURCE_ENV)
+
+    def test_invalid_override_is_ignored(self):
+        with patch("juniper_cascor_worker.thread_layout.usable_cpu_count", return_value=8):
+            layout = plan_thread_layout(2, environ={"OMP_NUM_THREADS": "lots"})
+        assert (layout.threads_per_task, layout.source) == (4, THREAD_LAYOUT_SOURCE_AUTO)
+
+    def test_usable_cpus_is_positive(self):
+        assert usable_cpu_count() >= 1
+
+
+@pytest.mark.unit
+class TestCgroupQuota:
+    @pytest.mark.parametrize(("content", "expected"), [("400000 100000\n", 4), ("50000 100000\n", 1), ("max 100000\n", None), ("garbage", None)])
+    def test_parses_cpu_max(self, tmp_path, content, expected):
+        path = tmp_path / "cpu.max"
+        path.write_text(content)
+        assert _cgroup_cpu_quota(str(path)) == expected
+
+    def test_missing_file(self, tmp_path):
+        assert _cgroup_cpu_quota(str(tmp_path / "absent")) is None
+
+
+@pytest.mark.unit
+class TestApplyBudget:
+    def test_export_keeps_operator_settings(self, clean_thread_env):
+        os.environ["MKL_NUM_THREADS"] = "7"
+        export_thread_env(2)
+        assert os.environ["OMP_NUM_THREADS"] == "2"
+        assert os.environ["MKL_NUM_THREADS"] == "7"
+        export_thread_env(3, override=True)
+        assert all(os.environ[name] == "3" for name in COMPUTE_THREAD_ENV_VARS)
+
+    def test_apply_sets_torch_threads(self):
+        torch = pytest.importorskip("torch")
+        original = torch.get_num_threads()
+        try:
+            apply_thread_budget(1)
+            assert torch.get_num_threads() == 1
+        finally:
+            torch.set_num_threads(original)
+
+    @pytest.mark.asyncio
+    async def test_thread_backend_applies_budget_on_pool_thread(self, clean_thread_env):
+        torch = pytest.importorskip("torch")
+        original = torch.get_num_threads()
+        backend = ThreadTrainingBackend(2, ThreadLayout(4, 2, 2))
+        try:
+            await backend.start()
+            report = await backend.run(_report_threads, {}, {}, {})
+        finally:
+            await backend.shutdown()
+            torch.set_num_threads(original)
+        assert report == {"env": "2", "torch": 2}
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="fork start method is POSIX-only")
+    @pytest.mark.filterwarnings("ignore:.*use of fork\\(\\) may lead to deadlocks:DeprecationWarning")
+    async def test_process_backend_pins_child_environment(self):
+        backend = ProcessTrainingBackend(1, "fork", stop_timeout=5, layout=ThreadLayout(8, 1, 3))
+        try:
+            report = await backend.run(_report_threads, {}, {}, {"x": np.zeros(1, dtype=np.float32)})
+        finally:
+            await backend.shutdown()
+        assert report["env"] == "3"
+        assert report["torch"] in (None, 3)
+
+
+@pytest.mark.unit
+def test_capabilities_report_thread_layout():
+    pytest.importorskip("torch")
+    agent = CascorWorkerAgent(WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers", auth_token="k", task_slots=2))  # nosec B106 — dummy test token
+    layout = agent._build_capabilities()["thread_layout"]
+    assert layout["task_slots"] == 2
+    assert layout["threads_per_task"] >= 1
+    assert set(layout) == {"usable_cpus", "task_slots", "threads_per_task", "source"}
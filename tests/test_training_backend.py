@@ -0,0 +1,198 @@
+"""Tests for the thread and process training backends."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.config import WorkerConfig
+from juniper_cascor_worker.constants import TRAINING_BACKEND_PROCESS
+from juniper_cascor_worker.exceptions import TrainingBackendError
+from juniper_cascor_worker.training_backend import ProcessTrainingBackend, ThreadTrainingBackend, _run_cancellable, _ThreadCancelToken, _TrainingCancelled, build_training_backend
+from juniper_cascor_worker.worker import CascorWorkerAgent, _encode_binary_frame
+
+# The process backend pickles the training callable by reference; the
+# callables below live at module level so the children can resolve them.
+# ``fork`` keeps the test module importable in the children without a
+# package install on ``sys.path``.
+_MP_CONTEXT = "fork"
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fork start method is POSIX-only")
+
+
+def _sum_inputs(candidate_data: dict[str, Any], training_params: dict[str, Any], tensors: dict[str, np.ndarray]) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    x = tensors["candidate_input"]
+    return {"candidate_uuid": candidate_data["candidate_uuid"], "total": float(x.sum()), "pid": os.getpid()}, {"echo": tensors["residual_error"].copy()}
+
+
+def _raise_value_error(*_args: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    raise ValueError("bad candidate")
+
+
+def _exit_process(*_args: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    os._exit(3)
+
+
+def _tensors() -> dict[str, np.ndarray]:
+    x = np.arange(12, dtype=np.float32).reshape(3, 4)
+    return {"candidate_input": x, "residual_error": x[:, :2].copy()}
+
+
+def _shm_segments() -> set[str]:
+    try:
+        return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+    except FileNotFoundError:
+        return set()
+
+
+@pytest.mark.unit
+class TestBackendFactory:
+    def test_factory_selects_backend(self):
+        assert isinstance(build_training_backend(WorkerConfig()), ThreadTrainingBackend)
+        assert isinstance(build_training_backend(WorkerConfig(training_backend=TRAINING_BACKEND_PROCESS)), ProcessTrainingBackend)
+
+
+@pytest.mark.unit
+class TestThreadTrainingBackend:
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop_thread(self):
+        backend = ThreadTrainingBackend(1)
+        result, tensors = await backend.run(_sum_inputs, {"candidate_uuid": "u"}, {}, _tensors())
+        await backend.shutdown()
+        assert result["total"] == 66.0
+        np.testing.assert_array_equal(tensors["echo"], _tensors()["residual_error"])
+
+
+@pytest.mark.unit
+# Python 3.12+ warns when forking a process that has threads (the backend's
+# waiter pool); the children here only run the pure-numpy callables above.
+@pytest.mark.filterwarnings("ignore:.*use of fork\\(\\) may lead to deadlocks:DeprecationWarning")
+class TestProcessTrainingBackend:
+    @pytest.mark.asyncio
+    async def test_round_trip_runs_in_child_and_releases_segments(self):
+        before = _shm_segments()
+        backend = ProcessTrainingBackend(2, _MP_CONTEXT, stop_timeout=5)
+        try:
+            result, tensors = await backend.run(_sum_inputs, {"candidate_uuid": "u"}, {}, _tensors())
+        finally:
+            await backend.shutdown()
+        assert result["total"] == 66.0
+        assert result["pid"] != os.getpid()
+        np.testing.assert_array_equal(tensors["echo"], _tensors()["residual_error"])
+        assert _shm_segments() <= before
+
+    @pytest.mark.asyncio
+    async def test_child_exception_becomes_backend_error(self):
+        backend = ProcessTrainingBackend(1, _MP_CONTEXT, stop_timeout=5)
+        try:
+            with pytest.raises(TrainingBackendError, match="ValueError: bad candidate"):
+                await backend.run(_raise_value_error, {}, {}, _tensors())
+            result, _ = await backend.run(_sum_inputs, {"candidate_uuid": "u"}, {}, _tensors())
+        finally:
+            await backend.shutdown()
+        assert result["total"] == 66.0
+
+    @pytest.mark.asyncio
+    async def test_dead_process_is_replaced(self):
+        backend = ProcessTrainingBackend(1, _MP_CONTEXT, stop_timeout=5)
+        try:
+            with pytest.raises(TrainingBackendError, match="exited"):
+                await backend.run(_exit_process, {}, {}, _tensors())
+            result, _ = await backend.run(_sum_inputs, {"candidate_uuid": "u"}, {}, _tensors())
+        finally:
+            await backend.shutdown()
+        assert result["total"] == 66.0
+
+
+@pytest.mark.unit
+class TestAgentBackendFailure:
+    @pytest.mark.asyncio
+    async def test_backend_error_sends_failure_result(self):
+        agent = CascorWorkerAgent(WorkerConfig(server_url="ws://localhost:8200/ws/v1/workers", auth_token="k"))  # nosec B106 — dummy test token
+        conn = MagicMock()
+        conn.send_json = AsyncMock()
+        conn.send_bytes = AsyncMock()
+        conn.receive_bytes = AsyncMock(return_value=_encode_binary_frame(np.zeros((2, 2), dtype=np.float32)))
+        agent._connection = conn
+        msg = {
+            "type": "task_assign",
+            "task_id": "t1",
+            "candidate_index": 0,
+            "candidate_data": {"candidate_uuid": "uuid-1"},
+            "training_params": {},
+            "tensor_manifest": {"candidate_input": {}, "residual_error": {}},
+        }
+
+        with patch.object(agent, "_run_training", side_effect=TrainingBackendError("training process cascor-train-1 exited")):
+            await agent._handle_task_assign(msg)
+
+        sent = conn.send_json.call_args[0][0]
+        assert sent["success"] is False
+        assert sent["candidate_uuid"] == "uuid-1"
+        assert "Training backend error" in sent["error_message"]
+        assert agent._tasks_failed == 1
+
+
+_spin_stopped = threading.Event()
+
+
+def _spin_forever(*_args: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    try:
+        while True:
+            sum(range(1000))
+    finally:
+        _spin_stopped.set()
+
+
+def _sleep_forever(*_args: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    time.sleep(3600)
+    return {}, {}
+
+
+@pytest.mark.unit
+class TestThreadCancellation:
+    @pytest.mark.asyncio
+    async def test_timeout_stops_training_thread(self):
+        _spin_stopped.clear()
+        backend = ThreadTrainingBackend(1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(backend.run(_spin_forever, {}, {}, _tensors()), timeout=0.1)
+        assert await asyncio.to_thread(_spin_stopped.wait, 5.0), "training thread kept running after cancellation"
+        result, _ = await backend.run(_sum_inputs, {"candidate_uuid": "u"}, {}, _tensors())
+        await backend.shutdown()
+        assert result["total"] == 66.0
+
+    def test_cancel_before_start_skips_training(self):
+        token = _ThreadCancelToken()
+        assert token.cancel() is False
+        with pytest.raises(_TrainingCancelled):
+            _run_cancellable(token, 1, _sum_inputs, {"candidate_uuid": "u"}, {}, _tensors())
+
+
+@pytest.mark.unit
+@pytest.mark.filterwarnings("ignore:.*use of fork\\(\\) may lead to deadlocks:DeprecationWarning")
+class TestProcessCancellation:
+    @pytest.mark.asyncio
+    async def test_timeout_kills_and_replaces_process(self):
+        before = _shm_segments()
+        backend = ProcessTrainingBackend(1, _MP_CONTEXT, stop_timeout=5)
+        try:
+            await backend.start()
+            (victim,) = backend._processes
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(backend.run(_sleep_forever, {}, {}, _tensors()), timeout=0.2)
+            result, _ = await asyncio.wait_for(backend.run(_sum_inputs, {"candidate_uuid": "u"}, {}, _tensors()), timeout=10.0)
+            assert not victim.alive
+            assert victim not in backend._processes
+        finally:
+            await backend.shutdown()
+        assert result["total"] == 66.0
+        assert _shm_segments() <= before
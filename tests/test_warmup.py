@@ -0,0 +1,102 @@
+"""Tests for the opt-in eager warm-up phase."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from juniper_cascor_worker.exceptions import WorkerConnectionError
+from juniper_cascor_worker.training_backend import ProcessTrainingBackend, ThreadTrainingBackend
+from juniper_cascor_worker.worker import CascorWorkerAgent
+
+
+def _report_pid(*_args: Any) -> dict[str, Any]:
+    return {"pid": os.getpid(), "activations": 0, "seconds": 0.0}
+
+
+@pytest.mark.unit
+class TestWarmUpPass:
+    def test_warm_up_trains_and_touches_activations(self):
+        pytest.importorskip("torch")
+        pytest.importorskip("candidate_unit.candidate_unit", reason="juniper-cascor-model not installed")
+        from juniper_cascor_worker.task_executor import warm_up
+
+        report = warm_up()
+        assert report["activations"] > 0
+        assert report["seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_thread_backend_warms_once(self):
+        backend = ThreadTrainingBackend(3)
+        try:
+            reports = await backend.warm_up(_report_pid)
+        finally:
+            await backend.shutdown()
+        assert len(reports) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="fork start method is POSIX-only")
+    @pytest.mark.filterwarnings("ignore:.*use of fork\\(\\) may lead to deadlocks:DeprecationWarning")
+    async def test_process_backend_warms_every_process(self):
+        backend = ProcessTrainingBackend(2, "fork", stop_timeout=5)
+        try:
+            reports = await backend.warm_up(_report_pid)
+        finally:
+            await backend.shutdown()
+        assert len({r["pid"] for r in reports}) == 2
+
+
+@pytest.mark.unit
+class TestAgentWarmup:
+    def test_readiness_waits_for_warm_up(self, make_agent):
+        agent = make_agent(warmup=True)
+        agent._connection = MagicMock(connected=True)
+        agent._registered = True
+        with pytest.raises(RuntimeError, match="warm-up"):
+            agent._readiness_tick()
+        agent._warm = True
+        agent._readiness_tick()
+
+    @pytest.mark.asyncio
+    async def test_failed_warm_up_still_marks_ready(self, make_agent):
+        agent = make_agent(warmup=True)
+        with patch.object(agent._backend, "warm_up", AsyncMock(side_effect=ImportError("no torch"))):
+            await agent._warm_up()
+        assert agent._warm is True
+
+    @pytest.mark.asyncio
+    async def test_registration_waits_for_warm_up(self, make_agent, monkeypatch):
+        agent = make_agent(warmup=True)
+        warm = asyncio.Event()
+        order: list[str] = []
+
+        async def slow_warm_up():
+            await warm.wait()
+            order.append("warm")
+            agent._warm = True
+
+        mock_conn = AsyncMock()
+        mock_conn.receive_json.side_effect = [{"type": "connection_established"}, {"type": "registration_ack"}]
+        mock_conn.receive.side_effect = WorkerConnectionError("socket closed")
+        mock_conn.send_json.side_effect = lambda msg: order.append(msg["type"])
+
+        async def stop_after_reconnect_delay(_seconds):
+            agent._stop_event.set()
+
+        monkeypatch.setattr(asyncio, "sleep", stop_after_reconnect_delay)
+        agent._warmup_task = asyncio.create_task(slow_warm_up())
+
+        with patch.object(CascorWorkerAgent, "_build_capabilities", return_value={}):
+            inner = asyncio.create_task(agent._run_inner(lambda **_kwargs: mock_conn))
+            for _ in range(5):
+                await asyncio.wait({inner}, timeout=0)
+            assert order == [], "register must wait for warm-up"
+            warm.set()
+            await asyncio.wait_for(inner, timeout=2.0)
+
+        assert order[:2] == ["warm", "register"]
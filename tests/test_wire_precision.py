@@ -0,0 +1,91 @@
+"""Tests for the negotiated reduced-precision wire mode."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from juniper_cascor_worker.constants import VALID_WIRE_PRECISIONS
+from juniper_cascor_worker.worker import CascorWorkerAgent, _decode_binary_frame, _encode_binary_frame, _encode_frame_header, _from_bfloat16_bits, _to_bfloat16_bits
+
+
+def _bfloat16_frame(array: np.ndarray) -> bytes:
+    return _encode_frame_header(array.shape, "bfloat16") + _to_bfloat16_bits(array).tobytes()
+
+
+@pytest.mark.unit
+class TestBfloat16:
+    def test_roundtrip_is_within_bfloat16_precision(self):
+        values = np.random.default_rng(0).standard_normal(1000).astype(np.float32)
+        restored = _from_bfloat16_bits(_to_bfloat16_bits(values))
+        np.testing.assert_allclose(restored, values, rtol=2**-8)
+
+    def test_exact_values_and_specials_survive(self):
+        values = np.array([0.0, -0.0, 1.0, -2.5, np.inf, -np.inf], dtype=np.float32)
+        np.testing.assert_array_equal(_from_bfloat16_bits(_to_bfloat16_bits(values)), values)
+        assert np.isnan(_from_bfloat16_bits(_to_bfloat16_bits(np.array([np.nan], dtype=np.float32))))[0]
+
+    def test_frame_decodes_to_float32(self):
+        values = np.arange(6, dtype=np.float32).reshape(2, 3)
+        decoded = _decode_binary_frame(_bfloat16_frame(values))
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, values)
+
+
+@pytest.mark.unit
+class TestAgentWirePrecision:
+    def test_capabilities_request_precision(self, make_agent):
+        pytest.importorskip("torch")
+        caps = make_agent(wire_precision="bfloat16")._build_capabilities()
+        assert caps["wire_precision"] == "bfloat16"
+        assert caps["wire_precisions"] == list(VALID_WIRE_PRECISIONS)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("acked", "expected"), [("float16", "float16"), ("bfloat16", "float32"), (None, "float32")])
+    async def test_precision_is_confirmed_by_ack(self, make_agent, acked, expected):
+        agent = make_agent(wire_precision="float16")
+        agent._connection.receive_json = AsyncMock(return_value={"type": "registration_ack", "wire_precision": acked})
+        with patch.object(CascorWorkerAgent, "_build_capabilities", return_value={}):
+            await agent._register()
+        assert agent._wire_precision == expected
+
+    @pytest.mark.asyncio
+    async def test_half_precision_inputs_are_upcast(self, make_agent):
+        agent = make_agent()
+        values = np.arange(4, dtype=np.float32).reshape(2, 2)
+        agent._connection.receive_bytes.side_effect = [_encode_binary_frame(values.astype(np.float16)), _bfloat16_frame(values)]
+        tensors, _ = await agent._receive_tensors({"candidate_input": {}, "residual_error": {}})
+        assert {t.dtype for t in tensors.values()} == {np.dtype(np.float32)}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("precision", ["float16", "bfloat16"])
+    async def test_only_norm_tensors_are_narrowed(self, make_agent, precision):
+        agent = make_agent(wire_precision=precision)
+        agent._wire_precision = precision
+        values = np.linspace(-1, 1, 8, dtype=np.float32)
+
+        entry, frame = await agent._encode_result_tensor("norm_output", values)
+        assert entry["dtype"] == precision
+        assert len(frame) < len(_encode_binary_frame(values))
+        np.testing.assert_allclose(_decode_binary_frame(frame).astype(np.float32), values, atol=1e-2)
+
+        entry, frame = await agent._encode_result_tensor("weights", values)
+        assert entry["dtype"] == "float32"
+        assert frame == _encode_binary_frame(values)
+
+    @pytest.mark.asyncio
+    async def test_result_records_precision(self, make_agent):
+        agent = make_agent(wire_precision="float16")
+        agent._wire_precision = "float16"
+        agent._connection.receive_bytes.return_value = _encode_binary_frame(np.zeros((2, 2), dtype=np.float32))
+        msg = {"type": "task_assign", "task_id": "t", "candidate_data": {}, "tensor_manifest": {"candidate_input": {}, "residual_error": {}}}
+        result = ({"success": True}, {"norm_output": np.ones((2, 1), dtype=np.float32)})
+
+        with patch.object(agent, "_run_training", AsyncMock(return_value=result)):
+            await agent._handle_task_assign(msg)
+
+        sent = agent._connection.send_json.call_args[0][0]
+        assert sent["wire_precision"] == "float16"
+        assert sent["tensor_manifest"]["norm_output"]["dtype"] == "float16"
@@ -52,16 +52,18 @@ class TestBuildCapabilities:
         import torch as real_torch
 
         # _build_capabilities does a local `import torch` inside the method,
-        # so we patch the torch module that's already imported at the top of worker.py
-        # plus mock the local import via sys.modules.
+        # so we mock the local import via sys.modules.
         mock_torch = MagicMock()
         mock_torch.cuda.is_available.return_value = False
         mock_torch.__version__ = "2.1.0"
 
+        agent = CascorWorkerAgent(_make_ws_config(task_slots=3))
         with patch.dict("sys.modules", {"torch": mock_torch}), patch("juniper_cascor_worker.worker.os.cpu_count", return_value=8), patch("juniper_cascor_worker.worker.platform.python_version", return_value="3.12.0"), patch("juniper_cascor_worker.worker.platform.system", return_value="Linux"):
-            caps = CascorWorkerAgent._build_capabilities()
+            caps = agent._build_capabilities()
 
         assert caps["cpu_cores"] == 8
+        assert caps["task_slots"] == 3
+        assert caps["training_backend"] == "thread"
         assert caps["python_version"] == "3.12.0"
         assert caps["torch_version"] == "2.1.0"
         assert caps["os"] == "Linux"
@@ -206,7 +208,7 @@ class TestHandleTaskAssign:
         fake_time = MagicMock()
         fake_time.monotonic.side_effect = [10.0, 10.25, 10.25]
         fake_time.time.return_value = 1234.5
-        with patch("juniper_cascor_worker.worker.asyncio.to_thread", new_callable=AsyncMock, return_value=(mock_result_dict, mock_tensors)), patch("juniper_cascor_worker.worker.time", fake_time):
+        with patch.object(CascorWorkerAgent, "_run_training", new_callable=AsyncMock, return_value=(mock_result_dict, mock_tensors)), patch("juniper_cascor_worker.worker.time", fake_time):
             await agent._handle_task_assign(task_msg)
 
         # Verify result JSON was sent
@@ -271,7 +273,7 @@ class TestHandleTaskAssign:
         fake_time = MagicMock()
         fake_time.monotonic.side_effect = [20.0, 20.5, 20.5]
         fake_time.time.return_value = 4321.0
-        with patch("juniper_cascor_worker.worker.asyncio.to_thread", new_callable=AsyncMock, return_value=(mock_result_dict, {})), patch("juniper_cascor_worker.worker.time", fake_time):
+        with patch.object(CascorWorkerAgent, "_run_training", new_callable=AsyncMock, return_value=(mock_result_dict, {})), patch("juniper_cascor_worker.worker.time", fake_time):
             await agent._handle_task_assign(task_msg)
 
         mock_conn.send_json.assert_awaited_once()
@@ -827,11 +829,11 @@ class TestTaskTimeout:
         }
 
         # Simulate a slow task that exceeds the timeout
-        async def slow_to_thread(func, *args):
+        async def slow_training(*args):
             await asyncio.sleep(10.0)
             return {}, {}
 
-        with patch("juniper_cascor_worker.worker.asyncio.to_thread", side_effect=slow_to_thread):
+        with patch.object(CascorWorkerAgent, "_run_training", side_effect=slow_training):
             fake_time = MagicMock()
             fake_time.monotonic.side_effect = [20.0, 22.5, 22.5]
             fake_time.time.return_value = 5678.0
@@ -2,8 +2,9 @@
 
 import asyncio
 import json
+import socket
 import ssl
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
@@ -17,6 +18,7 @@ def _make_mock_ws(state_name="OPEN"):
     mock_ws.protocol = MagicMock()
     mock_ws.protocol.state = MagicMock()
     mock_ws.protocol.state.name = state_name
+    mock_ws.transport = MagicMock()
     return mock_ws
 
 
@@ -107,6 +109,47 @@ class TestSend:
 
         mock_ws.send.assert_awaited_once_with(data)
 
+    @pytest.mark.asyncio
+    async def test_send_bytes_fragments(self):
+        """A sequence of buffers is handed to ws.send as fragments, not joined."""
+        mock_ws = _make_mock_ws()
+        conn = WorkerConnection("ws://localhost:8200/ws/v1/workers")
+        conn._ws = mock_ws
+
+        payload = memoryview(bytearray(8))
+        await conn.send_bytes((b"header", payload))
+
+        sent = mock_ws.send.await_args.args[0]
+        assert sent == [b"header", payload] and sent[1] is payload
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not hasattr(socket, "TCP_CORK"), reason="TCP_CORK is Linux-only")
+    async def test_sends_in_one_tick_share_a_cork(self):
+        """The socket is corked once for back-to-back sends and uncorked on the next loop iteration."""
+        mock_ws = _make_mock_ws()
+        sock = mock_ws.transport.get_extra_info.return_value
+        conn = WorkerConnection("ws://localhost:8200/ws/v1/workers")
+        conn._ws = mock_ws
+
+        await conn.send_json({"type": "task_result"})
+        await conn.send_bytes(b"frame")
+        assert sock.setsockopt.call_args_list == [call(socket.IPPROTO_TCP, socket.TCP_CORK, 1)]
+
+        await asyncio.sleep(0)
+        assert sock.setsockopt.call_args_list[-1] == call(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+        assert conn._corked is False
+
+    @pytest.mark.asyncio
+    async def test_cork_failure_is_ignored(self):
+        """Sockets that reject TCP_CORK (e.g. Unix sockets) still send."""
+        mock_ws = _make_mock_ws()
+        mock_ws.transport.get_extra_info.return_value.setsockopt.side_effect = OSError("not TCP")
+        conn = WorkerConnection("ws://localhost:8200/ws/v1/workers")
+        conn._ws = mock_ws
+
+        await conn.send_bytes(b"frame")
+        mock_ws.send.assert_awaited_once_with(b"frame")
+
     @pytest.mark.asyncio
     async def test_send_when_disconnected_raises(self):
         """Not connected -> WorkerConnectionError."""